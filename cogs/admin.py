@@ -44,7 +44,7 @@ class AnnounceModal(discord.ui.Modal, title="📢 Soạn Thông Báo"):
         if not chat_channel:
             return await interaction.followup.send("❌ Không tìm thấy kênh #chat-arena.", ephemeral=True)
 
-        player_role = discord.utils.get(guild.roles, name=config.ROLE_PLAYER)
+        player_role = bot_utils.get_role(config.ROLE_PLAYER, guild)
         mention_text = player_role.mention if player_role else "@player"
 
         title_str = self.ann_title.value.strip()
@@ -97,6 +97,7 @@ class AdminCog(commands.Cog):
     loan_admin_group = app_commands.Group(name="loan", description="Admin loan management", parent=admin_group)
     role_group = app_commands.Group(name="role", description="Admin role management", parent=admin_group)
     matchmaking_group = app_commands.Group(name="matchmaking", description="Manage matchmaking settings", parent=admin_group)
+    db_group = app_commands.Group(name="db", description="Database diagnostics", parent=admin_group)
     
     async def check_mod(self, interaction: discord.Interaction) -> bool:
         """Check if user has mod role."""
@@ -203,9 +204,9 @@ class AdminCog(commands.Cog):
             # We already applied to the new table with cooldowns.apply_cooldown above.
             # Just ensure the legacy column is cleared in the users table.
             print(f"[ADMIN] Setting join_leave cooldown for user {target_id}, clearing legacy column.")
-            async with db.get_connection() as conn:
+            async with db.transaction() as conn:
                 await conn.execute("UPDATE users SET cooldown_until = NULL WHERE id = ?", (target_id,))
-                await conn.commit()
+                db.invalidate_user(target_id)
         
         await interaction.response.send_message(f"✅ Đã đặt cooldown **{kind}** cho **{target_name}** trong {duration_days} ngày.\nLý do: {reason}")
         
@@ -253,9 +254,9 @@ class AdminCog(commands.Cog):
             # Kind was cleared in the new table via cooldowns.clear_cooldown above.
             # Clear legacy column in users table.
             print(f"[ADMIN] Clearing cooldown for user {target_id}, clearing legacy column.")
-            async with db.get_connection() as conn:
+            async with db.transaction() as conn:
                 await conn.execute("UPDATE users SET cooldown_until = NULL WHERE id = ?", (target_id,))
-                await conn.commit()
+                db.invalidate_user(target_id)
         
         msg = f"✅ Đã xóa **{kind if kind else 'TẤT CẢ'}** cooldown cho **{target_name}**."
         await interaction.response.send_message(msg)
@@ -820,7 +821,7 @@ class AdminCog(commands.Cog):
         try:
             # If user is captain of another clan and moving away, auto-handover captain to another member.
             if current_clan and current_clan["id"] != target_clan["id"] and current_clan["member_role"] == "captain":
-                async with db.get_connection() as conn:
+                async with db.transaction() as conn:
                     cursor = await conn.execute(
                         """SELECT user_id, role FROM clan_members
                            WHERE clan_id = ? AND user_id != ?
@@ -829,22 +830,24 @@ class AdminCog(commands.Cog):
                         (current_clan["id"], db_user["id"]),
                     )
                     replacement = await cursor.fetchone()
-                    if not replacement:
-                        await interaction.response.send_message(
-                            "❌ Không thể chuyển clan cho Captain khi clan hiện tại không có người thay thế.",
-                            ephemeral=True,
+                    if replacement:
+                        await conn.execute(
+                            "UPDATE clan_members SET role = 'captain' WHERE clan_id = ? AND user_id = ?",
+                            (current_clan["id"], replacement["user_id"]),
                         )
-                        return
+                        await conn.execute(
+                            "UPDATE clans SET captain_id = ?, updated_at = datetime('now') WHERE id = ?",
+                            (replacement["user_id"], current_clan["id"]),
+                        )
+                        db.invalidate_clan(current_clan["id"])
+                        db.invalidate_members(clan_id=current_clan["id"])
 
-                    await conn.execute(
-                        "UPDATE clan_members SET role = 'captain' WHERE clan_id = ? AND user_id = ?",
-                        (current_clan["id"], replacement["user_id"]),
-                    )
-                    await conn.execute(
-                        "UPDATE clans SET captain_id = ?, updated_at = datetime('now') WHERE id = ?",
-                        (replacement["user_id"], current_clan["id"]),
+                if not replacement:
+                    await interaction.response.send_message(
+                        "❌ Không thể chuyển clan cho Captain khi clan hiện tại không có người thay thế.",
+                        ephemeral=True,
                     )
-                    await conn.commit()
+                    return
 
             # Membership move/add
             if current_clan and current_clan["id"] != target_clan["id"]:
@@ -878,7 +881,7 @@ class AdminCog(commands.Cog):
                             await discord_member.add_roles(new_discord_role, reason=f"Admin set_member: {reason}")
                     
                     # Also ensure 'player' role is assigned
-                    player_role = discord.utils.get(guild.roles, name=config.ROLE_PLAYER)
+                    player_role = bot_utils.get_role(config.ROLE_PLAYER, guild)
                     if player_role and player_role not in discord_member.roles:
                         await discord_member.add_roles(player_role, reason=f"Admin set_member: {reason}")
                 else:
@@ -914,11 +917,11 @@ class AdminCog(commands.Cog):
         if not guild:
             return await interaction.followup.send("❌ Chỉ sử dụng được trong server.", ephemeral=True)
             
-        player_role = discord.utils.get(guild.roles, name=config.ROLE_PLAYER)
+        player_role = bot_utils.get_role(config.ROLE_PLAYER, guild)
         if not player_role:
             return await interaction.followup.send(f"❌ Không tìm thấy role **{config.ROLE_PLAYER}**.", ephemeral=True)
             
-        async with db.get_connection() as conn:
+        async with db.get_read_connection() as conn:
             cursor = await conn.execute("""
                 SELECT DISTINCT u.discord_id FROM users u
                 JOIN clan_members cm ON u.id = cm.user_id
@@ -1207,19 +1210,20 @@ class AdminCog(commands.Cog):
         admin_user = await db.get_user(str(interaction.user.id))
         admin_user_id = admin_user["id"] if admin_user else 0
 
-        # Create match in resolved status
-        match_id = await db.create_admin_match(
-            clan_a_id=clan_a_data["id"],
-            clan_b_id=clan_b_data["id"],
-            winner_clan_id=winner_data["id"],
-            score_a=score_a,
-            score_b=score_b,
-            admin_user_id=admin_user_id,
-            note=f"{reason} (by {interaction.user.display_name})"
-        )
+        async with db.transaction():
+            # Create match in resolved status
+            match_id = await db.create_admin_match(
+                clan_a_id=clan_a_data["id"],
+                clan_b_id=clan_b_data["id"],
+                winner_clan_id=winner_data["id"],
+                score_a=score_a,
+                score_b=score_b,
+                admin_user_id=admin_user_id,
+                note=f"{reason} (by {interaction.user.display_name})"
+            )
 
-        # Apply Elo
-        elo_result = await elo.apply_match_result(match_id, winner_data["id"])
+            # Apply Elo
+            elo_result = await elo.apply_match_result(match_id, winner_data["id"])
 
         if elo_result["success"]:
             loser_name = clan_b_data["name"] if winner_data["id"] == clan_a_data["id"] else clan_a_data["name"]
@@ -1345,11 +1349,12 @@ class AdminCog(commands.Cog):
         winner_id = clan_a["id"] if score_a > score_b else clan_b["id"]
         winner_name = clan_a["name"] if score_a > score_b else clan_b["name"]
         
-        # 3. Create Match
-        match_id = await db.create_finished_match(clan_a["id"], clan_b["id"], score_a, score_b)
-        
-        # 4. Apply Elo
-        elo_result = await elo.apply_match_result(match_id, winner_id)
+        async with db.transaction():
+            # 3. Create Match
+            match_id = await db.create_finished_match(clan_a["id"], clan_b["id"], score_a, score_b)
+            
+            # 4. Apply Elo
+            elo_result = await elo.apply_match_result(match_id, winner_id)
         
         if elo_result["success"]:
             # Success
@@ -1385,6 +1390,83 @@ class AdminCog(commands.Cog):
         embed = await view.get_overview_embed()
         await interaction.followup.send(embed=embed, view=view, ephemeral=True)
 
+    # =============================================================================
+    # DATABASE DIAGNOSTICS
+    # =============================================================================
+
+    @db_group.command(name="queries", description="Top SQL statements by total time / count / p95")
+    @app_commands.describe(
+        sort="Sort order",
+        limit="Number of statements to show (max 10)"
+    )
+    async def db_queries(self, interaction: discord.Interaction, sort: Literal["total_ms", "count", "p95_ms", "max_ms", "rows"] = "total_ms", limit: int = 10):
+        """List the most expensive statements since startup."""
+        if not await self.check_mod(interaction):
+            return
+        
+        stats = db.get_query_stats(limit=max(1, min(limit, 10)), order_by=sort)
+        if not stats:
+            await interaction.response.send_message("Chưa có dữ liệu query (DB_QUERY_STATS tắt hoặc bot vừa khởi động).", ephemeral=True)
+            return
+        
+        embed = discord.Embed(
+            title=f"🐢 Top SQL Statements (sort: {sort})",
+            color=discord.Color.orange()
+        )
+        for i, q in enumerate(stats, 1):
+            sql = q["sql"] if len(q["sql"]) <= 180 else q["sql"][:177] + "..."
+            embed.add_field(
+                name=f"#{i} • {q['count']}x • total {q['total_ms']:.0f} ms",
+                value=f"p50 `{q['p50_ms']}` p95 `{q['p95_ms']}` p99 `{q['p99_ms']}` max `{q['max_ms']}` ms • rows `{q['rows']}`\n```sql\n{sql}\n```",
+                inline=False
+            )
+        
+        writer = db.get_writer_stats()
+        settings = db.get_settings_cache_stats()
+        clans = db.get_clan_cache_stats()
+        users = db.get_user_cache_stats()
+        embed.set_footer(
+            text=f"Writer: queue {writer['queue_depth']} • avg batch {writer['avg_batch_size']} • avg commit {writer['avg_commit_ms']} ms"
+                 f" | Settings cache: {settings['hits']} hits / {settings['misses']} misses"
+                 f" | Clan cache: {clans['hit_rate']:.0%} | User cache: {users['hit_rate']:.0%} ({users['negative_hits']} unregistered)"
+        )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @db_group.command(name="slow", description="Recent slow queries with their query plan")
+    @app_commands.describe(limit="Number of entries to show (max 5)")
+    async def db_slow(self, interaction: discord.Interaction, limit: int = 3):
+        """Show the slow-query log."""
+        if not await self.check_mod(interaction):
+            return
+        
+        entries = db.get_slow_queries(limit=max(1, min(limit, 5)))
+        if not entries:
+            await interaction.response.send_message(f"✅ Không có query nào chậm hơn {config.DB_SLOW_QUERY_MS} ms.", ephemeral=True)
+            return
+        
+        embed = discord.Embed(
+            title=f"🐌 Slow Queries (> {config.DB_SLOW_QUERY_MS} ms)",
+            color=discord.Color.red()
+        )
+        for entry in entries:
+            sql = entry["sql"] if len(entry["sql"]) <= 300 else entry["sql"][:297] + "..."
+            plan = entry["plan"][:400] or "N/A"
+            embed.add_field(
+                name=f"{entry['ms']} ms • {entry['at'][:19]}",
+                value=f"```sql\n{sql}\n```**Plan:**\n```\n{plan}\n```",
+                inline=False
+            )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @db_group.command(name="reset_stats", description="Reset SQL statement metrics and the slow-query log")
+    async def db_reset_stats(self, interaction: discord.Interaction):
+        """Clear query metrics."""
+        if not await self.check_mod(interaction):
+            return
+        
+        db.reset_query_stats()
+        await interaction.response.send_message("✅ Đã reset thống kê query.", ephemeral=True)
+
     # =============================================================================
     # LOAN ADMIN COMMANDS
     # =============================================================================
@@ -1403,7 +1485,7 @@ class AdminCog(commands.Cog):
             return
         
         # Get all active loans
-        async with db.get_connection() as conn:
+        async with db.get_read_connection() as conn:
             cursor = await conn.execute(
                 "SELECT id, lending_clan_id, borrowing_clan_id, member_user_id FROM loans WHERE status = 'active'"
             )
@@ -1416,10 +1498,16 @@ class AdminCog(commands.Cog):
         fixed = 0
         errors = []
         
+        # Prefetch users/clans for every loan (2 queries instead of 3 per loan)
+        users = await db.get_users_by_ids([loan["member_user_id"] for loan in active_loans])
+        clans = await db.get_clans_by_ids(
+            [loan["lending_clan_id"] for loan in active_loans] + [loan["borrowing_clan_id"] for loan in active_loans]
+        )
+        
         for loan in active_loans:
             loan_id = loan["id"]
             try:
-                member_user = await db.get_user_by_id(loan["member_user_id"])
+                member_user = users.get(loan["member_user_id"])
                 if not member_user:
                     errors.append(f"Loan {loan_id}: user not found")
                     continue
@@ -1429,8 +1517,8 @@ class AdminCog(commands.Cog):
                     errors.append(f"Loan {loan_id}: <@{member_user['discord_id']}> not in server")
                     continue
                 
-                lending_clan = await db.get_clan_by_id(loan["lending_clan_id"])
-                borrowing_clan = await db.get_clan_by_id(loan["borrowing_clan_id"])
+                lending_clan = clans.get(loan["lending_clan_id"])
+                borrowing_clan = clans.get(loan["borrowing_clan_id"])
                 
                 changed = False
                 
@@ -1702,20 +1790,10 @@ class AdminCog(commands.Cog):
         if not clan:
             return await interaction.response.send_message(f"❌ Clan '{clan_name}' không tồn tại.", ephemeral=True)
         
-        old_elo = clan["elo"]
-        new_elo = max(0, old_elo + amount)
-        
-        async with db.get_connection() as conn:
-            await conn.execute(
-                "UPDATE clans SET elo = ?, updated_at = datetime('now') WHERE id = ?",
-                (new_elo, clan["id"])
-            )
-            await conn.execute(
-                """INSERT INTO elo_history (clan_id, old_elo, new_elo, change_amount, reason)
-                   VALUES (?, ?, ?, ?, ?)""",
-                (clan["id"], old_elo, new_elo, amount, f"admin_adjust: {reason}")
-            )
-            await conn.commit()
+        adjusted = await db.adjust_clan_elo(clan["id"], amount, f"admin_adjust: {reason}", floor=0)
+        if adjusted is None:
+            return await interaction.response.send_message(f"❌ Clan '{clan_name}' không tồn tại.", ephemeral=True)
+        old_elo, new_elo = adjusted["old_elo"], adjusted["new_elo"]
         
         await interaction.response.send_message(
             f"✅ Adjusted Elo for **{clan['name']}**: {old_elo} → {new_elo} ({amount:+d})\nReason: {reason}",
@@ -1762,18 +1840,7 @@ class AdminCog(commands.Cog):
                 if clan["elo"] < config.ACTIVITY_BONUS_ELO_THRESHOLD:
                     activity = await db.get_clan_activity_count(clan["id"])
                     if activity >= config.ACTIVITY_BONUS_MIN_MATCHES:
-                        bonus = config.ACTIVITY_BONUS_AMOUNT
-                        async with db.get_connection() as conn:
-                            await conn.execute(
-                                "UPDATE clans SET elo = elo + ?, updated_at = datetime('now') WHERE id = ?",
-                                (bonus, clan["id"])
-                            )
-                            await conn.execute(
-                                """INSERT INTO elo_history (clan_id, old_elo, new_elo, change_amount, reason)
-                                   VALUES (?, ?, ?, ?, ?)""",
-                                (clan["id"], clan["elo"], clan["elo"] + bonus, bonus, "activity_bonus_manual")
-                            )
-                            await conn.commit()
+                        await db.adjust_clan_elo(clan["id"], config.ACTIVITY_BONUS_AMOUNT, "activity_bonus_manual")
                         bonus_count += 1
             results.append(f"📈 Activity Bonus: {bonus_count} clans (+{config.ACTIVITY_BONUS_AMOUNT} Elo)")
         else:
@@ -1906,7 +1973,7 @@ class EloRollbackSelectView(discord.ui.View):
         if interaction.user.id != self.author.id:
             return await interaction.response.send_message("Không phải lệnh của bạn.", ephemeral=True)
         
-        self.selected_matches = self.select.values
+        self.selected_matches = [int(value) for value in self.select.values]
         await interaction.response.defer(ephemeral=True)
         
         # Disable view
@@ -1914,48 +1981,110 @@ class EloRollbackSelectView(discord.ui.View):
             child.disabled = True
         await interaction.edit_original_response(view=self)
 
-        # Process Rollbacks
+        # Diff preview of the replay rollback; the mod picks the mode
+        preview = await moderation.preview_replay_rollback(self.selected_matches)
+        embed = self.build_preview_embed(preview)
+        await interaction.followup.send(
+            embed=embed, view=EloRollbackModeView(self, replay_available=preview["success"]), ephemeral=True
+        )
+
+    def build_preview_embed(self, preview: dict) -> discord.Embed:
+        """Per-clan Elo diff and re-scored later matches of a replay rollback."""
+        ids = ", ".join(f"#{m}" for m in self.selected_matches)
+        embed = discord.Embed(title="🔍 Elo Rollback Preview", color=discord.Color.blue())
+        if not preview["success"]:
+            embed.description = (
+                f"Matches: {ids}\n⚠️ Không thể replay: {preview['reason']}\n"
+                f"Chỉ có thể dùng **Rollback nhanh** (trừ lại điểm của từng trận)."
+            )
+            return embed
+
+        embed.description = (
+            f"**Void + Replay** hủy {ids} và tính lại Elo theo thứ tự thời gian từ match "
+            f"#{preview['first_match_id']} trở đi.\n"
+            f"**Rollback nhanh** chỉ trừ lại điểm của từng trận (các trận sau giữ nguyên)."
+        )
+        lines = [
+            f"**{c['name']}**: {c['old_elo']} → {c['new_elo']} ({c['change']:+d})"
+            for c in preview["clans"] if c["change"]
+        ]
+        shown = lines[:15]
+        if len(lines) > len(shown):
+            shown.append(f"... và {len(lines) - len(shown)} clan khác")
+        embed.add_field(name=f"Elo thay đổi ({len(lines)} clan)", value="\n".join(shown) or "Không có", inline=False)
+        later = [
+            f"#{m['match_id']}: {m['old'][0]:+d}/{m['old'][1]:+d} → {m['new'][0]:+d}/{m['new'][1]:+d}"
+            for m in preview["matches"]
+        ]
+        if later:
+            more = f"\n... và {len(later) - 10} trận khác" if len(later) > 10 else ""
+            embed.add_field(name=f"Trận sau được tính lại ({len(later)})", value="\n".join(later[:10]) + more, inline=False)
+        embed.set_footer(text=f"Replay: {preview['replay_seconds']}s")
+        return embed
+
+    async def notify_victim(self, guild: discord.Guild, match_id: int, clan_id: int, after: int, change: int):
+        """Tell the opponent clan its Elo was restored."""
+        try:
+            victim_clan = await db.get_clan_by_id(clan_id)
+            if victim_clan and victim_clan.get("discord_channel_id"):
+                chan = guild.get_channel(int(victim_clan["discord_channel_id"]))
+                if chan:
+                    embed = discord.Embed(
+                        title="⚖️ Fair Play Update (Hoàn điểm Elo)",
+                        description=(
+                            f"Kết quả trận đấu **#{match_id}** đã bị hủy bỏ do phát hiện vi phạm từ đối thủ.\n\n"
+                            f"✅ **Điểm Elo được hoàn trả**: {after} (Hồi phục {change:+d})\n"
+                            f"Chúng tôi cam kết môi trường thi đấu công bằng cho ClanVXT."
+                        ),
+                        color=discord.Color.green()
+                    )
+                    await chan.send(embed=embed)
+        except Exception as e:
+            print(f"[ROLLBACK] Failed to notify victim clan {clan_id}: {e}")
+
+    async def run_replay(self, interaction: discord.Interaction, mod_id: Optional[int]) -> list:
+        res = await moderation.replay_rollback_matches(self.selected_matches, mod_id)
+        if not res["success"]:
+            return [f"❌ Replay rollback failed ({res['reason']})"]
+
+        results = [f"✅ Match #{m}: Voided." for m in res["match_ids"]]
+        results.append(
+            f"🔁 {len(res['clans'])} clan, {len(res['matches'])} trận sau được tính lại "
+            f"({res['history_rows']} dòng elo_history)."
+        )
+        # Notify the opponents of the voided matches (not clans only moved by the recompute)
+        for clan in res["clans"]:
+            if clan["clan_id"] == self.target_clan["id"] or clan["change"] <= 0 or not clan["voided"]:
+                continue
+            match_id = clan["voided"][0][0]
+            await self.notify_victim(interaction.guild, match_id, clan["clan_id"], clan["new_elo"], clan["change"])
+        await bot_utils.log_event(
+            "ELO_REPLAY_ROLLBACK",
+            f"{self.author.mention} voided {', '.join(f'#{m}' for m in res['match_ids'])} "
+            f"({self.target_clan['name']}); {len(res['clans'])} clans recomputed"
+        )
+        return results
+
+    async def run_legacy(self, interaction: discord.Interaction, mod_id: Optional[int]) -> list:
         results = []
-        mod_user = await db.get_user(str(self.author.id))
-        mod_id = mod_user["id"] if mod_user else 0
-        
-        for match_id_str in self.selected_matches:
-            match_id = int(match_id_str)
+        for match_id in self.selected_matches:
             res = await moderation.rollback_match_elo(match_id, mod_id)
             
             if res["success"]:
-                # Parse details for notification
-                victim_info = None
+                results.append(f"✅ Match #{match_id}: Rolled back.")
+                # Notify Victim
                 for d in res["rollback_details"]:
                     if d["clan_id"] != self.target_clan["id"]:
-                        victim_info = d
+                        await self.notify_victim(interaction.guild, match_id, d["clan_id"], d["after"], d["reverted_change"])
                         break
-                
-                results.append(f"✅ Match #{match_id}: Rolled back.")
-                
-                # Notify Victim
-                if victim_info:
-                    try:
-                        victim_clan = await db.get_clan_by_id(victim_info["clan_id"])
-                        if victim_clan and victim_clan.get("discord_channel_id"):
-                            guild = interaction.guild
-                            chan = guild.get_channel(int(victim_clan["discord_channel_id"]))
-                            if chan:
-                                embed = discord.Embed(
-                                    title="⚖️ Fair Play Update (Hoàn điểm Elo)",
-                                    description=(
-                                        f"Kết quả trận đấu **#{match_id}** đã bị hủy bỏ do phát hiện vi phạm từ đối thủ.\n\n"
-                                        f"✅ **Điểm Elo được hoàn trả**: {victim_info['after']} (Hồi phục {victim_info['reverted_change']:+d})\n"
-                                        f"Chúng tôi cam kết môi trường thi đấu công bằng cho ClanVXT."
-                                    ),
-                                    color=discord.Color.green()
-                                )
-                                await chan.send(embed=embed)
-                    except Exception as e:
-                        print(f"[ROLLBACK] Failed to notify victim clan {victim_info['clan_id']}: {e}")
-
             else:
                 results.append(f"❌ Match #{match_id}: Failed ({res['reason']})")
+        return results
+
+    async def apply(self, interaction: discord.Interaction, replay: bool):
+        mod_user = await db.get_user(str(self.author.id))
+        mod_id = mod_user["id"] if mod_user else None
+        results = await (self.run_replay if replay else self.run_legacy)(interaction, mod_id)
 
         # Summary Report
         embed = discord.Embed(title="🔄 Elo Rollback Report", color=discord.Color.orange())
@@ -1963,6 +2092,38 @@ class EloRollbackSelectView(discord.ui.View):
         await interaction.followup.send(embed=embed, ephemeral=True)
 
 
+class EloRollbackModeView(discord.ui.View):
+    """Confirm step after the diff preview: void + replay, per-match rollback, or cancel."""
+
+    def __init__(self, parent: EloRollbackSelectView, replay_available: bool):
+        super().__init__(timeout=180)
+        self.parent = parent
+        self.replay_button.disabled = not replay_available
+
+    async def _choose(self, interaction: discord.Interaction, replay: Optional[bool]):
+        if interaction.user.id != self.parent.author.id:
+            return await interaction.response.send_message("Không phải lệnh của bạn.", ephemeral=True)
+        for child in self.children:
+            child.disabled = True
+        await interaction.response.edit_message(view=self)
+        self.stop()
+        if replay is None:
+            return await interaction.followup.send("Đã hủy rollback.", ephemeral=True)
+        await self.parent.apply(interaction, replay)
+
+    @discord.ui.button(label="Void + Replay", style=discord.ButtonStyle.danger, emoji="🔁")
+    async def replay_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._choose(interaction, True)
+
+    @discord.ui.button(label="Rollback nhanh", style=discord.ButtonStyle.secondary, emoji="⚡")
+    async def legacy_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._choose(interaction, False)
+
+    @discord.ui.button(label="Hủy", style=discord.ButtonStyle.secondary, emoji="❌")
+    async def cancel_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._choose(interaction, None)
+
+
 # =============================================================================
 # DASHBOARD VIEW
 # =============================================================================
@@ -1978,7 +2139,7 @@ class DashboardView(discord.ui.View):
     
     async def get_overview_embed(self) -> discord.Embed:
         """Get overview/stats embed."""
-        async with db.get_connection() as conn:
+        async with db.get_read_connection() as conn:
             # Count clans by status
             cursor = await conn.execute("SELECT status, COUNT(*) FROM clans GROUP BY status")
             clan_stats = {row[0]: row[1] for row in await cursor.fetchall()}
@@ -2041,7 +2202,7 @@ class DashboardView(discord.ui.View):
     
     async def get_clans_embed(self, page: int = 0) -> discord.Embed:
         """Get clans list embed with pagination."""
-        async with db.get_connection() as conn:
+        async with db.get_read_connection() as conn:
             cursor = await conn.execute("""
                 SELECT c.id, c.name, c.status, c.elo, c.matches_played,
                        (SELECT COUNT(*) FROM clan_members WHERE clan_id = c.id) as member_count
@@ -2080,19 +2241,19 @@ class DashboardView(discord.ui.View):
     
     async def get_members_embed(self, page: int = 0) -> discord.Embed:
         """Get members list with clan info."""
-        async with db.get_connection() as conn:
+        async with db.get_read_connection() as conn:
             cursor = await conn.execute("""
                 SELECT u.discord_id, u.riot_id, u.is_banned, cm.role, c.name as clan_name,
                        (SELECT COUNT(*) FROM cooldowns cd
                         WHERE cd.target_type = 'user'
                           AND cd.target_id = u.id
-                          AND cd.until > datetime('now')) as has_cooldown
+                          AND cd.until_ts > ?) as has_cooldown
                 FROM users u
                 LEFT JOIN clan_members cm ON u.id = cm.user_id
                 LEFT JOIN clans c ON cm.clan_id = c.id AND c.status IN ('active', 'inactive', 'frozen')
                 ORDER BY c.name, cm.role DESC
                 LIMIT 15 OFFSET ?
-            """, (page * 15,))
+            """, (db.epoch_now(), page * 15))
             members = await cursor.fetchall()
             
             cursor = await conn.execute("SELECT COUNT(*) FROM users")
@@ -2142,7 +2303,7 @@ class DashboardView(discord.ui.View):
     
     async def get_matches_embed(self, page: int = 0) -> discord.Embed:
         """Get recent matches."""
-        async with db.get_connection() as conn:
+        async with db.get_read_connection() as conn:
             cursor = await conn.execute("""
                 SELECT m.id, ca.name, cb.name, m.status, m.created_at,
                        CASE WHEN m.reported_winner_clan_id = m.clan_a_id THEN 'A'
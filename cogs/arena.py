@@ -4,11 +4,12 @@ Provides a read-only channel with buttons to view clan system info.
 Auto-sends dashboard to #arena channel on bot startup.
 """
 
+import time
 import discord
 from discord import app_commands
 from discord.ext import commands
 from datetime import datetime, timezone, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Callable, Awaitable
 
 from services import db, bot_utils, cooldowns, permissions
 import config
@@ -617,7 +618,7 @@ class LFGModal(discord.ui.Modal, title="🤝 Đăng Ký Tìm Clan (Free Agent)")
 
         # Post to chat-arena
         channel_name = config.CHANNEL_CHAT_ARENA
-        channel = discord.utils.get(interaction.guild.channels, name=channel_name)
+        channel = bot_utils.get_text_channel(channel_name, interaction.guild)
         
         if not channel:
             await interaction.followup.send(f"❌ Không tìm thấy kênh `#{channel_name}` để đăng tin.", ephemeral=True)
@@ -671,6 +672,222 @@ class LFGModal(discord.ui.Modal, title="🤝 Đăng Ký Tìm Clan (Free Agent)")
         print(f"[ARENA] LFG Post created by {interaction.user.name} (Riot: {self.riot_id.value}, Rank: {self.rank.value})")
 
 
+# =============================================================================
+# RENDERED EMBED CACHE
+# =============================================================================
+# Clan list, leaderboard and match history show the same thing to everyone until
+# a write changes it. Each render is kept as an embed dict together with the
+# db.get_data_version() of the topics it reads; a click with an unchanged version
+# is answered from memory. The clan list also uses server display names, which
+# change without a DB write, so entries expire after ARENA_EMBED_CACHE_TTL_SECONDS.
+
+_rendered: Dict[Any, Tuple[Tuple[Any, ...], float, Any]] = {}
+_render_stats: Dict[str, int] = {"hits": 0, "renders": 0}
+
+
+async def _render_cached(key: Any, topics: Tuple[str, ...], render: Callable[[], Awaitable[Any]]) -> Any:
+    """Return the cached payload for `key` if `topics` did not change since it was rendered."""
+    version = db.get_data_version(*topics)
+    entry = _rendered.get(key)
+    if entry is not None and entry[0] == version and time.monotonic() - entry[1] < config.ARENA_EMBED_CACHE_TTL_SECONDS:
+        _render_stats["hits"] += 1
+        return entry[2]
+    payload = await render()
+    _render_stats["renders"] += 1
+    # A write that committed mid-render may be half reflected: serve it, don't keep it
+    if db.get_data_version(*topics) == version:
+        _rendered[key] = (version, time.monotonic(), payload)
+    return payload
+
+
+async def _render_clan_list(guild: Optional[discord.Guild]) -> Optional[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+    """Clan list embed + the clans offered in its detail dropdown (None if no clan is active)."""
+    clans = await db.get_all_active_clans()
+    print(f"[ARENA] Found {len(clans)} active clans")
+    if not clans:
+        return None
+    
+    # Build embed
+    embed = discord.Embed(
+        title="🏰 Danh Sách Clan Hoạt Động",
+        color=discord.Color.blue(),
+        description=f"Tổng số: **{len(clans)}** clan"
+    )
+    
+    # Sort by Elo descending
+    clans_sorted = sorted(clans, key=lambda c: c.get("elo", 1000), reverse=True)
+    
+    for i, clan in enumerate(clans_sorted[:10], 1):  # Limit to 10 clans
+        members = await db.get_clan_members(clan["id"])
+        member_count = len(members)
+        
+        # Build compact member list (inline, limited to first 4)
+        member_parts = []
+        captain = None
+        others = []
+        
+        for m in members:
+            # Try to get Discord member for display name
+            discord_member = guild.get_member(int(m["discord_id"])) if guild else None
+            display_name = discord_member.display_name if discord_member else m["riot_id"]
+            
+            if m["role"] == "captain":
+                captain = f"👑 {display_name}"
+            else:
+                others.append(display_name)
+        
+        # Format: Captain + first 3 others inline
+        if captain:
+            member_parts.append(captain)
+        
+        # Show max 3 other members
+        for name in others[:3]:
+            member_parts.append(f"👤 {name}")
+        
+        # If more than 3 others, show +X
+        remaining = len(others) - 3
+        if remaining > 0:
+            member_parts.append(f"*...+{remaining} khác*")
+        
+        members_text = " • ".join(member_parts) if member_parts else "Không có thành viên"
+        
+        embed.add_field(
+            name=f"{i}. {clan['name']} | Elo: `{clan.get('elo', 1000)}` | 👥 {member_count}",
+            value=members_text,
+            inline=False
+        )
+    
+    if len(clans) > 10:
+        embed.set_footer(text=f"...và {len(clans) - 10} clan khác")
+    
+    return embed.to_dict(), clans_sorted[:25]  # Discord limit 25 options
+
+
+async def _render_leaderboard() -> Optional[Dict[str, Any]]:
+    """Top 10 clans by Elo with their average rank (None if no clan is active)."""
+    clans = await db.get_all_active_clans()
+    print(f"[ARENA] Leaderboard: {len(clans)} clans")
+    if not clans:
+        return None
+    
+    # Sort by Elo
+    clans_sorted = sorted(clans, key=lambda c: c.get("elo", 1000), reverse=True)
+    
+    embed = discord.Embed(
+        title="🏆 Bảng Xếp Hạng Elo",
+        color=discord.Color.gold()
+    )
+    
+    # Top 10 with medals
+    medals = ["🥇", "🥈", "🥉"] + [""] * 7
+    leaderboard_lines = []
+    
+    for i, clan in enumerate(clans_sorted[:10], 0):
+        medal = medals[i] if i < 3 else f"**{i+1}.**"
+        # Balance System: show avg rank
+        avg_rank = await db.get_clan_avg_rank(clan["id"])
+        from services.elo import RANK_SCORE_TO_NAME
+        rank_label = RANK_SCORE_TO_NAME.get(round(avg_rank), "N/A") if avg_rank > 0 else "N/A"
+        leaderboard_lines.append(
+            f"{medal} **{clan['name']}** — `{clan.get('elo', 1000)}` Elo | 🎯 {rank_label}"
+        )
+    
+    embed.description = "\n".join(leaderboard_lines)
+    embed.set_footer(text="🎯 = Avg Rank của clan | Cập nhật theo thời gian thực")
+    return embed.to_dict()
+
+
+async def _render_match_history() -> Optional[Dict[str, Any]]:
+    """10 most recent matches, cancelled ones excluded (None if there is none)."""
+    matches = await db.get_recent_matches(limit=10, include_cancelled=False)
+    print(f"[ARENA] Found {len(matches)} recent matches")
+    if not matches:
+        return None
+    
+    embed = discord.Embed(
+        title="⚔️ Lịch Sử Trận Đấu Gần Đây",
+        color=discord.Color.red(),
+        description="*Ghi chú: 10 trận đấu chính thức mới nhất.*"
+    )
+    
+    # Get clan names (one query for the whole page)
+    clans = await db.get_clans_by_ids(
+        [m["clan_a_id"] for m in matches] + [m["clan_b_id"] for m in matches]
+    )
+    
+    match_lines = []
+    for match in matches:
+        clan_a = clans.get(match["clan_a_id"])
+        clan_b = clans.get(match["clan_b_id"])
+        
+        clan_a_name = clan_a["name"] if clan_a else "Unknown"
+        clan_b_name = clan_b["name"] if clan_b else "Unknown"
+        
+        status_emoji = {
+            "confirmed": "✅",
+            "reported": "⏳",
+            "dispute": "⚠️",
+            "resolved": "⚖️",
+            "voided": "🚫",
+            "created": "🆕"
+        }.get(match["status"], "❓")
+        
+        # Date & Time (formatted)
+        # SQLite datetime strings usually look like '2026-02-12 10:39:15' or ISO '2026-02-12T10:39:15'
+        raw_date = match.get("created_at", "")
+        if raw_date:
+            try:
+                # Simple cleanup for display
+                display_date = raw_date.replace("T", " ")[:16] # YYYY-MM-DD HH:MM
+            except:
+                display_date = raw_date[:10]
+        else:
+            display_date = "N/A"
+        
+        # Build line based on match state
+        winner_id = match.get("winner_clan_id") or match.get("reported_winner_clan_id") or match.get("resolved_winner_clan_id")
+        
+        if winner_id and match["status"] in ("confirmed", "resolved", "reported"):
+            winner_name = clan_a_name if winner_id == match["clan_a_id"] else clan_b_name
+            loser_name = clan_b_name if winner_id == match["clan_a_id"] else clan_a_name
+            
+            # Score info
+            score_text = ""
+            if match.get("score_a") is not None and match.get("score_b") is not None:
+                score_text = f" `{match['score_a']}-{match['score_b']}`"
+            
+            # Elo change info
+            elo_text = ""
+            if match.get("elo_applied"):
+                delta_a = match.get("final_delta_a", 0)
+                delta_b = match.get("final_delta_b", 0)
+                w_delta = abs(delta_a if winner_id == match["clan_a_id"] else delta_b)
+                l_delta = abs(delta_b if winner_id == match["clan_a_id"] else delta_a)
+                elo_text = f" (`+{w_delta}` / `-{l_delta}`)"
+            
+            prefix = "✅ " if match["status"] == "confirmed" else status_emoji
+            line = f"{prefix}**{winner_name}** thắng **{loser_name}**{score_text}{elo_text}"
+            if match["status"] == "reported":
+                line += " — *đang chờ xác nhận*"
+        elif match["status"] == "voided":
+            line = f"{status_emoji} ~~{clan_a_name} vs {clan_b_name}~~ — *Trận đấu vô hiệu*"
+        else:
+            status_text = {
+                "created": "đang chờ kết quả",
+                "reported": "chờ xác nhận",
+                "dispute": "tranh chấp — chờ Mod",
+            }.get(match["status"], match["status"])
+            line = f"{status_emoji} **{clan_a_name}** vs **{clan_b_name}** — *{status_text}*"
+
+        
+        line += f"\n└ 🕒 `{display_date}`"
+        match_lines.append(line)
+    
+    embed.description = "\n\n".join(match_lines)
+    embed.set_footer(text="10 trận gần nhất • Elo: (thắng/thua)")
+    return embed.to_dict()
+
+
 # =============================================================================
 # ARENA VIEW (Persistent Buttons)
 # =============================================================================
@@ -694,69 +911,18 @@ class ArenaView(discord.ui.View):
         await interaction.response.defer(ephemeral=True)
         
         try:
-            clans = await db.get_all_active_clans()
-            print(f"[ARENA] Found {len(clans)} active clans")
-            
-            if not clans:
+            rendered = await _render_cached(
+                ("clan_list", interaction.guild_id), ("clans", "members"),
+                lambda: _render_clan_list(interaction.guild)
+            )
+            if rendered is None:
                 await interaction.followup.send("📭 Chưa có clan nào hoạt động.", ephemeral=True)
                 return
             
-            # Build embed
-            embed = discord.Embed(
-                title="🏰 Danh Sách Clan Hoạt Động",
-                color=discord.Color.blue(),
-                description=f"Tổng số: **{len(clans)}** clan"
-            )
-            
-            # Sort by Elo descending
-            clans_sorted = sorted(clans, key=lambda c: c.get("elo", 1000), reverse=True)
-            
-            for i, clan in enumerate(clans_sorted[:10], 1):  # Limit to 10 clans
-                members = await db.get_clan_members(clan["id"])
-                member_count = len(members)
-                
-                # Build compact member list (inline, limited to first 4)
-                member_parts = []
-                captain = None
-                others = []
-                
-                for m in members:
-                    # Try to get Discord member for display name
-                    discord_member = interaction.guild.get_member(int(m["discord_id"])) if interaction.guild else None
-                    display_name = discord_member.display_name if discord_member else m["riot_id"]
-                    
-                    if m["role"] == "captain":
-                        captain = f"👑 {display_name}"
-                    else:
-                        others.append(display_name)
-                
-                # Format: Captain + first 3 others inline
-                if captain:
-                    member_parts.append(captain)
-                
-                # Show max 3 other members
-                for name in others[:3]:
-                    member_parts.append(f"👤 {name}")
-                
-                # If more than 3 others, show +X
-                remaining = len(others) - 3
-                if remaining > 0:
-                    member_parts.append(f"*...+{remaining} khác*")
-                
-                members_text = " • ".join(member_parts) if member_parts else "Không có thành viên"
-                
-                embed.add_field(
-                    name=f"{i}. {clan['name']} | Elo: `{clan.get('elo', 1000)}` | 👥 {member_count}",
-                    value=members_text,
-                    inline=False
-                )
-            
-            if len(clans) > 10:
-                embed.set_footer(text=f"...và {len(clans) - 10} clan khác")
-            
+            payload, select_clans = rendered
             # Add dropdown to select clan for detailed view
-            view = ClanDetailSelectView(clans_sorted[:25])  # Discord limit 25 options
-            await interaction.followup.send(embed=embed, view=view, ephemeral=True)
+            view = ClanDetailSelectView(select_clans)
+            await interaction.followup.send(embed=discord.Embed.from_dict(payload), view=view, ephemeral=True)
             print(f"[ARENA] Sent clan list with members to {interaction.user}")
             
         except Exception as e:
@@ -775,39 +941,12 @@ class ArenaView(discord.ui.View):
         await interaction.response.defer(ephemeral=True)
         
         try:
-            clans = await db.get_all_active_clans()
-            print(f"[ARENA] Leaderboard: {len(clans)} clans")
-            
-            if not clans:
+            payload = await _render_cached("leaderboard", ("clans", "members"), _render_leaderboard)
+            if payload is None:
                 await interaction.followup.send("📭 Chưa có clan nào để xếp hạng.", ephemeral=True)
                 return
             
-            # Sort by Elo
-            clans_sorted = sorted(clans, key=lambda c: c.get("elo", 1000), reverse=True)
-            
-            embed = discord.Embed(
-                title="🏆 Bảng Xếp Hạng Elo",
-                color=discord.Color.gold()
-            )
-            
-            # Top 10 with medals
-            medals = ["🥇", "🥈", "🥉"] + [""] * 7
-            leaderboard_lines = []
-            
-            for i, clan in enumerate(clans_sorted[:10], 0):
-                medal = medals[i] if i < 3 else f"**{i+1}.**"
-                # Balance System: show avg rank
-                avg_rank = await db.get_clan_avg_rank(clan["id"])
-                from services.elo import RANK_SCORE_TO_NAME
-                rank_label = RANK_SCORE_TO_NAME.get(round(avg_rank), "N/A") if avg_rank > 0 else "N/A"
-                leaderboard_lines.append(
-                    f"{medal} **{clan['name']}** — `{clan.get('elo', 1000)}` Elo | 🎯 {rank_label}"
-                )
-            
-            embed.description = "\n".join(leaderboard_lines)
-            embed.set_footer(text="🎯 = Avg Rank của clan | Cập nhật theo thời gian thực")
-            
-            await interaction.followup.send(embed=embed, ephemeral=True)
+            await interaction.followup.send(embed=discord.Embed.from_dict(payload), ephemeral=True)
             print(f"[ARENA] Sent leaderboard to {interaction.user}")
             
         except Exception as e:
@@ -826,93 +965,12 @@ class ArenaView(discord.ui.View):
         await interaction.response.defer(ephemeral=True)
         
         try:
-            # Get 10 most recent matches (excluding cancelled by default in db.py)
-            matches = await db.get_recent_matches(limit=10, include_cancelled=False)
-            print(f"[ARENA] Found {len(matches)} recent matches")
-            
-            if not matches:
+            payload = await _render_cached("match_history", ("clans", "matches"), _render_match_history)
+            if payload is None:
                 await interaction.followup.send("📭 Chưa có trận đấu nào được ghi nhận.", ephemeral=True)
                 return
             
-            embed = discord.Embed(
-                title="⚔️ Lịch Sử Trận Đấu Gần Đây",
-                color=discord.Color.red(),
-                description="*Ghi chú: 10 trận đấu chính thức mới nhất.*"
-            )
-            
-            match_lines = []
-            for match in matches:
-                # Get clan names
-                clan_a = await db.get_clan_by_id(match["clan_a_id"])
-                clan_b = await db.get_clan_by_id(match["clan_b_id"])
-                
-                clan_a_name = clan_a["name"] if clan_a else "Unknown"
-                clan_b_name = clan_b["name"] if clan_b else "Unknown"
-                
-                status_emoji = {
-                    "confirmed": "✅",
-                    "reported": "⏳",
-                    "dispute": "⚠️",
-                    "resolved": "⚖️",
-                    "voided": "🚫",
-                    "created": "🆕"
-                }.get(match["status"], "❓")
-                
-                # Date & Time (formatted)
-                # SQLite datetime strings usually look like '2026-02-12 10:39:15' or ISO '2026-02-12T10:39:15'
-                raw_date = match.get("created_at", "")
-                if raw_date:
-                    try:
-                        # Simple cleanup for display
-                        display_date = raw_date.replace("T", " ")[:16] # YYYY-MM-DD HH:MM
-                    except:
-                        display_date = raw_date[:10]
-                else:
-                    display_date = "N/A"
-                
-                # Build line based on match state
-                winner_id = match.get("winner_clan_id") or match.get("reported_winner_clan_id") or match.get("resolved_winner_clan_id")
-                
-                if winner_id and match["status"] in ("confirmed", "resolved", "reported"):
-                    winner_name = clan_a_name if winner_id == match["clan_a_id"] else clan_b_name
-                    loser_name = clan_b_name if winner_id == match["clan_a_id"] else clan_a_name
-                    
-                    # Score info
-                    score_text = ""
-                    if match.get("score_a") is not None and match.get("score_b") is not None:
-                        score_text = f" `{match['score_a']}-{match['score_b']}`"
-                    
-                    # Elo change info
-                    elo_text = ""
-                    if match.get("elo_applied"):
-                        delta_a = match.get("final_delta_a", 0)
-                        delta_b = match.get("final_delta_b", 0)
-                        w_delta = abs(delta_a if winner_id == match["clan_a_id"] else delta_b)
-                        l_delta = abs(delta_b if winner_id == match["clan_a_id"] else delta_a)
-                        elo_text = f" (`+{w_delta}` / `-{l_delta}`)"
-                    
-                    prefix = "✅ " if match["status"] == "confirmed" else status_emoji
-                    line = f"{prefix}**{winner_name}** thắng **{loser_name}**{score_text}{elo_text}"
-                    if match["status"] == "reported":
-                        line += " — *đang chờ xác nhận*"
-                elif match["status"] == "voided":
-                    line = f"{status_emoji} ~~{clan_a_name} vs {clan_b_name}~~ — *Trận đấu vô hiệu*"
-                else:
-                    status_text = {
-                        "created": "đang chờ kết quả",
-                        "reported": "chờ xác nhận",
-                        "dispute": "tranh chấp — chờ Mod",
-                    }.get(match["status"], match["status"])
-                    line = f"{status_emoji} **{clan_a_name}** vs **{clan_b_name}** — *{status_text}*"
-
-                
-                line += f"\n└ 🕒 `{display_date}`"
-                match_lines.append(line)
-            
-            embed.description = "\n\n".join(match_lines)
-            embed.set_footer(text="10 trận gần nhất • Elo: (thắng/thua)")
-            
-            await interaction.followup.send(embed=embed, ephemeral=True)
+            await interaction.followup.send(embed=discord.Embed.from_dict(payload), ephemeral=True)
             print(f"[ARENA] Sent match history to {interaction.user}")
             
         except Exception as e:
@@ -1055,170 +1113,7 @@ class ArenaView(discord.ui.View):
         """Show clan system rules."""
         print(f"[ARENA] User {interaction.user} clicked: Rules")
         
-        embed = discord.Embed(
-            title="📜 Luật Lệ Hệ Thống Clan",
-            description="Tóm tắt các quy định quan trọng của hệ thống Clan VXT",
-            color=discord.Color.dark_gold()
-        )
-        
-        # Section 1: Tổng quan
-        embed.add_field(
-            name="🏰 Tổng Quan",
-            value=(
-                "• Mỗi người chỉ được **1 tài khoản** Discord\n"
-                "• Mỗi người chỉ thuộc **1 clan** tại 1 thời điểm\n"
-                "• **Elo** là điểm của **clan**, không có Elo cá nhân\n"
-                "• Mọi clan mới phải qua **Mod duyệt**"
-            ),
-            inline=False
-        )
-        
-        # Section 2: Tạo Clan
-        embed.add_field(
-            name="🆕 Tạo Clan",
-            value=(
-                "• Captain phải có role **Thiểu Năng Con**\n"
-                "• Cần **5 người** ngay từ đầu (Captain + 4)\n"
-                "• 4 người phải **Accept** qua DM trong **48h**\n"
-                "• Tên clan **duy nhất**, không được nhái/giả mạo"
-            ),
-            inline=False
-        )
-        
-        # Section 3: Quyền lợi Clan
-        embed.add_field(
-            name="🎁 Quyền Lợi Khi Có Clan",
-            value=(
-                "• **Role riêng** với tên và màu của clan\n"
-                "• **Kênh chat riêng** chỉ clan và Mod xem được\n"
-                "• Tham gia **thi đấu** và ghi nhận **Elo**\n"
-                "• Cạnh tranh **BXH** và nhận **phần thưởng mùa**"
-            ),
-            inline=False
-        )
-        
-        # New Section: Try-Out
-        embed.add_field(
-            name="🛡️ Chế độ Thử Việc (Try-Out)",
-            value=(
-                "• Dành cho thành viên mới (Recruit) thời hạn **24h**\n"
-                "• Được tham gia thi đấu ngay lập tức\n"
-                "• Nếu bị kick/tự rời trong 24h: **KHÔNG BỊ COOLDOWN**\n"
-                "• Sau 24h không được Promote → **Tự động Kick**"
-            ),
-            inline=False
-        )
-        
-        # Section 4: Cooldown & Rời Clan
-        embed.add_field(
-            name="⏳ Cooldown",
-            value=(
-                "• Rời clan/bị kick → chờ **03 ngày** mới vào clan khác\n"
-                "• Captain rời clan → phải **chuyển Captain** trước\n"
-                "• Clan < 5 người → **tạm khóa** tính năng thi đấu"
-            ),
-            inline=False
-        )
-        
-        # Section 5: Trận đấu & Elo
-        embed.add_field(
-            name="⚔️ Trận Đấu & Elo",
-            value=(
-                "• Elo **thay đổi** dựa trên chênh lệch sức mạnh (K=32)\n"
-                "• **10 trận đầu** = placement: Elo thay đổi nhanh hơn (K=40)\n"
-                "• **Ban/Pick Map**: BO1/BO3 theo chuẩn giải đấu\n"
-                "• **Giới hạn**: Mỗi clan chỉ được 1 trận chưa hoàn thành (Active)"
-            ),
-            inline=False
-        )
-        
-        # Section 6: Cho mượn (Loan)
-        embed.add_field(
-            name="🤝 Cho Mượn Thành Viên",
-            value=(
-                "• Tối đa **2 người** cho mượn/mỗi clan\n"
-                "• Cần **3 bên đồng ý**: 2 Captain + người được mượn\n"
-                "• Thời hạn tối đa **7 ngày**\n"
-                "• Cooldown **03 ngày** sau khi kết thúc"
-            ),
-            inline=True
-        )
-        
-        # Section 7: Chuyển nhượng (Transfer)
-        embed.add_field(
-            name="🔄 Chuyển Nhượng",
-            value=(
-                "• Cần **3 bên đồng ý** (giống Cho mượn)\n"
-                "• Clan nguồn phải còn **≥5 người** sau chuyển\n"
-                "• **Transfer Sickness**: cấm thi đấu **3 ngày**\n"
-                "• Cooldown **03 ngày** không rời clan mới"
-            ),
-            inline=True
-        )
-        
-        # Section 8: Quy định thi đấu online
-        embed.add_field(
-            name="🎮 Quy Định Khi Thi Đấu Clan (Online)",
-            value=(
-                "• Tất cả trận đấu clan bắt buộc phải thi đấu trong voice channel của server chính\n"
-                "• Thành viên tham gia trận phải có mặt đầy đủ trong voice để Mod có thể kiểm soát\n"
-                "• Không được tự ý sang server riêng để thi đấu\n"
-                "• Không được thay người ngoài danh sách đăng ký mà không báo trước\n"
-                "• Mỗi team chỉ được tối đa **1 người nước ngoài (tây)** trong đội hình\n"
-                "• Không được lách luật bằng cách thay người giữa trận\n"
-                "• Vi phạm giới hạn đội hình/thay người trái phép sẽ bị xử lý nghiêm"
-            ),
-            inline=False
-        )
-
-        # Section: Balance System
-        embed.add_field(
-            name="⚖️ Hệ Thống Cân Bằng (Balance)",
-            value=(
-                "• **Khai báo Rank**: Mọi thành viên phải khai Rank Valorant khi vào clan\n"
-                "• **Bắt buộc khai báo**: Clan muốn thi đấu → tất cả phải đã khai Rank\n"
-                "• **Giới hạn tuyển quân**: Tối đa tuyển quân mỗi tuần (chống lách luật)\n"
-                "• **Giới hạn Rank cao**: Tối đa thành viên Immortal 2+ trong mỗi clan\n"
-                "• **Elo Decay**: Clan trên ngưỡng không thi đấu lâu sẽ bị giảm Elo\n"
-                "• **Thưởng hoạt động**: Clan thi đấu đều đặn nhận bonus Elo\n"
-                "• **Underdog Bonus**: Clan yếu hơn thắng sẽ được thưởng thêm\n"
-                "• **Chống farm**: Win rate quá cao sẽ bị giảm Elo nhận được"
-            ),
-            inline=False
-        )
-
-        # Section 9: Khung xử phạt
-        embed.add_field(
-            name="🚨 Khung Xử Phạt Vi Phạm",
-            value=(
-                "**Lần 1:** Reset Elo clan về mức thấp nhất: **100 Elo**\n"
-                "**Lần 2:** Xóa clan khỏi hệ thống. Thành viên không được tạo/tham gia clan khác\n"
-                "**Lần 3:** **Ban** khỏi server"
-            ),
-            inline=False
-        )
-
-        # Section 10: Vi phạm khác
-        embed.add_field(
-            name="🚫 Các Vi Phạm Khác",
-            value=(
-                "• Dùng nhiều acc/smurf → **ban hệ thống**\n"
-                "• Gian lận Elo/dàn xếp → **ban vĩnh viễn**\n"
-                "• Tên clan tục tĩu/kỳ thị → **reject**\n"
-                "• Mọi quyết định cuối thuộc về **Mod**"
-            ),
-            inline=False
-        )
-
-        # Section 11: Mục đích
-        embed.add_field(
-            name="📌 Mục Đích",
-            value="Đảm bảo minh bạch, công bằng và hạn chế rủi ro thay người không hợp lệ. Mod có quyền xác minh và đưa ra quyết định cuối cùng.",
-            inline=False
-        )
-        
-        embed.set_footer(text="💡 Liên hệ Mod nếu có thắc mắc! | VXT Clan System")
-        
+        embed = bot_utils.get_static_embed("arena_rules")
         await interaction.response.send_message(embed=embed, ephemeral=True)
         print(f"[ARENA] Sent rules to {interaction.user}")
 
@@ -1233,17 +1128,7 @@ class ArenaView(discord.ui.View):
         """Show donation info."""
         print(f"[ARENA] User {interaction.user} clicked: Donate")
         
-        embed = discord.Embed(
-            title="☕ Ủng Hộ Đội Ngũ Phát Triển",
-            description=config.DONATE_DESCRIPTION,
-            color=discord.Color.gold()
-        )
-        
-        if config.DONATE_IMAGE_URL:
-            embed.set_image(url=config.DONATE_IMAGE_URL)
-        
-        embed.set_footer(text="Cảm ơn tấm lòng của bạn! ❤️ - Server không thu phí, tiền donate là tự nguyện.")
-        
+        embed = bot_utils.get_static_embed("arena_donate")
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
     @discord.ui.button(
@@ -1379,6 +1264,12 @@ class ArenaView(discord.ui.View):
 
 def create_arena_embed() -> discord.Embed:
     """Create the main Arena Dashboard embed."""
+    return bot_utils.get_static_embed("arena_dashboard")
+
+
+@bot_utils.static_embed("arena_dashboard")
+def _build_arena_embed() -> discord.Embed:
+    """Main Arena Dashboard embed."""
     embed = discord.Embed(
         title="🏟️ ARENA - Trung Tâm Thông Tin",
         description=(
@@ -1401,6 +1292,191 @@ def create_arena_embed() -> discord.Embed:
     return embed
 
 
+@bot_utils.static_embed("arena_rules")
+def _build_rules_embed() -> discord.Embed:
+    """Clan system rules (📜 Luật Lệ)."""
+    embed = discord.Embed(
+        title="📜 Luật Lệ Hệ Thống Clan",
+        description="Tóm tắt các quy định quan trọng của hệ thống Clan VXT",
+        color=discord.Color.dark_gold()
+    )
+    
+    # Section 1: Tổng quan
+    embed.add_field(
+        name="🏰 Tổng Quan",
+        value=(
+            "• Mỗi người chỉ được **1 tài khoản** Discord\n"
+            "• Mỗi người chỉ thuộc **1 clan** tại 1 thời điểm\n"
+            "• **Elo** là điểm của **clan**, không có Elo cá nhân\n"
+            "• Mọi clan mới phải qua **Mod duyệt**"
+        ),
+        inline=False
+    )
+    
+    # Section 2: Tạo Clan
+    embed.add_field(
+        name="🆕 Tạo Clan",
+        value=(
+            "• Captain phải có role **Thiểu Năng Con**\n"
+            "• Cần **5 người** ngay từ đầu (Captain + 4)\n"
+            "• 4 người phải **Accept** qua DM trong **48h**\n"
+            "• Tên clan **duy nhất**, không được nhái/giả mạo"
+        ),
+        inline=False
+    )
+    
+    # Section 3: Quyền lợi Clan
+    embed.add_field(
+        name="🎁 Quyền Lợi Khi Có Clan",
+        value=(
+            "• **Role riêng** với tên và màu của clan\n"
+            "• **Kênh chat riêng** chỉ clan và Mod xem được\n"
+            "• Tham gia **thi đấu** và ghi nhận **Elo**\n"
+            "• Cạnh tranh **BXH** và nhận **phần thưởng mùa**"
+        ),
+        inline=False
+    )
+    
+    # New Section: Try-Out
+    embed.add_field(
+        name="🛡️ Chế độ Thử Việc (Try-Out)",
+        value=(
+            "• Dành cho thành viên mới (Recruit) thời hạn **24h**\n"
+            "• Được tham gia thi đấu ngay lập tức\n"
+            "• Nếu bị kick/tự rời trong 24h: **KHÔNG BỊ COOLDOWN**\n"
+            "• Sau 24h không được Promote → **Tự động Kick**"
+        ),
+        inline=False
+    )
+    
+    # Section 4: Cooldown & Rời Clan
+    embed.add_field(
+        name="⏳ Cooldown",
+        value=(
+            "• Rời clan/bị kick → chờ **03 ngày** mới vào clan khác\n"
+            "• Captain rời clan → phải **chuyển Captain** trước\n"
+            "• Clan < 5 người → **tạm khóa** tính năng thi đấu"
+        ),
+        inline=False
+    )
+    
+    # Section 5: Trận đấu & Elo
+    embed.add_field(
+        name="⚔️ Trận Đấu & Elo",
+        value=(
+            "• Elo **thay đổi** dựa trên chênh lệch sức mạnh (K=32)\n"
+            "• **10 trận đầu** = placement: Elo thay đổi nhanh hơn (K=40)\n"
+            "• **Ban/Pick Map**: BO1/BO3 theo chuẩn giải đấu\n"
+            "• **Giới hạn**: Mỗi clan chỉ được 1 trận chưa hoàn thành (Active)"
+        ),
+        inline=False
+    )
+    
+    # Section 6: Cho mượn (Loan)
+    embed.add_field(
+        name="🤝 Cho Mượn Thành Viên",
+        value=(
+            "• Tối đa **2 người** cho mượn/mỗi clan\n"
+            "• Cần **3 bên đồng ý**: 2 Captain + người được mượn\n"
+            "• Thời hạn tối đa **7 ngày**\n"
+            "• Cooldown **03 ngày** sau khi kết thúc"
+        ),
+        inline=True
+    )
+    
+    # Section 7: Chuyển nhượng (Transfer)
+    embed.add_field(
+        name="🔄 Chuyển Nhượng",
+        value=(
+            "• Cần **3 bên đồng ý** (giống Cho mượn)\n"
+            "• Clan nguồn phải còn **≥5 người** sau chuyển\n"
+            "• **Transfer Sickness**: cấm thi đấu **3 ngày**\n"
+            "• Cooldown **03 ngày** không rời clan mới"
+        ),
+        inline=True
+    )
+    
+    # Section 8: Quy định thi đấu online
+    embed.add_field(
+        name="🎮 Quy Định Khi Thi Đấu Clan (Online)",
+        value=(
+            "• Tất cả trận đấu clan bắt buộc phải thi đấu trong voice channel của server chính\n"
+            "• Thành viên tham gia trận phải có mặt đầy đủ trong voice để Mod có thể kiểm soát\n"
+            "• Không được tự ý sang server riêng để thi đấu\n"
+            "• Không được thay người ngoài danh sách đăng ký mà không báo trước\n"
+            "• Mỗi team chỉ được tối đa **1 người nước ngoài (tây)** trong đội hình\n"
+            "• Không được lách luật bằng cách thay người giữa trận\n"
+            "• Vi phạm giới hạn đội hình/thay người trái phép sẽ bị xử lý nghiêm"
+        ),
+        inline=False
+    )
+
+    # Section: Balance System
+    embed.add_field(
+        name="⚖️ Hệ Thống Cân Bằng (Balance)",
+        value=(
+            "• **Khai báo Rank**: Mọi thành viên phải khai Rank Valorant khi vào clan\n"
+            "• **Bắt buộc khai báo**: Clan muốn thi đấu → tất cả phải đã khai Rank\n"
+            "• **Giới hạn tuyển quân**: Tối đa tuyển quân mỗi tuần (chống lách luật)\n"
+            "• **Giới hạn Rank cao**: Tối đa thành viên Immortal 2+ trong mỗi clan\n"
+            "• **Elo Decay**: Clan trên ngưỡng không thi đấu lâu sẽ bị giảm Elo\n"
+            "• **Thưởng hoạt động**: Clan thi đấu đều đặn nhận bonus Elo\n"
+            "• **Underdog Bonus**: Clan yếu hơn thắng sẽ được thưởng thêm\n"
+            "• **Chống farm**: Win rate quá cao sẽ bị giảm Elo nhận được"
+        ),
+        inline=False
+    )
+
+    # Section 9: Khung xử phạt
+    embed.add_field(
+        name="🚨 Khung Xử Phạt Vi Phạm",
+        value=(
+            "**Lần 1:** Reset Elo clan về mức thấp nhất: **100 Elo**\n"
+            "**Lần 2:** Xóa clan khỏi hệ thống. Thành viên không được tạo/tham gia clan khác\n"
+            "**Lần 3:** **Ban** khỏi server"
+        ),
+        inline=False
+    )
+
+    # Section 10: Vi phạm khác
+    embed.add_field(
+        name="🚫 Các Vi Phạm Khác",
+        value=(
+            "• Dùng nhiều acc/smurf → **ban hệ thống**\n"
+            "• Gian lận Elo/dàn xếp → **ban vĩnh viễn**\n"
+            "• Tên clan tục tĩu/kỳ thị → **reject**\n"
+            "• Mọi quyết định cuối thuộc về **Mod**"
+        ),
+        inline=False
+    )
+
+    # Section 11: Mục đích
+    embed.add_field(
+        name="📌 Mục Đích",
+        value="Đảm bảo minh bạch, công bằng và hạn chế rủi ro thay người không hợp lệ. Mod có quyền xác minh và đưa ra quyết định cuối cùng.",
+        inline=False
+    )
+    
+    embed.set_footer(text="💡 Liên hệ Mod nếu có thắc mắc! | VXT Clan System")
+    return embed
+
+
+@bot_utils.static_embed("arena_donate")
+def _build_donate_embed() -> discord.Embed:
+    """Donation info (☕ Donate), from config.DONATE_*."""
+    embed = discord.Embed(
+        title="☕ Ủng Hộ Đội Ngũ Phát Triển",
+        description=config.DONATE_DESCRIPTION,
+        color=discord.Color.gold()
+    )
+    
+    if config.DONATE_IMAGE_URL:
+        embed.set_image(url=config.DONATE_IMAGE_URL)
+    
+    embed.set_footer(text="Cảm ơn tấm lòng của bạn! ❤️ - Server không thu phí, tiền donate là tự nguyện.")
+    return embed
+
+
 # =============================================================================
 # ARENA COG
 # =============================================================================
@@ -1415,7 +1491,8 @@ class ArenaCog(commands.Cog):
         print("[ARENA] ArenaCog initialized")
     
     async def cog_load(self):
-        """Register persistent view when cog loads."""
+        """Register persistent view and build the static screens when cog loads."""
+        bot_utils.build_static_embeds("arena_dashboard", "arena_rules", "arena_donate")
         self.bot.add_view(ArenaView())
         print("[ARENA] Registered ArenaView as persistent view")
 
@@ -1575,7 +1652,7 @@ class ArenaCog(commands.Cog):
             return
         
         # Find #arena channel
-        arena_channel = discord.utils.get(guild.text_channels, name=config.CHANNEL_ARENA)
+        arena_channel = bot_utils.get_text_channel(config.CHANNEL_ARENA, guild)
         
         if not arena_channel:
             print(f"[ARENA] WARNING: Channel '{config.CHANNEL_ARENA}' not found. Skipping auto-setup.")
@@ -1626,7 +1703,7 @@ class ArenaCog(commands.Cog):
             print("[ARENA] arena_channel not set, searching now...")
             guild = self.bot.get_guild(config.GUILD_ID)
             if guild:
-                self.arena_channel = discord.utils.get(guild.text_channels, name=config.CHANNEL_ARENA)
+                self.arena_channel = bot_utils.get_text_channel(config.CHANNEL_ARENA, guild)
                 if self.arena_channel:
                     print(f"[ARENA] Found arena channel: #{self.arena_channel.name}")
         
@@ -381,7 +381,7 @@ async def create_match_channels(
     role_b = guild.get_role(int(clan_b["discord_role_id"])) if clan_b.get("discord_role_id") else None
     bot_member = guild.me
 
-    category = discord.utils.get(guild.categories, name=config.CATEGORY_CLANS)
+    category = bot_utils.get_category(config.CATEGORY_CLANS, guild)
 
     # --- Voice A: only Clan A can connect, limit 5 ---
     voice_a_overwrites = {
@@ -454,6 +454,116 @@ class RankDeclarationView(discord.ui.View):
         self.add_item(btn)
 
 
+# =============================================================================
+# STATIC EMBEDS
+# =============================================================================
+
+@bot_utils.static_embed("clan_help")
+def _build_help_embed(is_mod: bool, is_verified: bool, clan_role: Optional[str]) -> discord.Embed:
+    """/clan help for one combination of roles (built once per combination)."""
+    embed = discord.Embed(
+        title="🏰 Hệ Thống Clan VXT - Hướng Dẫn",
+        description="Chào mừng bạn đến với đấu trường Clan VXT. Dưới đây là các lệnh bạn có thể sử dụng:",
+        color=discord.Color.gold()
+    )
+    
+    # Season info
+    season_info = """
+• **Reset:** Elo sẽ reset theo mỗi mùa giải của **Valorant**.
+• **🎁 Phần thưởng:** Top 1 Clan mỗi mùa nhận **05 Battle Pass**.
+"""
+    embed.add_field(name="📅 Thông Tin Mùa Giải", value=season_info, inline=False)
+
+    # Basic commands (everyone)
+    basic_cmds = """
+`/clan info [tên]` - Xem thông tin chi tiết một clan
+`/clan help` - Hiển thị bảng hướng dẫn này
+"""
+    embed.add_field(name="📋 Lệnh Cơ Bản", value=basic_cmds, inline=False)
+    
+    # Verified user commands
+    if is_verified:
+        user_cmds = """
+`/clan create` - Thành lập clan mới (Yêu cầu ít nhất 5 người)
+`/clan leave` - Rời clan hiện tại (Chịu cooldown 14 ngày)
+• **Lời mời:** Phản hồi qua nút bấm trong **DM** của Bot.
+"""
+        embed.add_field(name="👤 Lệnh Thành Viên", value=user_cmds, inline=False)
+    
+    # Match commands (any clan member)
+    if clan_role:
+        match_cmds = """
+`/match create <đối_thủ>` - Khởi tạo trận đấu Custom
+• Sau khi thi đấu: Bên Thắng báo kết quả -> Bên Thua xác nhận.
+• Elo chỉ được tính khi cả hai bên đồng thuận.
+"""
+        embed.add_field(name="⚔️ Lệnh Trận Đấu", value=match_cmds, inline=False)
+    
+    # Captain/Vice commands
+    if clan_role in ("captain", "vice"):
+        capvice_cmds = """
+`/clan invite @user` - Gửi lời mời gia nhập clan (qua DM)
+`/clan update_rank` - Nhắc khai báo Rank cho thành viên chưa khai
+`/transfer request @user <tên_clan>` - Yêu cầu chuyển nhượng thành viên
+`/loan request @user <tên_clan> <số_ngày>` - Yêu cầu mượn thành viên (có thời hạn)
+"""
+        embed.add_field(name="🛡️ Lệnh Captain/Vice", value=capvice_cmds, inline=False)
+    
+    # Captain only commands
+    if clan_role == "captain":
+        captain_cmds = """
+`/clan promote_vice @user` - Bổ nhiệm Đội Phó
+`/clan demote_vice @user` - Bãi nhiệm Đội Phó
+`/clan kick @user` - Trục xuất thành viên khỏi clan
+`/clan disband` - Giải toán clan
+`/transfer cancel <id>` - Hủy yêu cầu chuyển nhượng
+`/loan cancel <id>` - Hủy yêu cầu mượn quân
+"""
+        embed.add_field(name="👑 Lệnh Đội Trưởng", value=captain_cmds, inline=False)
+    
+    # Mod commands
+    if is_mod:
+        mod_cmds = """
+`/mod clan approve/reject/delete` - Quản lý clan
+`/matchadmin match resolve` - Xử lý tranh chấp match
+`/admin dashboard/cooldown/ban/freeze` - Quản trị hệ thống
+`/admin balance toggle/status/set_rank` - Quản lý Balance System
+"""
+        embed.add_field(name="⚖️ Lệnh Quản Trị", value=mod_cmds, inline=False)
+    
+    # Elo info (show if in clan)
+    if clan_role:
+        elo_txt = """
+• **K-Factor**: 32 | **Elo Khởi Điểm**: 1000
+• **Chống farm**: Trận 1=100%, Trận 2=70%, Trận 3=40%, Trận 4+=20%
+• Elo chỉ tính khi cả 2 clan đều **active**
+• **Balance**: Win rate modifier, Underdog bonus, Rank modifier
+• **Decay**: Elo giảm nếu clan không hoạt động lâu
+"""
+        embed.add_field(name="📊 Quy Tắc Elo", value=elo_txt, inline=False)
+    
+    # Info section
+    info_txt = """
+• **Transfer/Loan**: Cần sự đồng thuận từ 3 bên (2 Captain & Thành viên).
+• **Loan Limit**: Mỗi clan được phép mượn/cho mượn tối đa **02 thành viên** cùng lúc.
+• **Cooldown**: Rời/Đổi clan chịu **14 ngày** cooldown.
+• **Active**: Clan cần tối thiểu **5 thành viên** để được tính Elo.
+"""
+    embed.add_field(name="ℹ️ Thông Tin Chung", value=info_txt, inline=False)
+    
+    # Footer with role info
+    roles = []
+    if is_mod:
+        roles.append("Mod")
+    if is_verified:
+        roles.append("Verified")
+    if clan_role:
+        roles.append(clan_role.title())
+    
+    embed.set_footer(text=f"Your roles: {', '.join(roles) if roles else 'None'}")
+    return embed
+
+
 # =============================================================================
 # COG DEFINITION
 # =============================================================================
@@ -869,7 +979,7 @@ class ClanCog(commands.Cog):
                             print(f"[DEBUG] Assigned role {discord_role.name} to {guild_member.name}")
 
                             # Assign player role as well
-                            player_role = discord.utils.get(guild.roles, name=config.ROLE_PLAYER)
+                            player_role = bot_utils.get_role(config.ROLE_PLAYER, guild)
                             if player_role and player_role not in guild_member.roles:
                                 await guild_member.add_roles(player_role, reason="Clan join auto-role")
                                 print(f"[DEBUG] Assigned {config.ROLE_PLAYER} role to {guild_member.name}")
@@ -993,107 +1103,7 @@ class ClanCog(commands.Cog):
             if clan_data:
                 clan_role = clan_data.get("member_role")
         
-        embed = discord.Embed(
-            title="🏰 Hệ Thống Clan VXT - Hướng Dẫn",
-            description="Chào mừng bạn đến với đấu trường Clan VXT. Dưới đây là các lệnh bạn có thể sử dụng:",
-            color=discord.Color.gold()
-        )
-        
-        # Season info
-        season_info = """
-• **Reset:** Elo sẽ reset theo mỗi mùa giải của **Valorant**.
-• **🎁 Phần thưởng:** Top 1 Clan mỗi mùa nhận **05 Battle Pass**.
-"""
-        embed.add_field(name="📅 Thông Tin Mùa Giải", value=season_info, inline=False)
-
-        # Basic commands (everyone)
-        basic_cmds = """
-`/clan info [tên]` - Xem thông tin chi tiết một clan
-`/clan help` - Hiển thị bảng hướng dẫn này
-"""
-        embed.add_field(name="📋 Lệnh Cơ Bản", value=basic_cmds, inline=False)
-        
-        # Verified user commands
-        if is_verified:
-            user_cmds = """
-`/clan create` - Thành lập clan mới (Yêu cầu ít nhất 5 người)
-`/clan leave` - Rời clan hiện tại (Chịu cooldown 14 ngày)
-• **Lời mời:** Phản hồi qua nút bấm trong **DM** của Bot.
-"""
-            embed.add_field(name="👤 Lệnh Thành Viên", value=user_cmds, inline=False)
-        
-        # Match commands (any clan member)
-        if clan_role:
-            match_cmds = """
-`/match create <đối_thủ>` - Khởi tạo trận đấu Custom
-• Sau khi thi đấu: Bên Thắng báo kết quả -> Bên Thua xác nhận.
-• Elo chỉ được tính khi cả hai bên đồng thuận.
-"""
-            embed.add_field(name="⚔️ Lệnh Trận Đấu", value=match_cmds, inline=False)
-        
-        # Captain/Vice commands
-        if clan_role in ("captain", "vice"):
-            capvice_cmds = """
-`/clan invite @user` - Gửi lời mời gia nhập clan (qua DM)
-`/clan update_rank` - Nhắc khai báo Rank cho thành viên chưa khai
-`/transfer request @user <tên_clan>` - Yêu cầu chuyển nhượng thành viên
-`/loan request @user <tên_clan> <số_ngày>` - Yêu cầu mượn thành viên (có thời hạn)
-"""
-            embed.add_field(name="🛡️ Lệnh Captain/Vice", value=capvice_cmds, inline=False)
-        
-        # Captain only commands
-        if clan_role == "captain":
-            captain_cmds = """
-`/clan promote_vice @user` - Bổ nhiệm Đội Phó
-`/clan demote_vice @user` - Bãi nhiệm Đội Phó
-`/clan kick @user` - Trục xuất thành viên khỏi clan
-`/clan disband` - Giải toán clan
-`/transfer cancel <id>` - Hủy yêu cầu chuyển nhượng
-`/loan cancel <id>` - Hủy yêu cầu mượn quân
-"""
-            embed.add_field(name="👑 Lệnh Đội Trưởng", value=captain_cmds, inline=False)
-        
-        # Mod commands
-        if is_mod:
-            mod_cmds = """
-`/mod clan approve/reject/delete` - Quản lý clan
-`/matchadmin match resolve` - Xử lý tranh chấp match
-`/admin dashboard/cooldown/ban/freeze` - Quản trị hệ thống
-`/admin balance toggle/status/set_rank` - Quản lý Balance System
-"""
-            embed.add_field(name="⚖️ Lệnh Quản Trị", value=mod_cmds, inline=False)
-        
-        # Elo info (show if in clan)
-        if clan_role:
-            elo_txt = """
-• **K-Factor**: 32 | **Elo Khởi Điểm**: 1000
-• **Chống farm**: Trận 1=100%, Trận 2=70%, Trận 3=40%, Trận 4+=20%
-• Elo chỉ tính khi cả 2 clan đều **active**
-• **Balance**: Win rate modifier, Underdog bonus, Rank modifier
-• **Decay**: Elo giảm nếu clan không hoạt động lâu
-"""
-            embed.add_field(name="📊 Quy Tắc Elo", value=elo_txt, inline=False)
-        
-        # Info section
-        info_txt = """
-• **Transfer/Loan**: Cần sự đồng thuận từ 3 bên (2 Captain & Thành viên).
-• **Loan Limit**: Mỗi clan được phép mượn/cho mượn tối đa **02 thành viên** cùng lúc.
-• **Cooldown**: Rời/Đổi clan chịu **14 ngày** cooldown.
-• **Active**: Clan cần tối thiểu **5 thành viên** để được tính Elo.
-"""
-        embed.add_field(name="ℹ️ Thông Tin Chung", value=info_txt, inline=False)
-        
-        # Footer with role info
-        roles = []
-        if is_mod:
-            roles.append("Mod")
-        if is_verified:
-            roles.append("Verified")
-        if clan_role:
-            roles.append(clan_role.title())
-        
-        embed.set_footer(text=f"Your roles: {', '.join(roles) if roles else 'None'}")
-        
+        embed = bot_utils.get_static_embed("clan_help", is_mod, is_verified, clan_role)
         await interaction.response.send_message(embed=embed, ephemeral=True)
     
     @clan_group.command(name="create", description="Create a new clan (you + 4 members = 5 total)")
@@ -1245,7 +1255,7 @@ class ClanCog(commands.Cog):
                     await interaction.user.remove_roles(role)
                 
                 # Also remove player role
-                player_role = discord.utils.get(guild.roles, name=config.ROLE_PLAYER)
+                player_role = bot_utils.get_role(config.ROLE_PLAYER, guild)
                 if player_role and player_role in interaction.user.roles:
                     await interaction.user.remove_roles(player_role, reason="Left clan")
             except Exception:
@@ -1276,10 +1286,11 @@ class ClanCog(commands.Cog):
             await loan_service.end_all_clan_loans(clan_id, interaction.guild)
             
             # Update clan status and remove members
-            async with db.get_connection() as conn:
+            async with db.transaction() as conn:
                 await conn.execute("DELETE FROM clan_members WHERE clan_id = ?", (clan_id,))
                 await conn.execute("UPDATE clans SET status = 'disbanded', updated_at = datetime('now') WHERE id = ?", (clan_id,))
-                await conn.commit()
+                db.invalidate_clan(clan_id)
+                db.invalidate_members(clan_id=clan_id)
             
             await bot_utils.log_event(
                 "CLAN_AUTO_DISBANDED",
@@ -1370,17 +1381,18 @@ class ClanCog(commands.Cog):
         await loan_service.end_all_clan_loans(clan_id, interaction.guild)
         
         # Remove all members and update clan status to disbanded
-        async with db.get_connection() as conn:
+        async with db.transaction() as conn:
             # Get all member discord IDs before deleting from DB
             cursor = await conn.execute("SELECT u.discord_id FROM users u JOIN clan_members cm ON u.id = cm.user_id WHERE cm.clan_id = ?", (clan_id,))
             member_rows = await cursor.fetchall()
             
             await conn.execute("DELETE FROM clan_members WHERE clan_id = ?", (clan_id,))
             await conn.execute("UPDATE clans SET status = 'disbanded', updated_at = datetime('now') WHERE id = ?", (clan_id,))
-            await conn.commit()
+            db.invalidate_clan(clan_id)
+            db.invalidate_members(clan_id=clan_id)
             
         # Clean up 'player' role for all members
-        player_role = discord.utils.get(interaction.guild.roles, name=config.ROLE_PLAYER)
+        player_role = bot_utils.get_role(config.ROLE_PLAYER, interaction.guild)
         if player_role:
             for row in member_rows:
                 try:
@@ -1731,12 +1743,12 @@ class ClanCog(commands.Cog):
             return
             
         # Update Role: recruit -> member, join_type -> full, clear tryout_expires_at
-        async with db.get_connection() as conn:
+        async with db.transaction() as conn:
             await conn.execute(
                 "UPDATE clan_members SET role='member', join_type='full', tryout_expires_at=NULL WHERE clan_id=? AND user_id=?",
                 (clan_data["id"], target_user["id"])
             )
-            await conn.commit()
+            db.invalidate_members(user_id=target_user["id"])
             
         await interaction.response.send_message(f"✅ {member.mention} đã được thăng chức thành **Thành Viên Chính Thức**!", ephemeral=True)
         await bot_utils.log_event("MEMBER_PROMOTED", f"{member.mention} promoted from Recruit to Member in '{clan_data['name']}'")
@@ -2000,10 +2012,11 @@ class ClanCog(commands.Cog):
             await loan_service.end_all_clan_loans(clan_id, interaction.guild)
             
             # Update clan status and remove members
-            async with db.get_connection() as conn:
+            async with db.transaction() as conn:
                 await conn.execute("DELETE FROM clan_members WHERE clan_id = ?", (clan_id,))
                 await conn.execute("UPDATE clans SET status = 'disbanded', updated_at = datetime('now') WHERE id = ?", (clan_id,))
-                await conn.commit()
+                db.invalidate_clan(clan_id)
+                db.invalidate_members(clan_id=clan_id)
             
             await bot_utils.log_event(
                 "CLAN_AUTO_DISBANDED",
@@ -2138,7 +2151,7 @@ class ClanCog(commands.Cog):
         role_assign_failures = []
         
         # Get player role once
-        player_role = discord.utils.get(guild.roles, name=config.ROLE_PLAYER)
+        player_role = bot_utils.get_role(config.ROLE_PLAYER, guild)
         
         for member_data in members:
             try:
@@ -2260,7 +2273,7 @@ class ClanCog(commands.Cog):
                 pass
         
         # Safe hard delete clan from DB
-        async with db.get_connection() as conn:
+        async with db.get_read_connection() as conn:
             # Get members for role cleanup
             cursor = await conn.execute("SELECT u.discord_id FROM users u JOIN clan_members cm ON u.id = cm.user_id WHERE cm.clan_id = ?", (clan_id,))
             member_rows = await cursor.fetchall()
@@ -2268,7 +2281,7 @@ class ClanCog(commands.Cog):
         await db.hard_delete_clan(clan_id)
         
         # Cleanup 'player' role
-        player_role = discord.utils.get(interaction.guild.roles, name=config.ROLE_PLAYER)
+        player_role = bot_utils.get_role(config.ROLE_PLAYER, interaction.guild)
         if player_role:
             for row in member_rows:
                 try:
@@ -2330,7 +2343,7 @@ class ClanCog(commands.Cog):
             vice = next((m for m in candidates if m["role"] == "vice"), None)
             new_captain = vice or candidates[0]
 
-            async with db.get_connection() as conn:
+            async with db.transaction() as conn:
                 await conn.execute(
                     "UPDATE clan_members SET role = 'member' WHERE clan_id = ? AND role = 'captain'",
                     (clan_id,)
@@ -2343,7 +2356,8 @@ class ClanCog(commands.Cog):
                     "UPDATE clans SET captain_id = ? WHERE id = ?",
                     (new_captain["user_id"], clan_id)
                 )
-                await conn.commit()
+                db.invalidate_clan(clan_id)
+                db.invalidate_members(clan_id=clan_id)
 
         # Cleanup active loans and pending requests
         active_loan = await db.get_active_loan_for_member(target_user["id"])
@@ -2383,7 +2397,7 @@ class ClanCog(commands.Cog):
                     await member.remove_roles(role)
                 
                 # Also remove player role
-                player_role = discord.utils.get(guild.roles, name=config.ROLE_PLAYER)
+                player_role = bot_utils.get_role(config.ROLE_PLAYER, guild)
                 if player_role and player_role in member.roles:
                     await member.remove_roles(player_role, reason="Kicked from clan")
             except Exception:
@@ -2411,10 +2425,11 @@ class ClanCog(commands.Cog):
             from services import loan_service
             await loan_service.end_all_clan_loans(clan_id, interaction.guild)
 
-            async with db.get_connection() as conn:
+            async with db.transaction() as conn:
                 await conn.execute("DELETE FROM clan_members WHERE clan_id = ?", (clan_id,))
                 await conn.execute("UPDATE clans SET status = 'disbanded', updated_at = datetime('now') WHERE id = ?", (clan_id,))
-                await conn.commit()
+                db.invalidate_clan(clan_id)
+                db.invalidate_members(clan_id=clan_id)
 
             await bot_utils.log_event(
                 "CLAN_AUTO_DISBANDED",
@@ -2481,7 +2496,7 @@ class ClanCog(commands.Cog):
             return
         
         # Update captain in DB - demote old captain, promote new one
-        async with db.get_connection() as conn:
+        async with db.transaction() as conn:
             # Demote current captain(s) to member
             await conn.execute(
                 "UPDATE clan_members SET role = 'member' WHERE clan_id = ? AND role = 'captain'",
@@ -2497,7 +2512,8 @@ class ClanCog(commands.Cog):
                 "UPDATE clans SET captain_id = ? WHERE id = ?",
                 (target_user["id"], clan_id)
             )
-            await conn.commit()
+            db.invalidate_clan(clan_id)
+            db.invalidate_members(clan_id=clan_id)
         
         await bot_utils.log_event(
             "CAPTAIN_SET_BY_MOD",
@@ -7,7 +7,7 @@ import discord
 from discord import app_commands
 from discord.ext import commands, tasks
 import aiosqlite
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from typing import List, Optional, Dict, Any
 import logging
 
@@ -98,7 +98,7 @@ class HighlightModal(discord.ui.Modal, title="Submit Highlight"):
                  result_str += f" ({s_b}-{s_a})"
 
         # 3. Post to Channel
-        channel = discord.utils.get(interaction.guild.text_channels, name=config.CHANNEL_HIGHLIGHTS)
+        channel = bot_utils.get_text_channel(config.CHANNEL_HIGHLIGHTS, interaction.guild)
         if not channel:
             # Fallback by searching ID if name fails (though config uses name)
              await interaction.followup.send(f"❌ Không tìm thấy kênh Highlights: `{config.CHANNEL_HIGHLIGHTS}`", ephemeral=True)
@@ -124,13 +124,12 @@ class HighlightModal(discord.ui.Modal, title="Submit Highlight"):
             return
 
         # 4. Save to DB
-        async with db.get_connection() as conn:
+        async with db.transaction() as conn:
             await conn.execute(
                 """INSERT INTO highlights (user_id, match_id, clan_id, video_url, caption, message_id)
                    VALUES (?, ?, ?, ?, ?, ?)""",
                 (user.id, match_id, clan_id, url, caption, str(msg.id))
             )
-            await conn.commit()
 
         await interaction.followup.send(f"✅ Đã đăng highlight thành công tại {channel.mention}!", ephemeral=True)
 
@@ -230,7 +229,7 @@ class HighlightsCog(commands.Cog):
         # 2. Get Recent Matches (Last 5)
         # We need a custom query to get match + opponent name
         recent_matches = []
-        async with db.get_connection() as conn:
+        async with db.get_read_connection() as conn:
             cursor = await conn.execute("""
                 SELECT m.*, 
                        c1.name as clan_a_name, c2.name as clan_b_name 
@@ -270,27 +269,27 @@ class HighlightsCog(commands.Cog):
         await bot_utils.log_event("HIGHLIGHT_WEEKLY", "Starting weekly highlight vote count.")
 
         # Logic: Get highlights created in last 7 days
-        # SQL: created_at >= date('now', '-7 days')
+        # SQL: created_ts >= epoch 7 days ago
         
         # We need to manually count reactions for each message to filter own-clan votes.
         # This is expensive, so limit to top candidates if possible, but for now scan all active ones.
         
-        week_ago_str = (now - timedelta(days=7)).strftime("%Y-%m-%d")
+        week_ago = db.epoch_now(days=-7)
         
         candidates = []
         
-        channel = discord.utils.get(self.bot.get_all_channels(), name=config.CHANNEL_HIGHLIGHTS)
+        channel = bot_utils.get_text_channel(config.CHANNEL_HIGHLIGHTS)
         if not channel:
             print("[HIGHLIGHT] Highlights channel not found for weekly calculation.")
             return
 
-        async with db.get_connection() as conn:
+        async with db.get_read_connection() as conn:
             cursor = await conn.execute("""
                 SELECT h.*, u.discord_id as submitter_discord_id 
                 FROM highlights h
                 JOIN users u ON h.user_id = u.id
-                WHERE h.created_at >= ? AND h.status = 'active'
-            """, (week_ago_str,))
+                WHERE h.created_ts >= ? AND h.status = 'active'
+            """, (week_ago,))
             rows = await cursor.fetchall()
             
             for row in rows:
@@ -370,7 +369,7 @@ class HighlightsCog(commands.Cog):
         guild = self.bot.get_guild(config.GUILD_ID)
         if guild:
              member = guild.get_member(int(winner["user_id"]))
-             role_god = discord.utils.get(guild.roles, name="Highlight God 🎥")
+             role_god = bot_utils.get_role(config.ROLE_HIGHLIGHT_GOD, guild)
              if member and role_god:
                  await member.add_roles(role_god)
         
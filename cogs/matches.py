@@ -532,8 +532,16 @@ class MatchesCog(commands.Cog):
             await interaction.response.send_message("Bạn chưa đăng ký trong hệ thống.", ephemeral=True)
             return
         
-        # Try to confirm
-        success = await db.confirm_match_v2(match_id, user_id)
+        # Confirm + apply Elo + reload as one unit of work (single connection, single commit)
+        async with db.transaction():
+            success = await db.confirm_match_v2(match_id, user_id)
+            
+            if success:
+                # Apply Elo
+                elo_result = await elo.apply_match_result(match_id, winner_clan_id)
+                
+                # Get updated match data
+                match = await db.get_match_with_clans(match_id)
         
         if not success:
             try:
@@ -542,12 +550,6 @@ class MatchesCog(commands.Cog):
             except Exception: pass
             return
         
-        # Apply Elo
-        elo_result = await elo.apply_match_result(match_id, winner_clan_id)
-        
-        # Get updated match data
-        match = await db.get_match_with_clans(match_id)
-        
         # Build result message
         if elo_result["success"]:
             winner_name = elo_result["clan_a_name"] if winner_clan_id == match["clan_a_id"] else elo_result["clan_b_name"]
@@ -848,19 +850,21 @@ class MatchesCog(commands.Cog):
         # Get mod user ID
         mod_user = await permissions.ensure_user_exists(str(interaction.user.id), interaction.user.name)
         
-        # Resolve match
-        success = await db.resolve_match(match_id, mod_user["id"], winner["id"], reason)
+        # Resolve match + apply Elo + reload as one unit of work
+        async with db.transaction():
+            success = await db.resolve_match(match_id, mod_user["id"], winner["id"], reason)
+            
+            if success:
+                # Apply Elo
+                elo_result = await elo.apply_match_result(match_id, winner["id"])
+                
+                # Get updated match
+                match = await db.get_match_with_clans(match_id)
         
         if not success:
             await interaction.followup.send("Không thể xử lý match. Trạng thái đã thay đổi.", ephemeral=True)
             return
         
-        # Apply Elo
-        elo_result = await elo.apply_match_result(match_id, winner["id"])
-        
-        # Get updated match
-        match = await db.get_match_with_clans(match_id)
-        
         # Build result message
         if elo_result["success"]:
             elo_msg = elo.format_elo_explanation_vn(elo_result)
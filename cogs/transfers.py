@@ -177,7 +177,7 @@ class TransferAcceptView(discord.ui.View):
                 # Also ensure player role (just in case)
                 player_role = bot_utils.get_player_role()
                 if not player_role:
-                     player_role = discord.utils.get(guild.roles, name=config.ROLE_PLAYER)
+                     player_role = bot_utils.get_role(config.ROLE_PLAYER, guild)
                 
                 if player_role and player_role not in member.roles:
                     await member.add_roles(player_role, reason="Transfer completed")
@@ -29,6 +29,7 @@ if not GUILD_ID:
 ROLE_VERIFIED: str = "Thiểu Năng Con"  # Required to participate
 ROLE_MOD: str = "Hội đồng quản trị"     # Admin privileges
 ROLE_PLAYER: str = "player"          # Auto-assigned to all clan members
+ROLE_HIGHLIGHT_GOD: str = "Highlight God 🎥"  # Reward role for Highlight of the Week (optional)
 
 # =============================================================================
 # CHANNELS & CATEGORIES
@@ -130,3 +131,38 @@ ROSTER_SIZE: int = 5                     # Số người phải khai cho mỗi r
 # =============================================================================
 
 DB_PATH: Path = Path(os.getenv("DB_PATH", Path(__file__).parent / "data" / "clan.db"))
+
+# =============================================================================
+# DATABASE CONNECTION POOL & TUNING
+# =============================================================================
+
+DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))  # Số connection giữ mở sẵn (idle)
+DB_READ_POOL_SIZE: int = int(os.getenv("DB_READ_POOL_SIZE", "4"))  # Connection chỉ-đọc (query_only) cho dashboard / arena
+DB_POOL_HEALTH_CHECK_SECONDS: int = 60   # Connection idle lâu hơn → ping `SELECT 1` trước khi dùng lại
+DB_BUSY_TIMEOUT_SECONDS: float = 5.0     # Chờ tối đa khi DB đang bị lock bởi writer khác
+DB_SYNCHRONOUS: str = "NORMAL"           # An toàn với WAL, nhanh hơn FULL
+DB_CACHE_SIZE_KB: int = 16384            # Page cache mỗi connection (16 MB)
+DB_MMAP_SIZE_BYTES: int = 134217728      # Memory-mapped I/O (128 MB)
+DB_WRITER_MAX_BATCH: int = 32            # Số write job tối đa gộp chung 1 lần COMMIT (group commit)
+DB_WRITER_COMMIT_DELAY_MS: float = 0     # Chờ thêm job trước khi COMMIT (0 = chỉ nhường event loop 1 vòng)
+
+# =============================================================================
+# DATABASE QUERY INSTRUMENTATION
+# =============================================================================
+
+DB_QUERY_STATS: bool = os.getenv("DB_QUERY_STATS", "1") == "1"  # Đo thời gian từng câu SQL (/admin db queries)
+DB_QUERY_STATS_SAMPLES: int = 512        # Số lần chạy gần nhất giữ lại để tính p50/p95/p99
+DB_SLOW_QUERY_MS: float = 100            # Câu SQL chậm hơn ngưỡng này → slow log + EXPLAIN QUERY PLAN
+DB_SLOW_QUERY_LOG_SIZE: int = 50         # Số slow query gần nhất được giữ lại
+
+# =============================================================================
+# IN-MEMORY ENTITY CACHES
+# =============================================================================
+
+DB_CLAN_CACHE_SIZE: int = int(os.getenv("DB_CLAN_CACHE_SIZE", "512"))  # Số clan giữ trong cache (LRU, theo id + tên)
+DB_USER_CACHE_SIZE: int = int(os.getenv("DB_USER_CACHE_SIZE", "2048"))  # Số user giữ trong cache (LRU, theo id + discord_id)
+DB_USER_NEGATIVE_TTL_SECONDS: float = 60  # Nhớ "chưa đăng ký" bao lâu cho người bấm nút arena mà chưa có tài khoản
+ARENA_EMBED_CACHE_TTL_SECONDS: float = 300  # Embed arena (BXH, danh sách clan, lịch sử match) dùng lại tối đa bao lâu khi DB không đổi (tên hiển thị Discord vẫn có thể đổi)
+DB_CACHE_SELF_CHECK: bool = os.getenv("DB_CACHE_SELF_CHECK", "0") == "1"  # So sánh mỗi cache hit với DB (chỉ bật khi test/debug)
+DB_MEMO_SIZE: int = 256                  # Số kết quả tối đa mỗi hàm @cached giữ lại (LRU)
+DB_MEMO_TTL_SECONDS: float = 60          # Kết quả @cached hết hạn sau bấy nhiêu giây (phòng khi có ghi trực tiếp không invalidate)
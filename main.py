@@ -6,7 +6,7 @@ Main entry point - startup, cog loading, command sync
 import asyncio
 import discord
 from discord.ext import commands, tasks
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timezone
 
 import config
 from services import db, loan_service, bot_utils
@@ -44,11 +44,14 @@ async def on_ready():
     
     print(f"Target guild: {guild.name}")
     
+    # Resolve every configured role/channel/category name to its ID (one scan each)
+    guild_objects = bot_utils.resolve_guild_objects(guild)
+    
     # ==========================================================================
     # VALIDATE ROLES (Must exist, DO NOT CREATE)
     # ==========================================================================
     
-    verified_role = discord.utils.get(guild.roles, name=config.ROLE_VERIFIED)
+    verified_role = guild_objects[config.ROLE_VERIFIED]
     if not verified_role:
         print(f"ERROR: Required role '{config.ROLE_VERIFIED}' not found!")
         print("This role must exist on the server. DO NOT CREATE it manually here.")
@@ -57,7 +60,7 @@ async def on_ready():
     bot_utils.set_verified_role(verified_role)
     print(f"✓ Found verified role: {verified_role.name}")
     
-    mod_role = discord.utils.get(guild.roles, name=config.ROLE_MOD)
+    mod_role = guild_objects[config.ROLE_MOD]
     if not mod_role:
         print(f"ERROR: Required role '{config.ROLE_MOD}' not found!")
         print("This role must exist on the server. DO NOT CREATE it manually here.")
@@ -66,7 +69,7 @@ async def on_ready():
     bot_utils.set_mod_role(mod_role)
     print(f"✓ Found mod role: {mod_role.name}")
     
-    player_role = discord.utils.get(guild.roles, name=config.ROLE_PLAYER)
+    player_role = guild_objects[config.ROLE_PLAYER]
     if not player_role:
         print(f"ERROR: Required role '{config.ROLE_PLAYER}' not found!")
         print("This role must exist on the server. DO NOT CREATE it manually here.")
@@ -80,7 +83,7 @@ async def on_ready():
     # ==========================================================================
     
     # Log channel
-    log_channel = discord.utils.get(guild.text_channels, name=config.CHANNEL_MOD_LOG)
+    log_channel = guild_objects[config.CHANNEL_MOD_LOG]
     if not log_channel:
         print(f"WARNING: Log channel '{config.CHANNEL_MOD_LOG}' not found. Creating...")
         try:
@@ -98,7 +101,7 @@ async def on_ready():
     bot_utils.set_log_channel(log_channel)
     
     # Clans category
-    clans_category = discord.utils.get(guild.categories, name=config.CATEGORY_CLANS)
+    clans_category = guild_objects[config.CATEGORY_CLANS]
     if not clans_category:
         print(f"WARNING: Category '{config.CATEGORY_CLANS}' not found. Creating...")
         try:
@@ -116,7 +119,7 @@ async def on_ready():
     bot_utils.set_clans_category(clans_category)
     
     # Update-bot channel (optional, don't create if not found)
-    update_channel = discord.utils.get(guild.text_channels, name=config.CHANNEL_UPDATE_BOT)
+    update_channel = guild_objects[config.CHANNEL_UPDATE_BOT]
     if update_channel:
         bot_utils.set_update_channel(update_channel)
         print(f"✓ Found update channel: #{update_channel.name}")
@@ -124,7 +127,7 @@ async def on_ready():
         print(f"⚠ Update channel '{config.CHANNEL_UPDATE_BOT}' not found. Updates will not be posted.")
 
     # Chat channel (optional)
-    chat_channel = discord.utils.get(guild.text_channels, name=config.CHANNEL_CHAT_ARENA)
+    chat_channel = guild_objects[config.CHANNEL_CHAT_ARENA]
     if chat_channel:
         bot_utils.set_chat_channel(chat_channel)
         print(f"✓ Found chat arena channel: #{chat_channel.name}")
@@ -138,6 +141,8 @@ async def on_ready():
     
     # Initialize database
     await db.init_db()
+    await db.load_system_settings()
+    await db.load_cooldowns()
     print("✓ Database initialized")
     
     # Load cogs
@@ -207,6 +212,39 @@ async def on_member_remove(member):
         print(f"❌ Error during cleanup for {member}: {e}")
 
 
+# Keep the guild object registry (name -> ID) in step with role/channel changes
+@bot.event
+async def on_guild_role_create(role):
+    bot_utils.refresh_guild_objects("role")
+
+
+@bot.event
+async def on_guild_role_update(before, after):
+    if before.name != after.name:
+        bot_utils.refresh_guild_objects("role")
+
+
+@bot.event
+async def on_guild_role_delete(role):
+    bot_utils.refresh_guild_objects("role")
+
+
+@bot.event
+async def on_guild_channel_create(channel):
+    bot_utils.refresh_guild_objects("text_channel", "category")
+
+
+@bot.event
+async def on_guild_channel_update(before, after):
+    if before.name != after.name:
+        bot_utils.refresh_guild_objects("text_channel", "category")
+
+
+@bot.event
+async def on_guild_channel_delete(channel):
+    bot_utils.refresh_guild_objects("text_channel", "category")
+
+
 # =============================================================================
 # BACKGROUND TASKS
 # =============================================================================
@@ -214,61 +252,58 @@ async def on_member_remove(member):
 @tasks.loop(minutes=10)
 async def expire_requests_task():
     """Check for expired create requests and cancel them."""
-    async with db.get_connection() as conn:
-        now = datetime.now(timezone.utc).isoformat()
-        
+    async with db.get_read_connection() as conn:
         # Find expired pending requests
         cursor = await conn.execute(
             """SELECT DISTINCT cr.clan_id, c.name 
                FROM create_requests cr
                JOIN clans c ON cr.clan_id = c.id
                WHERE cr.status = 'pending' 
-               AND cr.expires_at < ?
+               AND cr.expires_ts < ?
                AND c.status = 'waiting_accept'""",
-            (now,)
+            (db.epoch_now(),)
         )
         expired_clans = await cursor.fetchall()
         
-        for row in expired_clans:
-            clan_id = row[0]
-            clan_name = row[1]
-            
-            # Safe hard delete the clan and all its relates
-            await db.hard_delete_clan(clan_id)
-            
-            await bot_utils.log_event("CLAN_EXPIRED", f"Clan '{clan_name}' creation expired (48h timeout) and deleted")
+    for row in expired_clans:
+        clan_id = row[0]
+        clan_name = row[1]
+        
+        # Safe hard delete the clan and all its relates (one writer job each)
+        await db.hard_delete_clan(clan_id)
         
-        # No need for conn.commit() here as hard_delete_clan handles it
+        await bot_utils.log_event("CLAN_EXPIRED", f"Clan '{clan_name}' creation expired (48h timeout) and deleted")
 
 
 @tasks.loop(minutes=10)
 async def check_loans_task():
     """Check for expired requests and end active loans."""
-    async with db.get_connection() as conn:
+    async with db.transaction() as conn:
         now = datetime.now(timezone.utc).isoformat()
         
         # 1. Expire pending requests (48h)
-        expiry_threshold = (datetime.now(timezone.utc) - timedelta(hours=48)).isoformat()
+        expiry_threshold = db.epoch_now(hours=-48)
         
         cursor = await conn.execute(
-            "SELECT id FROM loans WHERE status = 'requested' AND created_at < ?",
+            "SELECT id FROM loans WHERE status = 'requested' AND created_ts < ?",
             (expiry_threshold,)
         )
         expired_loans = await cursor.fetchall()
-        
-        for row in expired_loans:
-            loan_id = row[0]
-            await conn.execute("UPDATE loans SET status = 'expired', updated_at = ? WHERE id = ?", (now, loan_id))
-            await bot_utils.log_event("LOAN_EXPIRED", f"Loan request {loan_id} expired (48h timeout)")
+        await conn.executemany(
+            "UPDATE loans SET status = 'expired', updated_at = ? WHERE id = ?",
+            [(now, row[0]) for row in expired_loans]
+        )
             
         # 2. End active loans
         cursor = await conn.execute(
-            "SELECT id FROM loans WHERE status = 'active' AND end_at < ?",
-            (now,)
+            "SELECT id FROM loans WHERE status = 'active' AND end_ts < ?",
+            (db.epoch_now(),)
         )
         ending_loans = await cursor.fetchall()
-        
-        await conn.commit()
+
+    # Log outside the writer job (Discord I/O must not hold the write connection)
+    for row in expired_loans:
+        await bot_utils.log_event("LOAN_EXPIRED", f"Loan request {row[0]} expired (48h timeout)")
         
     # Process ending loans outside the transaction to use helper
     guild = bot.get_guild(config.GUILD_ID)
@@ -287,22 +322,23 @@ async def check_loans_task():
 @tasks.loop(minutes=10)
 async def check_transfers_task():
     """Check for expired transfer requests."""
-    async with db.get_connection() as conn:
+    async with db.transaction() as conn:
         now = datetime.now(timezone.utc).isoformat()
-        expiry_threshold = (datetime.now(timezone.utc) - timedelta(hours=48)).isoformat()
+        expiry_threshold = db.epoch_now(hours=-48)
         
         cursor = await conn.execute(
-            "SELECT id FROM transfers WHERE status = 'requested' AND created_at < ?",
+            "SELECT id FROM transfers WHERE status = 'requested' AND created_ts < ?",
             (expiry_threshold,)
         )
         expired_transfers = await cursor.fetchall()
-        
-        for row in expired_transfers:
-            transfer_id = row[0]
-            await conn.execute("UPDATE transfers SET status = 'expired', updated_at = ? WHERE id = ?", (now, transfer_id))
-            await bot_utils.log_event("TRANSFER_EXPIRED", f"Transfer request {transfer_id} expired (48h timeout)")
-            
-        await conn.commit()
+        await conn.executemany(
+            "UPDATE transfers SET status = 'expired', updated_at = ? WHERE id = ?",
+            [(now, row[0]) for row in expired_transfers]
+        )
+
+    # Log outside the writer job (Discord I/O must not hold the write connection)
+    for row in expired_transfers:
+        await bot_utils.log_event("TRANSFER_EXPIRED", f"Transfer request {row[0]} expired (48h timeout)")
 
 
 @tasks.loop(minutes=10)
@@ -320,11 +356,12 @@ async def check_cooldowns_task():
     }
 
     notified = set()
+    users = await db.get_users_by_ids([cd["target_id"] for cd in expired if cd.get("target_type") == "user"])
 
     for cd in expired:
         if cd.get("target_type") != "user":
             continue
-        db_user = await db.get_user_by_id(cd["target_id"])
+        db_user = users.get(cd["target_id"])
         if not db_user:
             continue
         discord_id = int(db_user["discord_id"])
@@ -384,10 +421,9 @@ async def weekly_balance_task():
         if await db.is_balance_feature_enabled("elo_decay"):
             decayed_clans = await db.get_clans_for_decay()
             for clan in decayed_clans:
-                old_elo = clan["elo"]
-                await db.apply_elo_decay(clan["id"], config.ELO_DECAY_AMOUNT)
-                new_elo = max(config.ELO_FLOOR, old_elo - config.ELO_DECAY_AMOUNT)
-                print(f"[BALANCE] Elo decay: {clan['name']} {old_elo} → {new_elo}")
+                decay = await db.apply_elo_decay(clan["id"], config.ELO_DECAY_AMOUNT)
+                if decay["success"]:
+                    print(f"[BALANCE] Elo decay: {clan['name']} {decay['old_elo']} → {decay['new_elo']}")
             
             if decayed_clans:
                 await bot_utils.log_event(
@@ -404,18 +440,7 @@ async def weekly_balance_task():
                 if clan["elo"] < config.ACTIVITY_BONUS_ELO_THRESHOLD:
                     activity = await db.get_clan_activity_count(clan["id"])
                     if activity >= config.ACTIVITY_BONUS_MIN_MATCHES:
-                        bonus = config.ACTIVITY_BONUS_AMOUNT
-                        async with db.get_connection() as conn:
-                            await conn.execute(
-                                "UPDATE clans SET elo = elo + ?, updated_at = datetime('now') WHERE id = ?",
-                                (bonus, clan["id"])
-                            )
-                            await conn.execute(
-                                """INSERT INTO elo_history (clan_id, old_elo, new_elo, change_amount, reason)
-                                   VALUES (?, ?, ?, ?, ?)""",
-                                (clan["id"], clan["elo"], clan["elo"] + bonus, bonus, "activity_bonus")
-                            )
-                            await conn.commit()
+                        await db.adjust_clan_elo(clan["id"], config.ACTIVITY_BONUS_AMOUNT, "activity_bonus")
                         bonus_count += 1
             
             if bonus_count > 0:
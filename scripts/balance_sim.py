@@ -0,0 +1,108 @@
+"""
+Balance What-If Simulator
+Replays the whole match history under a grid of balance settings (services/balance_sim.py)
+and prints ladder distribution, inflation and rank churn against the current settings.
+Read-only. Needs NumPy.
+
+Usage:
+    python scripts/balance_sim.py k_stable=24,32,40 max_gain_per_match=40,50 decay_amount=10,15
+    python scripts/balance_sim.py anti_farm_multipliers=1/0.7/0.4,1/0.5/0.25 underdog_bonus=on,off
+    python scripts/balance_sim.py ... --workers 4 --bench 200000   # synthetic history, no database
+
+Keys: EloConfig fields (k_stable, k_placement, placement_matches, max_gain_per_match,
+win_rate_*, anti_farm_multipliers, default_multiplier, floor), decay_threshold /
+decay_amount / decay_floor / decay_inactivity_days, and on/off flags win_rate_mod,
+rank_elo_mod, underdog_bonus, elo_gain_cap, elo_decay.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services import balance_sim, db, elo, elo_replay
+
+COLUMNS = [
+    ("mean", 8), ("std", 7), ("p10", 8), ("median", 8), ("p90", 8), ("inflation", 10),
+    ("spearman", 9), ("mean_rank_shift", 16), ("top10_kept", 11), ("seconds", 8), ("name", 0),
+]
+
+
+def parse_value(text: str) -> Any:
+    if text.lower() in ("on", "true"):
+        return True
+    if text.lower() in ("off", "false"):
+        return False
+    if "/" in text:
+        return tuple(float(part) for part in text.split("/"))
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def parse_axes(args: List[str]) -> Dict[str, list]:
+    axes = {}
+    for arg in args:
+        key, _, values = arg.partition("=")
+        if not values:
+            raise ValueError(f"Expected key=value[,value...], got: {arg}")
+        axes[key] = [parse_value(value) for value in values.split(",")]
+    return axes
+
+
+def print_table(reports: List[Dict[str, Any]]) -> None:
+    print("".join(title.ljust(width) for title, width in COLUMNS))
+    for report in reports:
+        print("".join(str(report.get(title, "")).ljust(width) for title, width in COLUMNS))
+
+
+async def load(bench: int):
+    if bench:
+        from scripts.elo_audit import synthetic_ladder
+        return synthetic_ladder(bench, max(2, bench // 500)), balance_sim.Scenario(
+            "current", elo.EloConfig.from_config(), frozenset(elo.BALANCE_FEATURES), elo_replay.DecayConfig.from_config()
+        )
+    await db.init_db()
+    await db.load_system_settings()
+    data = await elo_replay.load_ladder()
+    baseline = await balance_sim.current_scenario()
+    await db.close_pool()
+    return data, baseline
+
+
+def main() -> int:
+    args = sys.argv[1:]
+    workers = bench = None
+    for flag in ("--workers", "--bench"):
+        if flag in args:
+            at = args.index(flag)
+            value = int(args[at + 1])
+            del args[at:at + 2]
+            workers, bench = (value, bench) if flag == "--workers" else (workers, value)
+
+    axes = parse_axes(args)
+    data, baseline = asyncio.run(load(bench or 0))
+    scenarios = balance_sim.scenario_grid(baseline, axes) if axes else []
+    print(f"Replaying {data.matches:,} matches / {data.events:,} Elo changes under "
+          f"{len(scenarios) + 1} configurations...")
+    started = time.perf_counter()
+    reports = balance_sim.simulate(data, baseline, scenarios, workers)
+    print_table(reports)
+    print(f"⏱️ {len(reports)} configurations in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    if elo_replay.np is None:
+        print("❌ NumPy is required: pip install numpy")
+        sys.exit(2)
+    try:
+        sys.exit(main())
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(2)
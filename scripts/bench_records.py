@@ -0,0 +1,105 @@
+"""
+Row Record Benchmark
+Compares dict(row) with the __slots__ records from services/records.py on large
+result sets (admin members list, match history export): retained memory,
+allocations and build time.
+
+Usage: python scripts/bench_records.py [rows]
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services import db
+from services.records import ClanMember, Match
+
+MEMBERS_QUERY = """
+    SELECT u.discord_id, u.riot_id, u.is_banned, cm.role, cm.join_type, cm.valorant_rank,
+           c.name as clan_name
+    FROM users u
+    LEFT JOIN clan_members cm ON u.id = cm.user_id
+    LEFT JOIN clans c ON cm.clan_id = c.id
+"""
+MATCHES_QUERY = "SELECT * FROM matches"
+
+
+async def seed(rows: int) -> None:
+    """Fill a throwaway database with `rows` users/members and `rows` matches."""
+    db.DB_PATH = Path(tempfile.mkdtemp()) / "bench_records.db"
+    await db.init_db()
+    clans = max(2, rows // 50)
+    async with db.get_connection() as conn:
+        await conn.executemany(
+            "INSERT INTO users (discord_id, riot_id) VALUES (?, ?)",
+            [(str(100000 + i), f"Player{i}#VN") for i in range(rows)],
+        )
+        await conn.executemany(
+            "INSERT INTO clans (name, captain_id, status) VALUES (?, ?, 'active')",
+            [(f"Clan{i}", i + 1) for i in range(clans)],
+        )
+        await conn.executemany(
+            "INSERT INTO clan_members (user_id, clan_id, role) VALUES (?, ?, 'member')",
+            [(i + 1, i % clans + 1) for i in range(rows)],
+        )
+        await conn.executemany(
+            """INSERT INTO matches (clan_a_id, clan_b_id, creator_user_id, status, score_a, score_b)
+               VALUES (?, ?, 1, 'confirmed', 13, 7)""",
+            [(i % clans + 1, (i + 1) % clans + 1) for i in range(rows)],
+        )
+        await conn.commit()
+
+
+async def fetch(query: str):
+    async with db.get_connection() as conn:
+        cursor = await conn.execute(query)
+        return cursor, await cursor.fetchall()
+
+
+def measure(label: str, build) -> dict:
+    """Run `build()` under tracemalloc; report retained bytes, peak bytes, allocations, time."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - started
+    snapshot = tracemalloc.take_snapshot()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    allocations = sum(stat.count for stat in snapshot.statistics("filename"))
+    del result
+    return {"label": label, "retained": current, "peak": peak, "allocs": allocations, "ms": elapsed * 1000}
+
+
+def report(title: str, rows: int, baseline: dict, records: dict) -> None:
+    print(f"\n{title} ({rows} rows)")
+    print(f"  {'':<10} {'retained':>12} {'peak':>12} {'blocks':>10} {'build ms':>10}")
+    for r in (baseline, records):
+        print(f"  {r['label']:<10} {r['retained'] / 1024:>10.0f}KB {r['peak'] / 1024:>10.0f}KB {r['allocs']:>10} {r['ms']:>10.1f}")
+    saved = 1 - records["retained"] / baseline["retained"]
+    print(f"  → records retain {saved:.0%} less memory")
+
+
+async def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    await seed(rows)
+
+    for title, query, kind in (
+        ("Admin members list", MEMBERS_QUERY, ClanMember),
+        ("Match history export", MATCHES_QUERY, Match),
+    ):
+        cursor, fetched = await fetch(query)
+        baseline = measure("dict(row)", lambda: [dict(row) for row in fetched])
+        records = measure("records", lambda: db._records(kind, cursor, fetched))
+        report(title, len(fetched), baseline, records)
+
+    await db.close_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
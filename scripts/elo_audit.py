@@ -0,0 +1,89 @@
+"""
+Elo Ladder Audit
+Replays every decided match and Elo change (services/elo_replay.py) and lists the
+clans whose stored Elo differs from the replay. Read-only. Needs NumPy.
+
+Usage:
+    python scripts/elo_audit.py              # audit the bot database
+    python scripts/elo_audit.py --bench N    # replay N synthetic matches, no database
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services import db, elo_replay
+
+
+def synthetic_ladder(matches: int, clans: int, seed: int = 1) -> "elo_replay.LadderData":
+    """Random ladder: one match every 30s, each applied right away (two history rows)."""
+    np = elo_replay.np
+    rnd = np.random.default_rng(seed)
+    clan_a = rnd.integers(1, clans + 1, matches)
+    clan_b = (clan_a + rnd.integers(1, clans, matches) - 1) % clans + 1
+    created = np.arange(matches, dtype=np.int64) * 30
+    a_won = rnd.random(matches) < 0.5
+    winner = np.where(a_won, clan_a, clan_b)
+    ranks = rnd.uniform(1, 25, (2, matches))
+    ranks[:, rnd.random(matches) < 0.5] = np.nan
+    match_id = np.arange(1, matches + 1, dtype=np.int64)
+
+    # Winner row first, loser row second, for every match
+    event_clan = np.stack([winner, np.where(a_won, clan_b, clan_a)], axis=1).ravel()
+    zeros = np.zeros(2 * matches, dtype=np.int64)
+    return elo_replay.LadderData(
+        match_id=match_id, clan_a=clan_a, clan_b=clan_b, created_ts=created, winner=winner,
+        avg_rank_a=ranks[0], avg_rank_b=ranks[1],
+        final_delta_a=np.zeros(matches, dtype=np.int64), final_delta_b=np.zeros(matches, dtype=np.int64),
+        event_kind=zeros + elo_replay.KIND_MATCH, event_clan=event_clan,
+        event_match=np.repeat(match_id, 2), event_won=np.tile(np.array([1, 0], dtype=np.int64), matches),
+        event_change=zeros, event_new=zeros, event_ts=np.repeat(created + 60, 2),
+        clan_ids=np.arange(1, clans + 1, dtype=np.int64),
+        clan_elo=np.full(clans, 1000, dtype=np.int64), clan_names=[f"Clan{i}" for i in range(clans)],
+    )
+
+
+def bench(matches: int) -> None:
+    clans = max(2, matches // 500)
+    started = time.perf_counter()
+    data = synthetic_ladder(matches, clans)
+    built = time.perf_counter()
+    result = elo_replay.replay_ladder(data)
+    replayed = time.perf_counter()
+    ratings = list(result["elo"].values())
+    print(f"{matches:,} matches / {clans:,} clans: build {built - started:.2f}s, "
+          f"replay {replayed - built:.2f}s ({matches / (replayed - built):,.0f} matches/s)")
+    print(f"Elo range: {min(ratings)} .. {max(ratings)}")
+
+
+async def audit() -> int:
+    await db.init_db()
+    await db.load_system_settings()
+    report = await elo_replay.audit_ladder()
+    await db.close_pool()
+
+    print(f"Replayed {report['matches']:,} matches / {report['events']:,} Elo changes "
+          f"for {report['clans']} clans (load {report['load_seconds']}s, replay {report['replay_seconds']}s)")
+    for clan in report["clan_mismatches"]:
+        print(f"  ❌ {clan['name']} (#{clan['clan_id']}): stored {clan['stored']}, "
+              f"replayed {clan['replayed']} ({clan['diff']:+d})")
+    for match in report["match_mismatches"]:
+        print(f"  ⚠️ match #{match['match_id']}: stored {match['stored']}, replayed {match['replayed']}")
+    if not report["clan_mismatches"] and not report["match_mismatches"]:
+        print("✅ Ladder matches the replay")
+        return 0
+    return 1
+
+
+if __name__ == "__main__":
+    if elo_replay.np is None:
+        print("❌ NumPy is required: pip install numpy")
+        sys.exit(2)
+    if len(sys.argv) > 2 and sys.argv[1] == "--bench":
+        bench(int(sys.argv[2]))
+    else:
+        sys.exit(asyncio.run(audit()))
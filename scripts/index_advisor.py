@@ -0,0 +1,223 @@
+"""
+Index Advisor
+Replays the application's read workload (real services/db.py + elo helpers) against a
+synthetic large database, then runs EXPLAIN QUERY PLAN on every captured statement
+and flags full table scans and temp B-trees. With --compare it also times each
+statement with and without the indexes shipped in db.ADVISED_INDEXES.
+
+Usage: python scripts/index_advisor.py [--scale N] [--compare]
+"""
+
+import asyncio
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services import db, elo
+
+REPEAT = 30  # Timed runs per statement
+
+
+# =============================================================================
+# SYNTHETIC DATABASE
+# =============================================================================
+
+def _ts(days_ago: float) -> str:
+    return (datetime.now(timezone.utc) - timedelta(days=days_ago)).strftime("%Y-%m-%d %H:%M:%S")
+
+
+async def seed(scale: int) -> dict:
+    """
+    Build a throwaway database sized like `scale` seasons of activity:
+    200*scale clans, 10 members each, 100 matches per clan, elo history, cooldowns, invites.
+    """
+    db.DB_PATH = Path(tempfile.mkdtemp()) / "index_advisor.db"
+    await db.init_db()
+    rnd = random.Random(42)
+    clans = 200 * scale
+    users = clans * 10
+    matches = clans * 100
+
+    async with db.get_connection() as conn:
+        await conn.executemany(
+            "INSERT INTO users (discord_id, riot_id) VALUES (?, ?)",
+            [(str(10**17 + i), f"Player{i}#VN") for i in range(users)],
+        )
+        await conn.executemany(
+            "INSERT INTO clans (name, captain_id, status, elo, matches_played) VALUES (?, ?, 'active', ?, 100)",
+            [(f"Clan{i}", i * 10 + 1, rnd.randint(800, 1400)) for i in range(clans)],
+        )
+        await conn.executemany(
+            "INSERT INTO clan_members (user_id, clan_id, role) VALUES (?, ?, ?)",
+            [(u + 1, u // 10 + 1, "captain" if u % 10 == 0 else "member") for u in range(users)],
+        )
+        match_rows = []
+        for i in range(matches):
+            a = rnd.randint(1, clans)
+            b = rnd.randint(1, clans - 1)
+            b = b + 1 if b >= a else b
+            status = "created" if i % 100 == 0 else rnd.choice(["confirmed"] * 8 + ["resolved", "cancelled"])
+            match_rows.append((a, b, a * 10 - 9, status, 1 if status != "cancelled" else 0, a, _ts(rnd.uniform(0, 180))))
+        await conn.executemany(
+            """INSERT INTO matches (clan_a_id, clan_b_id, creator_user_id, status, elo_applied, winner_clan_id, created_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            match_rows,
+        )
+        await conn.executemany(
+            """INSERT INTO elo_history (clan_id, match_id, old_elo, new_elo, change_amount, reason, created_at)
+               VALUES (?, ?, 1000, 1016, 16, 'match_win', ?)""",
+            [(row[0], i + 1, row[6]) for i, row in enumerate(match_rows)],
+        )
+        await conn.executemany(
+            """INSERT OR IGNORE INTO cooldowns (target_type, target_id, kind, until, reason)
+               VALUES (?, ?, ?, ?, 'advisor')""",
+            [(rnd.choice(["user", "clan"]), rnd.randint(1, users), rnd.choice(["join_leave", "loan", "match_create"]),
+              (datetime.now(timezone.utc) + timedelta(days=rnd.uniform(-30, 30))).isoformat())
+             for _ in range(users)],
+        )
+        await conn.executemany(
+            """INSERT OR IGNORE INTO invite_requests (clan_id, user_id, invited_by_user_id, status, expires_at, responded_at)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            [(rnd.randint(1, clans), rnd.randint(1, users), 1, rnd.choice(["accepted", "declined", "expired"]),
+              _ts(-2), _ts(rnd.uniform(0, 90))) for _ in range(users * 2)],
+        )
+        # No ANALYZE: the bot never runs it, so plans must hold up without sqlite_stat1
+        await conn.commit()
+    return {"clans": clans, "users": users, "matches": matches}
+
+
+# =============================================================================
+# WORKLOAD
+# =============================================================================
+
+async def run_workload(size: dict) -> None:
+    """Call the hot read helpers the bot uses (arena, match flow, balance tasks)."""
+    rnd = random.Random(7)
+    for _ in range(20):
+        clan_id = rnd.randint(1, size["clans"])
+        other_id = rnd.randint(1, size["clans"])
+        user_id = rnd.randint(1, size["users"])
+        await db.get_user(str(10**17 + user_id - 1))
+        await db.get_user_clan(user_id)
+        await db.get_clan_members(clan_id)
+        await db.count_clan_members(clan_id)
+        await db.has_active_match(clan_id)
+        await db.get_clan_elo_history(clan_id)
+        await db.get_cooldown("user", user_id, "join_leave")
+        await db.get_all_user_cooldowns(user_id)
+        await elo.count_elo_matches_between_clans(clan_id, other_id)
+        await elo.fetch_match_context(rnd.randint(1, size["matches"]))
+        await db.count_recent_recruits(clan_id)
+        await db.get_clan_activity_count(clan_id)
+        await db.get_clan_win_rate(clan_id)
+        await db.get_won_matches_by_clan(clan_id)
+        await db.get_active_loan_for_member(user_id)
+        await db.is_user_banned(user_id)
+        await db.get_active_cooldown(user_id, "user", "loan")
+        await db.get_pending_invite(user_id, clan_id)
+    await db.get_recent_matches(limit=10)
+    await db.get_pending_matches()
+    await db.get_all_active_clans()
+    await db.get_clans_for_decay()
+    await db.get_expired_tryouts()
+
+
+# =============================================================================
+# ANALYSIS
+# =============================================================================
+
+def explain(conn: sqlite3.Connection, sql: str, params) -> list:
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params or ())]
+
+
+def problems(plan: list) -> list:
+    """Plan lines that point at a missing index."""
+    flagged = []
+    for line in plan:
+        if line.startswith("SCAN ") and "USING" not in line:
+            flagged.append(line)  # Full table scan
+        elif "USE TEMP B-TREE" in line:
+            flagged.append(line)  # Sort / DISTINCT without a usable index
+    return flagged
+
+
+def timed(conn: sqlite3.Connection, sql: str, params) -> float:
+    runs = []
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        conn.execute(sql, params or ()).fetchall()
+        runs.append((time.perf_counter() - started) * 1000)
+    return statistics.median(runs)
+
+
+def set_advised_indexes(conn: sqlite3.Connection, present: bool) -> None:
+    retired = {name for names in db.RETIRED_INDEXES.values() for name in names}
+    for indexes in db.ADVISED_INDEXES.values():
+        for name, target in indexes:
+            if name in retired:
+                continue
+            if present:
+                conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+            else:
+                conn.execute(f"DROP INDEX IF EXISTS {name}")
+    conn.commit()
+
+
+def short(sql: str, width: int = 110) -> str:
+    return sql if len(sql) <= width else sql[:width - 3] + "..."
+
+
+async def main():
+    scale = int(sys.argv[sys.argv.index("--scale") + 1]) if "--scale" in sys.argv else 1
+    compare = "--compare" in sys.argv
+
+    size = await seed(scale)
+    print(f"\nSynthetic DB: {size['clans']} clans, {size['users']} users, {size['matches']} matches")
+
+    db.reset_query_stats()
+    await run_workload(size)
+    statements = [s for s in db.get_query_stats(limit=10_000) if s["sql"].upper().startswith(("SELECT", "WITH"))]
+    await db.close_pool()
+
+    conn = sqlite3.connect(db.DB_PATH)
+    if compare:
+        set_advised_indexes(conn, present=False)
+
+    print(f"\n{'=' * 20} Plans ({'without' if compare else 'with'} advised indexes) {'=' * 20}")
+    flagged = []
+    for stmt in statements:
+        issues = problems(explain(conn, stmt["sql"], stmt["params"]))
+        if issues:
+            flagged.append(stmt)
+            print(f"\n⚠️  {short(stmt['sql'])}")
+            for line in issues:
+                print(f"     → {line}")
+    print(f"\n{len(flagged)}/{len(statements)} statements flagged")
+
+    if compare:
+        before = {s["sql"]: timed(conn, s["sql"], s["params"]) for s in statements}
+        set_advised_indexes(conn, present=True)
+        after = {s["sql"]: timed(conn, s["sql"], s["params"]) for s in statements}
+
+        print(f"\n{'=' * 20} Before / after advised indexes (median of {REPEAT}) {'=' * 20}")
+        changed = sorted(statements, key=lambda s: before[s["sql"]] - after[s["sql"]], reverse=True)
+        for stmt in changed:
+            b, a = before[stmt["sql"]], after[stmt["sql"]]
+            if b - a < 0.01:
+                continue
+            print(f"{b:8.3f} ms → {a:8.3f} ms  ({b / max(a, 1e-6):5.1f}x)  {short(stmt['sql'], 90)}")
+            for line in explain(conn, stmt["sql"], stmt["params"]):
+                print(f"{'':34}{line}")
+    conn.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
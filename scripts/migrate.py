@@ -0,0 +1,34 @@
+"""
+Database Migration Script
+Applies pending schema migrations (PRAGMA user_version). Use --dry-run to only list them.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services import db
+
+
+async def main():
+    """Run (or preview) pending migrations."""
+    dry_run = "--dry-run" in sys.argv[1:]
+    try:
+        report = await db.init_db(dry_run=dry_run)
+    except Exception as e:
+        print(f"✗ Migration failed: {e}")
+        sys.exit(1)
+    finally:
+        await db.close_pool()
+
+    if dry_run:
+        print(f"✓ {len(report['pending'])} migration(s) pending (schema version {report['from_version']} -> {db.SCHEMA_VERSION})")
+    else:
+        print(f"✓ Schema version {report['from_version']} -> {report['to_version']}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,229 @@
+"""
+Balance Simulator
+Replays the whole match history under alternative balance settings (K-factors,
+anti-farm multipliers, win-rate modifiers, gain cap, decay, feature flags) and
+compares each resulting ladder with the current settings: rating distribution,
+inflation and rank-order churn. Offline and read-only; needs NumPy like
+services/elo_replay.py.
+
+Every scenario is one replay_ladder() run in a ProcessPoolExecutor worker. The
+ladder arrays reach each worker once (pool initializer); a task only carries its
+settings. Workers are spawned, not forked, so the bot's aiosqlite threads are
+never copied into them.
+"""
+
+import itertools
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields, replace
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence
+
+from services import db, elo, elo_replay
+from services.elo_replay import DecayConfig, LadderData
+
+DECAY_PREFIX = "decay_"   # scenario_grid() keys for DecayConfig fields
+TOP_N = 10                # top-of-ladder overlap reported by rank_churn()
+
+EVENT_COLUMNS = ("event_kind", "event_clan", "event_match", "event_won", "event_change", "event_new", "event_ts")
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """One set of balance settings to replay. decay=None means elo_decay is off."""
+    name: str
+    elo: elo.EloConfig
+    features: FrozenSet[str]
+    decay: Optional[DecayConfig]
+
+
+async def current_scenario() -> Scenario:
+    """config.py constants plus the feature flags currently stored in system_settings."""
+    features = frozenset([f for f in elo.BALANCE_FEATURES if await db.is_balance_feature_enabled(f)])
+    decay = DecayConfig.from_config() if await db.is_balance_feature_enabled("elo_decay") else None
+    return Scenario("current", elo.EloConfig.from_config(), features, decay)
+
+
+def scenario_grid(base: Scenario, axes: Dict[str, Sequence[Any]]) -> List[Scenario]:
+    """
+    Cartesian product of overrides on `base`, one Scenario per combination.
+    Keys: EloConfig fields ("k_stable", "anti_farm_multipliers", ...), DecayConfig fields
+    with a "decay_" prefix ("decay_amount", ...), or a balance feature / "elo_decay" with True/False.
+    """
+    elo_fields = {f.name for f in fields(elo.EloConfig)}
+    decay_fields = {DECAY_PREFIX + f.name for f in fields(DecayConfig)}
+    flags = set(elo.BALANCE_FEATURES) | {"elo_decay"}
+    for key in axes:
+        if key not in elo_fields | decay_fields | flags:
+            raise ValueError(f"Unknown balance setting: {key}")
+
+    scenarios = []
+    for values in itertools.product(*axes.values()):
+        overrides = dict(zip(axes, values))
+        features = set(base.features)
+        for feature in elo.BALANCE_FEATURES:
+            if feature in overrides:
+                (features.add if overrides[feature] else features.discard)(feature)
+        decay = replace(
+            base.decay or DecayConfig.from_config(),
+            **{key[len(DECAY_PREFIX):]: value for key, value in overrides.items() if key in decay_fields},
+        )
+        scenarios.append(Scenario(
+            name=" ".join(f"{key}={value}" for key, value in overrides.items()) or base.name,
+            elo=replace(base.elo, **{key: value for key, value in overrides.items() if key in elo_fields}),
+            features=frozenset(features),
+            decay=decay if overrides.get("elo_decay", base.decay is not None) else None,
+        ))
+    return scenarios
+
+
+def with_decay_ticks(data: LadderData, decay: Optional[DecayConfig]) -> LadderData:
+    """
+    `data` with its recorded elo_decay rows replaced by simulated weekly ticks: every
+    decay.interval_days after the first match, each clan that has played before but
+    created no match in the last decay.inactivity_days gets a -decay.amount row
+    (replay_ladder applies the threshold and floor). decay=None drops decay entirely.
+    Clan status (inactive / disbanded) is not modelled.
+    """
+    np = elo_replay.np
+    keep = data.event_kind != elo_replay.KIND_DECAY
+    columns = {name: getattr(data, name)[keep] for name in EVENT_COLUMNS}
+    if decay is None or not data.matches or decay.amount == 0:
+        return replace(data, **columns)
+
+    base = int(data.created_ts.min())
+    end = int(max(data.created_ts.max(), columns["event_ts"].max(initial=base)))
+    interval = decay.interval_days * 86400
+    ticks = np.arange(base + interval, end + 1, interval, dtype=np.int64)
+
+    # Every (clan, tick): played before the tick, and no match created in the inactivity window
+    clans = np.concatenate([data.clan_a, data.clan_b])
+    stamps = np.concatenate([data.created_ts, data.created_ts]) - base
+    order = np.lexsort((stamps, clans))
+    clans, stamps = clans[order], stamps[order]
+    universe, first = np.unique(clans, return_index=True)
+    span = end - base + 2
+    keys = clans * span + stamps
+    clan_grid = np.repeat(universe, len(ticks))
+    tick_grid = np.tile(ticks - base, len(universe))
+    played_by = np.searchsorted(keys, clan_grid * span + tick_grid, side="right")
+    window_start = np.searchsorted(
+        keys, clan_grid * span + np.maximum(tick_grid - decay.inactivity_days * 86400, 0), side="left"
+    )
+    eligible = (np.repeat(stamps[first], len(ticks)) <= tick_grid) & (played_by == window_start)
+
+    tick_order = np.lexsort((clan_grid[eligible], tick_grid[eligible]))
+    decay_clan = clan_grid[eligible][tick_order]
+    decay_ts = tick_grid[eligible][tick_order] + base
+    at = np.searchsorted(np.maximum.accumulate(columns["event_ts"]), decay_ts, side="right")
+    rows = len(decay_ts)
+    inserted = {
+        "event_kind": np.full(rows, elo_replay.KIND_DECAY), "event_clan": decay_clan,
+        "event_match": np.full(rows, -1), "event_won": np.zeros(rows, dtype=np.int64),
+        "event_change": np.full(rows, -decay.amount), "event_new": np.zeros(rows, dtype=np.int64),
+        "event_ts": decay_ts,
+    }
+    return replace(data, **{name: np.insert(columns[name], at, inserted[name]).astype(np.int64) for name in EVENT_COLUMNS})
+
+
+# =============================================================================
+# METRICS
+# =============================================================================
+
+def ladder_metrics(ratings: Any, initial_elo: int = elo.ELO_INITIAL) -> Dict[str, Any]:
+    """Distribution of the final ladder and how far it drifted from the starting rating."""
+    np = elo_replay.np
+    if not len(ratings):
+        return {"clans": 0}
+    p10, p50, p90 = np.percentile(ratings, [10, 50, 90])
+    return {
+        "clans": len(ratings),
+        "mean": round(float(ratings.mean()), 1),
+        "std": round(float(ratings.std()), 1),
+        "min": int(ratings.min()),
+        "p10": round(float(p10), 1),
+        "median": round(float(p50), 1),
+        "p90": round(float(p90), 1),
+        "max": int(ratings.max()),
+        "inflation": round(float(ratings.mean()) - initial_elo, 1),
+        "points_created": int(ratings.sum()) - initial_elo * len(ratings),
+    }
+
+
+def _ranks(clan_ids: Any, ratings: Any) -> Any:
+    """Ladder position of every clan (0 = top), ties broken by clan id like the leaderboard."""
+    np = elo_replay.np
+    order = np.lexsort((clan_ids, -ratings))
+    ranks = np.empty(len(order), dtype=np.int64)
+    ranks[order] = np.arange(len(order))
+    return ranks
+
+
+def rank_churn(base_ids: Any, base_ratings: Any, clan_ids: Any, ratings: Any, top_n: int = TOP_N) -> Dict[str, Any]:
+    """Rank-order change against the baseline ladder (same clans: match history decides who is ranked)."""
+    np = elo_replay.np
+    n = len(clan_ids)
+    if n < 2 or not np.array_equal(base_ids, clan_ids):
+        return {"spearman": None, "mean_rank_shift": None, "max_rank_shift": None, f"top{top_n}_kept": None}
+    shift = _ranks(clan_ids, ratings) - _ranks(base_ids, base_ratings)
+    base_top = set(base_ids[_ranks(base_ids, base_ratings) < top_n].tolist())
+    top = set(clan_ids[_ranks(clan_ids, ratings) < top_n].tolist())
+    return {
+        "spearman": round(1 - 6 * float((shift ** 2).sum()) / (n * (n * n - 1)), 4),
+        "mean_rank_shift": round(float(np.abs(shift).mean()), 2),
+        "max_rank_shift": int(np.abs(shift).max()),
+        f"top{top_n}_kept": len(base_top & top),
+    }
+
+
+# =============================================================================
+# PROCESS POOL
+# =============================================================================
+
+_worker_data: Optional[LadderData] = None
+
+
+def _init_worker(data: LadderData) -> None:
+    global _worker_data
+    _worker_data = data
+
+
+def _run_scenario(scenario: Scenario) -> Dict[str, Any]:
+    """One replay in a worker: final ratings of every clan that played at least one match."""
+    np = elo_replay.np
+    started = time.perf_counter()
+    result = elo_replay.replay_ladder(
+        with_decay_ticks(_worker_data, scenario.decay), scenario.elo, scenario.features, decay=scenario.decay
+    )
+    clan_ids = np.array(sorted(c for c, played in result["matches_played"].items() if played), dtype=np.int64)
+    return {
+        "clan_ids": clan_ids,
+        "ratings": np.array([result["elo"][c] for c in clan_ids.tolist()], dtype=np.int64),
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+def simulate(data: LadderData, baseline: Scenario, scenarios: List[Scenario],
+             workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Replay `baseline` and every scenario in a process pool (`workers`: default CPU count).
+    Returns one report per run, baseline first: {name, seconds, <ladder_metrics>, <rank_churn>}.
+    """
+    elo_replay._require_numpy()
+    runs = [baseline, *scenarios]
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker, initargs=(data,),
+    ) as pool:
+        outcomes = list(pool.map(_run_scenario, runs))
+
+    base = outcomes[0]
+    reports = []
+    for scenario, outcome in zip(runs, outcomes):
+        reports.append({
+            "name": scenario.name,
+            "seconds": outcome["seconds"],
+            **ladder_metrics(outcome["ratings"]),
+            **rank_churn(base["clan_ids"], base["ratings"], outcome["clan_ids"], outcome["ratings"]),
+        })
+    return reports
@@ -4,9 +4,12 @@ Bot Utilities
 Shared helper functions and state to avoid circular dependencies.
 """
 
+import copy
 import discord
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Optional, Any, Callable, Dict, Tuple
+
+import config
 
 # Global cache variables
 _log_channel: Optional[discord.TextChannel] = None
@@ -19,22 +22,27 @@ _player_role: Optional[discord.Role] = None
 def set_log_channel(channel: discord.TextChannel):
     global _log_channel
     _log_channel = channel
+    _remember("text_channel", config.CHANNEL_MOD_LOG, channel)
 
 def set_clans_category(category: discord.CategoryChannel):
     global _clans_category
     _clans_category = category
+    _remember("category", config.CATEGORY_CLANS, category)
 
 def set_verified_role(role: discord.Role):
     global _verified_role
     _verified_role = role
+    _remember("role", config.ROLE_VERIFIED, role)
 
 def set_mod_role(role: discord.Role):
     global _mod_role
     _mod_role = role
+    _remember("role", config.ROLE_MOD, role)
 
 def set_player_role(role: discord.Role):
     global _player_role
     _player_role = role
+    _remember("role", config.ROLE_PLAYER, role)
 
 # Getter functions
 def get_log_channel() -> Optional[discord.TextChannel]:
@@ -74,6 +82,7 @@ _update_channel: Optional[discord.TextChannel] = None
 def set_update_channel(channel: discord.TextChannel):
     global _update_channel
     _update_channel = channel
+    _remember("text_channel", config.CHANNEL_UPDATE_BOT, channel)
 
 def get_update_channel() -> Optional[discord.TextChannel]:
     return _update_channel
@@ -88,6 +97,7 @@ _chat_channel: Optional[discord.TextChannel] = None
 def set_chat_channel(channel: discord.TextChannel):
     global _chat_channel
     _chat_channel = channel
+    _remember("text_channel", config.CHANNEL_CHAT_ARENA, channel)
 
 def get_chat_channel() -> Optional[discord.TextChannel]:
     return _chat_channel
@@ -160,3 +170,144 @@ async def announce_public(title: str, description: str, color: discord.Color = d
         print(f"[ANNOUNCE] Failed to post: {e}")
         return False
 
+
+# =============================================================================
+# STATIC EMBEDS (built once, reused by every interaction)
+# =============================================================================
+# Screens whose content only depends on code and config (rules, donate, help,
+# arena dashboard) register their builder with @static_embed("name"). The builder
+# runs once - at cog load via build_static_embeds(), or on first use - and every
+# request gets a copy of the stored payload. Builders may take hashable arguments
+# (e.g. the viewer's roles); each distinct set of arguments is built once.
+
+_static_builders: Dict[str, Callable[..., discord.Embed]] = {}
+_static_payloads: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+static_embed_stats: Dict[str, int] = {"builds": 0, "hits": 0}
+
+def static_embed(name: str):
+    """Decorator: register `builder` as the static embed `name`."""
+    def register(builder: Callable[..., discord.Embed]) -> Callable[..., discord.Embed]:
+        _static_builders[name] = builder
+        for key in [key for key in _static_payloads if key[0] == name]:
+            del _static_payloads[key]
+        return builder
+    return register
+
+def get_static_embed(name: str, *args: Any) -> discord.Embed:
+    """The static embed `name` for `args`, built on first use. Safe to modify (it is a copy)."""
+    key = (name, *args)
+    payload = _static_payloads.get(key)
+    if payload is None:
+        payload = _static_payloads[key] = _static_builders[name](*args).to_dict()
+        static_embed_stats["builds"] += 1
+    else:
+        static_embed_stats["hits"] += 1
+    return discord.Embed.from_dict(copy.deepcopy(payload))
+
+def build_static_embeds(*names: str) -> int:
+    """Build the argument-less static embeds `names` now (cog load). Returns how many were built."""
+    built = 0
+    for name in names:
+        if (name,) not in _static_payloads:
+            _static_payloads[(name,)] = _static_builders[name]().to_dict()
+            static_embed_stats["builds"] += 1
+            built += 1
+    return built
+
+def reset_static_embeds() -> None:
+    """Drop every built payload (call after changing config at runtime); they rebuild on next use."""
+    _static_payloads.clear()
+
+
+# =============================================================================
+# GUILD OBJECT REGISTRY (configured names resolved to IDs)
+# =============================================================================
+# Roles, text channels and categories named in config.py are resolved to IDs once
+# by resolve_guild_objects() (main.py on_ready; the setters above also record
+# theirs). Lookups are then guild.get_role() / guild.get_channel() dict hits
+# instead of scans over guild.roles / text_channels / categories. The
+# on_guild_role_* / on_guild_channel_* events call refresh_guild_objects(), and
+# a hit whose name no longer matches is resolved again, so renames are safe.
+# Names that are not configured are resolved (and remembered) on first use.
+
+GUILD_OBJECT_NAMES: Dict[str, Tuple[str, ...]] = {
+    "role": (config.ROLE_VERIFIED, config.ROLE_MOD, config.ROLE_PLAYER, config.ROLE_HIGHLIGHT_GOD),
+    "text_channel": (
+        config.CHANNEL_MOD_LOG, config.CHANNEL_ARENA, config.CHANNEL_UPDATE_BOT,
+        config.CHANNEL_CHAT_ARENA, config.CHANNEL_HIGHLIGHTS,
+    ),
+    "category": (config.CATEGORY_CLANS,),
+}
+
+_registry_guild: Optional[discord.Guild] = None
+_guild_object_ids: Dict[Tuple[str, str], Optional[int]] = {}  # (kind, name) -> id, None = not on the server
+guild_registry_stats: Dict[str, int] = {"hits": 0, "resolves": 0}
+
+def _scan(guild: discord.Guild, kind: str, name: str) -> Any:
+    if kind == "role":
+        return discord.utils.get(guild.roles, name=name)
+    if kind == "category":
+        return discord.utils.get(guild.categories, name=name)
+    return discord.utils.get(guild.text_channels, name=name)
+
+def _by_id(guild: discord.Guild, kind: str, object_id: int) -> Any:
+    return guild.get_role(object_id) if kind == "role" else guild.get_channel(object_id)
+
+def _remember(kind: str, name: str, obj: Any) -> None:
+    global _registry_guild
+    if obj is None:
+        return
+    if _registry_guild is None or _registry_guild.id != obj.guild.id:
+        _registry_guild = obj.guild
+    _guild_object_ids[(kind, name)] = obj.id
+
+def _resolve(guild: discord.Guild, kind: str, name: str) -> Any:
+    obj = _scan(guild, kind, name)
+    guild_registry_stats["resolves"] += 1
+    _guild_object_ids[(kind, name)] = obj.id if obj is not None else None
+    return obj
+
+def resolve_guild_objects(guild: discord.Guild) -> Dict[str, Any]:
+    """Resolve every configured role / text channel / category name to its ID. Returns {name: object or None}."""
+    global _registry_guild
+    _registry_guild = guild
+    _guild_object_ids.clear()
+    return {name: _resolve(guild, kind, name) for kind, names in GUILD_OBJECT_NAMES.items() for name in names}
+
+def refresh_guild_objects(*kinds: str) -> None:
+    """Re-resolve the registered names of `kinds` (guild role / channel create, update, delete events)."""
+    if _registry_guild is None:
+        return
+    for kind, name in [key for key in _guild_object_ids if key[0] in kinds]:
+        _resolve(_registry_guild, kind, name)
+
+def _lookup(kind: str, name: str, guild: Optional[discord.Guild]) -> Any:
+    guild = guild or _registry_guild
+    if guild is None:
+        return None
+    if _registry_guild is None or guild.id != _registry_guild.id:
+        return _scan(guild, kind, name)  # Not the registered guild: plain lookup
+    key = (kind, name)
+    if key not in _guild_object_ids:
+        return _resolve(guild, kind, name)
+    object_id = _guild_object_ids[key]
+    if object_id is None:
+        guild_registry_stats["hits"] += 1
+        return None
+    obj = _by_id(guild, kind, object_id)
+    if obj is None or obj.name != name:
+        return _resolve(guild, kind, name)  # Deleted or renamed since the last event
+    guild_registry_stats["hits"] += 1
+    return obj
+
+def get_role(name: str, guild: Optional[discord.Guild] = None) -> Optional[discord.Role]:
+    """Role named `name` (O(1) after the first resolve). `guild` defaults to the registered guild."""
+    return _lookup("role", name, guild)
+
+def get_text_channel(name: str, guild: Optional[discord.Guild] = None) -> Optional[discord.TextChannel]:
+    """Text channel named `name` (O(1) after the first resolve). `guild` defaults to the registered guild."""
+    return _lookup("text_channel", name, guild)
+
+def get_category(name: str, guild: Optional[discord.Guild] = None) -> Optional[discord.CategoryChannel]:
+    """Category named `name` (O(1) after the first resolve). `guild` defaults to the registered guild."""
+    return _lookup("category", name, guild)
@@ -3,205 +3,1857 @@ Clan System Database Helper
 Async SQLite operations using aiosqlite
 """
 
+import asyncio
+import contextvars
+import functools
+import heapq
+import inspect
+import threading
+import time
 import aiosqlite
 from pathlib import Path
 from datetime import datetime, timedelta, timezone
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Set, Iterable, Callable, Awaitable
 from contextlib import asynccontextmanager
+from collections import OrderedDict, deque
 
 import config
+from services.records import Record, User, Clan, ClanMember, Match, Loan, Transfer, Cooldown, Case, record_class
 
 # Database path
 DB_PATH = Path(__file__).parent.parent / "data" / "clan.db"
 SCHEMA_PATH = Path(__file__).parent.parent / "db" / "schema.sql"
 
 
+# =============================================================================
+# ROW RECORDS
+# =============================================================================
+
+def _columns(cursor) -> Tuple[str, ...]:
+    return tuple(column[0] for column in cursor.description)
+
+
+def _record(kind: type, cursor, row) -> Optional[Record]:
+    """Build one `kind` record (dict-compatible) from a fetched row, or None."""
+    if row is None:
+        return None
+    cls = record_class(kind, _columns(cursor))
+    return cls(row) if cls is not None else dict(row)
+
+
+def _records(kind: type, cursor, rows) -> List[Record]:
+    """Build `kind` records for all fetched rows (column layout resolved once)."""
+    if not rows:
+        return []
+    cls = record_class(kind, _columns(cursor))
+    if cls is None:
+        return [dict(row) for row in rows]
+    return [cls(row) for row in rows]
+
+
+# =============================================================================
+# QUERY INSTRUMENTATION
+# =============================================================================
+
+_EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE")
+
+
+def _normalize_sql(sql: str) -> str:
+    return " ".join(sql.split())
+
+
+class QueryStats:
+    """
+    Per-statement metrics collected by every pooled / writer connection.
+
+    Statements are keyed by their whitespace-normalized SQL (parameters are bound,
+    so one helper = one key). For each key: count, total/max time, rows and
+    p50/p95/p99 over the last DB_QUERY_STATS_SAMPLES executions. Time covers
+    execute() plus the fetches of its cursor. Statements slower than
+    DB_SLOW_QUERY_MS are appended to a bounded slow log with their EXPLAIN QUERY PLAN.
+    """
+
+    def __init__(self):
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._plans: Dict[str, str] = {}
+        self.slow_log: deque = deque(maxlen=config.DB_SLOW_QUERY_LOG_SIZE)
+
+    def record(self, key: str, elapsed: float, rows: int, first: bool = True, parameters: Any = None) -> None:
+        entry = self._stats.get(key)
+        if entry is None:
+            entry = self._stats[key] = {
+                "count": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": 0, "params": None,
+                "samples": deque(maxlen=config.DB_QUERY_STATS_SAMPLES),
+            }
+        ms = elapsed * 1000
+        entry["total_ms"] += ms
+        entry["rows"] += rows
+        if first:
+            entry["count"] += 1
+            entry["params"] = parameters  # Last bound parameters, lets tools replay the statement
+            entry["samples"].append(ms)
+            entry["max_ms"] = max(entry["max_ms"], ms)
+        elif entry["samples"]:
+            # Later fetches of the same cursor belong to the same execution
+            entry["samples"][-1] += ms
+            entry["max_ms"] = max(entry["max_ms"], entry["samples"][-1])
+
+    async def note_slow(self, conn: aiosqlite.Connection, sql: str, parameters: Any, elapsed: float) -> None:
+        key = _normalize_sql(sql)
+        plan = self._plans.get(key)
+        if plan is None and key.split(" ", 1)[0].upper() in _EXPLAINABLE:
+            try:
+                cursor = await conn.execute(f"EXPLAIN QUERY PLAN {sql}", parameters or ())
+                plan = "\n".join(row[3] for row in await cursor.fetchall())
+            except Exception as e:
+                plan = f"(EXPLAIN failed: {e})"
+            self._plans[key] = plan
+        ms = round(elapsed * 1000, 2)
+        self.slow_log.append({
+            "sql": key,
+            "ms": ms,
+            "plan": plan or "",
+            "at": datetime.now(timezone.utc).isoformat(),
+        })
+        print(f"[DB] Slow query ({ms} ms): {key[:200]}")
+
+    @staticmethod
+    def _percentile(ordered: List[float], pct: float) -> float:
+        if not ordered:
+            return 0.0
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return round(ordered[index], 3)
+
+    def top(self, limit: int = 10, order_by: str = "total_ms") -> List[Dict[str, Any]]:
+        """Statements sorted by `order_by` (total_ms, count, p95_ms, max_ms, rows, ...)."""
+        result = []
+        for key, entry in self._stats.items():
+            ordered = sorted(entry["samples"])
+            result.append({
+                "sql": key,
+                "count": entry["count"],
+                "total_ms": round(entry["total_ms"], 3),
+                "avg_ms": round(entry["total_ms"] / entry["count"], 3) if entry["count"] else 0.0,
+                "p50_ms": self._percentile(ordered, 50),
+                "p95_ms": self._percentile(ordered, 95),
+                "p99_ms": self._percentile(ordered, 99),
+                "max_ms": round(entry["max_ms"], 3),
+                "rows": entry["rows"],
+                "params": entry["params"],
+            })
+        result.sort(key=lambda item: item.get(order_by, 0), reverse=True)
+        return result[:limit]
+
+    def reset(self) -> None:
+        self._stats.clear()
+        self._plans.clear()
+        self.slow_log.clear()
+
+
+_query_stats = QueryStats()
+
+
+class _TracedCursor:
+    """Cursor proxy that adds fetch time and row counts to its statement."""
+
+    def __init__(self, cursor: aiosqlite.Cursor, conn: "_TracedConnection", sql: str, parameters: Any, elapsed: float):
+        self._cursor = cursor
+        self._conn = conn
+        self._sql = sql
+        self._parameters = parameters
+        self._elapsed = elapsed
+        self._recorded = False
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cursor, name)
+
+    async def _fetched(self, started: float, rows: int) -> None:
+        fetch_time = time.perf_counter() - started
+        key = _normalize_sql(self._sql)
+        if self._recorded:
+            _query_stats.record(key, fetch_time, rows, first=False)
+            return
+        self._recorded = True
+        elapsed = self._elapsed + fetch_time
+        _query_stats.record(key, elapsed, rows, parameters=self._parameters)
+        if elapsed * 1000 >= config.DB_SLOW_QUERY_MS:
+            await _query_stats.note_slow(self._conn.raw, self._sql, self._parameters, elapsed)
+
+    async def fetchone(self):
+        started = time.perf_counter()
+        row = await self._cursor.fetchone()
+        await self._fetched(started, 1 if row is not None else 0)
+        return row
+
+    async def fetchall(self):
+        started = time.perf_counter()
+        rows = await self._cursor.fetchall()
+        await self._fetched(started, len(rows))
+        return rows
+
+    async def fetchmany(self, size: Optional[int] = None):
+        started = time.perf_counter()
+        rows = await (self._cursor.fetchmany(size) if size is not None else self._cursor.fetchmany())
+        await self._fetched(started, len(rows))
+        return rows
+
+
+class _TracedConnection:
+    """
+    Connection proxy installed by _open_connection() when DB_QUERY_STATS is on.
+    Statements that return rows are recorded on their first fetch (so fetch time
+    counts); writes are recorded right away with rowcount as rows.
+    """
+
+    def __init__(self, conn: aiosqlite.Connection):
+        self.raw = conn
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.raw, name)
+
+    async def execute(self, sql: str, parameters: Any = None):
+        started = time.perf_counter()
+        cursor = await self.raw.execute(sql, parameters)
+        elapsed = time.perf_counter() - started
+        if cursor.description is not None:
+            return _TracedCursor(cursor, self, sql, parameters, elapsed)
+        _query_stats.record(_normalize_sql(sql), elapsed, max(cursor.rowcount, 0), parameters=parameters)
+        if elapsed * 1000 >= config.DB_SLOW_QUERY_MS:
+            await _query_stats.note_slow(self.raw, sql, parameters, elapsed)
+        return cursor
+
+    async def executemany(self, sql: str, parameters: Any):
+        started = time.perf_counter()
+        cursor = await self.raw.executemany(sql, parameters)
+        _query_stats.record(_normalize_sql(sql), time.perf_counter() - started, max(cursor.rowcount, 0))
+        return cursor
+
+
+def get_query_stats(limit: int = 10, order_by: str = "total_ms") -> List[Dict[str, Any]]:
+    """Top statements by `order_by` with count, total/avg/p50/p95/p99/max ms, rows and last params."""
+    return _query_stats.top(limit, order_by)
+
+
+def get_slow_queries(limit: int = 10) -> List[Dict[str, Any]]:
+    """Most recent slow statements (newest first) with their EXPLAIN QUERY PLAN."""
+    return list(reversed(_query_stats.slow_log))[:limit]
+
+
+def reset_query_stats() -> None:
+    """Clear statement metrics and the slow-query log."""
+    _query_stats.reset()
+
+
 # =============================================================================
 # CONNECTION MANAGEMENT
 # =============================================================================
 
-@asynccontextmanager
-async def get_connection():
-    """Get a database connection with row factory enabled."""
+def _daemonize(conn: aiosqlite.Connection) -> None:
+    """
+    Mark the aiosqlite worker thread as daemon.
+    Pooled connections live for the whole process, so they must never block
+    interpreter exit (scripts/tests that forget to call close_pool()).
+    """
+    # aiosqlite >= 0.20 keeps the worker in `_thread`, older versions ARE the thread
+    worker = getattr(conn, "_thread", conn)
+    if isinstance(worker, threading.Thread):
+        worker.daemon = True
+
+
+async def _open_connection(read_only: bool = False) -> aiosqlite.Connection:
+    """
+    Open a new tuned connection (WAL, foreign keys, cache/mmap sizes).
+    `read_only` connections run with `query_only` so a stray write fails loudly.
+    """
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = await aiosqlite.connect(DB_PATH)
+    conn = aiosqlite.connect(DB_PATH, timeout=config.DB_BUSY_TIMEOUT_SECONDS)
+    _daemonize(conn)
+    await conn
     conn.row_factory = aiosqlite.Row
     await conn.execute("PRAGMA foreign_keys = ON")
+    await conn.execute("PRAGMA journal_mode = WAL")
+    await conn.execute(f"PRAGMA synchronous = {config.DB_SYNCHRONOUS}")
+    await conn.execute(f"PRAGMA cache_size = -{config.DB_CACHE_SIZE_KB}")
+    await conn.execute(f"PRAGMA mmap_size = {config.DB_MMAP_SIZE_BYTES}")
+    if read_only:
+        await conn.execute("PRAGMA query_only = ON")
+    return _TracedConnection(conn) if config.DB_QUERY_STATS else conn
+
+
+class ConnectionPool:
+    """
+    Pool of long-lived aiosqlite connections.
+
+    - Keeps up to `size` idle connections open and hands them out again instead of
+      spawning a new worker thread + re-running PRAGMAs for every helper call.
+    - Never blocks: if every pooled connection is busy (e.g. a helper opened while
+      another connection is still held by the same command), an overflow connection
+      is opened and closed again on release. This keeps nested get_connection()
+      calls deadlock-free, exactly like before pooling.
+    - Connections idle longer than DB_POOL_HEALTH_CHECK_SECONDS are pinged before reuse.
+    - The pool is bound to one event loop and one DB_PATH; if either changes
+      (tests, scripts calling asyncio.run() twice) the idle connections are dropped.
+    - `read_only` pools hand out `query_only` connections (WAL readers).
+    """
+
+    def __init__(self, size: int, read_only: bool = False):
+        self.size = size
+        self.read_only = read_only
+        self._idle: List[Tuple[aiosqlite.Connection, float]] = []
+        self._generation = 0
+        self._owners: Dict[int, int] = {}  # id(conn) -> generation it was opened in
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._path: Optional[Path] = None
+        self.stats: Dict[str, int] = {
+            "opened": 0,
+            "reused": 0,
+            "overflow": 0,
+            "closed": 0,
+            "in_use": 0,
+            "peak_in_use": 0,
+            "health_checks": 0,
+            "health_failures": 0,
+            "rollbacks_on_release": 0,
+        }
+
+    def _reset_if_stale(self) -> None:
+        loop = asyncio.get_running_loop()
+        if loop is self._loop and self._path == DB_PATH:
+            return
+        for conn, _ in self._idle:
+            self._owners.pop(id(conn), None)
+            conn.stop()
+            self.stats["closed"] += 1
+        self._idle = []
+        self._generation += 1
+        self._loop = loop
+        self._path = DB_PATH
+
+    async def _is_healthy(self, conn: aiosqlite.Connection) -> bool:
+        self.stats["health_checks"] += 1
+        try:
+            await conn.execute("SELECT 1")
+            return True
+        except Exception:
+            self.stats["health_failures"] += 1
+            return False
+
+    async def _discard(self, conn: aiosqlite.Connection) -> None:
+        self._owners.pop(id(conn), None)
+        self.stats["closed"] += 1
+        try:
+            await conn.close()
+        except Exception:
+            pass
+
+    async def acquire(self) -> aiosqlite.Connection:
+        """Take an idle connection (or open one) for exclusive use."""
+        self._reset_if_stale()
+        conn = None
+        while self._idle and conn is None:
+            candidate, last_used = self._idle.pop()
+            if time.monotonic() - last_used > config.DB_POOL_HEALTH_CHECK_SECONDS:
+                if not await self._is_healthy(candidate):
+                    await self._discard(candidate)
+                    continue
+            conn = candidate
+            self.stats["reused"] += 1
+
+        if conn is None:
+            conn = await _open_connection(self.read_only)
+            self._owners[id(conn)] = self._generation
+            self.stats["opened"] += 1
+
+        self.stats["in_use"] += 1
+        self.stats["peak_in_use"] = max(self.stats["peak_in_use"], self.stats["in_use"])
+        return conn
+
+    async def release(self, conn: aiosqlite.Connection) -> None:
+        """Return a connection; uncommitted work left behind is rolled back."""
+        self.stats["in_use"] -= 1
+        try:
+            if conn.in_transaction:
+                # Helper raised (or forgot to commit) mid-write. The old per-call
+                # connection discarded this work on close(); keep that behaviour.
+                self.stats["rollbacks_on_release"] += 1
+                await conn.rollback()
+        except Exception:
+            await self._discard(conn)
+            return
+
+        same_generation = self._owners.get(id(conn)) == self._generation
+        if same_generation and len(self._idle) < self.size:
+            self._idle.append((conn, time.monotonic()))
+        else:
+            if same_generation:
+                self.stats["overflow"] += 1
+            await self._discard(conn)
+
+    async def health_check(self) -> Dict[str, int]:
+        """Ping every idle connection, replacing dead ones. Returns {checked, replaced}."""
+        self._reset_if_stale()
+        checked = replaced = 0
+        alive = []
+        for conn, last_used in self._idle:
+            checked += 1
+            if await self._is_healthy(conn):
+                alive.append((conn, time.monotonic()))
+            else:
+                replaced += 1
+                await self._discard(conn)
+        self._idle = alive
+        return {"checked": checked, "replaced": replaced}
+
+    def get_stats(self) -> Dict[str, int]:
+        """Snapshot of pool counters plus current idle count and configured size."""
+        return {**self.stats, "idle": len(self._idle), "size": self.size}
+
+    async def close(self) -> None:
+        """Close all idle connections (in-use ones are closed on release)."""
+        idle, self._idle = self._idle, []
+        self._generation += 1
+        for conn, _ in idle:
+            await self._discard(conn)
+
+
+_pool = ConnectionPool(config.DB_POOL_SIZE)
+
+# WAL readers never wait for the writer, so dashboards / arena lists stay responsive
+# while matches are being confirmed.
+_read_pool = ConnectionPool(config.DB_READ_POOL_SIZE, read_only=True)
+
+
+# =============================================================================
+# UNIT OF WORK (transaction scope shared by every helper)
+# =============================================================================
+
+_BEGIN_STATEMENTS = {"BEGIN", "BEGIN TRANSACTION", "BEGIN DEFERRED", "BEGIN IMMEDIATE", "BEGIN EXCLUSIVE"}
+
+
+class _ScopedConnection:
+    """
+    Connection proxy handed to code running inside a transaction() scope.
+
+    Helpers were written to own their connection (`BEGIN` ... `commit()` / `rollback()`).
+    Inside a scope those calls are mapped onto a SAVEPOINT, so a helper can undo its own
+    work but can never commit or roll back the caller's whole unit of work.
+    Everything else is delegated to the real aiosqlite connection.
+    """
+
+    def __init__(self, conn: aiosqlite.Connection, savepoint: str):
+        self._conn = conn
+        self._savepoint = savepoint
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._conn, name)
+
+    async def execute(self, sql: str, parameters: Any = None):
+        if sql.strip().rstrip(";").upper() in _BEGIN_STATEMENTS:
+            return None  # Savepoint is already open
+        return await self._conn.execute(sql, parameters)
+
+    async def commit(self) -> None:
+        # Keep the work, keep protecting whatever the helper does next
+        await self._conn.execute(f"RELEASE SAVEPOINT {self._savepoint}")
+        await self._conn.execute(f"SAVEPOINT {self._savepoint}")
+
+    async def rollback(self) -> None:
+        await self._conn.execute(f"ROLLBACK TO SAVEPOINT {self._savepoint}")
+
+
+class _TransactionScope:
+    """One connection + savepoint counter, owned by the task that opened transaction()."""
+
+    def __init__(self, conn: aiosqlite.Connection):
+        self.conn = conn
+        self.task = asyncio.current_task()
+        self.active = True
+        self._counter = 0
+        self.after_commit: List[Callable[[], None]] = []
+        self.dirty: Set[str] = set()  # In-memory snapshots written in this scope (read them from `conn`)
+
+    def usable(self) -> bool:
+        # Tasks spawned inside the scope inherit the contextvar; they must not share
+        # the connection concurrently, so only the owning task joins.
+        return self.active and self.task is asyncio.current_task()
+
+    @asynccontextmanager
+    async def savepoint(self):
+        self._counter += 1
+        name = f"sp_{self._counter}"
+        await self.conn.execute(f"SAVEPOINT {name}")
+        try:
+            yield _ScopedConnection(self.conn, name)
+        except BaseException:
+            # SQLite may already have aborted the whole transaction (e.g. disk full)
+            if self.conn.in_transaction:
+                await self.conn.execute(f"ROLLBACK TO SAVEPOINT {name}")
+                await self.conn.execute(f"RELEASE SAVEPOINT {name}")
+            raise
+        await self.conn.execute(f"RELEASE SAVEPOINT {name}")
+
+
+_current_scope: contextvars.ContextVar[Optional[_TransactionScope]] = contextvars.ContextVar(
+    "db_transaction_scope", default=None
+)
+
+
+def _active_scope() -> Optional[_TransactionScope]:
+    scope = _current_scope.get()
+    return scope if scope is not None and scope.usable() else None
+
+
+def _after_commit(callback: Callable[[], None]) -> None:
+    """
+    Run `callback` once the current write is durable: at the end of the active
+    transaction() scope (dropped if it rolls back), or right away outside one.
+    Used by the in-memory caches, so they never publish uncommitted state.
+    """
+    scope = _active_scope()
+    if scope is not None:
+        scope.after_commit.append(callback)
+    else:
+        callback()
+
+
+# Topics of get_data_version(); each is bumped after any committed write to its tables
+_data_versions: Dict[str, int] = {"clans": 0, "members": 0, "matches": 0}
+
+
+def _data_changed(*topics: str) -> None:
+    def bump() -> None:
+        for topic in topics:
+            _data_versions[topic] += 1
+    _after_commit(bump)
+
+
+def get_data_version(*topics: str) -> Tuple[Any, ...]:
+    """
+    Current version of `topics` ("clans", "members", "matches"), for caching
+    anything derived from those tables (e.g. rendered embeds): equal versions
+    mean no committed write touched them since. Includes DB_PATH, so switching
+    databases never reuses an old entry.
+    """
+    return (str(DB_PATH),) + tuple(_data_versions[topic] for topic in topics)
+
+
+def invalidate_matches(match_id: Optional[int] = None) -> None:
+    """
+    Bump the "matches" data version and drop @cached match results once the
+    current write commits. Call it next to any raw `INSERT/UPDATE/DELETE matches`;
+    the match helpers here already do.
+    """
+    _data_changed("matches")
+    invalidate_tags("matches", *([] if match_id is None else [f"match:{match_id}"]))
+
+
+# =============================================================================
+# SINGLE WRITER (group commit)
+# =============================================================================
+
+class _WriteLease:
+    """One queued write job: the writer grants the connection, the caller reports back."""
+
+    __slots__ = ("granted", "done", "committed", "enqueued_at")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.granted = loop.create_future()    # -> write connection (set by the writer)
+        self.done = loop.create_future()       # -> True = keep work, False = rolled back (set by caller)
+        self.committed = loop.create_future()  # -> outcome of the group commit (set by the writer)
+        self.enqueued_at = time.monotonic()
+
+
+class DatabaseWriter:
+    """
+    In-process writer task that owns the ONLY write connection.
+
+    - Every mutating helper queues a lease and waits until the writer hands over the
+      connection. Jobs run one after another, each inside its own SAVEPOINT, so a
+      failing job only undoes itself.
+    - Jobs that queued up while a batch was running are folded into the same
+      transaction (up to DB_WRITER_MAX_BATCH) and made durable with ONE commit.
+      A caller only returns once the commit that contains its work succeeded.
+    - Because only this task ever takes SQLite's write lock, helpers no longer fight
+      each other for it ("database is locked" stalls under concurrent confirms).
+    - Like the pool, the writer is bound to one event loop and one DB_PATH and
+      restarts itself if either changes.
+    """
+
+    def __init__(self, max_batch: int):
+        self.max_batch = max_batch
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._conn: Optional[aiosqlite.Connection] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._path: Optional[Path] = None
+        self.stats: Dict[str, Any] = {
+            "jobs": 0,
+            "batches": 0,
+            "commit_failures": 0,
+            "begin_failures": 0,
+            "max_batch_size": 0,
+            "max_queue_depth": 0,
+            "last_commit_ms": 0.0,
+            "max_commit_ms": 0.0,
+        }
+        self._commit_seconds = 0.0
+        self._wait_seconds = 0.0
+
+    # ------------------------------------------------------------------ lifecycle
+
+    def _ensure_running(self) -> None:
+        loop = asyncio.get_running_loop()
+        running = self._task is not None and not self._task.done()
+        if running and self._loop is loop and self._path == DB_PATH:
+            return
+        if running and self._loop is loop:
+            self._task.cancel()  # DB_PATH changed: drop the old connection
+        elif self._conn is not None:
+            self._conn.stop()  # Old event loop is gone, just stop the worker thread
+        self._conn = None
+        self._loop = loop
+        self._path = DB_PATH
+        self._queue = asyncio.Queue()
+        self._task = loop.create_task(self._run(self._queue), name="db-writer")
+
+    async def close(self) -> None:
+        """Stop the writer task and close its connection."""
+        task, self._task = self._task, None
+        if task is None or task.done():
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    # ------------------------------------------------------------------ writer side
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        conn = None
+        try:
+            while True:
+                lease = await queue.get()
+                if lease.granted.done():
+                    continue  # Caller was cancelled while queued
+                try:
+                    if conn is None:
+                        conn = self._conn = await _open_connection()
+                    await conn.execute("BEGIN IMMEDIATE")
+                except Exception as e:
+                    print(f"[DB] Writer could not start a transaction: {e}")
+                    self.stats["begin_failures"] += 1
+                    lease.granted.set_exception(e)
+                    continue
+
+                batch = []
+                while lease is not None:
+                    if await self._serve(conn, lease):
+                        batch.append(lease)
+                    lease = None
+                    if len(batch) < self.max_batch:
+                        if queue.empty():
+                            # Let callers that are already runnable enqueue and join this commit
+                            await asyncio.sleep(config.DB_WRITER_COMMIT_DELAY_MS / 1000)
+                        if not queue.empty():
+                            lease = queue.get_nowait()
+
+                if not await self._commit(conn, batch):
+                    conn = self._conn = None
+        except asyncio.CancelledError:
+            pass
+        finally:
+            while not queue.empty():
+                pending = queue.get_nowait()
+                if not pending.granted.done():
+                    pending.granted.set_exception(RuntimeError("Database writer stopped"))
+            if conn is not None:
+                try:
+                    if conn.in_transaction:
+                        await conn.rollback()
+                    await conn.close()
+                except Exception:
+                    conn.stop()
+            if self._conn is conn:
+                self._conn = None
+
+    async def _serve(self, conn: aiosqlite.Connection, lease: _WriteLease) -> bool:
+        """Hand the connection to one caller and wait until it is done with it."""
+        if lease.granted.done():
+            return False
+        self._wait_seconds += time.monotonic() - lease.enqueued_at
+        self.stats["jobs"] += 1
+        lease.granted.set_result(conn)
+        await lease.done
+        return True
+
+    async def _commit(self, conn: aiosqlite.Connection, batch: List[_WriteLease]) -> bool:
+        """Commit one batch and wake its callers. Returns False if the connection is unusable."""
+        started = time.monotonic()
+        error = None
+        healthy = True
+        try:
+            await conn.commit()
+        except Exception as e:
+            error = e
+            self.stats["commit_failures"] += 1
+            print(f"[DB] Writer commit failed for {len(batch)} job(s): {e}")
+            try:
+                await conn.rollback()
+            except Exception:
+                healthy = False
+                conn.stop()
+
+        elapsed = time.monotonic() - started
+        self._commit_seconds += elapsed
+        self.stats["batches"] += 1
+        self.stats["max_batch_size"] = max(self.stats["max_batch_size"], len(batch))
+        self.stats["last_commit_ms"] = round(elapsed * 1000, 3)
+        self.stats["max_commit_ms"] = max(self.stats["max_commit_ms"], self.stats["last_commit_ms"])
+
+        for lease in batch:
+            # Jobs that already rolled back their savepoint have nothing to lose
+            if error is not None and lease.done.result():
+                lease.committed.set_exception(error)
+            else:
+                lease.committed.set_result(None)
+        return healthy
+
+    # ------------------------------------------------------------------ caller side
+
+    @asynccontextmanager
+    async def lease(self):
+        """Wait for the write connection, run the block in a scope, then wait for the commit."""
+        self._ensure_running()
+        lease = _WriteLease(asyncio.get_running_loop())
+        self._queue.put_nowait(lease)
+        self.stats["max_queue_depth"] = max(self.stats["max_queue_depth"], self._queue.qsize())
+        try:
+            conn = await lease.granted
+        except asyncio.CancelledError:
+            # Granted right before we were cancelled: give the connection back
+            if lease.granted.done() and not lease.granted.cancelled():
+                lease.done.set_result(False)
+            raise
+
+        scope = _TransactionScope(conn)
+        token = _current_scope.set(scope)
+        keep = False
+        try:
+            async with scope.savepoint() as scoped:
+                yield scoped
+            keep = True
+        finally:
+            scope.active = False
+            _current_scope.reset(token)
+            lease.done.set_result(keep)
+        await lease.committed
+        for callback in scope.after_commit:
+            callback()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot of writer counters plus queue depth and average latencies."""
+        batches = self.stats["batches"]
+        jobs = self.stats["jobs"]
+        return {
+            **self.stats,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "avg_batch_size": round(jobs / batches, 2) if batches else 0.0,
+            "avg_commit_ms": round(self._commit_seconds * 1000 / batches, 3) if batches else 0.0,
+            "avg_wait_ms": round(self._wait_seconds * 1000 / jobs, 3) if jobs else 0.0,
+        }
+
+
+_writer = DatabaseWriter(config.DB_WRITER_MAX_BATCH)
+
+
+@asynccontextmanager
+async def _write_connection():
+    """
+    Connection for mutating helpers.
+    Joins the active scope if there is one, otherwise queues on the single writer.
+    """
+    scope = _active_scope()
+    if scope is not None:
+        async with scope.savepoint() as conn:
+            yield conn
+        return
+
+    async with _writer.lease() as conn:
+        yield conn
+
+
+async def run_write(job: Callable[[Any], Awaitable[Any]]) -> Any:
+    """
+    Queue `job(conn)` on the single writer and return its result once it is committed.
+    For ad-hoc write SQL that has no helper yet.
+    """
+    async with _write_connection() as conn:
+        return await job(conn)
+
+
+@asynccontextmanager
+async def transaction():
+    """
+    Run a unit of work as ONE job on the single writer connection.
+
+    Every helper in this module called inside the block (directly or through
+    elo/moderation services) joins the same transaction automatically:
+
+        async with db.transaction():
+            await db.confirm_match_v2(match_id, user_id)
+            await elo.apply_match_result(match_id, winner_id)
+
+    Reads see the scope's own uncommitted writes; an exception rolls everything back.
+    The block returns once the group commit containing it is durable.
+    Nested transaction() blocks become savepoints of the outer one.
+    The scope belongs to the task that opened it (spawned tasks get their own connections).
+    While the block runs no other write can start, so never await another task that
+    writes to the database from inside it.
+    """
+    scope = _active_scope()
+    if scope is not None:
+        async with scope.savepoint() as conn:
+            yield conn
+        return
+
+    async with _writer.lease() as conn:
+        yield conn
+
+
+def in_transaction() -> bool:
+    """True if the current task is inside a transaction() scope."""
+    return _active_scope() is not None
+
+
+@asynccontextmanager
+async def get_connection():
+    """
+    Get a pooled database connection with row factory enabled.
+    Inside a transaction() scope this joins the scope's connection instead.
+    Outside one it is a separate writable connection that competes with the single
+    writer for SQLite's lock: only for migrations (init_db), scripts and test fixtures.
+    Bot code writes through transaction() / run_write() / the helpers here and reads
+    through get_read_connection() (tests/test_db_writer.py enforces this for cogs and services).
+    """
+    scope = _active_scope()
+    if scope is not None:
+        async with scope.savepoint() as conn:
+            yield conn
+        return
+
+    conn = await _pool.acquire()
     try:
         yield conn
     finally:
-        await conn.close()
+        await _pool.release(conn)
 
 
-async def init_db() -> None:
-    """Initialize database by executing schema.sql."""
-    async with get_connection() as conn:
-        # Get existing tables before init
-        cursor = await conn.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'"
-        )
-        existing_tables = {row[0] for row in await cursor.fetchall()}
-        
-        # Execute schema
-        schema = SCHEMA_PATH.read_text(encoding="utf-8")
-        await conn.executescript(schema)
-        await conn.commit()
-        
-        # Get tables after init
-        cursor = await conn.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'"
-        )
-        all_tables = {row[0] for row in await cursor.fetchall()}
-        
-        # Check for new tables
-        new_tables = all_tables - existing_tables
-        
-        print(f"Database initialized at {DB_PATH}")
-        if new_tables:
-            print(f"  ✓ New tables created: {', '.join(sorted(new_tables))}")
+@asynccontextmanager
+async def get_read_connection():
+    """
+    Get a pooled read-only connection (`query_only`) for SELECT-only work.
+    Inside a transaction() scope this joins the scope's connection instead,
+    so the caller still sees its own uncommitted writes.
+    """
+    scope = _active_scope()
+    if scope is not None:
+        async with scope.savepoint() as conn:
+            yield conn
+        return
+
+    conn = await _read_pool.acquire()
+    try:
+        yield conn
+    finally:
+        await _read_pool.release(conn)
+
+
+def get_pool_stats() -> Dict[str, int]:
+    """Connection pool metrics (opened/reused/overflow/in_use/idle/...)."""
+    return _pool.get_stats()
+
+
+def get_read_pool_stats() -> Dict[str, int]:
+    """Read-only pool metrics, same keys as get_pool_stats()."""
+    return _read_pool.get_stats()
+
+
+def get_writer_stats() -> Dict[str, Any]:
+    """Single writer metrics (queue_depth, avg_batch_size, last/avg/max commit latency, ...)."""
+    return _writer.get_stats()
+
+
+async def check_pool_health() -> Dict[str, int]:
+    """Ping idle pooled connections (both pools) and replace broken ones."""
+    result = await _pool.health_check()
+    read_result = await _read_pool.health_check()
+    return {key: result[key] + read_result[key] for key in result}
+
+
+async def close_pool() -> None:
+    """Close pooled connections and the writer (call on shutdown / at the end of scripts)."""
+    await _writer.close()
+    await _pool.close()
+    await _read_pool.close()
+
+
+# =============================================================================
+# BATCHED LOOKUPS (DataLoader)
+# =============================================================================
+
+_MAX_IN_PARAMS = 500  # Stay well below SQLite's bound-parameter limit
+
+
+_TABLE_RECORDS = {"users": User, "clans": Clan}
+
+
+async def _select_by_ids(table: str, ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """SELECT * FROM table WHERE id IN (...) in chunks. Returns {id: row}."""
+    unique_ids = list(dict.fromkeys(i for i in ids if i is not None))
+    if not unique_ids:
+        return {}
+    result: Dict[int, Dict[str, Any]] = {}
+    async with get_read_connection() as conn:
+        for start in range(0, len(unique_ids), _MAX_IN_PARAMS):
+            chunk = unique_ids[start:start + _MAX_IN_PARAMS]
+            placeholders = ",".join(["?"] * len(chunk))
+            cursor = await conn.execute(
+                f"SELECT * FROM {table} WHERE id IN ({placeholders})", chunk
+            )
+            for record in _records(_TABLE_RECORDS[table], cursor, await cursor.fetchall()):
+                result[record["id"]] = record
+    return result
+
+
+class _BatchLoader:
+    """
+    Coalesces single-id lookups issued in the same event-loop tick into ONE
+    `WHERE id IN (...)` query (DataLoader pattern).
+
+    `load(id)` only queues the id and schedules a dispatch with loop.call_soon();
+    every load() made before that callback runs shares the batch. Nothing is cached
+    between batches, so results are never staler than a direct query.
+    """
+
+    def __init__(self, table: str):
+        self.table = table
+        self._pending: Dict[int, List[asyncio.Future]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stats: Dict[str, int] = {"loads": 0, "batches": 0}
+
+    def load(self, key: int) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._pending = {}
+        future = loop.create_future()
+        if not self._pending:
+            loop.call_soon(self._dispatch)
+        self._pending.setdefault(key, []).append(future)
+        self.stats["loads"] += 1
+        return future
+
+    def _dispatch(self) -> None:
+        batch, self._pending = self._pending, {}
+        self.stats["batches"] += 1
+        self._loop.create_task(self._fetch(batch))
+
+    async def _fetch(self, batch: Dict[int, List[asyncio.Future]]) -> None:
+        try:
+            rows = await _select_by_ids(self.table, list(batch))
+        except Exception as e:
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+        for key, futures in batch.items():
+            row = rows.get(key)
+            for future in futures:
+                if not future.done():
+                    # Every caller gets its own record, exactly like a direct query
+                    future.set_result(row.copy() if row else None)
+
+
+_user_loader = _BatchLoader("users")
+_clan_loader = _BatchLoader("clans")
+
+
+async def _load_by_id(loader: _BatchLoader, key: Any) -> Optional[Dict[str, Any]]:
+    try:
+        key = int(key)
+    except (TypeError, ValueError):
+        return None
+    if _active_scope() is not None:
+        # Inside a transaction the lookup must see the scope's own writes
+        return (await _select_by_ids(loader.table, [key])).get(key)
+    return await loader.load(key)
+
+
+def get_lookup_stats() -> Dict[str, Dict[str, int]]:
+    """DataLoader metrics: {users|clans: {loads, batches}}."""
+    return {"users": dict(_user_loader.stats), "clans": dict(_clan_loader.stats)}
+
+
+# =============================================================================
+# ENTITY CACHE
+# =============================================================================
+
+class _EntityCache:
+    """
+    Bounded LRU of rows keyed by id, plus a secondary key (e.g. case-folded clan
+    name) pointing at the same entry.
+
+    Entries are dropped — never patched — by invalidate(), which every mutator
+    calls through _after_commit(), so a cached row is always a committed row.
+    Callers get a copy of the record, like a fresh query. `_version` is bumped by
+    every invalidation; a fill that started before one is discarded, so a read
+    that raced a write cannot put the old row back.
+    Lookups inside transaction() bypass the cache (they must see the scope's writes).
+    With `negative_ttl` > 0, secondary keys that matched no row are remembered for
+    that many seconds (same LRU bound), until a write for that key invalidates them.
+    With `self_check` on, every hit is compared against the database.
+    """
+
+    def __init__(self, table: str, size: int, alt_key: Callable[[Any], Any], negative_ttl: float = 0):
+        self.table = table
+        self.size = size
+        self.alt_key = alt_key
+        self.negative_ttl = negative_ttl
+        self.self_check = False
+        self._by_id: "OrderedDict[int, Any]" = OrderedDict()
+        self._by_alt: Dict[Any, int] = {}
+        self._missing: "OrderedDict[Any, float]" = OrderedDict()
+        self._path: Optional[Path] = None
+        self._version = 0
+        self.stats = {
+            "hits": 0, "misses": 0, "negative_hits": 0,
+            "evictions": 0, "invalidations": 0, "mismatches": 0,
+        }
+
+    def _usable(self) -> bool:
+        if _active_scope() is not None:
+            return False
+        if self._path != DB_PATH:
+            self.clear()
+            self._path = DB_PATH
+        return True
+
+    def version(self) -> int:
+        return self._version
+
+    def get(self, key: int) -> Optional[Any]:
+        if not self._usable():
+            return None
+        record = self._by_id.get(key)
+        if record is None:
+            self.stats["misses"] += 1
+            return None
+        self._by_id.move_to_end(key)
+        self.stats["hits"] += 1
+        return record.copy()
+
+    def find(self, alt: Any) -> Optional[Any]:
+        if not self._usable():
+            return None
+        key = self._by_alt.get(alt)
+        if key is None:
+            self.stats["misses"] += 1
+            return None
+        return self.get(key)
+
+    def is_missing(self, alt: Any) -> bool:
+        """True if `alt` is negatively cached (looked up recently and not found)."""
+        if not self._usable():
+            return False
+        expires = self._missing.get(alt)
+        if expires is None:
+            return False
+        if expires <= time.monotonic():
+            del self._missing[alt]
+            return False
+        self.stats["negative_hits"] += 1
+        return True
+
+    def put_missing(self, alt: Any, version: int) -> None:
+        if not self.negative_ttl or version != self._version or not self._usable():
+            return
+        self._missing[alt] = time.monotonic() + self.negative_ttl
+        self._missing.move_to_end(alt)
+        while len(self._missing) > self.size:
+            self._missing.popitem(last=False)
+
+    def put(self, record: Any, version: int) -> None:
+        """Cache a row fetched while `version` was current (ignored if a write landed since)."""
+        if record is None or version != self._version or not self._usable():
+            return
+        key = record["id"]
+        self._drop(key)
+        self._by_id[key] = record.copy()
+        self._by_alt[self.alt_key(record)] = key
+        self._missing.pop(self.alt_key(record), None)
+        while len(self._by_id) > self.size:
+            old_key = next(iter(self._by_id))
+            self._drop(old_key)
+            self.stats["evictions"] += 1
+
+    def _drop(self, key: int) -> None:
+        record = self._by_id.pop(key, None)
+        if record is not None and self._by_alt.get(self.alt_key(record)) == key:
+            del self._by_alt[self.alt_key(record)]
+
+    def invalidate(self, key: Optional[int] = None, alt: Any = None) -> None:
+        self._version += 1
+        self.stats["invalidations"] += 1
+        if key is not None:
+            self._drop(key)
+        if alt is not None:
+            self._missing.pop(alt, None)
+            if alt in self._by_alt:
+                self._drop(self._by_alt.pop(alt))
+
+    def clear(self) -> None:
+        self._version += 1
+        self._by_id.clear()
+        self._by_alt.clear()
+        self._missing.clear()
+
+    async def check(self, key: int, record: Any) -> None:
+        """Self-check: a hit must equal what the database returns right now."""
+        fresh = (await _select_by_ids(self.table, [key])).get(key)
+        if fresh is None or dict(fresh) != dict(record):
+            self.stats["mismatches"] += 1
+            raise AssertionError(f"[DB] {self.table} cache is stale for id {key}: {dict(record)} != {fresh and dict(fresh)}")
+
+    async def verify(self) -> List[int]:
+        """Ids whose cached row differs from the database."""
+        cached = list(self._by_id.items())
+        fresh = await _select_by_ids(self.table, [key for key, _ in cached])
+        return [key for key, record in cached if key not in fresh or dict(fresh[key]) != dict(record)]
+
+    def get_stats(self) -> Dict[str, Any]:
+        hits = self.stats["hits"] + self.stats["negative_hits"]
+        lookups = hits + self.stats["misses"]
+        return {
+            **self.stats,
+            "size": len(self._by_id),
+            "negative_size": len(self._missing),
+            "max_size": self.size,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+def _fold(name: Any) -> Any:
+    return name.casefold() if isinstance(name, str) else name
+
+
+_clan_cache = _EntityCache("clans", config.DB_CLAN_CACHE_SIZE, lambda clan: _fold(clan["name"]))
+_user_cache = _EntityCache(
+    "users", config.DB_USER_CACHE_SIZE, lambda user: str(user["discord_id"]),
+    negative_ttl=config.DB_USER_NEGATIVE_TTL_SECONDS,
+)
+_clan_cache.self_check = _user_cache.self_check = config.DB_CACHE_SELF_CHECK
+
+
+def invalidate_clan(clan_id: Optional[int] = None, name: Optional[str] = None) -> None:
+    """
+    Drop a clan from the entity cache once the current write commits.
+    Call it next to any raw `UPDATE/DELETE clans` (after conn.commit() when using
+    get_connection() outside transaction()); the helpers in this module already do.
+    """
+    _after_commit(lambda: _clan_cache.invalidate(clan_id, _fold(name)))
+    _data_changed("clans")
+    invalidate_tags("clans", *([] if clan_id is None else [f"clan:{clan_id}"]))
+
+
+def invalidate_user(user_id: Optional[int] = None, discord_id: Optional[str] = None) -> None:
+    """Same as invalidate_clan() for the user identity cache (by id and/or discord_id)."""
+    _after_commit(lambda: _user_cache.invalidate(user_id, None if discord_id is None else str(discord_id)))
+    _data_changed("members")  # Member lists show riot_id
+    invalidate_tags("users", *([] if user_id is None else [f"user:{user_id}"]))
+
+
+def set_cache_self_check(enabled: bool) -> None:
+    """Compare every in-memory cache / index hit against the database (tests / debugging)."""
+    _clan_cache.self_check = _user_cache.self_check = _memberships.self_check = enabled
+    _sanctions.self_check = _cooldowns.self_check = enabled
+    _memo_state["self_check"] = enabled
+
+
+async def verify_clan_cache() -> List[int]:
+    """Consistency check: ids whose cached clan differs from the database."""
+    return await _clan_cache.verify()
+
+
+async def verify_user_cache() -> List[int]:
+    """Consistency check: ids whose cached user differs from the database."""
+    return await _user_cache.verify()
+
+
+def get_clan_cache_stats() -> Dict[str, Any]:
+    """Clan cache metrics: hits, misses, evictions, invalidations, size, hit_rate."""
+    return _clan_cache.get_stats()
+
+
+def get_user_cache_stats() -> Dict[str, Any]:
+    """User identity cache metrics (same keys as get_clan_cache_stats() + negative_hits)."""
+    return _user_cache.get_stats()
+
+
+async def _checked(cache: _EntityCache, record: Optional[Any]) -> Optional[Any]:
+    if record is not None and cache.self_check:
+        await cache.check(record["id"], record)
+    return record
+
+
+async def _cached_by_id(cache: _EntityCache, loader: _BatchLoader, key: Any) -> Optional[Any]:
+    """Cache hit, else the DataLoader (then cache the row)."""
+    try:
+        key = int(key)
+    except (TypeError, ValueError):
+        return None
+    cached = cache.get(key)
+    if cached is not None:
+        return await _checked(cache, cached)
+    version = cache.version()
+    record = await _load_by_id(loader, key)
+    cache.put(record, version)
+    return record
+
+
+async def _cached_by_ids(cache: _EntityCache, ids: List[Any]) -> Dict[int, Any]:
+    """Cache hits plus one bulk query for the rest. Returns {id: row} (missing ids omitted)."""
+    result: Dict[int, Any] = {}
+    missing = []
+    for key in dict.fromkeys(k for k in ids if k is not None):
+        cached = cache.get(key)
+        if cached is not None:
+            result[key] = await _checked(cache, cached)
         else:
-            print(f"  ✓ Schema up to date ({len(all_tables)} tables)")
+            missing.append(key)
+    if missing:
+        version = cache.version()
+        fetched = await _select_by_ids(cache.table, missing)
+        for record in fetched.values():
+            cache.put(record, version)
+        result.update(fetched)
+    return result
 
-        # --- Automatic Migrations for Existing Tables ---
-        
-        # Check for cancel_requested_by_clan_id in matches
-        cursor = await conn.execute("PRAGMA table_info(matches)")
-        match_columns = [row[1] for row in await cursor.fetchall()]
-        if "cancel_requested_by_clan_id" not in match_columns:
-            print("[DB] Migrating: Adding 'cancel_requested_by_clan_id' to 'matches' table...")
-            await conn.execute("ALTER TABLE matches ADD COLUMN cancel_requested_by_clan_id INTEGER")
-            await conn.commit()
-            print("  ✓ Column added.")
-        
-        # Check for score_a, score_b in matches
-        if "score_a" not in match_columns:
-            print("[DB] Migrating: Adding 'score_a' to 'matches' table...")
-            await conn.execute("ALTER TABLE matches ADD COLUMN score_a INTEGER")
-            await conn.commit()
-            print("  ✓ Column added.")
-        if "score_b" not in match_columns:
-            print("[DB] Migrating: Adding 'score_b' to 'matches' table...")
-            await conn.execute("ALTER TABLE matches ADD COLUMN score_b INTEGER")
-            await conn.commit()
-            print("  ✓ Column added.")
 
-        # Check for winner_clan_id in matches
-        if "winner_clan_id" not in match_columns:
-            print("[DB] Migrating: Adding 'winner_clan_id' to 'matches' table...")
-            await conn.execute("ALTER TABLE matches ADD COLUMN winner_clan_id INTEGER")
-            await conn.commit()
-            print("  ✓ Column added.")
-
-        # Check for note in loans
-        cursor = await conn.execute("PRAGMA table_info(loans)")
-        loan_columns = [row[1] for row in await cursor.fetchall()]
-        if "note" not in loan_columns:
-            print("[DB] Migrating: Adding 'note' to 'loans' table...")
-            await conn.execute("ALTER TABLE loans ADD COLUMN note TEXT")
-            await conn.commit()
-            print("  ✓ Column added.")
+class _MembershipIndex:
+    """
+    In-memory copy of the hot clan_members columns, in both directions:
+    user_id -> {clan_id: {"role", "join_type", "tryout_expires_at"}} and clan_id -> {user_id}.
+
+    Loaded with one query per database file. Member helpers write through once
+    their write commits (see _after_commit); raw SQL on clan_members marks the
+    user / clan dirty through invalidate_members(), and the next lookup reloads
+    just those rows. A version counter discards loads that raced a write.
+    Lookups inside transaction() return None so callers read the scope connection.
+    """
 
+    FIELDS = ("role", "join_type", "tryout_expires_at")
+
+    def __init__(self):
+        self.self_check = False
+        self._by_user: Dict[int, Dict[int, Dict[str, Any]]] = {}
+        self._by_clan: Dict[int, Set[int]] = {}
+        self._dirty_users: Set[int] = set()
+        self._dirty_clans: Set[int] = set()
+        self._path: Optional[Path] = None
+        self._version = 0
+        self.stats = {"hits": 0, "loads": 0, "refreshes": 0, "writes": 0, "fallbacks": 0, "mismatches": 0}
+
+    def _reset(self) -> None:
+        self._version += 1
+        self._path = None
+        self._by_user.clear()
+        self._by_clan.clear()
+        self._dirty_users.clear()
+        self._dirty_clans.clear()
+
+    def _add(self, user_id: int, clan_id: int, fields: Dict[str, Any]) -> None:
+        self._by_user.setdefault(user_id, {})[clan_id] = fields
+        self._by_clan.setdefault(clan_id, set()).add(user_id)
+
+    def _discard(self, user_id: int, clan_id: int) -> None:
+        memberships = self._by_user.get(user_id)
+        if memberships is not None:
+            memberships.pop(clan_id, None)
+            if not memberships:
+                del self._by_user[user_id]
+        members = self._by_clan.get(clan_id)
+        if members is not None:
+            members.discard(user_id)
+            if not members:
+                del self._by_clan[clan_id]
+
+    async def _fetch(self, where: str = "", params: Tuple = ()) -> List[Any]:
+        async with get_read_connection() as conn:
+            cursor = await conn.execute(
+                f"SELECT user_id, clan_id, {', '.join(self.FIELDS)} FROM clan_members {where} ORDER BY id",
+                params
+            )
+            return await cursor.fetchall()
 
-        # Check for system_settings table (created via schema, but good to check if we need to seed)
-        # No seed needed for now.
+    async def _sync(self) -> bool:
+        """Load / refresh dirty rows. False if the index cannot answer right now."""
+        if _active_scope() is not None:
+            return False
+        if self._path != DB_PATH:
+            self._reset()
+            version = self._version
+            rows = await self._fetch()
+            if version != self._version:
+                return False
+            for row in rows:
+                self._add(row["user_id"], row["clan_id"], {f: row[f] for f in self.FIELDS})
+            self._path = DB_PATH
+            self.stats["loads"] += 1
+        if self._dirty_users or self._dirty_clans:
+            users, clans = set(self._dirty_users), set(self._dirty_clans)
+            version = self._version
+            conditions, params = [], []
+            if users:
+                conditions.append(f"user_id IN ({','.join('?' * len(users))})")
+                params.extend(users)
+            if clans:
+                conditions.append(f"clan_id IN ({','.join('?' * len(clans))})")
+                params.extend(clans)
+            rows = await self._fetch(f"WHERE {' OR '.join(conditions)}", tuple(params))
+            if version != self._version:
+                return False
+            for user_id in users:
+                for clan_id in list(self._by_user.get(user_id, ())):
+                    self._discard(user_id, clan_id)
+            for clan_id in clans:
+                for user_id in list(self._by_clan.get(clan_id, ())):
+                    self._discard(user_id, clan_id)
+            for row in rows:
+                self._add(row["user_id"], row["clan_id"], {f: row[f] for f in self.FIELDS})
+            self._dirty_users -= users
+            self._dirty_clans -= clans
+            self.stats["refreshes"] += 1
+        return True
+
+    async def of_user(self, user_id: int) -> Optional[Dict[int, Dict[str, Any]]]:
+        """{clan_id: membership} for a user (copies), or None if the caller must query."""
+        if not await self._sync():
+            self.stats["fallbacks"] += 1
+            return None
+        self.stats["hits"] += 1
+        return {clan_id: dict(fields) for clan_id, fields in self._by_user.get(user_id, {}).items()}
+
+    async def of_clan(self, clan_id: int) -> Optional[Set[int]]:
+        """Member user_ids of a clan (a copy), or None if the caller must query."""
+        if not await self._sync():
+            self.stats["fallbacks"] += 1
+            return None
+        self.stats["hits"] += 1
+        return set(self._by_clan.get(clan_id, ()))
+
+    # Write-through (called after commit)
+    def put(self, user_id: int, clan_id: int, **fields: Any) -> None:
+        """Insert a membership, or update the given fields of an existing one."""
+        self._version += 1
+        self.stats["writes"] += 1
+        existing = self._by_user.get(user_id, {}).get(clan_id)
+        if existing is not None:
+            existing.update(fields)
+        elif set(fields) == set(self.FIELDS):
+            self._add(user_id, clan_id, dict(fields))
+        else:
+            self._dirty_users.add(user_id)  # partial update of a row we do not hold
 
-        # Check for Veto columns in matches
-        if "match_format" not in match_columns:
-            print("[DB] Migrating: Adding 'match_format' to 'matches' table...")
-            await conn.execute("ALTER TABLE matches ADD COLUMN match_format TEXT")
-            await conn.commit()
-            print("  ✓ Column added.")
-            
-        if "maps" not in match_columns:
-            print("[DB] Migrating: Adding 'maps' to 'matches' table...")
-            await conn.execute("ALTER TABLE matches ADD COLUMN maps TEXT")
-            await conn.commit()
-            print("  ✓ Column added.")
-            
-        if "veto_status" not in match_columns:
-            print("[DB] Migrating: Adding 'veto_status' to 'matches' table...")
-            await conn.execute("ALTER TABLE matches ADD COLUMN veto_status TEXT")
-            await conn.commit()
-            print("  ✓ Column added.")
+    def remove(self, user_id: int, clan_id: int) -> None:
+        self._version += 1
+        self.stats["writes"] += 1
+        self._discard(user_id, clan_id)
 
-        # Check for Try-out columns in clan_members
-        cursor = await conn.execute("PRAGMA table_info(clan_members)")
-        member_columns = [row[1] for row in await cursor.fetchall()]
-        
-        if "join_type" not in member_columns:
-            print("[DB] Migrating: Adding 'join_type' to 'clan_members' table...")
-            await conn.execute("ALTER TABLE clan_members ADD COLUMN join_type TEXT DEFAULT 'full'")
-            await conn.commit()
-            print("  ✓ Column added.")
-            
-        if "tryout_expires_at" not in member_columns:
-            print("[DB] Migrating: Adding 'tryout_expires_at' to 'clan_members' table...")
-            await conn.execute("ALTER TABLE clan_members ADD COLUMN tryout_expires_at TEXT DEFAULT NULL")
-            await conn.commit()
-            print("  ✓ Column added.")
+    def invalidate(self, user_id: Optional[int] = None, clan_id: Optional[int] = None) -> None:
+        self._version += 1
+        if user_id is not None:
+            self._dirty_users.add(user_id)
+        if clan_id is not None:
+            self._dirty_clans.add(clan_id)
 
-        # Check for invite_type in invite_requests
-        cursor = await conn.execute("PRAGMA table_info(invite_requests)")
-        invite_columns = [row[1] for row in await cursor.fetchall()]
-        
-        if "invite_type" not in invite_columns:
-            print("[DB] Migrating: Adding 'invite_type' to 'invite_requests' table...")
-            await conn.execute("ALTER TABLE invite_requests ADD COLUMN invite_type TEXT DEFAULT 'full'")
-            await conn.commit()
-            print("  ✓ Column added.")
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "users": len(self._by_user), "clans": len(self._by_clan)}
 
-        # Ensure lfg_posts table exists (handled by executescript but for clarity)
-        if "lfg_posts" not in all_tables:
-             print("[DB] Initializing 'lfg_posts' table...")
 
-        # --- Balance System Migrations ---
+_memberships = _MembershipIndex()
+_memberships.self_check = config.DB_CACHE_SELF_CHECK
 
-        # Rank Declaration columns in clan_members (Feature 6)
-        # Re-read member_columns in case it changed
-        cursor = await conn.execute("PRAGMA table_info(clan_members)")
-        member_columns = [row[1] for row in await cursor.fetchall()]
 
-        if "valorant_rank" not in member_columns:
-            print("[DB] Migrating: Adding 'valorant_rank' to 'clan_members' table...")
-            await conn.execute("ALTER TABLE clan_members ADD COLUMN valorant_rank TEXT")
-            await conn.commit()
-            print("  ✓ Column added.")
+def invalidate_members(clan_id: Optional[int] = None, user_id: Optional[int] = None) -> None:
+    """
+    Reload a clan's and/or a user's memberships once the current write commits.
+    Call it next to any raw `INSERT/UPDATE/DELETE clan_members`; the member helpers
+    in this module already keep the index up to date.
+    """
+    _after_commit(lambda: _memberships.invalidate(user_id, clan_id))
+    _data_changed("members")
+    tags = ["members" if clan_id is None else f"members:{clan_id}"]  # Without a clan: every member list
+    if user_id is not None:
+        tags.append(f"user:{user_id}")
+    invalidate_tags(*tags)
 
-        if "valorant_rank_score" not in member_columns:
-            print("[DB] Migrating: Adding 'valorant_rank_score' to 'clan_members' table...")
-            await conn.execute("ALTER TABLE clan_members ADD COLUMN valorant_rank_score INTEGER")
-            await conn.commit()
-            print("  ✓ Column added.")
 
-        # Roster columns in matches (Feature 9)
-        # Re-read match_columns
-        cursor = await conn.execute("PRAGMA table_info(matches)")
-        match_columns = [row[1] for row in await cursor.fetchall()]
+def _member_added(user_id: int, clan_id: int, role: str, join_type: str = "full", tryout_expires_at: Optional[str] = None) -> None:
+    _after_commit(lambda: _memberships.put(
+        user_id, clan_id, role=role, join_type=join_type, tryout_expires_at=tryout_expires_at
+    ))
+    _data_changed("members")
+    invalidate_tags(f"members:{clan_id}", f"user:{user_id}")
 
-        if "roster_a" not in match_columns:
-            print("[DB] Migrating: Adding 'roster_a' to 'matches' table...")
-            await conn.execute("ALTER TABLE matches ADD COLUMN roster_a TEXT")
-            await conn.commit()
-            print("  ✓ Column added.")
 
-        if "roster_b" not in match_columns:
-            print("[DB] Migrating: Adding 'roster_b' to 'matches' table...")
-            await conn.execute("ALTER TABLE matches ADD COLUMN roster_b TEXT")
-            await conn.commit()
-            print("  ✓ Column added.")
+def _member_updated(user_id: int, clan_id: int, **fields: Any) -> None:
+    _after_commit(lambda: _memberships.put(user_id, clan_id, **fields))
+    _data_changed("members")
+    invalidate_tags(f"members:{clan_id}", f"user:{user_id}")
 
-        if "avg_rank_a" not in match_columns:
-            print("[DB] Migrating: Adding 'avg_rank_a' to 'matches' table...")
-            await conn.execute("ALTER TABLE matches ADD COLUMN avg_rank_a REAL")
-            await conn.commit()
-            print("  ✓ Column added.")
 
-        if "avg_rank_b" not in match_columns:
-            print("[DB] Migrating: Adding 'avg_rank_b' to 'matches' table...")
-            await conn.execute("ALTER TABLE matches ADD COLUMN avg_rank_b REAL")
-            await conn.commit()
-            print("  ✓ Column added.")
+def _member_removed(user_id: int, clan_id: int) -> None:
+    _after_commit(lambda: _memberships.remove(user_id, clan_id))
+    _data_changed("members")
+    invalidate_tags(f"members:{clan_id}", f"user:{user_id}")
+
+
+def get_membership_stats() -> Dict[str, Any]:
+    """Membership index metrics: hits, loads, refreshes, writes, fallbacks, size."""
+    return _memberships.get_stats()
+
+
+# =============================================================================
+# TAG MEMOIZATION (@cached read helpers)
+# =============================================================================
 
+class _Memo:
+    """
+    Bounded LRU of one @cached helper's results, keyed by its bound arguments.
+
+    Each entry carries the tags it was stored under (the decorator's templates
+    formatted with the call's arguments, e.g. "members:{clan_id}" -> "members:7").
+    Entries expire after `ttl` seconds, are evicted least-recently-used past
+    `size`, and are dropped when one of their tags is invalidated.
+    """
+
+    def __init__(self, fn: Callable[..., Awaitable[Any]], ttl: float, tags: Tuple[str, ...], size: int):
+        self.fn = fn
+        self.signature = inspect.signature(fn)
+        self.ttl = ttl
+        self.tags = tags
+        self.size = size
+        self.entries: "OrderedDict[Tuple[Any, ...], Tuple[float, Any, Tuple[str, ...]]]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0, "invalidations": 0, "mismatches": 0}
+
+    def bind(self, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Tuple[Tuple[Any, ...], Tuple[str, ...]]:
+        bound = self.signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = tuple(bound.arguments.values())
+        return key, tuple(tag.format(**bound.arguments) for tag in self.tags)
+
+    def get(self, key: Tuple[Any, ...]) -> Tuple[bool, Any]:
+        entry = self.entries.get(key)
+        if entry is None:
+            self.stats["misses"] += 1
+            return False, None
+        if entry[0] <= time.monotonic():
+            self.stats["expired"] += 1
+            self.stats["misses"] += 1
+            self.drop(key)
+            return False, None
+        self.entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return True, entry[1]
+
+    def put(self, key: Tuple[Any, ...], value: Any, tags: Tuple[str, ...]) -> None:
+        self.drop(key)
+        self.entries[key] = (time.monotonic() + self.ttl, value, tags)
+        for tag in tags:
+            _memo_tags.setdefault(tag, set()).add((self, key))
+        while len(self.entries) > self.size:
+            self.drop(next(iter(self.entries)))
+            self.stats["evictions"] += 1
+
+    def drop(self, key: Tuple[Any, ...]) -> None:
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            holders = _memo_tags.get(tag)
+            if holders is not None:
+                holders.discard((self, key))
+                if not holders:
+                    del _memo_tags[tag]
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "size": len(self.entries),
+            "max_size": self.size,
+            "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+        }
+
+
+_memos: Dict[str, _Memo] = {}
+_memo_tags: Dict[str, Set[Tuple[_Memo, Tuple[Any, ...]]]] = {}
+_memo_state: Dict[str, Any] = {"epoch": 0, "path": None, "self_check": config.DB_CACHE_SELF_CHECK}
+
+
+def _memo_usable() -> bool:
+    if _active_scope() is not None:
+        return False  # Reads in transaction() must see the scope's own writes
+    if _memo_state["path"] != DB_PATH:
+        for memo in _memos.values():
+            memo.entries.clear()
+        _memo_tags.clear()
+        _memo_state["path"] = DB_PATH
+    return True
+
+
+def _copy_result(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_copy_result(item) for item in value]
+    if isinstance(value, (Record, dict)):
+        return value.copy()
+    return value
+
+
+def cached(ttl: float = config.DB_MEMO_TTL_SECONDS, tags: Iterable[str] = (), size: int = config.DB_MEMO_SIZE):
+    """
+    Memoize an async read helper (arguments must be hashable).
+
+    `tags` are str.format templates over the helper's parameters; a committed write
+    calling invalidate_tags() (the invalidate_* helpers and write helpers here do)
+    drops every entry stored under one of them. `ttl` is a safety net for writes
+    that bypass the helpers. Callers get a copy, like a fresh query. A fill that
+    raced an invalidation is not stored; calls inside transaction() bypass the cache.
+    """
+    def decorate(fn: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        memo = _memos[fn.__name__] = _Memo(fn, ttl, tuple(tags), size)
+
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _memo_usable():
+                return await fn(*args, **kwargs)
+            key, entry_tags = memo.bind(args, kwargs)
+            hit, value = memo.get(key)
+            if hit:
+                if _memo_state["self_check"]:
+                    fresh = await fn(*args, **kwargs)
+                    if fresh != value:
+                        memo.stats["mismatches"] += 1
+                        raise AssertionError(f"[DB] @cached {fn.__name__}{key} is stale: {value!r} != {fresh!r}")
+                return _copy_result(value)
+            epoch = _memo_state["epoch"]
+            value = await fn(*args, **kwargs)
+            if epoch == _memo_state["epoch"] and _memo_usable():
+                memo.put(key, _copy_result(value), entry_tags)
+            return value
+
+        wrapper.memo = memo
+        return wrapper
+    return decorate
+
+
+def _drop_tags(tags: Iterable[str]) -> None:
+    _memo_state["epoch"] += 1
+    for tag in tags:
+        for memo, key in list(_memo_tags.get(tag, ())):
+            memo.drop(key)
+            memo.stats["invalidations"] += 1
+
+
+def invalidate_tags(*tags: str) -> None:
+    """
+    Drop @cached results stored under any of `tags` ("clan:5", "match:12", ...)
+    once the current write commits. The invalidate_* helpers fire the standard
+    tags; call this directly only for tags of your own.
+    """
+    _after_commit(lambda: _drop_tags(tags))
+
+
+def get_memo_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-function @cached metrics: hits, misses, evictions, expired, invalidations, size, hit_rate."""
+    return {name: memo.get_stats() for name, memo in _memos.items()}
+
+
+# =============================================================================
+# SCHEMA MIGRATIONS (PRAGMA user_version)
+# =============================================================================
+# Every schema change is a new numbered migration appended at the end of this
+# registry. init_db() reads `PRAGMA user_version` and only runs migrations with a
+# higher number, then bumps the version — an up-to-date database costs ONE pragma.
+# Migrations must stay idempotent: a legacy database (user_version = 0) replays
+# all of them, including columns it may already have.
+
+_MIGRATIONS: List[Dict[str, Any]] = []
+
+
+def _migration(version: int, name: str):
+    """Register `fn(conn)` as schema migration `version` (must be the next number)."""
+    def register(fn: Callable[[Any], Awaitable[None]]):
+        expected = len(_MIGRATIONS) + 1
+        if version != expected:
+            raise ValueError(f"Migration {name!r} has version {version}, expected {expected}")
+        _MIGRATIONS.append({"version": version, "name": name, "apply": fn})
+        return fn
+    return register
+
+
+async def _add_columns(conn, table: str, columns: List[Tuple[str, str]]) -> None:
+    """ALTER TABLE ADD COLUMN for every (name, definition) the table does not have yet."""
+    cursor = await conn.execute(f"PRAGMA table_info({table})")
+    existing = {row[1] for row in await cursor.fetchall()}
+    for column, definition in columns:
+        if column not in existing:
+            print(f"[DB] Migrating: Adding '{column}' to '{table}' table...")
+            await conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+@_migration(1, "baseline schema.sql")
+async def _migrate_baseline(conn) -> None:
+    # executescript() commits on its own; schema.sql is all IF NOT EXISTS, so a rerun is harmless
+    await conn.executescript(SCHEMA_PATH.read_text(encoding="utf-8"))
+
+
+@_migration(2, "match cancel request, scores and winner")
+async def _migrate_match_scores(conn) -> None:
+    # Folds in migrate_db.py + scripts/migration_v5_scores.py
+    await _add_columns(conn, "matches", [
+        ("cancel_requested_by_clan_id", "INTEGER"),
+        ("score_a", "INTEGER"),
+        ("score_b", "INTEGER"),
+        ("winner_clan_id", "INTEGER"),
+    ])
+
+
+@_migration(3, "loan note")
+async def _migrate_loan_note(conn) -> None:
+    await _add_columns(conn, "loans", [("note", "TEXT")])
+
+
+@_migration(4, "match veto columns")
+async def _migrate_match_veto(conn) -> None:
+    await _add_columns(conn, "matches", [
+        ("match_format", "TEXT"),
+        ("maps", "TEXT"),
+        ("veto_status", "TEXT"),
+    ])
+
+
+@_migration(5, "try-out membership")
+async def _migrate_tryout(conn) -> None:
+    # Folds in scripts/migrate_tryout.py + scripts/migrate_invite_type.py
+    await _add_columns(conn, "clan_members", [
+        ("join_type", "TEXT DEFAULT 'full'"),
+        ("tryout_expires_at", "TEXT DEFAULT NULL"),
+    ])
+    await _add_columns(conn, "invite_requests", [("invite_type", "TEXT DEFAULT 'full'")])
+
+
+@_migration(6, "rank declaration")
+async def _migrate_rank_declaration(conn) -> None:
+    await _add_columns(conn, "clan_members", [
+        ("valorant_rank", "TEXT"),
+        ("valorant_rank_score", "INTEGER"),
+    ])
+
+
+@_migration(7, "match rosters")
+async def _migrate_match_rosters(conn) -> None:
+    await _add_columns(conn, "matches", [
+        ("roster_a", "TEXT"),
+        ("roster_b", "TEXT"),
+        ("avg_rank_a", "REAL"),
+        ("avg_rank_b", "REAL"),
+    ])
+
+
+@_migration(8, "legacy users.cooldown_until -> cooldowns")
+async def _migrate_legacy_cooldowns(conn) -> None:
+    # Folds in scripts/migrate_cooldowns.py: still-running legacy cooldowns become
+    # join_leave rows in `cooldowns`, expired ones are simply cleared.
+    cursor = await conn.execute(
+        "SELECT id, cooldown_until FROM users WHERE cooldown_until IS NOT NULL"
+    )
+    now = datetime.now(timezone.utc)
+    for row in await cursor.fetchall():
+        try:
+            until_dt = datetime.fromisoformat(row["cooldown_until"].replace("Z", "+00:00"))
+        except (TypeError, ValueError):
+            continue
+        if until_dt.tzinfo is None:
+            until_dt = until_dt.replace(tzinfo=timezone.utc)
+        if until_dt > now:
+            await conn.execute(
+                """INSERT INTO cooldowns (target_type, target_id, kind, until, reason)
+                   VALUES ('user', ?, 'join_leave', ?, 'Migrated from legacy system')
+                   ON CONFLICT(target_type, target_id, kind)
+                   DO UPDATE SET until = excluded.until, updated_at = datetime('now')""",
+                (row["id"], until_dt.isoformat())
+            )
+    await conn.execute("UPDATE users SET cooldown_until = NULL WHERE cooldown_until IS NOT NULL")
+    _cooldowns.invalidate()
+
+
+# Composite indexes justified by scripts/index_advisor.py (EXPLAIN QUERY PLAN over the
+# replayed workload). Kept as data so the advisor can drop/recreate them for timings.
+ADVISED_INDEXES: Dict[int, List[Tuple[str, str]]] = {
+    9: [
+        # elo.count_elo_matches_between_clans (anti-farming check on every confirm)
+        ("idx_matches_pair_elo", "matches(clan_a_id, clan_b_id, elo_applied, created_at)"),
+        # get_won_matches_by_clan (Elo rollback picker): expression must match the WHERE clause
+        ("idx_matches_winner_created",
+         "matches(COALESCE(winner_clan_id, resolved_winner_clan_id, reported_winner_clan_id), created_at)"),
+        # get_clans_for_decay / get_clan_activity_count: status + created_at window
+        ("idx_matches_status_created", "matches(status, created_at)"),
+        # get_clan_elo_history: no temp B-tree for ORDER BY created_at DESC LIMIT
+        ("idx_elo_history_clan_created", "elo_history(clan_id, created_at)"),
+        # count_recent_recruits (recruit cap)
+        ("idx_invite_requests_recruits", "invite_requests(clan_id, status, responded_at)"),
+    ],
+    10: [
+        # Same workloads as version 9, now filtering on the epoch columns
+        ("idx_matches_pair_elo_ts", "matches(clan_a_id, clan_b_id, elo_applied, created_ts)"),
+        ("idx_matches_status_created_ts", "matches(status, created_ts)"),
+        ("idx_invite_requests_recruits_ts", "invite_requests(clan_id, status, responded_ts)"),
+        # Expiry sweeps (pop_expired_cooldowns, get_expired_tryouts, main.py background tasks)
+        ("idx_cooldowns_until_ts", "cooldowns(until_ts)"),
+        ("idx_clan_members_tryout_ts", "clan_members(tryout_expires_ts)"),
+        ("idx_create_requests_expiry_ts", "create_requests(status, expires_ts)"),
+        ("idx_loans_status_created_ts", "loans(status, created_ts)"),
+        ("idx_loans_status_end_ts", "loans(status, end_ts)"),
+        ("idx_transfers_status_created_ts", "transfers(status, created_ts)"),
+        # Weekly highlight winner
+        ("idx_highlights_status_created_ts", "highlights(status, created_ts)"),
+    ],
+}
+
+# Advised indexes made redundant by a later version (dropped by that migration).
+RETIRED_INDEXES: Dict[int, List[str]] = {
+    10: ["idx_matches_pair_elo", "idx_matches_status_created", "idx_invite_requests_recruits"],
+}
+
+
+@_migration(9, "workload composite indexes")
+async def _migrate_advised_indexes(conn) -> None:
+    for name, target in ADVISED_INDEXES[9]:
+        await conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+
+
+# Time columns used in WHERE clauses get an INTEGER epoch twin (`<name>_ts`, UTC seconds).
+# The TEXT columns stay for display / ORDER BY; filters compare the twin against
+# epoch_now(), which is an index range scan whatever string format the row was
+# written with (Python isoformat() with 'T' + offset, or SQLite datetime('now')).
+EPOCH_COLUMNS: Dict[str, List[Tuple[str, str]]] = {
+    "cooldowns": [("until", "until_ts")],
+    "system_bans": [("expires_at", "expires_ts")],
+    "clan_members": [("tryout_expires_at", "tryout_expires_ts")],
+    "create_requests": [("expires_at", "expires_ts")],
+    "invite_requests": [("responded_at", "responded_ts")],
+    "matches": [("created_at", "created_ts")],
+    "loans": [("created_at", "created_ts"), ("end_at", "end_ts")],
+    "transfers": [("created_at", "created_ts")],
+    "highlights": [("created_at", "created_ts")],
+}
+
+
+def epoch_now(**offset) -> int:
+    """Current UTC time as epoch seconds, optionally shifted (`epoch_now(days=-7)`)."""
+    return int((datetime.now(timezone.utc) + timedelta(**offset)).timestamp())
+
+
+@_migration(10, "integer epoch time columns")
+async def _migrate_epoch_columns(conn) -> None:
+    for table, columns in EPOCH_COLUMNS.items():
+        await _add_columns(conn, table, [(ts, "INTEGER") for _, ts in columns])
+        for column, ts in columns:
+            # strftime('%s') understands both 'YYYY-MM-DD HH:MM:SS' and isoformat() with offsets
+            to_epoch = f"CAST(strftime('%s', NEW.{column}) AS INTEGER)"
+            await conn.execute(
+                f"UPDATE {table} SET {ts} = CAST(strftime('%s', {column}) AS INTEGER) WHERE {column} IS NOT NULL"
+            )
+            # Triggers keep the twin in sync for every writer, including raw SQL in cogs
+            await conn.execute(
+                f"""CREATE TRIGGER IF NOT EXISTS trg_{table}_{ts}_insert AFTER INSERT ON {table}
+                    BEGIN UPDATE {table} SET {ts} = {to_epoch} WHERE id = NEW.id; END"""
+            )
+            await conn.execute(
+                f"""CREATE TRIGGER IF NOT EXISTS trg_{table}_{ts}_update AFTER UPDATE OF {column} ON {table}
+                    BEGIN UPDATE {table} SET {ts} = {to_epoch} WHERE id = NEW.id; END"""
+            )
+    for name in RETIRED_INDEXES[10]:
+        await conn.execute(f"DROP INDEX IF EXISTS {name}")
+    for name, target in ADVISED_INDEXES[10]:
+        await conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+
+
+SCHEMA_VERSION = len(_MIGRATIONS)
+
+
+async def get_schema_version() -> int:
+    """Current `PRAGMA user_version` of the database."""
+    async with get_read_connection() as conn:
+        cursor = await conn.execute("PRAGMA user_version")
+        return (await cursor.fetchone())[0]
+
+
+async def init_db(dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Bring the database up to SCHEMA_VERSION.
+
+    Runs only the migrations newer than `PRAGMA user_version`, each in its own
+    transaction together with the version bump, and times them.
+    `dry_run=True` only reports what would run.
+    Returns {from_version, to_version, pending, applied: [{version, name, ms}]}.
+    """
+    async with get_connection() as conn:
+        cursor = await conn.execute("PRAGMA user_version")
+        current = (await cursor.fetchone())[0]
+        pending = [m for m in _MIGRATIONS if m["version"] > current]
+        report = {
+            "from_version": current,
+            "to_version": current,
+            "pending": [f"{m['version']:03d} {m['name']}" for m in pending],
+            "applied": [],
+        }
+
+        if not pending:
+            print(f"Database initialized at {DB_PATH}")
+            print(f"  ✓ Schema up to date (version {current})")
+            return report
+
+        if dry_run:
+            print(f"[DB] Dry run: {len(pending)} migration(s) pending on {DB_PATH} (version {current} -> {SCHEMA_VERSION})")
+            for line in report["pending"]:
+                print(f"  - {line}")
+            return report
+
+        print(f"Database initialized at {DB_PATH}")
+        for migration in pending:
+            started = time.monotonic()
+            try:
+                await conn.execute("BEGIN IMMEDIATE")
+                await migration["apply"](conn)
+                # PRAGMA user_version is transactional: the bump commits with the migration
+                await conn.execute(f"PRAGMA user_version = {migration['version']}")
+                await conn.commit()
+            except Exception as e:
+                await conn.rollback()
+                print(f"[DB] Migration {migration['version']:03d} '{migration['name']}' failed: {e}")
+                raise
+            elapsed_ms = round((time.monotonic() - started) * 1000, 2)
+            report["applied"].append(
+                {"version": migration["version"], "name": migration["name"], "ms": elapsed_ms}
+            )
+            report["to_version"] = migration["version"]
+            print(f"  ✓ Migration {migration['version']:03d} {migration['name']} ({elapsed_ms} ms)")
+
+        return report
 
 
 # =============================================================================
@@ -209,42 +1861,59 @@ async def init_db() -> None:
 # =============================================================================
 
 async def get_user(discord_id: str) -> Optional[Dict[str, Any]]:
-    """Get user by Discord ID."""
-    async with get_connection() as conn:
+    """
+    Get user by Discord ID. Served from the identity cache; Discord users that are
+    not registered are remembered for DB_USER_NEGATIVE_TTL_SECONDS (no query).
+    """
+    key = str(discord_id)
+    cached = _user_cache.find(key)
+    if cached is not None:
+        return await _checked(_user_cache, cached)
+    if _user_cache.is_missing(key):
+        return None
+
+    version = _user_cache.version()
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             "SELECT * FROM users WHERE discord_id = ?", (discord_id,)
         )
         row = await cursor.fetchone()
-        return dict(row) if row else None
+        user = _record(User, cursor, row)
+    if user is not None:
+        _user_cache.put(user, version)
+    else:
+        _user_cache.put_missing(key, version)
+    return user
 
 
 async def get_user_by_id(user_id: int) -> Optional[Dict[str, Any]]:
-    """Get user by internal ID."""
-    async with get_connection() as conn:
-        cursor = await conn.execute(
-            "SELECT * FROM users WHERE id = ?", (user_id,)
-        )
-        row = await cursor.fetchone()
-        return dict(row) if row else None
+    """Get user by internal ID. Served from the identity cache; concurrent misses in the same tick share one query."""
+    return await _cached_by_id(_user_cache, _user_loader, user_id)
+
+
+async def get_users_by_ids(user_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """Bulk get_user_by_id: cache hits plus one query for the rest. Returns {user_id: user} (missing ids omitted)."""
+    return await _cached_by_ids(_user_cache, list(user_ids))
 
 
 async def get_user_by_riot_id(riot_id: str) -> Optional[Dict[str, Any]]:
     """Get user by Valorant Riot ID."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             "SELECT * FROM users WHERE riot_id = ?", (riot_id,)
         )
         row = await cursor.fetchone()
-        return dict(row) if row else None
+        return _record(User, cursor, row)
 
 
 async def create_user(discord_id: str, riot_id: str) -> int:
     """Create a new user. Returns user ID."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         cursor = await conn.execute(
             "INSERT INTO users (discord_id, riot_id) VALUES (?, ?)",
             (discord_id, riot_id)
         )
+        invalidate_user(discord_id=discord_id)  # drops the "not registered" entry
         await conn.commit()
         return cursor.lastrowid
 
@@ -263,7 +1932,7 @@ async def update_user_cooldown(user_id: int, cooldown_until: Optional[str]) -> N
                 await set_cooldown("user", user_id, "join_leave", duration, "Updated via legacy API")
         except Exception:
             # Fallback for invalid formats
-            async with get_connection() as conn:
+            async with _write_connection() as conn:
                 await conn.execute(
                     """INSERT INTO cooldowns (target_type, target_id, kind, until, reason) 
                        VALUES ('user', ?, 'join_leave', ?, 'Legacy fallback') 
@@ -271,37 +1940,41 @@ async def update_user_cooldown(user_id: int, cooldown_until: Optional[str]) -> N
                        DO UPDATE SET until = excluded.until""", 
                     (user_id, cooldown_until)
                 )
+                await _publish_cooldown(conn, "user", user_id, "join_leave")
                 await conn.commit()
     else:
         await clear_cooldown("user", user_id, "join_leave")
 
     # Clear legacy column to avoid double-checks
     print(f"[DB] Clearing legacy cooldown_until for user {user_id} (Syncing with new system)")
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         await conn.execute(
             "UPDATE users SET cooldown_until = NULL, updated_at = datetime('now') WHERE id = ?",
             (user_id,)
         )
+        invalidate_user(user_id)
         await conn.commit()
 
 
 async def ban_user(user_id: int, reason: str) -> None:
     """Ban user from clan system."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         await conn.execute(
             "UPDATE users SET is_banned = 1, ban_reason = ?, updated_at = datetime('now') WHERE id = ?",
             (reason, user_id)
         )
+        invalidate_user(user_id)
         await conn.commit()
 
 
 async def unban_user(user_id: int) -> None:
     """Unban user from clan system."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         await conn.execute(
             "UPDATE users SET is_banned = 0, ban_reason = NULL, updated_at = datetime('now') WHERE id = ?",
             (user_id,)
         )
+        invalidate_user(user_id)
         await conn.commit()
 
 
@@ -320,7 +1993,7 @@ async def cleanup_user_on_leave(discord_id: str) -> Dict[str, Any]:
     user_id = user["id"]
     results = {"user_id": user_id, "actions": []}
 
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         await conn.execute("BEGIN")
         try:
             # 1. Handle Captaincy
@@ -348,10 +2021,12 @@ async def cleanup_user_on_leave(discord_id: str) -> Dict[str, Any]:
                         "UPDATE clan_members SET role = 'captain' WHERE clan_id = ? AND user_id = ?",
                         (clan_id, new_captain_id)
                     )
+                    _member_updated(new_captain_id, clan_id, role="captain")
                     await conn.execute(
                         "UPDATE clans SET captain_id = ?, updated_at = datetime('now') WHERE id = ?",
                         (new_captain_id, clan_id)
                     )
+                    invalidate_clan(clan_id)
                     results["actions"].append(f"Promoted user {new_captain_id} to captain of clan '{clan['name']}'")
                 else:
                     # No vice, set to inactive
@@ -359,10 +2034,12 @@ async def cleanup_user_on_leave(discord_id: str) -> Dict[str, Any]:
                         "UPDATE clans SET status = 'inactive', updated_at = datetime('now') WHERE id = ?",
                         (clan_id,)
                     )
+                    invalidate_clan(clan_id)
                     results["actions"].append(f"Set clan '{clan['name']}' to inactive (no vice found)")
 
             # 2. Cleanup memberships and requests
             await conn.execute("DELETE FROM clan_members WHERE user_id = ?", (user_id,))
+            invalidate_members(user_id=user_id)
             await conn.execute("DELETE FROM lfg_posts WHERE user_id = ?", (user_id,))
             
             # Cancel/Cleanup requests
@@ -409,6 +2086,7 @@ async def cleanup_user_on_leave(discord_id: str) -> Dict[str, Any]:
                 await conn.execute("DELETE FROM users WHERE id = ?", (user_id,))
                 results["actions"].append("Deleted user from database")
 
+            invalidate_user(user_id, discord_id)
             await conn.commit()
             results["success"] = True
             return results
@@ -421,40 +2099,48 @@ async def cleanup_user_on_leave(discord_id: str) -> Dict[str, Any]:
 # CLAN CRUD
 # =============================================================================
 
+async def _clan_by_name(name: str) -> Optional[Dict[str, Any]]:
+    # The cache index is case-folded, but `name = ?` in SQLite is case-sensitive:
+    # only an exact match counts as a hit.
+    cached = _clan_cache.find(_fold(name))
+    if cached is not None and cached["name"] == name:
+        return await _checked(_clan_cache, cached)
+
+    version = _clan_cache.version()
+    async with get_read_connection() as conn:
+        cursor = await conn.execute("SELECT * FROM clans WHERE name = ?", (name,))
+        row = await cursor.fetchone()
+        clan = _record(Clan, cursor, row)
+    _clan_cache.put(clan, version)
+    return clan
+
+
 async def get_clan(name: str) -> Optional[Dict[str, Any]]:
     """Get active or pending clan by name."""
-    async with get_connection() as conn:
-        cursor = await conn.execute(
-            "SELECT * FROM clans WHERE name = ? AND status NOT IN ('disbanded', 'cancelled', 'rejected')", 
-            (name,)
-        )
-        row = await cursor.fetchone()
-        return dict(row) if row else None
+    clan = await _clan_by_name(name)
+    if clan is None or clan["status"] in ("disbanded", "cancelled", "rejected"):
+        return None
+    return clan
 
 
 async def get_clan_any_status(name: str) -> Optional[Dict[str, Any]]:
     """Get clan by name regardless of status (for mod commands)."""
-    async with get_connection() as conn:
-        cursor = await conn.execute(
-            "SELECT * FROM clans WHERE name = ?", (name,)
-        )
-        row = await cursor.fetchone()
-        return dict(row) if row else None
+    return await _clan_by_name(name)
 
 
 async def get_clan_by_id(clan_id: int) -> Optional[Dict[str, Any]]:
-    """Get clan by ID."""
-    async with get_connection() as conn:
-        cursor = await conn.execute(
-            "SELECT * FROM clans WHERE id = ?", (clan_id,)
-        )
-        row = await cursor.fetchone()
-        return dict(row) if row else None
+    """Get clan by ID. Served from the clan cache; concurrent misses in the same tick share one query."""
+    return await _cached_by_id(_clan_cache, _clan_loader, clan_id)
+
+
+async def get_clans_by_ids(clan_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """Bulk get_clan_by_id: cache hits plus one query for the rest. Returns {clan_id: clan} (missing ids omitted)."""
+    return await _cached_by_ids(_clan_cache, list(clan_ids))
 
 
 async def create_clan(name: str, captain_id: int) -> int:
     """Create a new clan in waiting_accept status. Returns clan ID."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         # Check if a clan with this name already exists but is not active
         # (This handles cases where a previous creation failed or was cancelled)
         cursor = await conn.execute(
@@ -470,13 +2156,18 @@ async def create_clan(name: str, captain_id: int) -> int:
             await conn.execute("DELETE FROM create_requests WHERE clan_id = ?", (old_id,))
             await conn.execute("DELETE FROM invite_requests WHERE clan_id = ?", (old_id,))
             await conn.execute("DELETE FROM clan_flags WHERE clan_id = ?", (old_id,))
+            _sanctions_written()
             await conn.execute("DELETE FROM elo_history WHERE clan_id = ?", (old_id,))
             await conn.execute("DELETE FROM matches WHERE clan_a_id = ? OR clan_b_id = ?", (old_id, old_id))
+            invalidate_matches()
             await conn.execute("DELETE FROM loans WHERE lending_clan_id = ? OR borrowing_clan_id = ?", (old_id, old_id))
             await conn.execute("DELETE FROM transfers WHERE source_clan_id = ? OR dest_clan_id = ?", (old_id, old_id))
             await conn.execute("DELETE FROM cooldowns WHERE target_type = 'clan' AND target_id = ?", (old_id,))
+            _cooldowns_removed("clan", old_id)
             await conn.execute("DELETE FROM cases WHERE target_type = 'clan' AND target_id = ?", (old_id,))
             await conn.execute("DELETE FROM clans WHERE id = ?", (old_id,))
+            invalidate_clan(old_id)
+            invalidate_members(clan_id=old_id)
             
         # Now insert the new clan
         cursor = await conn.execute(
@@ -489,23 +2180,25 @@ async def create_clan(name: str, captain_id: int) -> int:
             "INSERT INTO clan_members (user_id, clan_id, role) VALUES (?, ?, 'captain')",
             (captain_id, clan_id)
         )
+        _member_added(captain_id, clan_id, "captain")
         await conn.commit()
         return clan_id
 
 
 async def update_clan_status(clan_id: int, status: str) -> None:
     """Update clan status."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         await conn.execute(
             "UPDATE clans SET status = ?, updated_at = datetime('now') WHERE id = ?",
             (status, clan_id)
         )
+        invalidate_clan(clan_id)
         await conn.commit()
 
 
 async def update_clan_elo(clan_id: int, new_elo: int, match_id: Optional[int], reason: str, changed_by: Optional[int] = None) -> None:
     """Update clan Elo and record history. Uses transaction."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         # Get current elo
         cursor = await conn.execute("SELECT elo FROM clans WHERE id = ?", (clan_id,))
         row = await cursor.fetchone()
@@ -519,6 +2212,7 @@ async def update_clan_elo(clan_id: int, new_elo: int, match_id: Optional[int], r
             "UPDATE clans SET elo = ?, updated_at = datetime('now') WHERE id = ?",
             (new_elo, clan_id)
         )
+        invalidate_clan(clan_id)
         
         # Record history
         await conn.execute(
@@ -529,58 +2223,80 @@ async def update_clan_elo(clan_id: int, new_elo: int, match_id: Optional[int], r
         await conn.commit()
 
 
-async def add_bonus_elo(clan_id: int, amount: int, reason: str) -> None:
-    """Add bonus Elo to a clan (e.g., for rewards). Wrapper around update_clan_elo."""
-    async with get_connection() as conn:
+async def adjust_clan_elo(
+    clan_id: int, delta: int, reason: str, match_id: Optional[int] = None,
+    changed_by: Optional[int] = None, floor: Optional[int] = None
+) -> Optional[Dict[str, int]]:
+    """
+    Move a clan's Elo by `delta` (clamped to `floor` if given) and record history.
+
+    The current Elo is read on the writer connection in the same job as the update,
+    so concurrent adjustments / match results on the same clan never overwrite each
+    other and elo_history.old_elo / new_elo always chain. Callers must not compute
+    an absolute value from an earlier read. A change that clamps to 0 writes nothing.
+    Returns {old_elo, new_elo, change}, or None if the clan does not exist.
+    """
+    async with _write_connection() as conn:
         cursor = await conn.execute("SELECT elo FROM clans WHERE id = ?", (clan_id,))
         row = await cursor.fetchone()
         if not row:
-            print(f"[DB] add_bonus_elo: Clan {clan_id} not found.")
-            return
-        
-        current_elo = row["elo"]
-        new_elo = current_elo + amount
-        
-        # Borrow update_clan_elo logic but simplified or call it directly if possible?
-        # Since update_clan_elo is async, we can call it.
-        # But we are inside a context manager here if we used one.
-        # Ideally, we should just reuse update_clan_elo but it opens its own connection.
-        # So we just close this cursor/conn and call the other function.
-        pass
-
-    # Call the main function to handle history and updates
-    await update_clan_elo(clan_id, new_elo, None, reason, changed_by=None)
+            return None
+        old_elo = row["elo"]
+        new_elo = old_elo + delta if floor is None else max(floor, old_elo + delta)
+        if new_elo != old_elo:
+            await conn.execute(
+                "UPDATE clans SET elo = ?, updated_at = datetime('now') WHERE id = ?",
+                (new_elo, clan_id)
+            )
+            await conn.execute(
+                """INSERT INTO elo_history (clan_id, match_id, old_elo, new_elo, change_amount, reason, changed_by)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (clan_id, match_id, old_elo, new_elo, new_elo - old_elo, reason, changed_by)
+            )
+            invalidate_clan(clan_id)
+        await conn.commit()
+    return {"old_elo": old_elo, "new_elo": new_elo, "change": new_elo - old_elo}
+
+
+async def add_bonus_elo(clan_id: int, amount: int, reason: str) -> None:
+    """Add bonus Elo to a clan (e.g., for rewards)."""
+    if await adjust_clan_elo(clan_id, amount, reason) is None:
+        print(f"[DB] add_bonus_elo: Clan {clan_id} not found.")
+        return
     print(f"[DB] Bonus Elo (+{amount}) added to Clan ID {clan_id}. Reason: {reason}")
 
 
 async def increment_clan_matches(clan_id: int) -> None:
     """Increment matches_played counter."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         await conn.execute(
             "UPDATE clans SET matches_played = matches_played + 1, updated_at = datetime('now') WHERE id = ?",
             (clan_id,)
         )
+        invalidate_clan(clan_id)
         await conn.commit()
 
 
 async def set_clan_discord_ids(clan_id: int, role_id: str, channel_id: str) -> None:
     """Set Discord role and channel IDs for an approved clan."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         await conn.execute(
             "UPDATE clans SET discord_role_id = ?, discord_channel_id = ?, updated_at = datetime('now') WHERE id = ?",
             (role_id, channel_id, clan_id)
         )
+        invalidate_clan(clan_id)
         await conn.commit()
 
 
 async def update_clan_name(clan_id: int, new_name: str) -> bool:
     """Update clan name. Returns True if successful, False if name already exists."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         try:
             await conn.execute(
                 "UPDATE clans SET name = ?, updated_at = datetime('now') WHERE id = ?",
                 (new_name, clan_id)
             )
+            invalidate_clan(clan_id)
             await conn.commit()
             return True
         except aiosqlite.IntegrityError:
@@ -590,13 +2306,13 @@ async def update_clan_name(clan_id: int, new_name: str) -> bool:
 
 async def search_clans(query: str, limit: int = 25) -> List[Dict[str, Any]]:
     """Search clans by name (partial match)."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             "SELECT id, name FROM clans WHERE name LIKE ? ORDER BY matches_played DESC LIMIT ?",
             (f"%{query}%", limit)
         )
         rows = await cursor.fetchall()
-        return [dict(row) for row in rows]
+        return _records(Clan, cursor, rows)
 
 
 # =============================================================================
@@ -605,27 +2321,30 @@ async def search_clans(query: str, limit: int = 25) -> List[Dict[str, Any]]:
 
 async def add_member(user_id: int, clan_id: int, role: str = "member", join_type: str = "full", tryout_expires_at: Optional[str] = None) -> None:
     """Add a member to a clan. Idempotent: uses INSERT OR IGNORE."""
-    async with get_connection() as conn:
-        await conn.execute(
+    async with _write_connection() as conn:
+        cursor = await conn.execute(
             "INSERT OR IGNORE INTO clan_members (user_id, clan_id, role, join_type, tryout_expires_at) VALUES (?, ?, ?, ?, ?)",
             (user_id, clan_id, role, join_type, tryout_expires_at)
         )
+        if cursor.rowcount:
+            _member_added(user_id, clan_id, role, join_type, tryout_expires_at)
         await conn.commit()
 
 
 async def remove_member(user_id: int, clan_id: int) -> None:
     """Remove a member from a clan."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         await conn.execute(
             "DELETE FROM clan_members WHERE user_id = ? AND clan_id = ?",
             (user_id, clan_id)
         )
+        _member_removed(user_id, clan_id)
         await conn.commit()
 
 
 async def move_member(user_id: int, from_clan_id: int, to_clan_id: int, new_role: str = "member") -> None:
     """Move a member from one clan to another in a single transaction."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         await conn.execute("BEGIN")
         try:
             await conn.execute(
@@ -636,6 +2355,8 @@ async def move_member(user_id: int, from_clan_id: int, to_clan_id: int, new_role
                 "INSERT INTO clan_members (user_id, clan_id, role) VALUES (?, ?, ?)",
                 (user_id, to_clan_id, new_role)
             )
+            _member_removed(user_id, from_clan_id)
+            _member_added(user_id, to_clan_id, new_role)
             await conn.commit()
         except Exception as e:
             await conn.rollback()
@@ -644,11 +2365,12 @@ async def move_member(user_id: int, from_clan_id: int, to_clan_id: int, new_role
 
 async def update_member_role(user_id: int, clan_id: int, role: str) -> None:
     """Update member's role in a clan."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         await conn.execute(
             "UPDATE clan_members SET role = ? WHERE user_id = ? AND clan_id = ?",
             (role, user_id, clan_id)
         )
+        _member_updated(user_id, clan_id, role=role)
         await conn.commit()
 
 
@@ -664,7 +2386,7 @@ async def admin_set_member_role(clan_id: int, user_id: int, new_role: str) -> Di
     if new_role not in {"captain", "vice", "member"}:
         return {"success": False, "reason": "invalid_role"}
 
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         await conn.execute("BEGIN")
         try:
             cursor = await conn.execute(
@@ -703,11 +2425,14 @@ async def admin_set_member_role(clan_id: int, user_id: int, new_role: str) -> Di
                     "UPDATE clans SET captain_id = ?, updated_at = datetime('now') WHERE id = ?",
                     (user_id, clan_id),
                 )
+                invalidate_clan(clan_id)
+                invalidate_members(clan_id=clan_id)  # old captain(s) demoted
             else:
                 await conn.execute(
                     "UPDATE clan_members SET role = ? WHERE clan_id = ? AND user_id = ?",
                     (new_role, clan_id, user_id),
                 )
+                _member_updated(user_id, clan_id, role=new_role)
 
             await conn.commit()
             return {
@@ -721,9 +2446,10 @@ async def admin_set_member_role(clan_id: int, user_id: int, new_role: str) -> Di
             raise e
 
 
+@cached(tags=("members", "members:{clan_id}", "users"))
 async def get_clan_members(clan_id: int) -> List[Dict[str, Any]]:
     """Get all members of a clan."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             """SELECT cm.*, u.discord_id, u.riot_id 
                FROM clan_members cm
@@ -732,23 +2458,49 @@ async def get_clan_members(clan_id: int) -> List[Dict[str, Any]]:
             (clan_id,)
         )
         rows = await cursor.fetchall()
-        return [dict(row) for row in rows]
+        return _records(ClanMember, cursor, rows)
 
 
 async def get_clan_member(user_id: int, clan_id: int) -> Optional[Dict[str, Any]]:
     """Get a specific member record from a clan."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             "SELECT * FROM clan_members WHERE user_id = ? AND clan_id = ?",
             (user_id, clan_id)
         )
         row = await cursor.fetchone()
-        return dict(row) if row else None
+        return _record(ClanMember, cursor, row)
 
 
 async def get_user_clan(user_id: int) -> Optional[Dict[str, Any]]:
-    """Get the clan a user belongs to (excludes disbanded/cancelled clans)."""
-    async with get_connection() as conn:
+    """
+    Get the clan a user belongs to (excludes disbanded/cancelled clans), with
+    member_role / join_type / tryout_expires_at. Served from the membership index
+    and the clan cache, so a warm lookup costs no query.
+    """
+    memberships = await _memberships.of_user(user_id)
+    if memberships is None:
+        return await _select_user_clan(user_id)
+
+    result = None
+    for clan_id, membership in memberships.items():
+        clan = await get_clan_by_id(clan_id)
+        if clan is not None and clan["status"] not in ("disbanded", "cancelled", "rejected"):
+            clan["member_role"] = membership["role"]
+            clan["join_type"] = membership["join_type"]
+            clan["tryout_expires_at"] = membership["tryout_expires_at"]
+            result = clan
+            break
+    if _memberships.self_check:
+        fresh = await _select_user_clan(user_id)
+        if (fresh and dict(fresh)) != (result and dict(result)):
+            _memberships.stats["mismatches"] += 1
+            raise AssertionError(f"[DB] membership index is stale for user {user_id}: {result and dict(result)} != {fresh and dict(fresh)}")
+    return result
+
+
+async def _select_user_clan(user_id: int) -> Optional[Dict[str, Any]]:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             """SELECT c.*, 
                       cm.role as member_role, 
@@ -760,12 +2512,15 @@ async def get_user_clan(user_id: int) -> Optional[Dict[str, Any]]:
             (user_id,)
         )
         row = await cursor.fetchone()
-        return dict(row) if row else None
+        return _record(Clan, cursor, row)
 
 
 async def count_clan_members(clan_id: int) -> int:
-    """Count members in a clan."""
-    async with get_connection() as conn:
+    """Count members in a clan (membership index; no query when warm)."""
+    members = await _memberships.of_clan(clan_id)
+    if members is not None:
+        return len(members)
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             "SELECT COUNT(*) as count FROM clan_members WHERE clan_id = ?",
             (clan_id,)
@@ -780,7 +2535,7 @@ async def count_clan_members(clan_id: int) -> int:
 
 async def create_create_request(clan_id: int, user_id: int, expires_at: str) -> int:
     """Create a new clan creation request for a member."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         cursor = await conn.execute(
             "INSERT INTO create_requests (clan_id, user_id, expires_at) VALUES (?, ?, ?)",
             (clan_id, user_id, expires_at)
@@ -791,7 +2546,7 @@ async def create_create_request(clan_id: int, user_id: int, expires_at: str) ->
 
 async def accept_create_request(clan_id: int, user_id: int) -> None:
     """Accept a clan creation request."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         await conn.execute(
             "UPDATE create_requests SET status = 'accepted', responded_at = datetime('now') WHERE clan_id = ? AND user_id = ?",
             (clan_id, user_id)
@@ -801,7 +2556,7 @@ async def accept_create_request(clan_id: int, user_id: int) -> None:
 
 async def decline_create_request(clan_id: int, user_id: int) -> None:
     """Decline a clan creation request."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         await conn.execute(
             "UPDATE create_requests SET status = 'declined', responded_at = datetime('now') WHERE clan_id = ? AND user_id = ?",
             (clan_id, user_id)
@@ -811,7 +2566,7 @@ async def decline_create_request(clan_id: int, user_id: int) -> None:
 
 async def get_pending_create_requests(clan_id: int) -> List[Dict[str, Any]]:
     """Get all pending create requests for a clan."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             "SELECT * FROM create_requests WHERE clan_id = ? AND status = 'pending'",
             (clan_id,)
@@ -822,7 +2577,7 @@ async def get_pending_create_requests(clan_id: int) -> List[Dict[str, Any]]:
 
 async def get_user_pending_request(user_id: int) -> Optional[Dict[str, Any]]:
     """Get pending request for a user."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             "SELECT * FROM create_requests WHERE user_id = ? AND status = 'pending'",
             (user_id,)
@@ -833,7 +2588,7 @@ async def get_user_pending_request(user_id: int) -> Optional[Dict[str, Any]]:
 
 async def get_user_request_any_status(clan_id: int, user_id: int) -> Optional[Dict[str, Any]]:
     """Get request for a user in a specific clan regardless of status."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             "SELECT * FROM create_requests WHERE clan_id = ? AND user_id = ?",
             (clan_id, user_id)
@@ -844,7 +2599,7 @@ async def get_user_request_any_status(clan_id: int, user_id: int) -> Optional[Di
 
 async def check_all_accepted(clan_id: int) -> bool:
     """Check if all 4 invited members have accepted."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             "SELECT COUNT(*) as count FROM create_requests WHERE clan_id = ? AND status = 'accepted'",
             (clan_id,)
@@ -859,7 +2614,7 @@ async def check_all_accepted(clan_id: int) -> bool:
 
 async def create_invite_request(clan_id: int, user_id: int, invited_by_user_id: int, expires_at: str, invite_type: str = "full") -> int:
     """Create a new invite request for joining an existing clan. Returns invite ID."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         await conn.execute("BEGIN")
         try:
             # Cancel any existing pending invites for this user to this clan
@@ -886,7 +2641,7 @@ async def create_invite_request(clan_id: int, user_id: int, invited_by_user_id:
 
 async def get_pending_invite(user_id: int, clan_id: int = None) -> Optional[Dict[str, Any]]:
     """Get pending invite for a user. Optionally filter by clan."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         if clan_id:
             cursor = await conn.execute(
                 "SELECT * FROM invite_requests WHERE user_id = ? AND clan_id = ? AND status = 'pending'",
@@ -903,7 +2658,7 @@ async def get_pending_invite(user_id: int, clan_id: int = None) -> Optional[Dict
 
 async def accept_invite(invite_id: int) -> bool:
     """Accept an invite. Returns True if successful."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         await conn.execute("BEGIN")
         try:
             # Get invite details first to handle duplicates
@@ -932,7 +2687,7 @@ async def accept_invite(invite_id: int) -> bool:
 
 async def decline_invite(invite_id: int) -> bool:
     """Decline an invite. Returns True if successful."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         await conn.execute("BEGIN")
         try:
             # Get invite details first to handle duplicates
@@ -961,7 +2716,7 @@ async def decline_invite(invite_id: int) -> bool:
 
 async def get_invite_by_id(invite_id: int) -> Optional[Dict[str, Any]]:
     """Get invite by ID."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             "SELECT * FROM invite_requests WHERE id = ?", (invite_id,)
         )
@@ -982,34 +2737,36 @@ async def create_match_v2(
     channel_id: Optional[str] = None
 ) -> int:
     """Create a new match. Returns match ID."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         cursor = await conn.execute(
             """INSERT INTO matches 
                (clan_a_id, clan_b_id, creator_user_id, note, message_id, channel_id) 
                VALUES (?, ?, ?, ?, ?, ?)""",
             (clan_a_id, clan_b_id, creator_user_id, note, message_id, channel_id)
         )
+        invalidate_matches(cursor.lastrowid)
         await conn.commit()
         return cursor.lastrowid
 
 
 async def get_match(match_id: int) -> Optional[Dict[str, Any]]:
     """Get match by ID with all fields."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             "SELECT * FROM matches WHERE id = ?", (match_id,)
         )
         row = await cursor.fetchone()
-        return dict(row) if row else None
+        return _record(Match, cursor, row)
 
 
 async def update_match_message_ids(match_id: int, message_id: str, channel_id: str) -> None:
     """Update Discord message/channel IDs for a match (for button persistence)."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         await conn.execute(
             "UPDATE matches SET message_id = ?, channel_id = ? WHERE id = ?",
             (message_id, channel_id, match_id)
         )
+        invalidate_matches(match_id)
         await conn.commit()
 
 
@@ -1019,11 +2776,12 @@ async def update_match_status_atomic(match_id: int, expected_status: str, new_st
     Used for concurrency safety (e.g., two users clicking Confirm at same time).
     Returns True if update succeeded, False if status didn't match.
     """
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         cursor = await conn.execute(
             "UPDATE matches SET status = ? WHERE id = ? AND status = ?",
             (new_status, match_id, expected_status)
         )
+        invalidate_matches(match_id)
         await conn.commit()
         return cursor.rowcount > 0
 
@@ -1033,7 +2791,7 @@ async def report_match_v3(match_id: int, score_a: int, score_b: int) -> bool:
     Report match result with numerical scores. Sets status to 'reported'.
     Returns True if successful, False if match not in 'created' status.
     """
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         # Determine reported_winner_clan_id based on scores
         # We need to get clan IDs first
         cursor = await conn.execute("SELECT clan_a_id, clan_b_id FROM matches WHERE id = ?", (match_id,))
@@ -1062,6 +2820,7 @@ async def report_match_v3(match_id: int, score_a: int, score_b: int) -> bool:
                WHERE id = ? AND status = 'created'""",
             (score_a, score_b, reported_winner_id, match_id)
         )
+        invalidate_matches(match_id)
         await conn.commit()
         return cursor.rowcount > 0
 
@@ -1071,7 +2830,7 @@ async def confirm_match_v2(match_id: int, confirmed_by_user_id: int) -> bool:
     Confirm match result. Sets status to 'confirmed' and populates winner_clan_id.
     Returns True if successful, False if match not in 'reported' status.
     """
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         cursor = await conn.execute(
             """UPDATE matches SET 
                confirmed_by_user_id = ?,
@@ -1081,6 +2840,7 @@ async def confirm_match_v2(match_id: int, confirmed_by_user_id: int) -> bool:
                WHERE id = ? AND status = 'reported'""",
             (confirmed_by_user_id, match_id)
         )
+        invalidate_matches(match_id)
         await conn.commit()
         return cursor.rowcount > 0
 
@@ -1090,7 +2850,7 @@ async def dispute_match(match_id: int, disputed_by_user_id: int, reason: Optiona
     Dispute match result. Sets status to 'dispute'.
     Returns True if successful, False if match not in 'reported' status.
     """
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         cursor = await conn.execute(
             """UPDATE matches SET 
                disputed_by_user_id = ?,
@@ -1100,6 +2860,7 @@ async def dispute_match(match_id: int, disputed_by_user_id: int, reason: Optiona
                WHERE id = ? AND status = 'reported'""",
             (disputed_by_user_id, reason, match_id)
         )
+        invalidate_matches(match_id)
         await conn.commit()
         return cursor.rowcount > 0
 
@@ -1109,7 +2870,7 @@ async def resolve_match(match_id: int, resolved_by_user_id: int, winner_clan_id:
     Resolve disputed match (Mod action). Sets status to 'resolved' and populates winner_clan_id.
     Returns True if successful, False if match not in 'dispute' status.
     """
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         cursor = await conn.execute(
             """UPDATE matches SET 
                resolved_by_user_id = ?,
@@ -1121,6 +2882,7 @@ async def resolve_match(match_id: int, resolved_by_user_id: int, winner_clan_id:
                WHERE id = ? AND status = 'dispute'""",
             (resolved_by_user_id, reason, winner_clan_id, winner_clan_id, match_id)
         )
+        invalidate_matches(match_id)
         await conn.commit()
         return cursor.rowcount > 0
 
@@ -1130,11 +2892,12 @@ async def cancel_match(match_id: int) -> bool:
     Finalize cancelling a match.
     Returns True if successful.
     """
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         cursor = await conn.execute(
             "UPDATE matches SET status = 'cancelled' WHERE id = ?",
             (match_id,)
         )
+        invalidate_matches(match_id)
         await conn.commit()
         return cursor.rowcount > 0
 
@@ -1143,11 +2906,12 @@ async def request_match_cancel(match_id: int, clan_id: int) -> bool:
     """
     Record that a clan requested to cancel the match.
     """
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         cursor = await conn.execute(
             "UPDATE matches SET cancel_requested_by_clan_id = ? WHERE id = ? AND status = 'created'",
             (clan_id, match_id)
         )
+        invalidate_matches(match_id)
         await conn.commit()
         return cursor.rowcount > 0
 
@@ -1156,11 +2920,12 @@ async def clear_match_cancel_request(match_id: int) -> bool:
     """
     Clear a cancellation request (e.g. if someone reports score instead).
     """
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         cursor = await conn.execute(
             "UPDATE matches SET cancel_requested_by_clan_id = NULL WHERE id = ?",
             (match_id,)
         )
+        invalidate_matches(match_id)
         await conn.commit()
         return cursor.rowcount > 0
 
@@ -1172,7 +2937,7 @@ async def create_finished_match(clan_a_id: int, clan_b_id: int, score_a: int, sc
     """
     winner_id = clan_a_id if score_a > score_b else clan_b_id
     
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         cursor = await conn.execute(
             """INSERT INTO matches 
                (clan_a_id, clan_b_id, score_a, score_b, reported_winner_clan_id, status, created_at, resolved_at)
@@ -1180,6 +2945,7 @@ async def create_finished_match(clan_a_id: int, clan_b_id: int, score_a: int, sc
             (clan_a_id, clan_b_id, score_a, score_b, winner_id)
         )
         match_id = cursor.lastrowid
+        invalidate_matches(match_id)
         await conn.commit()
         return match_id
 
@@ -1190,7 +2956,7 @@ async def has_active_match(clan_id: int) -> bool:
     A match is considered 'active' if its status is 'created' or 'reported'.
     Returns True if the clan has at least one such match.
     """
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             """SELECT COUNT(*) as cnt FROM matches 
                WHERE (clan_a_id = ? OR clan_b_id = ?) 
@@ -1203,18 +2969,20 @@ async def has_active_match(clan_id: int) -> bool:
 
 async def force_cancel_match(match_id: int, reason: str = None) -> bool:
     """Force cancel a match by setting its status to 'cancelled'."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         cursor = await conn.execute(
             "UPDATE matches SET status = 'cancelled', note = COALESCE(?, note) WHERE id = ? AND status IN ('created', 'reported')",
             (reason, match_id)
         )
+        invalidate_matches(match_id)
         await conn.commit()
         return cursor.rowcount > 0
 
 
+@cached(tags=("matches", "clans"))
 async def get_pending_matches() -> list:
     """Get all matches that are in 'created' or 'reported' status."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             """SELECT m.id, m.status, m.created_at, m.match_format,
                       ca.name as clan_a_name, cb.name as clan_b_name
@@ -1225,7 +2993,7 @@ async def get_pending_matches() -> list:
                ORDER BY m.created_at DESC"""
         )
         rows = await cursor.fetchall()
-        return [dict(r) for r in rows]
+        return _records(Match, cursor, rows)
 
 
 async def create_admin_match(
@@ -1238,7 +3006,7 @@ async def create_admin_match(
     note: str = "Admin force resolve"
 ) -> int:
     """Create a match directly in 'resolved' status for admin Elo correction."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         cursor = await conn.execute(
             """INSERT INTO matches 
                (clan_a_id, clan_b_id, creator_user_id, status, score_a, score_b, 
@@ -1247,13 +3015,15 @@ async def create_admin_match(
             (clan_a_id, clan_b_id, admin_user_id, score_a, score_b, 
              winner_clan_id, note)
         )
+        invalidate_matches(cursor.lastrowid)
         await conn.commit()
         return cursor.lastrowid
 
 
+@cached(tags=("match:{match_id}", "clans", "users"))
 async def get_match_with_clans(match_id: int) -> Optional[Dict[str, Any]]:
     """Get match with clan names included."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             """SELECT m.*, 
                       ca.name as clan_a_name, ca.elo as clan_a_elo, ca.status as clan_a_status,
@@ -1267,16 +3037,17 @@ async def get_match_with_clans(match_id: int) -> Optional[Dict[str, Any]]:
             (match_id,)
         )
         row = await cursor.fetchone()
-        return dict(row) if row else None
+        return _record(Match, cursor, row)
 
 
 # =============================================================================
 # ELO HISTORY CRUD
 # =============================================================================
 
+@cached(tags=("clan:{clan_id}",))
 async def get_clan_elo_history(clan_id: int, limit: int = 20) -> List[Dict[str, Any]]:
     """Get Elo history for a clan."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             "SELECT * FROM elo_history WHERE clan_id = ? ORDER BY created_at DESC LIMIT ?",
             (clan_id, limit)
@@ -1291,7 +3062,7 @@ async def get_clan_elo_history(clan_id: int, limit: int = 20) -> List[Dict[str,
 
 async def create_loan(lending_clan_id: int, borrowing_clan_id: int, member_user_id: int, requested_by_user_id: int, duration_days: int, note: Optional[str] = None) -> int:
     """Create a loan request. Returns loan ID."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         cursor = await conn.execute(
             """INSERT INTO loans 
                (lending_clan_id, borrowing_clan_id, member_user_id, requested_by_user_id, duration_days, status) 
@@ -1304,17 +3075,17 @@ async def create_loan(lending_clan_id: int, borrowing_clan_id: int, member_user_
 
 async def get_loan(loan_id: int) -> Optional[Dict[str, Any]]:
     """Get loan by ID."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             "SELECT * FROM loans WHERE id = ?", (loan_id,)
         )
         row = await cursor.fetchone()
-        return dict(row) if row else None
+        return _record(Loan, cursor, row)
 
 
 async def update_loan_acceptance(loan_id: int, lending: Optional[bool] = None, borrowing: Optional[bool] = None, member: Optional[bool] = None) -> None:
     """Update acceptance flags for a loan."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         updates = []
         params = []
         if lending is not None:
@@ -1341,7 +3112,7 @@ async def update_loan_acceptance(loan_id: int, lending: Optional[bool] = None, b
 
 async def activate_loan(loan_id: int) -> bool:
     """Activate a loan (all parties accepted). Returns True if status was changed."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         # Get duration
         cursor = await conn.execute("SELECT duration_days FROM loans WHERE id = ?", (loan_id,))
         row = await cursor.fetchone()
@@ -1361,7 +3132,7 @@ async def activate_loan(loan_id: int) -> bool:
 
 async def end_loan(loan_id: int) -> None:
     """End a loan."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         await conn.execute(
             "UPDATE loans SET status = 'ended', updated_at = datetime('now') WHERE id = ?",
             (loan_id,)
@@ -1371,7 +3142,7 @@ async def end_loan(loan_id: int) -> None:
 
 async def cancel_loan(loan_id: int, user_id: int, reason: str) -> None:
     """Cancel a loan request."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         await conn.execute(
             "UPDATE loans SET status = 'cancelled', cancelled_by_user_id = ?, cancelled_reason = ?, updated_at = datetime('now') WHERE id = ?",
             (user_id, reason, loan_id)
@@ -1381,7 +3152,7 @@ async def cancel_loan(loan_id: int, user_id: int, reason: str) -> None:
 
 async def get_active_loan_for_clan(clan_id: int) -> Optional[Dict[str, Any]]:
     """Check if clan has an active loan (either lending or borrowing)."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             """SELECT * FROM loans 
                WHERE (lending_clan_id = ? OR borrowing_clan_id = ?) 
@@ -1389,12 +3160,12 @@ async def get_active_loan_for_clan(clan_id: int) -> Optional[Dict[str, Any]]:
             (clan_id, clan_id)
         )
         row = await cursor.fetchone()
-        return dict(row) if row else None
+        return _record(Loan, cursor, row)
 
 
 async def count_active_loans_for_clan(clan_id: int) -> int:
     """Count how many active loans a clan is involved in (lending or borrowing)."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             """SELECT COUNT(*) FROM loans 
                WHERE (lending_clan_id = ? OR borrowing_clan_id = ?) 
@@ -1407,7 +3178,7 @@ async def count_active_loans_for_clan(clan_id: int) -> int:
 
 async def get_all_active_loans_for_clan(clan_id: int) -> List[Dict[str, Any]]:
     """Get all active loans for a clan (as lending or borrowing)."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             """SELECT * FROM loans 
                WHERE (lending_clan_id = ? OR borrowing_clan_id = ?) 
@@ -1415,23 +3186,23 @@ async def get_all_active_loans_for_clan(clan_id: int) -> List[Dict[str, Any]]:
             (clan_id, clan_id)
         )
         rows = await cursor.fetchall()
-        return [dict(row) for row in rows]
+        return _records(Loan, cursor, rows)
 
 
 async def get_active_loan_for_member(user_id: int) -> Optional[Dict[str, Any]]:
     """Check if member is currently in an active loan."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             "SELECT * FROM loans WHERE member_user_id = ? AND status = 'active'",
             (user_id,)
         )
         row = await cursor.fetchone()
-        return dict(row) if row else None
+        return _record(Loan, cursor, row)
 
 
 async def get_all_active_loans() -> List[Dict[str, Any]]:
     """Get all active loans system-wide."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             """SELECT l.*, 
                       c1.name as lending_clan_name, 
@@ -1445,7 +3216,7 @@ async def get_all_active_loans() -> List[Dict[str, Any]]:
                ORDER BY l.end_date"""
         )
         rows = await cursor.fetchall()
-        return [dict(row) for row in rows]
+        return _records(Loan, cursor, rows)
 
 
 # =============================================================================
@@ -1454,7 +3225,7 @@ async def get_all_active_loans() -> List[Dict[str, Any]]:
 
 async def create_transfer(source_clan_id: int, dest_clan_id: int, member_user_id: int, requested_by_user_id: int) -> int:
     """Create a transfer request. Returns transfer ID."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         cursor = await conn.execute(
             """INSERT INTO transfers 
                (source_clan_id, dest_clan_id, member_user_id, requested_by_user_id, status) 
@@ -1467,17 +3238,17 @@ async def create_transfer(source_clan_id: int, dest_clan_id: int, member_user_id
 
 async def get_transfer(transfer_id: int) -> Optional[Dict[str, Any]]:
     """Get transfer by ID."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             "SELECT * FROM transfers WHERE id = ?", (transfer_id,)
         )
         row = await cursor.fetchone()
-        return dict(row) if row else None
+        return _record(Transfer, cursor, row)
 
 
 async def update_transfer_acceptance(transfer_id: int, source: Optional[bool] = None, dest: Optional[bool] = None, member: Optional[bool] = None) -> None:
     """Update acceptance flags for a transfer."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         updates = []
         params = []
         if source is not None:
@@ -1504,7 +3275,7 @@ async def update_transfer_acceptance(transfer_id: int, source: Optional[bool] =
 
 async def complete_transfer(transfer_id: int) -> bool:
     """Complete a transfer. Returns True if status was changed."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         cursor = await conn.execute(
             "UPDATE transfers SET status = 'completed', completed_at = datetime('now'), updated_at = datetime('now') WHERE id = ? AND status = 'requested'",
             (transfer_id,)
@@ -1515,7 +3286,7 @@ async def complete_transfer(transfer_id: int) -> bool:
 
 async def cancel_transfer(transfer_id: int, user_id: int, reason: str) -> None:
     """Cancel a transfer request."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         await conn.execute(
             "UPDATE transfers SET status = 'cancelled', cancelled_by_user_id = ?, cancelled_reason = ?, updated_at = datetime('now') WHERE id = ?",
             (user_id, reason, transfer_id)
@@ -1525,35 +3296,225 @@ async def cancel_transfer(transfer_id: int, user_id: int, reason: str) -> None:
 
 async def get_user_pending_transfer(user_id: int) -> Optional[Dict[str, Any]]:
     """Get pending transfer for a user."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             "SELECT * FROM transfers WHERE member_user_id = ? AND status = 'requested'",
             (user_id,)
         )
         row = await cursor.fetchone()
-        return dict(row) if row else None
+        return _record(Transfer, cursor, row)
 
 
 # =============================================================================
 # COOLDOWNS CRUD
 # =============================================================================
 
+class _CooldownIndex:
+    """
+    Every cooldowns row in memory, keyed by (target_type, target_id, kind), plus a
+    min-heap of (until_ts, key) so expiry only looks at entries that are due.
+
+    Loaded once per database file (load_cooldowns() at startup, or lazily). The
+    cooldown helpers re-read the row they wrote inside the write and publish it
+    after commit; raw SQL on cooldowns must call invalidate_cooldowns().
+    Heap entries are never updated in place: a changed or removed row leaves its
+    old entry behind, and pop_due() skips entries whose until_ts no longer matches.
+    """
+
+    def __init__(self):
+        self.self_check = False
+        self._rows: Dict[Tuple[str, int, str], Any] = {}
+        self._kinds: Dict[Tuple[str, int], Set[str]] = {}
+        self._heap: List[Tuple[int, Tuple[str, int, str]]] = []
+        self._path: Optional[Path] = None
+        self._version = 0
+        self.stats = {"hits": 0, "fallbacks": 0, "loads": 0, "writes": 0, "expired": 0, "mismatches": 0}
+
+    async def _sync(self) -> bool:
+        """Make sure the index is loaded. False if the caller must query."""
+        scope = _active_scope()
+        if scope is not None and "cooldowns" in scope.dirty:
+            return False
+        if self._path == DB_PATH:
+            return True
+        if scope is not None:
+            return False  # never load through a scope connection
+        await self.load()
+        return self._path == DB_PATH
+
+    async def load(self) -> None:
+        version = self._version
+        async with get_read_connection() as conn:
+            cursor = await conn.execute("SELECT * FROM cooldowns")
+            rows = _records(Cooldown, cursor, await cursor.fetchall())
+        if version != self._version:
+            return  # A write landed meanwhile; the next lookup loads again
+        self._rows.clear()
+        self._kinds.clear()
+        self._heap = []
+        for row in rows:
+            self._add(row)
+        heapq.heapify(self._heap)
+        self._path = DB_PATH
+        self.stats["loads"] += 1
+
+    def _add(self, row: Any, push: Callable = list.append) -> None:
+        key = (row["target_type"], row["target_id"], row["kind"])
+        self._rows[key] = row
+        self._kinds.setdefault(key[:2], set()).add(key[2])
+        if row["until_ts"] is not None:
+            push(self._heap, (row["until_ts"], key))
+
+    def _discard(self, key: Tuple[str, int, str]) -> None:
+        if self._rows.pop(key, None) is not None:
+            kinds = self._kinds[key[:2]]
+            kinds.discard(key[2])
+            if not kinds:
+                del self._kinds[key[:2]]
+
+    async def get(self, target_type: str, target_id: int, kind: str) -> Tuple[bool, Optional[Any]]:
+        """(answered, active row copy). answered=False means: query instead."""
+        if not await self._sync():
+            self.stats["fallbacks"] += 1
+            return False, None
+        self.stats["hits"] += 1
+        row = self._rows.get((target_type, target_id, kind))
+        if row is None or row["until_ts"] is None or row["until_ts"] <= epoch_now():
+            return True, None
+        return True, row.copy()
+
+    async def of_target(self, target_type: str, target_id: int) -> Optional[List[Any]]:
+        """Active rows of one target (copies, in id order), or None if the caller must query."""
+        if not await self._sync():
+            self.stats["fallbacks"] += 1
+            return None
+        self.stats["hits"] += 1
+        now = epoch_now()
+        rows = (self._rows[(target_type, target_id, kind)] for kind in self._kinds.get((target_type, target_id), ()))
+        return sorted((row.copy() for row in rows if row["until_ts"] is not None and row["until_ts"] > now),
+                      key=lambda row: row["id"])
+
+    async def pop_due(self, now: int) -> Optional[List[Any]]:
+        """Take the rows whose until_ts <= now off the heap (None if the caller must query)."""
+        if not await self._sync():
+            self.stats["fallbacks"] += 1
+            return None
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            until_ts, key = heapq.heappop(self._heap)
+            row = self._rows.get(key)
+            if row is not None and row["until_ts"] == until_ts:
+                due.append(row)
+        return due
+
+    def requeue(self, rows: List[Any]) -> None:
+        """Put back rows taken by pop_due() whose delete did not commit."""
+        for row in rows:
+            key = (row["target_type"], row["target_id"], row["kind"])
+            if self._rows.get(key) is row:
+                heapq.heappush(self._heap, (row["until_ts"], key))
+
+    # Write-through (called after commit)
+    def put(self, row: Any) -> None:
+        self._version += 1
+        self.stats["writes"] += 1
+        if self._path != DB_PATH:
+            return
+        key = (row["target_type"], row["target_id"], row["kind"])
+        self._discard(key)
+        self._add(row, heapq.heappush)
+        if len(self._heap) > 2 * len(self._rows) + 64:
+            # Too many superseded entries: rebuild from the live rows
+            self._heap = [(r["until_ts"], k) for k, r in self._rows.items() if r["until_ts"] is not None]
+            heapq.heapify(self._heap)
+
+    def remove(self, target_type: str, target_id: int, kind: Optional[str] = None, expired: bool = False) -> None:
+        self._version += 1
+        self.stats["writes"] += 1
+        kinds = [kind] if kind else list(self._kinds.get((target_type, target_id), ()))
+        for k in kinds:
+            self._discard((target_type, target_id, k))
+        if expired:
+            self.stats["expired"] += len(kinds)
+
+    def invalidate(self) -> None:
+        self._version += 1
+        self._path = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "rows": len(self._rows), "heap": len(self._heap)}
+
+
+_cooldowns = _CooldownIndex()
+_cooldowns.self_check = config.DB_CACHE_SELF_CHECK
+
+
+def _cooldown_scope_write() -> None:
+    scope = _active_scope()
+    if scope is not None:
+        scope.dirty.add("cooldowns")
+
+
+def invalidate_cooldowns() -> None:
+    """Reload the cooldown index once the current write commits (for raw SQL on cooldowns)."""
+    _cooldown_scope_write()
+    _after_commit(_cooldowns.invalidate)
+
+
+async def _publish_cooldown(conn, target_type: str, target_id: int, kind: str) -> None:
+    """Re-read a row just written (exact until_ts / timestamps) and publish it after commit."""
+    cursor = await conn.execute(
+        "SELECT * FROM cooldowns WHERE target_type = ? AND target_id = ? AND kind = ?",
+        (target_type, target_id, kind)
+    )
+    row = _record(Cooldown, cursor, await cursor.fetchone())
+    _cooldown_scope_write()
+    if row is not None:
+        _after_commit(lambda: _cooldowns.put(row))
+
+
+def _cooldowns_removed(target_type: str, target_id: int, kind: Optional[str] = None) -> None:
+    _cooldown_scope_write()
+    _after_commit(lambda: _cooldowns.remove(target_type, target_id, kind))
+
+
+async def load_cooldowns() -> None:
+    """Load the cooldown index (main.py calls this at startup; lookups also load it lazily)."""
+    await _cooldowns.load()
+
+
+def get_cooldown_index_stats() -> Dict[str, Any]:
+    """Cooldown index metrics: hits, fallbacks, loads, writes, expired, rows, heap."""
+    return _cooldowns.get_stats()
+
+
 async def get_cooldown(target_type: str, target_id: int, kind: str) -> Optional[Dict[str, Any]]:
-    """Get active cooldown for a target."""
-    async with get_connection() as conn:
+    """Get active cooldown for a target. O(1) from the cooldown index."""
+    answered, row = await _cooldowns.get(target_type, target_id, kind)
+    if answered and not _cooldowns.self_check:
+        return row
+    fresh = await _select_cooldown(target_type, target_id, kind)
+    if answered and (row and dict(row)) != (fresh and dict(fresh)):
+        _cooldowns.stats["mismatches"] += 1
+        raise AssertionError(f"[DB] cooldown index is stale for {target_type} {target_id} {kind}: {row and dict(row)} != {fresh and dict(fresh)}")
+    return fresh
+
+
+async def _select_cooldown(target_type: str, target_id: int, kind: str) -> Optional[Dict[str, Any]]:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             """SELECT * FROM cooldowns 
                WHERE target_type = ? AND target_id = ? AND kind = ? 
-               AND DATETIME(until) > datetime('now')""",
-            (target_type, target_id, kind)
+               AND until_ts > ?""",
+            (target_type, target_id, kind, epoch_now())
         )
         row = await cursor.fetchone()
-        return dict(row) if row else None
+        return _record(Cooldown, cursor, row)
 
 
 async def set_cooldown(target_type: str, target_id: int, kind: str, duration_days: int, reason: str) -> None:
     """Set or update a cooldown in days."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         until = (datetime.now(timezone.utc) + timedelta(days=duration_days)).isoformat()
         await conn.execute(
             """INSERT INTO cooldowns (target_type, target_id, kind, until, reason)
@@ -1562,12 +3523,13 @@ async def set_cooldown(target_type: str, target_id: int, kind: str, duration_day
                DO UPDATE SET until = excluded.until, reason = excluded.reason, updated_at = datetime('now')""",
             (target_type, target_id, kind, until, reason)
         )
+        await _publish_cooldown(conn, target_type, target_id, kind)
         await conn.commit()
 
 
 async def set_cooldown_minutes(target_type: str, target_id: int, kind, duration_minutes: int, reason: str) -> None:
     """Set or update a cooldown in minutes."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         # Use timezone-aware now
         until = (datetime.now(timezone.utc) + timedelta(minutes=duration_minutes)).isoformat()
         await conn.execute(
@@ -1577,12 +3539,13 @@ async def set_cooldown_minutes(target_type: str, target_id: int, kind, duration_
                DO UPDATE SET until = excluded.until, reason = excluded.reason, updated_at = datetime('now')""",
             (target_type, target_id, kind, until, reason)
         )
+        await _publish_cooldown(conn, target_type, target_id, kind)
         await conn.commit()
 
 
 async def clear_cooldown(target_type: str, target_id: int, kind: Optional[str] = None) -> None:
     """Clear cooldown(s) for a target."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         if kind:
             await conn.execute(
                 "DELETE FROM cooldowns WHERE target_type = ? AND target_id = ? AND kind = ?",
@@ -1593,32 +3556,54 @@ async def clear_cooldown(target_type: str, target_id: int, kind: Optional[str] =
                 "DELETE FROM cooldowns WHERE target_type = ? AND target_id = ?",
                 (target_type, target_id)
             )
+        _cooldowns_removed(target_type, target_id, kind)
         await conn.commit()
 
 
 async def pop_expired_cooldowns() -> List[Dict[str, Any]]:
-    """Return and clear expired cooldowns from the new cooldowns table."""
-    async with get_connection() as conn:
-        cursor = await conn.execute(
-            "SELECT * FROM cooldowns WHERE DATETIME(until) <= datetime('now')"
-        )
-        rows = await cursor.fetchall()
-        if not rows:
-            return []
+    """
+    Return and clear expired cooldowns from the new cooldowns table.
+    The cooldown index hands over only the entries that are due (heap order), so a
+    sweep with nothing expired costs no query; the rows are then deleted by id.
+    """
+    now = epoch_now()
+    due = await _cooldowns.pop_due(now)
+    if due is not None and not due:
+        return []
+    try:
+        async with _write_connection() as conn:
+            if due is None:
+                cursor = await conn.execute("SELECT * FROM cooldowns WHERE until_ts <= ?", (now,))
+            else:
+                # Re-check in the write: a cooldown extended meanwhile is no longer due
+                cursor = await conn.execute(
+                    f"SELECT * FROM cooldowns WHERE id IN ({','.join('?' * len(due))}) AND until_ts <= ?",
+                    (*[row["id"] for row in due], now)
+                )
+            rows = await cursor.fetchall()
+            if not rows:
+                return []
 
-        ids = [row["id"] for row in rows]
-        placeholders = ",".join(["?"] * len(ids))
-        await conn.execute(
-            f"DELETE FROM cooldowns WHERE id IN ({placeholders})",
-            ids
-        )
-        await conn.commit()
-        return [dict(row) for row in rows]
+            ids = [row["id"] for row in rows]
+            placeholders = ",".join(["?"] * len(ids))
+            await conn.execute(
+                f"DELETE FROM cooldowns WHERE id IN ({placeholders})",
+                ids
+            )
+            for row in rows:
+                _cooldown_scope_write()
+                _after_commit(lambda key=(row["target_type"], row["target_id"], row["kind"]): _cooldowns.remove(*key, expired=True))
+            await conn.commit()
+            return _records(Cooldown, cursor, rows)
+    except BaseException:
+        if due:
+            _cooldowns.requeue(due)
+        raise
 
 
 async def pop_expired_user_cooldowns() -> List[Dict[str, Any]]:
     """Return and clear expired legacy join/leave cooldowns from users table."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         cursor = await conn.execute(
             "SELECT id, discord_id, cooldown_until FROM users WHERE cooldown_until IS NOT NULL"
         )
@@ -1639,7 +3624,7 @@ async def pop_expired_user_cooldowns() -> List[Dict[str, Any]]:
 
             if until_dt <= now:
                 expired_ids.append(row["id"])
-                expired_rows.append(dict(row))
+                expired_rows.append(_record(User, cursor, row))
 
         if expired_ids:
             placeholders = ",".join(["?"] * len(expired_ids))
@@ -1647,6 +3632,8 @@ async def pop_expired_user_cooldowns() -> List[Dict[str, Any]]:
                 f"UPDATE users SET cooldown_until = NULL, updated_at = datetime('now') WHERE id IN ({placeholders})",
                 expired_ids
             )
+            for user_id in expired_ids:
+                invalidate_user(user_id)
             await conn.commit()
 
         return expired_rows
@@ -1654,7 +3641,7 @@ async def pop_expired_user_cooldowns() -> List[Dict[str, Any]]:
 
 async def cancel_user_pending_requests(user_id: int) -> None:
     """Cancel all pending loan/transfer requests initiated by or involving this user."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         now = datetime.now(timezone.utc).isoformat()
         
         # Cancel loans where user is member or initiator
@@ -1680,7 +3667,7 @@ async def cancel_user_pending_requests(user_id: int) -> None:
 
 async def create_case(reporter_id: int, target_type: str, target_id: int, reason: str, proof: Optional[str] = None) -> int:
     """Create a new report case. Returns case ID."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         cursor = await conn.execute(
             "INSERT INTO cases (reporter_id, target_type, target_id, reason, proof) VALUES (?, ?, ?, ?, ?)",
             (reporter_id, target_type, target_id, reason, proof)
@@ -1691,17 +3678,17 @@ async def create_case(reporter_id: int, target_type: str, target_id: int, reason
 
 async def get_case(case_id: int) -> Optional[Dict[str, Any]]:
     """Get case by ID."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             "SELECT * FROM cases WHERE id = ?", (case_id,)
         )
         row = await cursor.fetchone()
-        return dict(row) if row else None
+        return _record(Case, cursor, row)
 
 
 async def update_case_status(case_id: int, status: str) -> None:
     """Update case status."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         await conn.execute(
             "UPDATE cases SET status = ? WHERE id = ?",
             (status, case_id)
@@ -1711,7 +3698,7 @@ async def update_case_status(case_id: int, status: str) -> None:
 
 async def resolve_case(case_id: int, mod_id: int, verdict: str, verdict_reason: str, punishment: Optional[str] = None) -> None:
     """Resolve a case with verdict."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         appeal_deadline = (datetime.now(timezone.utc) + timedelta(days=7)).isoformat()
         
         await conn.execute(
@@ -1731,12 +3718,12 @@ async def resolve_case(case_id: int, mod_id: int, verdict: str, verdict_reason:
 
 async def get_open_cases() -> List[Dict[str, Any]]:
     """Get all open/investigating cases."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             "SELECT * FROM cases WHERE status IN ('open', 'investigating') ORDER BY created_at"
         )
         rows = await cursor.fetchall()
-        return [dict(row) for row in rows]
+        return _records(Case, cursor, rows)
 
 
 # =============================================================================
@@ -1745,7 +3732,7 @@ async def get_open_cases() -> List[Dict[str, Any]]:
 
 async def create_appeal(case_id: int, user_id: int, reason: str, proof: Optional[str] = None) -> int:
     """Create an appeal for a case. Returns appeal ID."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         cursor = await conn.execute(
             "INSERT INTO appeals (case_id, user_id, reason, proof) VALUES (?, ?, ?, ?)",
             (case_id, user_id, reason, proof)
@@ -1758,7 +3745,7 @@ async def create_appeal(case_id: int, user_id: int, reason: str, proof: Optional
 
 async def get_appeal(appeal_id: int) -> Optional[Dict[str, Any]]:
     """Get appeal by ID."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             "SELECT * FROM appeals WHERE id = ?", (appeal_id,)
         )
@@ -1768,7 +3755,7 @@ async def get_appeal(appeal_id: int) -> Optional[Dict[str, Any]]:
 
 async def get_appeal_by_case(case_id: int) -> Optional[Dict[str, Any]]:
     """Get appeal for a case."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             "SELECT * FROM appeals WHERE case_id = ?", (case_id,)
         )
@@ -1778,7 +3765,7 @@ async def get_appeal_by_case(case_id: int) -> Optional[Dict[str, Any]]:
 
 async def resolve_appeal(appeal_id: int, mod_id: int, status: str, mod_verdict: str, mod_reason: str) -> None:
     """Resolve an appeal."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         # Get appeal to find case_id
         cursor = await conn.execute("SELECT case_id FROM appeals WHERE id = ?", (appeal_id,))
         row = await cursor.fetchone()
@@ -1805,9 +3792,150 @@ async def resolve_appeal(appeal_id: int, mod_id: int, status: str, mod_verdict:
 # SYSTEM BANS CRUD
 # =============================================================================
 
+class _SanctionSets:
+    """
+    Active system bans and frozen clans, held in memory: one snapshot per database
+    file (both tables hold a handful of rows and change only on mod actions).
+
+    - Ban expiry is checked on every lookup (`expires_ts` against epoch_now()), so a
+      temporary ban lapses on time without a reload.
+    - Every sanction write drops the snapshot once it commits; the next lookup
+      reloads it (2 queries). A rolled-back scope leaves it alone.
+    - Lookups inside transaction() use the snapshot too, unless the scope itself
+      wrote a sanction (then they read the scope connection).
+    """
+
+    def __init__(self):
+        self.self_check = False
+        self._bans: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        self._frozen: Dict[int, Dict[str, Any]] = {}
+        self._path: Optional[Path] = None
+        self._version = 0
+        self.stats = {"hits": 0, "fallbacks": 0, "loads": 0, "invalidations": 0, "mismatches": 0}
+
+    async def _sync(self) -> bool:
+        """Make sure the snapshot is loaded. False if the caller must query."""
+        scope = _active_scope()
+        if scope is not None and "sanctions" in scope.dirty:
+            return False
+        if self._path == DB_PATH:
+            return True
+        if scope is not None:
+            return False  # never load through a scope connection
+        version = self._version
+        async with get_read_connection() as conn:
+            cursor = await conn.execute(
+                "SELECT * FROM system_bans WHERE expires_at IS NULL OR expires_ts > ?", (epoch_now(),)
+            )
+            bans = await cursor.fetchall()
+            cursor = await conn.execute("SELECT * FROM clan_flags WHERE is_frozen = 1")
+            frozen = await cursor.fetchall()
+        if version != self._version:
+            return False
+        self._bans = {(row["entity_type"], row["entity_id"]): dict(row) for row in bans}
+        self._frozen = {row["clan_id"]: dict(row) for row in frozen}
+        self._path = DB_PATH
+        self.stats["loads"] += 1
+        return True
+
+    def _active_ban(self, entity_type: str, entity_id: int, now: int) -> Optional[Dict[str, Any]]:
+        ban = self._bans.get((entity_type, entity_id))
+        if ban is None:
+            return None
+        if ban["expires_at"] is not None and (ban["expires_ts"] is None or ban["expires_ts"] <= now):
+            return None
+        return ban
+
+    async def ban(self, entity_type: str, entity_id: int) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """(answered, active ban row copy). answered=False means: query instead."""
+        if not await self._sync():
+            self.stats["fallbacks"] += 1
+            return False, None
+        self.stats["hits"] += 1
+        ban = self._active_ban(entity_type, entity_id, epoch_now())
+        return True, dict(ban) if ban else None
+
+    async def lookup(self, user_ids: List[int], clan_ids: List[int]) -> Optional[Dict[str, Set[int]]]:
+        if not await self._sync():
+            self.stats["fallbacks"] += 1
+            return None
+        self.stats["hits"] += 1
+        now = epoch_now()
+        return {
+            "banned_users": {u for u in user_ids if self._active_ban("user", u, now)},
+            "banned_clans": {c for c in clan_ids if self._active_ban("clan", c, now)},
+            "frozen_clans": {c for c in clan_ids if c in self._frozen},
+        }
+
+    def invalidate(self) -> None:
+        self._version += 1
+        self._path = None
+        self.stats["invalidations"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "bans": len(self._bans), "frozen": len(self._frozen)}
+
+
+_sanctions = _SanctionSets()
+_sanctions.self_check = config.DB_CACHE_SELF_CHECK
+
+
+def _sanctions_written() -> None:
+    """Call inside the write block of anything that changes system_bans / clan_flags."""
+    scope = _active_scope()
+    if scope is not None:
+        scope.dirty.add("sanctions")
+    _after_commit(_sanctions.invalidate)
+
+
+async def _select_sanctions(user_ids: List[int], clan_ids: List[int]) -> Dict[str, Set[int]]:
+    result: Dict[str, Set[int]] = {"banned_users": set(), "banned_clans": set(), "frozen_clans": set()}
+    async with get_read_connection() as conn:
+        for entity_type, ids in (("user", user_ids), ("clan", clan_ids)):
+            if not ids:
+                continue
+            cursor = await conn.execute(
+                f"""SELECT entity_id FROM system_bans
+                    WHERE entity_type = ? AND entity_id IN ({','.join('?' * len(ids))})
+                    AND (expires_at IS NULL OR expires_ts > ?)""",
+                (entity_type, *ids, epoch_now())
+            )
+            result[f"banned_{entity_type}s"] = {row[0] for row in await cursor.fetchall()}
+        if clan_ids:
+            cursor = await conn.execute(
+                f"SELECT clan_id FROM clan_flags WHERE is_frozen = 1 AND clan_id IN ({','.join('?' * len(clan_ids))})",
+                tuple(clan_ids)
+            )
+            result["frozen_clans"] = {row[0] for row in await cursor.fetchall()}
+    return result
+
+
+async def get_sanctions(user_ids: Iterable[int] = (), clan_ids: Iterable[int] = ()) -> Dict[str, Set[int]]:
+    """
+    Check many entities at once.
+    Returns {"banned_users", "banned_clans", "frozen_clans"}: the given ids that are sanctioned.
+    """
+    user_ids = list(dict.fromkeys(u for u in user_ids if u is not None))
+    clan_ids = list(dict.fromkeys(c for c in clan_ids if c is not None))
+    result = await _sanctions.lookup(user_ids, clan_ids)
+    if result is None:
+        return await _select_sanctions(user_ids, clan_ids)
+    if _sanctions.self_check:
+        fresh = await _select_sanctions(user_ids, clan_ids)
+        if fresh != result:
+            _sanctions.stats["mismatches"] += 1
+            raise AssertionError(f"[DB] sanction snapshot is stale: {result} != {fresh}")
+    return result
+
+
+def get_sanction_stats() -> Dict[str, Any]:
+    """Sanction snapshot metrics: hits, fallbacks, loads, invalidations, bans, frozen."""
+    return _sanctions.get_stats()
+
+
 async def add_system_ban(entity_type: str, entity_id: int, reason: str, mod_id: int, expires_at: Optional[str] = None) -> int:
     """Add a system ban. Returns ban ID."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         cursor = await conn.execute(
             """INSERT INTO system_bans (entity_type, entity_id, reason, banned_by_mod_user_id, expires_at)
                VALUES (?, ?, ?, ?, ?)
@@ -1816,29 +3944,42 @@ async def add_system_ban(entity_type: str, entity_id: int, reason: str, mod_id:
                              banned_at = datetime('now'), expires_at = excluded.expires_at""",
             (entity_type, entity_id, reason, mod_id, expires_at)
         )
+        _sanctions_written()
         await conn.commit()
         return cursor.lastrowid
 
 
 async def remove_system_ban(entity_type: str, entity_id: int) -> bool:
     """Remove a system ban. Returns True if removed, False if not found."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         cursor = await conn.execute(
             "DELETE FROM system_bans WHERE entity_type = ? AND entity_id = ?",
             (entity_type, entity_id)
         )
+        _sanctions_written()
         await conn.commit()
         return cursor.rowcount > 0
 
 
 async def get_system_ban(entity_type: str, entity_id: int) -> Optional[Dict[str, Any]]:
-    """Get active system ban for an entity (checks expiration)."""
-    async with get_connection() as conn:
+    """Get active system ban for an entity (checks expiration). Served from the sanction snapshot."""
+    answered, ban = await _sanctions.ban(entity_type, entity_id)
+    if answered and not _sanctions.self_check:
+        return ban
+    fresh = await _select_system_ban(entity_type, entity_id)
+    if answered and fresh != ban:
+        _sanctions.stats["mismatches"] += 1
+        raise AssertionError(f"[DB] sanction snapshot is stale for {entity_type} {entity_id}: {ban} != {fresh}")
+    return fresh
+
+
+async def _select_system_ban(entity_type: str, entity_id: int) -> Optional[Dict[str, Any]]:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             """SELECT * FROM system_bans 
                WHERE entity_type = ? AND entity_id = ?
-               AND (expires_at IS NULL OR expires_at > datetime('now'))""",
-            (entity_type, entity_id)
+               AND (expires_at IS NULL OR expires_ts > ?)""",
+            (entity_type, entity_id, epoch_now())
         )
         row = await cursor.fetchone()
         return dict(row) if row else None
@@ -1862,7 +4003,7 @@ async def is_clan_system_banned(clan_id: int) -> bool:
 
 async def get_clan_flags(clan_id: int) -> Optional[Dict[str, Any]]:
     """Get clan flags."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             "SELECT * FROM clan_flags WHERE clan_id = ?", (clan_id,)
         )
@@ -1872,7 +4013,7 @@ async def get_clan_flags(clan_id: int) -> Optional[Dict[str, Any]]:
 
 async def set_clan_frozen(clan_id: int, reason: str, mod_id: int) -> None:
     """Freeze a clan (Elo will not be applied)."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         await conn.execute(
             """INSERT INTO clan_flags (clan_id, is_frozen, frozen_reason, frozen_by_mod_user_id, frozen_at)
                VALUES (?, 1, ?, ?, datetime('now'))
@@ -1881,24 +4022,25 @@ async def set_clan_frozen(clan_id: int, reason: str, mod_id: int) -> None:
                              frozen_by_mod_user_id = excluded.frozen_by_mod_user_id, frozen_at = datetime('now')""",
             (clan_id, reason, mod_id)
         )
+        _sanctions_written()
         await conn.commit()
 
 
 async def unset_clan_frozen(clan_id: int) -> bool:
     """Unfreeze a clan. Returns True if was frozen, False otherwise."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         cursor = await conn.execute(
             "UPDATE clan_flags SET is_frozen = 0, frozen_reason = NULL, frozen_by_mod_user_id = NULL, frozen_at = NULL WHERE clan_id = ? AND is_frozen = 1",
             (clan_id,)
         )
+        _sanctions_written()
         await conn.commit()
         return cursor.rowcount > 0
 
 
 async def is_clan_frozen(clan_id: int) -> bool:
-    """Check if clan is frozen."""
-    flags = await get_clan_flags(clan_id)
-    return flags is not None and flags.get("is_frozen") == 1
+    """Check if clan is frozen (sanction snapshot)."""
+    return clan_id in (await get_sanctions(clan_ids=[clan_id]))["frozen_clans"]
 
 
 # =============================================================================
@@ -1907,7 +4049,7 @@ async def is_clan_frozen(clan_id: int) -> bool:
 
 async def add_case_action(case_id: int, action_type: str, mod_id: int, target_info: Optional[str] = None, payload_json: Optional[str] = None) -> int:
     """Log a case action. Returns action ID."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         cursor = await conn.execute(
             """INSERT INTO case_actions (case_id, action_type, target_info, payload_json, performed_by_mod_user_id)
                VALUES (?, ?, ?, ?, ?)""",
@@ -1919,7 +4061,7 @@ async def add_case_action(case_id: int, action_type: str, mod_id: int, target_in
 
 async def get_case_actions(case_id: int) -> List[Dict[str, Any]]:
     """Get all actions for a case."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             "SELECT * FROM case_actions WHERE case_id = ? ORDER BY performed_at",
             (case_id,)
@@ -1934,7 +4076,7 @@ async def get_case_actions(case_id: int) -> List[Dict[str, Any]]:
 
 async def get_cases_filtered(status: Optional[str] = None, target_type: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
     """Get cases with optional filters."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         query = "SELECT * FROM cases WHERE 1=1"
         params = []
         
@@ -1950,12 +4092,12 @@ async def get_cases_filtered(status: Optional[str] = None, target_type: Optional
         
         cursor = await conn.execute(query, params)
         rows = await cursor.fetchall()
-        return [dict(row) for row in rows]
+        return _records(Case, cursor, rows)
 
 
 async def close_case(case_id: int) -> None:
     """Close a case."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         await conn.execute(
             "UPDATE cases SET status = 'closed' WHERE id = ?",
             (case_id,)
@@ -1969,11 +4111,12 @@ async def close_case(case_id: int) -> None:
 
 async def void_match(match_id: int) -> bool:
     """Void a match (mark as cancelled by mod). Returns True if voided, False if already terminal."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         cursor = await conn.execute(
             "UPDATE matches SET status = 'voided' WHERE id = ? AND status NOT IN ('voided', 'cancelled')",
             (match_id,)
         )
+        invalidate_matches(match_id)
         await conn.commit()
         return cursor.rowcount > 0
 
@@ -1984,7 +4127,7 @@ async def void_match(match_id: int) -> bool:
 
 async def get_elo_history_for_match(match_id: int) -> List[Dict[str, Any]]:
     """Get Elo history entries for a specific match."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             "SELECT * FROM elo_history WHERE match_id = ? ORDER BY created_at",
             (match_id,)
@@ -1995,7 +4138,7 @@ async def get_elo_history_for_match(match_id: int) -> List[Dict[str, Any]]:
 
 async def set_clan_elo_directly(clan_id: int, new_elo: int) -> int:
     """Set clan Elo directly. Returns old Elo value."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         cursor = await conn.execute("SELECT elo FROM clans WHERE id = ?", (clan_id,))
         row = await cursor.fetchone()
         if not row:
@@ -2006,17 +4149,19 @@ async def set_clan_elo_directly(clan_id: int, new_elo: int) -> int:
             "UPDATE clans SET elo = ?, updated_at = datetime('now') WHERE id = ?",
             (new_elo, clan_id)
         )
+        invalidate_clan(clan_id)
         await conn.commit()
         return old_elo
 
 
 async def mark_match_elo_rolled_back(match_id: int) -> None:
     """Mark a match as having its Elo rolled back."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         await conn.execute(
             "UPDATE matches SET elo_applied = 0 WHERE id = ?",
             (match_id,)
         )
+        invalidate_matches(match_id)
         await conn.commit()
 
 
@@ -2025,26 +4170,31 @@ async def hard_delete_clan(clan_id: int) -> None:
     Completely remove a clan and all its related data (matches, loans, transfers, etc.)
     from the database. This is used when a mod deletes a clan or creation fails.
     """
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         # 1. Delete basic relations (ON DELETE CASCADE in schema would handle some, 
         # but we do it manually to be safe and clear)
         await conn.execute("DELETE FROM clan_members WHERE clan_id = ?", (clan_id,))
+        invalidate_members(clan_id=clan_id)
         await conn.execute("DELETE FROM create_requests WHERE clan_id = ?", (clan_id,))
         await conn.execute("DELETE FROM invite_requests WHERE clan_id = ?", (clan_id,))
         await conn.execute("DELETE FROM clan_flags WHERE clan_id = ?", (clan_id,))
+        _sanctions_written()
         await conn.execute("DELETE FROM elo_history WHERE clan_id = ?", (clan_id,))
         
         # 2. Delete complex relations (these have ON DELETE RESTRICT in schema)
         await conn.execute("DELETE FROM matches WHERE clan_a_id = ? OR clan_b_id = ?", (clan_id, clan_id))
+        invalidate_matches()
         await conn.execute("DELETE FROM loans WHERE lending_clan_id = ? OR borrowing_clan_id = ?", (clan_id, clan_id))
         await conn.execute("DELETE FROM transfers WHERE source_clan_id = ? OR dest_clan_id = ?", (clan_id, clan_id))
         
         # 3. Delete metadata
         await conn.execute("DELETE FROM cooldowns WHERE target_type = 'clan' AND target_id = ?", (clan_id,))
+        _cooldowns_removed("clan", clan_id)
         await conn.execute("DELETE FROM cases WHERE target_type = 'clan' AND target_id = ?", (clan_id,))
         
         # 4. Finally delete the clan itself
         await conn.execute("DELETE FROM clans WHERE id = ?", (clan_id,))
+        invalidate_clan(clan_id)
         await conn.commit()
 
 
@@ -2054,19 +4204,19 @@ async def hard_delete_clan(clan_id: int) -> None:
 
 async def get_all_active_clans() -> List[Dict[str, Any]]:
     """Get all clans with status 'active'."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             "SELECT * FROM clans WHERE status = 'active' ORDER BY elo DESC"
         )
         rows = await cursor.fetchall()
-        return [dict(row) for row in rows]
+        return _records(Clan, cursor, rows)
 
 
 
 
 async def get_recent_matches(limit: int = 10, include_cancelled: bool = False) -> List[Dict[str, Any]]:
     """Get recent matches, ordered by created_at descending."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         query = "SELECT * FROM matches"
         if not include_cancelled:
             query += " WHERE status != 'cancelled'"
@@ -2074,7 +4224,7 @@ async def get_recent_matches(limit: int = 10, include_cancelled: bool = False) -
         
         cursor = await conn.execute(query, (limit,))
         rows = await cursor.fetchall()
-        return [dict(row) for row in rows]
+        return _records(Match, cursor, rows)
 
 
 # =============================================================================
@@ -2083,73 +4233,63 @@ async def get_recent_matches(limit: int = 10, include_cancelled: bool = False) -
 
 async def get_active_cooldown(target_id: int, target_type: str, kind: str) -> Optional[Dict[str, Any]]:
     """Get an active cooldown for a target. Returns None if no active cooldown exists."""
-    async with get_connection() as conn:
-        cursor = await conn.execute(
-            """SELECT * FROM cooldowns 
-               WHERE target_id = ? AND target_type = ? AND kind = ? 
-               AND DATETIME(until) > datetime('now')""",
-            (target_id, target_type, kind)
-        )
-        row = await cursor.fetchone()
-        return dict(row) if row else None
+    return await get_cooldown(target_type, target_id, kind)
 
 
-async def get_all_user_cooldowns(user_id: int) -> List[Dict[str, Any]]:
-    """Get all active cooldowns for a user (FUSED: checks both systems)."""
-    async with get_connection() as conn:
-        # 1. New table
+async def _select_user_cooldowns(user_id: int) -> List[Dict[str, Any]]:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             """SELECT * FROM cooldowns 
                WHERE target_id = ? AND target_type = 'user' 
-               AND DATETIME(until) > datetime('now')""",
-            (user_id,)
+               AND until_ts > ?
+               ORDER BY id""",
+            (user_id, epoch_now())
         )
         rows = await cursor.fetchall()
-        cooldowns = [dict(row) for row in rows]
-        
-        # 2. Legacy check (for UI visibility before lazy migration)
-        cursor = await conn.execute(
-            "SELECT cooldown_until FROM users WHERE id = ? AND cooldown_until IS NOT NULL",
-            (user_id,)
-        )
-        user_row = await cursor.fetchone()
-        
-        if user_row:
-            legacy_until = user_row["cooldown_until"]
-            try:
-                # Basic check if it's in the future
-                if legacy_until.endswith('Z'):
-                    until_str = legacy_until.replace('Z', '+00:00')
-                else:
-                    until_str = legacy_until
-                
-                if datetime.fromisoformat(until_str) > datetime.now(timezone.utc):
-                    # Check if not already in the list
-                    if not any(c["kind"] == "join_leave" for c in cooldowns):
-                        cooldowns.append({
-                            "target_type": "user",
-                            "target_id": user_id,
-                            "kind": "join_leave",
-                            "until": legacy_until,
-                            "reason": "Legacy join cooldown"
-                        })
-            except Exception:
-                pass
-                
-        return cooldowns
+        return _records(Cooldown, cursor, rows)
+
+
+async def get_all_user_cooldowns(user_id: int) -> List[Dict[str, Any]]:
+    """Get all active cooldowns for a user (FUSED: checks both systems). No query when the indexes are warm."""
+    # 1. New table
+    cooldowns = await _cooldowns.of_target("user", user_id)
+    if cooldowns is None or _cooldowns.self_check:
+        fresh = await _select_user_cooldowns(user_id)
+        if cooldowns is not None and [dict(c) for c in cooldowns] != [dict(c) for c in fresh]:
+            _cooldowns.stats["mismatches"] += 1
+            raise AssertionError(f"[DB] cooldown index is stale for user {user_id}")
+        cooldowns = fresh
+
+    # 2. Legacy check (for UI visibility before lazy migration)
+    user_row = await get_user_by_id(user_id)
+    if user_row and user_row["cooldown_until"]:
+        legacy_until = user_row["cooldown_until"]
+        try:
+            # Basic check if it's in the future
+            if legacy_until.endswith('Z'):
+                until_str = legacy_until.replace('Z', '+00:00')
+            else:
+                until_str = legacy_until
+            
+            if datetime.fromisoformat(until_str) > datetime.now(timezone.utc):
+                # Check if not already in the list
+                if not any(c["kind"] == "join_leave" for c in cooldowns):
+                    cooldowns.append({
+                        "target_type": "user",
+                        "target_id": user_id,
+                        "kind": "join_leave",
+                        "until": legacy_until,
+                        "reason": "Legacy join cooldown"
+                    })
+        except Exception:
+            pass
+            
+    return cooldowns
 
 
 async def is_user_banned(user_id: int) -> Optional[Dict[str, Any]]:
     """Check if a user is system-banned. Returns ban info or None."""
-    async with get_connection() as conn:
-        cursor = await conn.execute(
-            """SELECT * FROM system_bans 
-               WHERE entity_type = 'user' AND entity_id = ?
-               AND (expires_at IS NULL OR DATETIME(expires_at) > datetime('now'))""",
-            (user_id,)
-        )
-        row = await cursor.fetchone()
-        return dict(row) if row else None
+    return await get_system_ban("user", user_id)
 
 
 # =============================================================================
@@ -2158,7 +4298,7 @@ async def is_user_banned(user_id: int) -> Optional[Dict[str, Any]]:
 
 async def create_lfg_post(user_id: int, riot_id: str, rank: str, role: str, tracker_link: str, note: str) -> int:
     """Create a new LFG post and close previous ones for the same user."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         # Close old posts
         await conn.execute(
             "UPDATE lfg_posts SET status = 'closed', updated_at = datetime('now') WHERE user_id = ? AND status = 'active'",
@@ -2175,7 +4315,7 @@ async def create_lfg_post(user_id: int, riot_id: str, rank: str, role: str, trac
 
 async def get_active_lfg_post(user_id: int) -> Optional[Dict[str, Any]]:
     """Get the active LFG post for a user."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             "SELECT * FROM lfg_posts WHERE user_id = ? AND status = 'active'",
             (user_id,)
@@ -2185,7 +4325,7 @@ async def get_active_lfg_post(user_id: int) -> Optional[Dict[str, Any]]:
 
 async def close_lfg_post(post_id: int) -> bool:
     """Close an LFG post."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         cursor = await conn.execute(
             "UPDATE lfg_posts SET status = 'closed', updated_at = datetime('now') WHERE id = ?",
             (post_id,)
@@ -2195,7 +4335,7 @@ async def close_lfg_post(post_id: int) -> bool:
 
 async def get_lfg_post_by_id(post_id: int) -> Optional[Dict[str, Any]]:
     """Get LFG post by ID."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             "SELECT * FROM lfg_posts WHERE id = ?",
             (post_id,)
@@ -2210,7 +4350,7 @@ async def get_lfg_post_by_id(post_id: int) -> Optional[Dict[str, Any]]:
 
 async def get_won_matches_by_clan(clan_id: int, limit: int = 25) -> List[Dict[str, Any]]:
     """Get recent confirmed/resolved matches where the specified clan was the winner."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             """SELECT m.*, 
                       c1.name as clan_a_name, c2.name as clan_b_name
@@ -2226,35 +4366,133 @@ async def get_won_matches_by_clan(clan_id: int, limit: int = 25) -> List[Dict[st
             (clan_id, limit)
         )
         rows = await cursor.fetchall()
-        return [dict(row) for row in rows]
+        return _records(Match, cursor, rows)
 
 
 # =============================================================================
 # SYSTEM SETTINGS
 # =============================================================================
 
+class _SettingsCache:
+    """
+    Snapshot of the whole `system_settings` table (a handful of rows that almost
+    never change), loaded once per database file and kept current by
+    set_system_setting(). Reads are a dict lookup.
+
+    - A write outside transaction() updates the snapshot after its commit.
+    - A write inside transaction() marks the key stale when the scope commits;
+      the next read refetches that one row. A rolled-back scope leaves it alone.
+    - Reads inside a transaction() that has not written a setting are served from
+      the snapshot; once it has, they go to the scope connection (read-your-own-writes).
+    `_version` is bumped by every write so a read that raced one never re-inserts
+    the value it fetched before the commit.
+    """
+
+    def __init__(self):
+        self._values: Dict[str, Any] = {}
+        self._stale: set = set()
+        self._path: Optional[Path] = None
+        self._version = 0
+        self.stats = {"hits": 0, "misses": 0, "loads": 0, "writes": 0}
+
+    def _loaded(self) -> bool:
+        return self._path == DB_PATH
+
+    async def load(self) -> None:
+        """(Re)load the snapshot from the database."""
+        version = self._version
+        async with get_read_connection() as conn:
+            cursor = await conn.execute("SELECT key, value FROM system_settings")
+            rows = await cursor.fetchall()
+        if version != self._version:
+            return  # A write landed meanwhile; the next read loads again
+        self._values = {row[0]: row[1] for row in rows}
+        self._stale.clear()
+        self._path = DB_PATH
+        self.stats["loads"] += 1
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        scope = _active_scope()
+        if scope is None or "settings" not in scope.dirty:
+            if scope is None and not self._loaded():
+                await self.load()  # never load through a scope connection
+            if self._loaded() and key not in self._stale:
+                self.stats["hits"] += 1
+                return self._values.get(key, default)
+
+        self.stats["misses"] += 1
+        version = self._version
+        async with get_read_connection() as conn:
+            cursor = await conn.execute("SELECT value FROM system_settings WHERE key = ?", (key,))
+            row = await cursor.fetchone()
+        if _active_scope() is None and version == self._version and self._loaded():
+            if row:
+                self._values[key] = row[0]
+            else:
+                self._values.pop(key, None)
+            self._stale.discard(key)
+        return row[0] if row else default
+
+    def put(self, key: str, value: str) -> None:
+        """Publish a committed write."""
+        self._version += 1
+        self.stats["writes"] += 1
+        if self._loaded():
+            self._values[key] = value
+            self._stale.discard(key)
+
+    def invalidate(self, key: str) -> None:
+        self._version += 1
+        self.stats["writes"] += 1
+        if self._loaded():
+            self._stale.add(key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "keys": len(self._values) if self._loaded() else 0,
+            "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+        }
+
+
+_settings_cache = _SettingsCache()
+
+
+async def load_system_settings() -> None:
+    """Load the system_settings snapshot (called once at startup)."""
+    await _settings_cache.load()
+
+
+def get_settings_cache_stats() -> Dict[str, Any]:
+    """Settings cache metrics: hits, misses, loads, writes, keys, hit_rate."""
+    return _settings_cache.get_stats()
+
+
 async def set_system_setting(key: str, value: Any) -> None:
     """Set a system setting."""
-    async with get_connection() as conn:
+    value = str(value)
+    scope = _active_scope()
+    if scope is not None:
+        scope.dirty.add("settings")
+    async with _write_connection() as conn:
         await conn.execute(
             """INSERT INTO system_settings (key, value, updated_at) 
                VALUES (?, ?, datetime('now'))
                ON CONFLICT(key) DO UPDATE SET 
                value = excluded.value, 
                updated_at = excluded.updated_at""",
-            (key, str(value))
+            (key, value)
         )
         await conn.commit()
+    if in_transaction():
+        _after_commit(lambda: _settings_cache.invalidate(key))
+    else:
+        _settings_cache.put(key, value)
 
 async def get_system_setting(key: str, default: Any = None) -> Any:
-    """Get a system setting."""
-    async with get_connection() as conn:
-        cursor = await conn.execute(
-            "SELECT value FROM system_settings WHERE key = ?",
-            (key,)
-        )
-        row = await cursor.fetchone()
-        return row[0] if row else default
+    """Get a system setting (served from the in-memory snapshot)."""
+    return await _settings_cache.get(key, default)
 
 async def is_matchmaking_locked() -> tuple[bool, str]:
     """Check if matchmaking is locked. Returns (is_locked, reason)."""
@@ -2271,18 +4509,18 @@ async def is_matchmaking_locked() -> tuple[bool, str]:
 
 async def get_expired_tryouts() -> List[Dict[str, Any]]:
     """Get all members whose tryout period has expired."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             """SELECT cm.*, c.name as clan_name, c.status as clan_status, u.discord_id
                FROM clan_members cm
                JOIN clans c ON cm.clan_id = c.id
                JOIN users u ON cm.user_id = u.id
                WHERE cm.join_type = 'tryout' 
-                 AND cm.tryout_expires_at IS NOT NULL 
-                 AND cm.tryout_expires_at < datetime('now')"""
+                 AND cm.tryout_expires_ts < ?""",
+            (epoch_now(),)
         )
         rows = await cursor.fetchall()
-        return [dict(row) for row in rows]
+        return _records(ClanMember, cursor, rows)
 
 
 # =============================================================================
@@ -2291,19 +4529,21 @@ async def get_expired_tryouts() -> List[Dict[str, Any]]:
 
 async def update_member_rank(user_id: int, clan_id: int, rank: str, rank_score: int) -> None:
     """Update valorant rank for a clan member."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         await conn.execute(
             """UPDATE clan_members 
                SET valorant_rank = ?, valorant_rank_score = ?
                WHERE user_id = ? AND clan_id = ?""",
             (rank, rank_score, user_id, clan_id)
         )
+        _data_changed("members")  # Leaderboard shows the average rank
+        invalidate_tags(f"members:{clan_id}", f"user:{user_id}")
         await conn.commit()
 
 
 async def get_clan_avg_rank(clan_id: int) -> float:
     """Get average rank score for a clan. Only counts members with declared rank."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             """SELECT AVG(valorant_rank_score) as avg_score
                FROM clan_members WHERE clan_id = ? AND valorant_rank_score IS NOT NULL AND valorant_rank_score > 0""",
@@ -2317,7 +4557,7 @@ async def count_high_rank_members(clan_id: int, min_score: int = None) -> int:
     """Count members with rank_score >= min_score. Used for Rank Cap (F7)."""
     if min_score is None:
         min_score = config.RANK_CAP_THRESHOLD
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             "SELECT COUNT(*) as count FROM clan_members WHERE clan_id = ? AND valorant_rank_score >= ?",
             (clan_id, min_score)
@@ -2328,7 +4568,7 @@ async def count_high_rank_members(clan_id: int, min_score: int = None) -> int:
 
 async def get_undeclared_members(clan_id: int) -> List[Dict[str, Any]]:
     """Get members who haven't declared their rank. Used to block competition."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             """SELECT cm.user_id, u.discord_id, u.riot_id
                FROM clan_members cm
@@ -2337,17 +4577,17 @@ async def get_undeclared_members(clan_id: int) -> List[Dict[str, Any]]:
             (clan_id,)
         )
         rows = await cursor.fetchall()
-        return [dict(row) for row in rows]
+        return _records(ClanMember, cursor, rows)
 
 
 async def count_recent_recruits(clan_id: int, days: int = 7) -> int:
     """Count successful invites/recruits in the last N days. Used for Recruitment Cap (F1)."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             """SELECT COUNT(*) as count FROM invite_requests
                WHERE clan_id = ? AND status = 'accepted'
-               AND responded_at >= datetime('now', ? || ' days')""",
-            (clan_id, f"-{days}")
+               AND responded_ts >= ?""",
+            (clan_id, epoch_now(days=-days))
         )
         row = await cursor.fetchone()
         return row["count"]
@@ -2359,56 +4599,44 @@ async def get_clans_for_decay(elo_threshold: int = None, inactivity_days: int =
         elo_threshold = config.ELO_DECAY_THRESHOLD
     if inactivity_days is None:
         inactivity_days = config.ELO_DECAY_INACTIVITY_DAYS
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             """SELECT c.id, c.name, c.elo FROM clans c
                WHERE c.status = 'active' AND c.elo > ?
                AND c.id NOT IN (
                    SELECT DISTINCT clan_a_id FROM matches 
-                   WHERE created_at >= datetime('now', ? || ' days')
+                   WHERE created_ts >= ?
                    AND status IN ('confirmed', 'resolved')
                    UNION
                    SELECT DISTINCT clan_b_id FROM matches 
-                   WHERE created_at >= datetime('now', ? || ' days')
+                   WHERE created_ts >= ?
                    AND status IN ('confirmed', 'resolved')
                )""",
-            (elo_threshold, f"-{inactivity_days}", f"-{inactivity_days}")
+            (elo_threshold, epoch_now(days=-inactivity_days), epoch_now(days=-inactivity_days))
         )
         rows = await cursor.fetchall()
-        return [dict(row) for row in rows]
+        return _records(Clan, cursor, rows)
 
 
 async def apply_elo_decay(clan_id: int, amount: int, floor: int = None) -> Dict[str, Any]:
     """Apply Elo decay to a clan. Returns {old_elo, new_elo, change}."""
     if floor is None:
         floor = config.ELO_FLOOR
-    async with get_connection() as conn:
-        cursor = await conn.execute("SELECT elo FROM clans WHERE id = ?", (clan_id,))
-        row = await cursor.fetchone()
-        if not row:
-            return {"success": False, "reason": "clan_not_found"}
-        
-        old_elo = row["elo"]
-        new_elo = max(old_elo - amount, floor)
-        change = new_elo - old_elo
-        
-        if change == 0:
-            return {"success": True, "old_elo": old_elo, "new_elo": new_elo, "change": 0, "skipped": True}
-    
-    # Use update_clan_elo for proper history tracking
-    await update_clan_elo(clan_id, new_elo, None, "elo_decay")
-    return {"success": True, "old_elo": old_elo, "new_elo": new_elo, "change": change, "skipped": False}
+    result = await adjust_clan_elo(clan_id, -amount, "elo_decay", floor=floor)
+    if result is None:
+        return {"success": False, "reason": "clan_not_found"}
+    return {"success": True, **result, "skipped": result["change"] == 0}
 
 
 async def get_clan_activity_count(clan_id: int, days: int = 7) -> int:
     """Count confirmed/resolved matches for a clan in the last N days."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             """SELECT COUNT(*) as count FROM matches
                WHERE (clan_a_id = ? OR clan_b_id = ?)
                AND status IN ('confirmed', 'resolved')
-               AND created_at >= datetime('now', ? || ' days')""",
-            (clan_id, clan_id, f"-{days}")
+               AND created_ts >= ?""",
+            (clan_id, clan_id, epoch_now(days=-days))
         )
         row = await cursor.fetchone()
         return row["count"]
@@ -2416,7 +4644,7 @@ async def get_clan_activity_count(clan_id: int, days: int = 7) -> int:
 
 async def get_clan_win_rate(clan_id: int, last_n: int = 10) -> Dict[str, Any]:
     """Calculate clan's win rate over their last N confirmed/resolved matches."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             """SELECT id, winner_clan_id FROM matches
                WHERE (clan_a_id = ? OR clan_b_id = ?)
@@ -2450,7 +4678,7 @@ async def toggle_balance_feature(feature: str, enabled: bool) -> None:
 
 async def save_match_roster(match_id: int, side: str, roster_json: str, avg_rank: float) -> None:
     """Save roster for a match side ('a' or 'b'). roster_json is a JSON string."""
-    async with get_connection() as conn:
+    async with _write_connection() as conn:
         if side == "a":
             await conn.execute(
                 "UPDATE matches SET roster_a = ?, avg_rank_a = ? WHERE id = ?",
@@ -2461,12 +4689,13 @@ async def save_match_roster(match_id: int, side: str, roster_json: str, avg_rank
                 "UPDATE matches SET roster_b = ?, avg_rank_b = ? WHERE id = ?",
                 (roster_json, avg_rank, match_id)
             )
+        invalidate_matches(match_id)
         await conn.commit()
 
 
 async def get_match_rosters(match_id: int) -> Dict[str, Any]:
     """Get roster data for a match. Returns {roster_a, roster_b, avg_rank_a, avg_rank_b}."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             "SELECT roster_a, roster_b, avg_rank_a, avg_rank_b FROM matches WHERE id = ?",
             (match_id,)
@@ -2477,10 +4706,10 @@ async def get_match_rosters(match_id: int) -> Dict[str, Any]:
 
 async def get_clan_member(user_id: int, clan_id: int) -> Dict[str, Any]:
     """Get a specific clan_member row for a user in a clan."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cursor = await conn.execute(
             "SELECT * FROM clan_members WHERE user_id = ? AND clan_id = ?",
             (user_id, clan_id)
         )
         row = await cursor.fetchone()
-        return dict(row) if row else None
+        return _record(ClanMember, cursor, row)
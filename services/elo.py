@@ -3,8 +3,8 @@ Elo Calculation Service
 Implements Elo rating formula with anti-farm mechanics
 """
 
-from typing import Dict, Any, Tuple
-from datetime import datetime, timedelta, timezone
+from dataclasses import dataclass
+from typing import Dict, Any, Tuple, Optional, FrozenSet
 from services import db
 import config
 
@@ -143,305 +143,404 @@ async def count_elo_matches_between_clans(clan_a_id: int, clan_b_id: int) -> int
     Count matches between two clans in the past 24 hours where Elo was applied.
     Order-independent (A vs B = B vs A).
     """
-    async with db.get_connection() as conn:
-        cutoff = (datetime.now(timezone.utc) - timedelta(hours=24)).isoformat()
+    async with db.get_read_connection() as conn:
+        cutoff = db.epoch_now(hours=-24)
         cursor = await conn.execute(
             """SELECT COUNT(*) as count FROM matches 
                WHERE ((clan_a_id = ? AND clan_b_id = ?) OR (clan_a_id = ? AND clan_b_id = ?))
                AND elo_applied = 1
-               AND created_at >= ?""",
+               AND created_ts >= ?""",
             (clan_a_id, clan_b_id, clan_b_id, clan_a_id, cutoff)
         )
         row = await cursor.fetchone()
         return row["count"]
 
 
+# =============================================================================
+# ELO ENGINE: prefetch -> pure compute -> one write
+# =============================================================================
+# apply_match_result() reads everything it needs in ONE statement (match row, both
+# clans, 24h pair count, both win rates, roster averages) into an immutable
+# MatchContext; sanctions and feature flags come from the in-memory snapshots.
+# compute_elo() is pure (no I/O, no clock) so it can be unit-tested and benchmarked
+# on its own; its result is then written in one batch inside the same transaction.
+
+BALANCE_FEATURES = ("win_rate_mod", "rank_elo_mod", "underdog_bonus", "elo_gain_cap")
+WIN_RATE_WINDOW = 10  # Last N confirmed/resolved matches (db.get_clan_win_rate default)
+
+
+@dataclass(frozen=True)
+class EloConfig:
+    """Tuning constants for compute_elo(). from_config() reads config.py."""
+    k_stable: int
+    k_placement: int
+    placement_matches: int
+    rating_scale: int
+    floor: int
+    max_gain_per_match: int
+    win_rate_min_matches: int
+    win_rate_high_threshold: float
+    win_rate_high_modifier: float
+    win_rate_low_threshold: float
+    win_rate_low_modifier: float
+    anti_farm_multipliers: Tuple[float, ...] = (1.0, 0.7, 0.4)
+    default_multiplier: float = DEFAULT_MULTIPLIER
+
+    @classmethod
+    def from_config(cls) -> "EloConfig":
+        return cls(
+            k_stable=config.ELO_K_STABLE,
+            k_placement=config.ELO_K_PLACEMENT,
+            placement_matches=config.ELO_PLACEMENT_MATCHES,
+            rating_scale=RATING_SCALE,
+            floor=config.ELO_FLOOR,
+            max_gain_per_match=config.ELO_MAX_GAIN_PER_MATCH,
+            win_rate_min_matches=config.WIN_RATE_MIN_MATCHES,
+            win_rate_high_threshold=config.WIN_RATE_HIGH_THRESHOLD,
+            win_rate_high_modifier=config.WIN_RATE_HIGH_MODIFIER,
+            win_rate_low_threshold=config.WIN_RATE_LOW_THRESHOLD,
+            win_rate_low_modifier=config.WIN_RATE_LOW_MODIFIER,
+            anti_farm_multipliers=tuple(ANTI_FARM_MULTIPLIERS[i] for i in sorted(ANTI_FARM_MULTIPLIERS)),
+        )
+
+
+@dataclass(frozen=True)
+class MatchContext:
+    """Everything compute_elo() needs about one match, fetched up front."""
+    match_id: int
+    status: str
+    elo_applied: bool
+    winner_clan_id: Optional[int]
+    score_a: Optional[int]
+    score_b: Optional[int]
+    clan_a_id: int
+    clan_b_id: int
+    clan_a_name: str
+    clan_b_name: str
+    clan_a_status: str
+    clan_b_status: str
+    elo_a: int
+    elo_b: int
+    matches_played_a: int
+    matches_played_b: int
+    pair_matches_24h: int = 0             # Elo-applied matches between the pair in the last 24h
+    win_rate_total_a: int = 0
+    win_rate_wins_a: int = 0
+    win_rate_total_b: int = 0
+    win_rate_wins_b: int = 0
+    avg_rank_a: Optional[float] = None
+    avg_rank_b: Optional[float] = None
+    frozen_clan_ids: FrozenSet[int] = frozenset()
+    banned_clan_ids: FrozenSet[int] = frozenset()
+    features: FrozenSet[str] = frozenset(BALANCE_FEATURES)
+
+
+# Same window as db.get_clan_win_rate(): last N decided confirmed/resolved matches
+_WIN_RATE_SQL = """(SELECT {agg} FROM (
+               SELECT x.winner_clan_id FROM matches x
+               WHERE (x.clan_a_id = m.{side} OR x.clan_b_id = m.{side})
+                 AND x.status IN ('confirmed', 'resolved') AND x.winner_clan_id IS NOT NULL
+               ORDER BY x.created_at DESC LIMIT :last_n) w)"""
+
+_MATCH_CONTEXT_SQL = f"""
+    SELECT m.id, m.status, m.elo_applied, m.score_a, m.score_b, m.avg_rank_a, m.avg_rank_b,
+           m.clan_a_id, m.clan_b_id,
+           ca.name AS clan_a_name, ca.status AS clan_a_status, ca.elo AS elo_a, ca.matches_played AS played_a,
+           cb.name AS clan_b_name, cb.status AS clan_b_status, cb.elo AS elo_b, cb.matches_played AS played_b,
+           (SELECT COUNT(*) FROM matches p
+             WHERE p.clan_a_id = m.clan_a_id AND p.clan_b_id = m.clan_b_id
+               AND p.elo_applied = 1 AND p.created_ts >= :cutoff)
+         + (SELECT COUNT(*) FROM matches p
+             WHERE p.clan_a_id = m.clan_b_id AND p.clan_b_id = m.clan_a_id
+               AND p.elo_applied = 1 AND p.created_ts >= :cutoff) AS pair_matches_24h,
+           {_WIN_RATE_SQL.format(agg="COUNT(*)", side="clan_a_id")} AS wr_total_a,
+           {_WIN_RATE_SQL.format(agg="COALESCE(SUM(w.winner_clan_id = m.clan_a_id), 0)", side="clan_a_id")} AS wr_wins_a,
+           {_WIN_RATE_SQL.format(agg="COUNT(*)", side="clan_b_id")} AS wr_total_b,
+           {_WIN_RATE_SQL.format(agg="COALESCE(SUM(w.winner_clan_id = m.clan_b_id), 0)", side="clan_b_id")} AS wr_wins_b
+    FROM matches m
+    JOIN clans ca ON ca.id = m.clan_a_id
+    JOIN clans cb ON cb.id = m.clan_b_id
+    WHERE m.id = :match_id
+"""
+
+
+async def fetch_match_context(match_id: int, winner_clan_id: Optional[int] = None) -> Optional[MatchContext]:
+    """
+    Build the MatchContext for `match_id` with one SELECT (None if the match or a clan is gone).
+    Sanctions and balance flags are served from their in-memory snapshots.
+    Call inside db.transaction() when the result is going to be written.
+    """
+    async with db.get_read_connection() as conn:
+        cursor = await conn.execute(
+            _MATCH_CONTEXT_SQL,
+            {"match_id": match_id, "cutoff": db.epoch_now(hours=-24), "last_n": WIN_RATE_WINDOW}
+        )
+        row = await cursor.fetchone()
+    if not row:
+        return None
+
+    sanctions = await db.get_sanctions(clan_ids=(row["clan_a_id"], row["clan_b_id"]))
+    features = frozenset([f for f in BALANCE_FEATURES if await db.is_balance_feature_enabled(f)])
+    return MatchContext(
+        match_id=row["id"],
+        status=row["status"],
+        elo_applied=bool(row["elo_applied"]),
+        winner_clan_id=winner_clan_id,
+        score_a=row["score_a"],
+        score_b=row["score_b"],
+        clan_a_id=row["clan_a_id"],
+        clan_b_id=row["clan_b_id"],
+        clan_a_name=row["clan_a_name"],
+        clan_b_name=row["clan_b_name"],
+        clan_a_status=row["clan_a_status"],
+        clan_b_status=row["clan_b_status"],
+        elo_a=row["elo_a"],
+        elo_b=row["elo_b"],
+        matches_played_a=row["played_a"] or 0,
+        matches_played_b=row["played_b"] or 0,
+        pair_matches_24h=row["pair_matches_24h"],
+        win_rate_total_a=row["wr_total_a"],
+        win_rate_wins_a=row["wr_wins_a"],
+        win_rate_total_b=row["wr_total_b"],
+        win_rate_wins_b=row["wr_wins_b"],
+        avg_rank_a=row["avg_rank_a"],
+        avg_rank_b=row["avg_rank_b"],
+        frozen_clan_ids=frozenset(sanctions["frozen_clans"]),
+        banned_clan_ids=frozenset(sanctions["banned_clans"]),
+        features=features,
+    )
+
+
+def _k_factor(matches_played: int, cfg: EloConfig) -> int:
+    return cfg.k_placement if matches_played < cfg.placement_matches else cfg.k_stable
+
+
+def _base_delta(elo_a: int, elo_b: int, score_a: float, k: int, cfg: EloConfig) -> int:
+    expected_a = 1.0 / (1.0 + 10 ** ((elo_b - elo_a) / cfg.rating_scale))
+    return round(k * (score_a - expected_a))
+
+
+def _win_rate_modifier(total: int, wins: int, cfg: EloConfig) -> float:
+    if total < cfg.win_rate_min_matches:
+        return 1.0
+    win_rate = wins / total if total else 0.0
+    if win_rate >= cfg.win_rate_high_threshold:
+        return cfg.win_rate_high_modifier
+    if win_rate <= cfg.win_rate_low_threshold:
+        return cfg.win_rate_low_modifier
+    return 1.0
+
+
+def compute_elo(context: MatchContext, cfg: Optional[EloConfig] = None) -> Dict[str, Any]:
+    """
+    Pure Elo calculation for one match. Returns the same dict as apply_match_result().
+
+    Reasons: "OK", "INVALID_STATUS", "ALREADY_APPLIED", "DRAW_NOT_SUPPORTED",
+    "WINNER_REQUIRED", "CLANS_INACTIVE", "CLANS_FROZEN", "CLANS_BANNED".
+    """
+    if cfg is None:
+        cfg = EloConfig.from_config()
+    ctx = context
+
+    if ctx.status not in ("confirmed", "resolved"):
+        return {"success": False, "reason": "INVALID_STATUS", "current_status": ctx.status}
+    if ctx.elo_applied:
+        return {"success": False, "reason": "ALREADY_APPLIED"}
+
+    # Determine winner from scores if not provided
+    winner_clan_id = ctx.winner_clan_id
+    if winner_clan_id is None:
+        if ctx.score_a is None or ctx.score_b is None:
+            return {"success": False, "reason": "WINNER_REQUIRED"}
+        if ctx.score_a == ctx.score_b:
+            return {"success": False, "reason": "DRAW_NOT_SUPPORTED"}
+        winner_clan_id = ctx.clan_a_id if ctx.score_a > ctx.score_b else ctx.clan_b_id
+
+    # Both clans must be active; frozen / system-banned clans can play but get no Elo
+    sides = ((ctx.clan_a_id, ctx.clan_a_name, ctx.clan_a_status), (ctx.clan_b_id, ctx.clan_b_name, ctx.clan_b_status))
+    inactive_clans = [name for _, name, status in sides if status != "active"]
+    if inactive_clans:
+        return {"success": False, "reason": "CLANS_INACTIVE", "inactive_clans": inactive_clans}
+    frozen_clans = [name for clan_id, name, _ in sides if clan_id in ctx.frozen_clan_ids]
+    if frozen_clans:
+        return {"success": False, "reason": "CLANS_FROZEN", "frozen_clans": frozen_clans}
+    banned_clans = [name for clan_id, name, _ in sides if clan_id in ctx.banned_clan_ids]
+    if banned_clans:
+        return {"success": False, "reason": "CLANS_BANNED", "banned_clans": banned_clans}
+
+    a_won = winner_clan_id == ctx.clan_a_id
+    elo_a, elo_b = ctx.elo_a, ctx.elo_b
+
+    # Per-clan K-factor (placement vs stable), base deltas and anti-farm multiplier
+    k_a = _k_factor(ctx.matches_played_a, cfg)
+    k_b = _k_factor(ctx.matches_played_b, cfg)
+    base_delta_a = _base_delta(elo_a, elo_b, 1.0 if a_won else 0.0, k_a, cfg)
+    base_delta_b = _base_delta(elo_b, elo_a, 0.0 if a_won else 1.0, k_b, cfg)
+    if ctx.pair_matches_24h < len(cfg.anti_farm_multipliers):
+        multiplier = cfg.anti_farm_multipliers[ctx.pair_matches_24h]
+    else:
+        multiplier = cfg.default_multiplier
+    final_delta_a = round(base_delta_a * multiplier)
+    final_delta_b = round(base_delta_b * multiplier)
+
+    # --- Balance System Modifiers ---
+    win_rate_mod_a = 1.0
+    win_rate_mod_b = 1.0
+    rank_mod_a = 1.0
+    rank_mod_b = 1.0
+    underdog_bonus = 0
+    elo_capped = False
+
+    # Feature 3 — Win Rate Modifier
+    if "win_rate_mod" in ctx.features:
+        win_rate_mod_a = _win_rate_modifier(ctx.win_rate_total_a, ctx.win_rate_wins_a, cfg)
+        win_rate_mod_b = _win_rate_modifier(ctx.win_rate_total_b, ctx.win_rate_wins_b, cfg)
+        if win_rate_mod_a != 1.0 or win_rate_mod_b != 1.0:
+            final_delta_a = round(final_delta_a * win_rate_mod_a)
+            final_delta_b = round(final_delta_b * win_rate_mod_b)
+
+    # Feature 8 — Rank Elo Modifier (uses roster avg rank from Feature 9)
+    if "rank_elo_mod" in ctx.features and ctx.avg_rank_a is not None and ctx.avg_rank_b is not None:
+        rank_mod_a, rank_mod_b = get_rank_modifier(ctx.avg_rank_a, ctx.avg_rank_b)
+        if rank_mod_a != 1.0 or rank_mod_b != 1.0:
+            # Cap combined modifier (win_rate * rank) >= 0.3 to avoid over-nerfing
+            combined_mod_a = max(0.3, win_rate_mod_a * rank_mod_a)
+            combined_mod_b = max(0.3, win_rate_mod_b * rank_mod_b)
+            # Recompute with combined modifier instead of stacking
+            final_delta_a = round(round(base_delta_a * multiplier) * combined_mod_a)
+            final_delta_b = round(round(base_delta_b * multiplier) * combined_mod_b)
+
+    # Feature 5 — Underdog Bonus
+    if "underdog_bonus" in ctx.features:
+        underdog_bonus = get_underdog_bonus(elo_a if a_won else elo_b, elo_b if a_won else elo_a)
+        if underdog_bonus > 0:
+            if a_won:
+                final_delta_a += underdog_bonus
+            else:
+                final_delta_b += underdog_bonus
+
+    # Feature 5 — Elo Gain Cap (only cap positive deltas)
+    if "elo_gain_cap" in ctx.features:
+        if final_delta_a > cfg.max_gain_per_match:
+            final_delta_a = cfg.max_gain_per_match
+            elo_capped = True
+        if final_delta_b > cfg.max_gain_per_match:
+            final_delta_b = cfg.max_gain_per_match
+            elo_capped = True
+
+    return {
+        "success": True,
+        "reason": "OK",
+        "winner_clan_id": winner_clan_id,
+        "base_delta_a": base_delta_a,
+        "base_delta_b": base_delta_b,
+        "multiplier": multiplier,
+        "final_delta_a": final_delta_a,
+        "final_delta_b": final_delta_b,
+        "elo_a_old": elo_a,
+        "elo_b_old": elo_b,
+        # New Elo values (enforce floor)
+        "elo_a_new": max(cfg.floor, elo_a + final_delta_a),
+        "elo_b_new": max(cfg.floor, elo_b + final_delta_b),
+        "clan_a_name": ctx.clan_a_name,
+        "clan_b_name": ctx.clan_b_name,
+        "match_count_24h": ctx.pair_matches_24h + 1,
+        "k_a": k_a,
+        "k_b": k_b,
+        # Balance modifiers info
+        "win_rate_mod_a": win_rate_mod_a,
+        "win_rate_mod_b": win_rate_mod_b,
+        "rank_mod_a": rank_mod_a,
+        "rank_mod_b": rank_mod_b,
+        "underdog_bonus": underdog_bonus,
+        "elo_capped": elo_capped,
+    }
+
+
+_NO_ELO_REASONS = ("CLANS_INACTIVE", "CLANS_FROZEN", "CLANS_BANNED")
+
+
+async def _write_elo_result(conn, context: MatchContext, result: Dict[str, Any]) -> None:
+    """Persist a compute_elo() result: the match row, both clans and both elo_history rows."""
+    match_id = context.match_id
+    if not result["success"]:
+        # Mark match as processed but no Elo applied
+        await conn.execute(
+            """UPDATE matches SET 
+               elo_applied = 0,
+               base_delta_a = 0, base_delta_b = 0,
+               multiplier = 0, final_delta_a = 0, final_delta_b = 0
+               WHERE id = ?""",
+            (match_id,)
+        )
+        db.invalidate_matches(match_id)
+        return
+
+    clan_a_id, clan_b_id = context.clan_a_id, context.clan_b_id
+    a_won = result["winner_clan_id"] == clan_a_id
+    await conn.executemany(
+        "UPDATE clans SET elo = ?, matches_played = matches_played + 1, updated_at = datetime('now') WHERE id = ?",
+        [(result["elo_a_new"], clan_a_id), (result["elo_b_new"], clan_b_id)]
+    )
+    await conn.executemany(
+        """INSERT INTO elo_history (clan_id, match_id, old_elo, new_elo, change_amount, reason)
+           VALUES (?, ?, ?, ?, ?, ?)""",
+        [
+            (clan_a_id, match_id, result["elo_a_old"], result["elo_a_new"], result["final_delta_a"],
+             "match_win" if a_won else "match_loss"),
+            (clan_b_id, match_id, result["elo_b_old"], result["elo_b_new"], result["final_delta_b"],
+             "match_loss" if a_won else "match_win"),
+        ]
+    )
+    await conn.execute(
+        """UPDATE matches SET 
+           elo_applied = 1,
+           base_delta_a = ?, base_delta_b = ?,
+           multiplier = ?,
+           final_delta_a = ?, final_delta_b = ?
+           WHERE id = ?""",
+        (result["base_delta_a"], result["base_delta_b"], result["multiplier"],
+         result["final_delta_a"], result["final_delta_b"], match_id)
+    )
+    db.invalidate_clan(clan_a_id)
+    db.invalidate_clan(clan_b_id)
+    db.invalidate_matches(match_id)
+
+
 async def apply_match_result(match_id: int, winner_clan_id: int) -> Dict[str, Any]:
     """
     Apply Elo changes for a confirmed/resolved match.
     
-    This function:
-    1. Validates match status is CONFIRMED or RESOLVED
-    2. Checks both clans are ACTIVE
-    3. Computes anti-farm multiplier
-    4. Calculates and applies Elo changes
-    5. Updates match record with Elo details
-    
     Args:
         match_id: The match to apply Elo for
-        winner_clan_id: The winning clan's ID
+        winner_clan_id: The winning clan's ID (None = derive from the scores)
     
     Returns:
         Dict with:
         - success: bool
-        - reason: "OK", "CLANS_INACTIVE", "INVALID_STATUS", "MATCH_NOT_FOUND"
+        - reason: "OK", "CLANS_INACTIVE", "CLANS_FROZEN", "CLANS_BANNED", "INVALID_STATUS", "MATCH_NOT_FOUND", ...
         - base_delta_a, base_delta_b: Base Elo changes
         - final_delta_a, final_delta_b: Final Elo changes after multiplier
         - multiplier: The anti-farm multiplier used
         - elo_a_new, elo_b_new: New Elo values
+    
+    Runs as one db.transaction(): fetch_match_context() (one SELECT) joins it,
+    compute_elo() does the math, and the result is written and committed once.
+    The transaction is a job on the single writer, so the Elo it reads is the Elo
+    it overwrites: concurrent confirmations of matches sharing a clan are applied
+    one after another, and every other Elo change goes through db.adjust_clan_elo(),
+    which reads and writes in one writer job as well.
     """
-    async with db.get_connection() as conn:
-        # Get match with lock-like behavior (single transaction)
-        cursor = await conn.execute("SELECT * FROM matches WHERE id = ?", (match_id,))
-        match = await cursor.fetchone()
-        
-        if not match:
+    async with db.transaction() as conn:
+        context = await fetch_match_context(match_id, winner_clan_id)
+        if context is None:
             return {"success": False, "reason": "MATCH_NOT_FOUND"}
         
-        match = dict(match)
-        
-        # Validate status
-        if match["status"] not in ("confirmed", "resolved"):
-            return {"success": False, "reason": "INVALID_STATUS", "current_status": match["status"]}
-        
-        # Already applied?
-        if match["elo_applied"]:
-            return {"success": False, "reason": "ALREADY_APPLIED"}
-        
-        clan_a_id = match["clan_a_id"]
-        clan_b_id = match["clan_b_id"]
-        
-        # Get clan data
-        cursor = await conn.execute("SELECT * FROM clans WHERE id = ?", (clan_a_id,))
-        clan_a = dict(await cursor.fetchone())
-        
-        cursor = await conn.execute("SELECT * FROM clans WHERE id = ?", (clan_b_id,))
-        clan_b = dict(await cursor.fetchone())
-        
-        # Determine winner from scores if not provided
-        if winner_clan_id is None:
-            if match.get("score_a") is not None and match.get("score_b") is not None:
-                if match["score_a"] > match["score_b"]:
-                    winner_clan_id = clan_a_id
-                elif match["score_b"] > match["score_a"]:
-                    winner_clan_id = clan_b_id
-                else:
-                    return {"success": False, "reason": "DRAW_NOT_SUPPORTED"}
-            else:
-                return {"success": False, "reason": "WINNER_REQUIRED"}
-
-        # Check both clans are active
-        if clan_a["status"] != "active" or clan_b["status"] != "active":
-            inactive_clans = []
-            if clan_a["status"] != "active":
-                inactive_clans.append(clan_a["name"])
-            if clan_b["status"] != "active":
-                inactive_clans.append(clan_b["name"])
-            
-            # Mark match as processed but no Elo applied
-            await conn.execute(
-                """UPDATE matches SET 
-                   elo_applied = 0,
-                   base_delta_a = 0, base_delta_b = 0,
-                   multiplier = 0, final_delta_a = 0, final_delta_b = 0
-                   WHERE id = ?""",
-                (match_id,)
-            )
+        result = compute_elo(context)
+        if result["success"] or result["reason"] in _NO_ELO_REASONS:
+            await _write_elo_result(conn, context, result)
             await conn.commit()
-            
-            return {
-                "success": False,
-                "reason": "CLANS_INACTIVE",
-                "inactive_clans": inactive_clans
-            }
-        
-        # Check for frozen clans (can play but no Elo)
-        frozen_clans = []
-        if await db.is_clan_frozen(clan_a_id):
-            frozen_clans.append(clan_a["name"])
-        if await db.is_clan_frozen(clan_b_id):
-            frozen_clans.append(clan_b["name"])
-        
-        if frozen_clans:
-            await conn.execute(
-                """UPDATE matches SET 
-                   elo_applied = 0,
-                   base_delta_a = 0, base_delta_b = 0,
-                   multiplier = 0, final_delta_a = 0, final_delta_b = 0
-                   WHERE id = ?""",
-                (match_id,)
-            )
-            await conn.commit()
-            
-            return {
-                "success": False,
-                "reason": "CLANS_FROZEN",
-                "frozen_clans": frozen_clans
-            }
-        
-        # Check for system banned clans
-        banned_clans = []
-        if await db.is_clan_system_banned(clan_a_id):
-            banned_clans.append(clan_a["name"])
-        if await db.is_clan_system_banned(clan_b_id):
-            banned_clans.append(clan_b["name"])
-        
-        if banned_clans:
-            await conn.execute(
-                """UPDATE matches SET 
-                   elo_applied = 0,
-                   base_delta_a = 0, base_delta_b = 0,
-                   multiplier = 0, final_delta_a = 0, final_delta_b = 0
-                   WHERE id = ?""",
-                (match_id,)
-            )
-            await conn.commit()
-            
-            return {
-                "success": False,
-                "reason": "CLANS_BANNED",
-                "banned_clans": banned_clans
-            }
-        
-        elo_a = clan_a["elo"]
-        elo_b = clan_b["elo"]
-        matches_played_a = clan_a.get("matches_played", 0)
-        matches_played_b = clan_b.get("matches_played", 0)
-        
-        # Per-clan K-factor (placement vs stable)
-        k_a = get_k_factor(matches_played_a)
-        k_b = get_k_factor(matches_played_b)
-        
-        # Determine scores
-        if winner_clan_id == clan_a_id:
-            score_a = 1.0
-            score_b = 0.0
-        else:
-            score_a = 0.0
-            score_b = 1.0
-        
-        # Calculate base deltas (each clan uses its own K-factor)
-        base_delta_a = compute_base_delta(elo_a, elo_b, score_a, k=k_a)
-        base_delta_b = compute_base_delta(elo_b, elo_a, score_b, k=k_b)
-        
-        # Get anti-farm multiplier
-        match_count = await count_elo_matches_between_clans(clan_a_id, clan_b_id)
-        multiplier = get_pair_multiplier(match_count)
-        
-        # Apply anti-farm multiplier
-        final_delta_a = round(base_delta_a * multiplier)
-        final_delta_b = round(base_delta_b * multiplier)
-        
-        # --- Balance System Modifiers ---
-        win_rate_mod_a = 1.0
-        win_rate_mod_b = 1.0
-        rank_mod_a = 1.0
-        rank_mod_b = 1.0
-        underdog_bonus = 0
-        elo_capped = False
-        
-        # Feature 3 — Win Rate Modifier
-        if await db.is_balance_feature_enabled("win_rate_mod"):
-            wr_a = await db.get_clan_win_rate(clan_a_id)
-            wr_b = await db.get_clan_win_rate(clan_b_id)
-            win_rate_mod_a = get_win_rate_modifier(wr_a["win_rate"], wr_a["total"])
-            win_rate_mod_b = get_win_rate_modifier(wr_b["win_rate"], wr_b["total"])
-            if win_rate_mod_a != 1.0 or win_rate_mod_b != 1.0:
-                final_delta_a = round(final_delta_a * win_rate_mod_a)
-                final_delta_b = round(final_delta_b * win_rate_mod_b)
-        
-        # Feature 8 — Rank Elo Modifier (uses roster avg rank from Feature 9)
-        if await db.is_balance_feature_enabled("rank_elo_mod"):
-            rosters = await db.get_match_rosters(match_id)
-            avg_rank_a = rosters.get("avg_rank_a")
-            avg_rank_b = rosters.get("avg_rank_b")
-            if avg_rank_a is not None and avg_rank_b is not None:
-                rank_mod_a, rank_mod_b = get_rank_modifier(avg_rank_a, avg_rank_b)
-                if rank_mod_a != 1.0 or rank_mod_b != 1.0:
-                    # Cap combined modifier (win_rate * rank) >= 0.3 to avoid over-nerfing
-                    combined_mod_a = max(0.3, win_rate_mod_a * rank_mod_a)
-                    combined_mod_b = max(0.3, win_rate_mod_b * rank_mod_b)
-                    # Recompute with combined modifier instead of stacking
-                    final_delta_a = round(round(base_delta_a * multiplier) * combined_mod_a)
-                    final_delta_b = round(round(base_delta_b * multiplier) * combined_mod_b)
-        
-        # Feature 5 — Underdog Bonus
-        if await db.is_balance_feature_enabled("underdog_bonus"):
-            winner_elo = elo_a if winner_clan_id == clan_a_id else elo_b
-            loser_elo = elo_b if winner_clan_id == clan_a_id else elo_a
-            underdog_bonus = get_underdog_bonus(winner_elo, loser_elo)
-            if underdog_bonus > 0:
-                if winner_clan_id == clan_a_id:
-                    final_delta_a += underdog_bonus
-                else:
-                    final_delta_b += underdog_bonus
-        
-        # Feature 5 — Elo Gain Cap (only cap positive deltas)
-        if await db.is_balance_feature_enabled("elo_gain_cap"):
-            if final_delta_a > config.ELO_MAX_GAIN_PER_MATCH:
-                final_delta_a = config.ELO_MAX_GAIN_PER_MATCH
-                elo_capped = True
-            if final_delta_b > config.ELO_MAX_GAIN_PER_MATCH:
-                final_delta_b = config.ELO_MAX_GAIN_PER_MATCH
-                elo_capped = True
-        
-        # New Elo values (enforce floor)
-        new_elo_a = max(ELO_FLOOR, elo_a + final_delta_a)
-        new_elo_b = max(ELO_FLOOR, elo_b + final_delta_b)
-        
-        # Update clan Elos
-        await conn.execute(
-            "UPDATE clans SET elo = ?, matches_played = matches_played + 1, updated_at = datetime('now') WHERE id = ?",
-            (new_elo_a, clan_a_id)
-        )
-        await conn.execute(
-            "UPDATE clans SET elo = ?, matches_played = matches_played + 1, updated_at = datetime('now') WHERE id = ?",
-            (new_elo_b, clan_b_id)
-        )
-        
-        # Record Elo history for both clans
-        reason_a = "match_win" if winner_clan_id == clan_a_id else "match_loss"
-        reason_b = "match_win" if winner_clan_id == clan_b_id else "match_loss"
-        
-        await conn.execute(
-            """INSERT INTO elo_history (clan_id, match_id, old_elo, new_elo, change_amount, reason)
-               VALUES (?, ?, ?, ?, ?, ?)""",
-            (clan_a_id, match_id, elo_a, new_elo_a, final_delta_a, reason_a)
-        )
-        await conn.execute(
-            """INSERT INTO elo_history (clan_id, match_id, old_elo, new_elo, change_amount, reason)
-               VALUES (?, ?, ?, ?, ?, ?)""",
-            (clan_b_id, match_id, elo_b, new_elo_b, final_delta_b, reason_b)
-        )
-        
-        # Update match with Elo details
-        await conn.execute(
-            """UPDATE matches SET 
-               elo_applied = 1,
-               base_delta_a = ?, base_delta_b = ?,
-               multiplier = ?,
-               final_delta_a = ?, final_delta_b = ?
-               WHERE id = ?""",
-            (base_delta_a, base_delta_b, multiplier, final_delta_a, final_delta_b, match_id)
-        )
-        
-        await conn.commit()
-        
-        return {
-            "success": True,
-            "reason": "OK",
-            "base_delta_a": base_delta_a,
-            "base_delta_b": base_delta_b,
-            "multiplier": multiplier,
-            "final_delta_a": final_delta_a,
-            "final_delta_b": final_delta_b,
-            "elo_a_old": elo_a,
-            "elo_b_old": elo_b,
-            "elo_a_new": new_elo_a,
-            "elo_b_new": new_elo_b,
-            "clan_a_name": clan_a["name"],
-            "clan_b_name": clan_b["name"],
-            "match_count_24h": match_count + 1,
-            "k_a": k_a,
-            "k_b": k_b,
-            # Balance modifiers info
-            "win_rate_mod_a": win_rate_mod_a,
-            "win_rate_mod_b": win_rate_mod_b,
-            "rank_mod_a": rank_mod_a,
-            "rank_mod_b": rank_mod_b,
-            "underdog_bonus": underdog_bonus,
-            "elo_capped": elo_capped,
-        }
+        return result
 
 def format_elo_explanation_vn(elo_result: Dict[str, Any]) -> str:
     """
@@ -0,0 +1,713 @@
+"""
+Ladder Replay
+Recomputes every clan's Elo from `matches` + `elo_history` and reports where the
+stored ladder disagrees (audit), and plans / applies the replay rollback behind
+`/admin elo_rollback_matches`. Needs NumPy (listed in requirements.txt); without it
+the module still imports, the audit scripts exit and the rollback falls back to
+the per-match mode.
+
+Replay model (what apply_match_result() saw when it ran):
+- The clock is `elo_history.id`: the order the single writer committed changes in.
+- The first match_win / match_loss row of a match re-runs the Elo formula
+  (elo.compute_elo() math, same EloConfig) for both clans; its partner row is skipped.
+- `rollback_match_<id>` rows revert the replayed change and drop the match from the
+  anti-farm window; absolute sets (reset / "Admin Adjustment") replay `new_elo`;
+  every other row (bonus, decay, admin adjust, activity bonus) replays its `change_amount`.
+- `replay_correction_<id>` rows (written by apply_void_rollback()) are skipped: they
+  record what the replay itself derives once the voided matches are gone.
+- Anti-farm counts Elo-applied matches of the pair whose created_ts falls in the
+  24h before the history row; K uses the replayed matches_played.
+- Win rate uses the clan's last WIN_RATE_WINDOW decided matches by created_at up to
+  and including the match (assumes matches are decided in creation order).
+- Balance flags are today's values unless `features` is given; roster averages
+  come from the match row.
+
+Speed: Elo is path-dependent, but two changes that share no clan commute. Every
+change gets a wavefront level (one past the last level that touched either of its
+clans) and each level is applied as one set of array operations. K-factor,
+anti-farm, win-rate and rank inputs do not depend on ratings and are computed for
+all matches up front. About 3s for 1M matches over 2,000 clans; fewer clans mean
+deeper, smaller levels (~6s over 50).
+"""
+
+import asyncio
+import bisect
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Dict, FrozenSet, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # requirements.txt installs it; tests and scripts skip without it
+    np = None
+
+import config
+from services import db, elo
+
+# elo_history.reason values replayed as "set to new_elo" instead of "add change_amount"
+ABSOLUTE_REASONS = ("elo_reset_by_mod", "manual_set")
+ABSOLUTE_REASON_PREFIXES = ("Admin Adjustment:",)
+
+KIND_MATCH, KIND_ROLLBACK, KIND_DELTA, KIND_SET, KIND_DECAY, KIND_CORRECTION = 0, 1, 2, 3, 4, 5
+ANTI_FARM_WINDOW = 24 * 3600  # seconds, as in elo.count_elo_matches_between_clans()
+PLAN_ATTEMPTS = 3             # apply_void_rollback(): optimistic plans before re-planning under the writer lock
+
+
+MATCH_COLUMNS = (
+    "match_id", "clan_a", "clan_b", "created_ts", "winner", "avg_rank_a", "avg_rank_b", "final_delta_a", "final_delta_b",
+)
+
+
+@dataclass
+class LadderData:
+    """Column arrays for one replay. Matches are sorted by (created_ts, id); events by elo_history.id."""
+    match_id: Any
+    clan_a: Any
+    clan_b: Any
+    created_ts: Any
+    winner: Any          # winner_clan_id, -1 if undecided
+    avg_rank_a: Any      # NaN if no roster
+    avg_rank_b: Any
+    final_delta_a: Any   # stored result (0 if no Elo)
+    final_delta_b: Any
+    event_kind: Any
+    event_clan: Any
+    event_match: Any     # -1 for manual changes
+    event_won: Any       # 1 for match_win rows
+    event_change: Any
+    event_new: Any
+    event_ts: Any
+    clan_ids: Any
+    clan_elo: Any
+    clan_names: List[str]
+
+    @property
+    def matches(self) -> int:
+        return len(self.match_id)
+
+    @property
+    def events(self) -> int:
+        return len(self.event_kind)
+
+
+@dataclass(frozen=True)
+class DecayConfig:
+    """Weekly Elo decay as main.weekly_balance_task() runs it (db.get_clans_for_decay + apply_elo_decay)."""
+    threshold: int
+    amount: int
+    floor: int
+    inactivity_days: int
+    interval_days: int = 7
+
+    @classmethod
+    def from_config(cls) -> "DecayConfig":
+        # apply_elo_decay() floors at ELO_FLOOR; ELO_DECAY_FLOOR is not read by the weekly task
+        return cls(
+            threshold=config.ELO_DECAY_THRESHOLD,
+            amount=config.ELO_DECAY_AMOUNT,
+            floor=config.ELO_FLOOR,
+            inactivity_days=config.ELO_DECAY_INACTIVITY_DAYS,
+        )
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("Ladder replay needs NumPy: pip install numpy")
+
+
+_MATCHES_SQL = """
+    SELECT id, clan_a_id, clan_b_id, COALESCE(created_ts, 0), COALESCE(winner_clan_id, -1),
+           avg_rank_a, avg_rank_b, COALESCE(final_delta_a, 0), COALESCE(final_delta_b, 0)
+    FROM matches
+    WHERE status IN ('confirmed', 'resolved')
+    ORDER BY created_ts, id
+"""
+
+_EVENTS_SQL = f"""
+    SELECT CASE
+             WHEN reason IN ('match_win', 'match_loss') AND match_id IS NOT NULL THEN {KIND_MATCH}
+             WHEN reason LIKE 'rollback\\_match\\_%' ESCAPE '\\' AND match_id IS NOT NULL THEN {KIND_ROLLBACK}
+             WHEN reason IN ({', '.join('?' * len(ABSOLUTE_REASONS))})
+               {''.join(' OR reason LIKE ?' for _ in ABSOLUTE_REASON_PREFIXES)} THEN {KIND_SET}
+             WHEN reason = 'elo_decay' THEN {KIND_DECAY}
+             WHEN reason LIKE 'replay\\_correction\\_%' ESCAPE '\\' THEN {KIND_CORRECTION}
+             ELSE {KIND_DELTA}
+           END,
+           clan_id, COALESCE(match_id, -1), reason = 'match_win', change_amount, new_elo,
+           COALESCE(CAST(strftime('%s', created_at) AS INTEGER), 0)
+    FROM elo_history
+    ORDER BY id
+"""
+
+
+def _columns(rows: list, count: int, dtype: Any) -> list:
+    if not rows:
+        return [np.zeros(0, dtype=dtype) for _ in range(count)]
+    table = np.array(rows, dtype=dtype)
+    return [table[:, i] for i in range(count)]
+
+
+async def load_ladder() -> LadderData:
+    """Read decided matches, the whole elo_history and current clan Elo into NumPy arrays."""
+    _require_numpy()
+    async with db.get_read_connection() as conn:
+        cursor = await conn.execute(_MATCHES_SQL)
+        match_rows = await cursor.fetchall()
+        cursor = await conn.execute(
+            _EVENTS_SQL, (*ABSOLUTE_REASONS, *(f"{prefix}%" for prefix in ABSOLUTE_REASON_PREFIXES))
+        )
+        event_rows = await cursor.fetchall()
+        cursor = await conn.execute("SELECT id, elo, name FROM clans ORDER BY id")
+        clan_rows = await cursor.fetchall()
+    # Row -> array conversion is CPU work: off the event loop, like the replay itself
+    return await asyncio.to_thread(_build_ladder, match_rows, event_rows, clan_rows)
+
+
+def _build_ladder(match_rows: list, event_rows: list, clan_rows: list) -> LadderData:
+    match_ints = _columns([(r[0], r[1], r[2], r[3], r[4], r[7], r[8]) for r in match_rows], 7, np.int64)
+    ranks = _columns([(np.nan if r[5] is None else r[5], np.nan if r[6] is None else r[6]) for r in match_rows], 2, np.float64)
+    events = _columns([tuple(r) for r in event_rows], 7, np.int64)
+    return LadderData(
+        match_id=match_ints[0], clan_a=match_ints[1], clan_b=match_ints[2], created_ts=match_ints[3],
+        winner=match_ints[4], avg_rank_a=ranks[0], avg_rank_b=ranks[1],
+        final_delta_a=match_ints[5], final_delta_b=match_ints[6],
+        event_kind=events[0], event_clan=events[1], event_match=events[2], event_won=events[3],
+        event_change=events[4], event_new=events[5], event_ts=events[6],
+        clan_ids=np.array([r[0] for r in clan_rows], dtype=np.int64),
+        clan_elo=np.array([r[1] for r in clan_rows], dtype=np.int64),
+        clan_names=[r[2] for r in clan_rows],
+    )
+
+
+# =============================================================================
+# VECTORIZED PRE-PASS
+# =============================================================================
+
+def _stable_order(keys: Any) -> Any:
+    """argsort(kind="stable"); small non-negative keys (clan ids, levels) get NumPy's radix sort."""
+    if len(keys) and 0 <= keys.min() and keys.max() < 1 << 16:
+        keys = keys.astype(np.uint16)
+    return np.argsort(keys, kind="stable")
+
+
+def _win_rate_windows(data: LadderData, window: int) -> tuple:
+    """
+    For every match and side: (total, wins) over the clan's last `window` decided
+    matches up to and including this one (0, 0 for undecided matches: never replayed).
+    One stable sort by clan and a cumulative sum, no Python loop.
+    """
+    n = data.matches
+    rows = np.flatnonzero(data.winner >= 0)
+    # Interleaved sides (a0, b0, a1, b1, ...): a stable sort by clan keeps match order per clan
+    clans = np.stack([data.clan_a[rows], data.clan_b[rows]], axis=1).ravel()
+    won = np.repeat(data.winner[rows], 2) == clans
+    sort = _stable_order(clans)
+    sorted_clans = clans[sort]
+
+    position = np.arange(len(clans))
+    group_start = np.ones(len(clans), dtype=bool)
+    group_start[1:] = sorted_clans[1:] != sorted_clans[:-1]
+    count = position - np.maximum.accumulate(np.where(group_start, position, 0)) + 1
+    total = np.minimum(count, window)
+    cum_wins = np.concatenate([[0], np.cumsum(won[sort], dtype=np.int64)])
+    wins = cum_wins[position + 1] - cum_wins[position + 1 - total]
+
+    sides = np.zeros((2, len(clans)), dtype=np.int64)
+    sides[0, sort], sides[1, sort] = total, wins
+    result = []
+    for side in (0, 1):
+        total_side, wins_side = np.zeros(n, dtype=np.int64), np.zeros(n, dtype=np.int64)
+        total_side[rows], wins_side[rows] = sides[0, side::2], sides[1, side::2]
+        result.append((total_side, wins_side))
+    return tuple(result)
+
+
+def _win_rate_modifiers(total: Any, wins: Any, cfg: elo.EloConfig) -> Any:
+    rate = np.divide(wins, total, out=np.zeros(len(total)), where=total > 0)
+    modifier = np.where(rate >= cfg.win_rate_high_threshold, cfg.win_rate_high_modifier,
+                        np.where(rate <= cfg.win_rate_low_threshold, cfg.win_rate_low_modifier, 1.0))
+    return np.where(total < cfg.win_rate_min_matches, 1.0, modifier)
+
+
+def _rank_modifiers(avg_a: Any, avg_b: Any) -> tuple:
+    """elo.get_rank_modifier() over whole columns (NaN = no roster = 1.0)."""
+    gap = np.abs(avg_a - avg_b)
+    mod = np.where(gap <= 5, 0.9, np.where(gap <= 8, 0.8, 0.7))
+    neutral = np.isnan(gap) | (gap <= 2)
+    a_higher = avg_a > avg_b
+    rank_a = np.where(neutral, 1.0, np.where(a_higher, mod, 2.0 - mod))
+    rank_b = np.where(neutral, 1.0, np.where(a_higher, 2.0 - mod, mod))
+    return rank_a, rank_b
+
+
+# =============================================================================
+# REPLAY
+# =============================================================================
+
+def _expected_table(scale: int) -> tuple:
+    """
+    Expected score for every integer rating gap, built with elo._base_delta()'s own
+    float expression so a lookup equals it bit for bit. Gaps past 16 scales are clipped:
+    the score is then within 1e-16 of 0 or 1, which cannot move round(k * ...) for integer K.
+    """
+    span = int(scale) * 16
+    table = np.array([1.0 / (1.0 + 10 ** (gap / scale)) for gap in range(-span, span + 1)])
+    return table, span
+
+
+def _played_before(first: Any, second: Any) -> tuple:
+    """matches_played of both clans before each application (cumulative count per clan)."""
+    clans = np.stack([first, second], axis=1).ravel()  # application order kept by a stable sort
+    sort = _stable_order(clans)
+    ordered = clans[sort]
+    position = np.arange(len(clans))
+    group_start = np.ones(len(clans), dtype=bool)
+    group_start[1:] = ordered[1:] != ordered[:-1]
+    played = np.empty(len(clans), dtype=np.int64)
+    played[sort] = position - np.maximum.accumulate(np.where(group_start, position, 0))
+    return played[0::2], played[1::2]
+
+
+def _pair_window_counts(pair: Any, created: Any, ts: Any, order: Any,
+                        removed_pair: Any, removed_created: Any, removed_order: Any) -> Any:
+    """
+    Anti-farm count for every application: earlier applications of the same pair whose
+    created_ts is within 24h before it. Vectorized for pairs applied in creation order and
+    never rolled back; other pairs are walked with a sorted list, as the bot saw them.
+    """
+    n = len(pair)
+    counts = np.zeros(n, dtype=np.int64)
+    if not n:
+        return counts
+    sort = np.lexsort((order, pair))
+    pairs, stamps = pair[sort], created[sort]
+    same = pairs[1:] == pairs[:-1]
+    slow_pairs = np.unique(np.concatenate([pairs[1:][same & (stamps[1:] < stamps[:-1])], removed_pair]))
+
+    base = int(stamps.min())
+    span = int(stamps.max()) - base + 2
+    keys = np.maximum.accumulate(pairs * span + (stamps - base))  # only slow pairs change
+    since = np.clip(ts[sort] - ANTI_FARM_WINDOW - base, 0, span - 1)
+    first = np.searchsorted(keys, pairs * span + since, side="left")
+    counts[sort] = np.maximum(np.arange(n) - first, 0)
+
+    if len(slow_pairs):
+        slow = np.flatnonzero(np.isin(pair, slow_pairs))
+        steps = sorted(zip(
+            np.concatenate([pair[slow], removed_pair]).tolist(),
+            np.concatenate([order[slow], removed_order]).tolist(),
+            np.concatenate([slow, np.full(len(removed_pair), -1)]).tolist(),
+            np.concatenate([created[slow], removed_created]).tolist(),
+            np.concatenate([ts[slow], np.zeros(len(removed_pair), dtype=np.int64)]).tolist(),
+        ))
+        window: List[int] = []
+        current = None
+        for key, _, app, stamp, at_ts in steps:
+            if key != current:
+                window, current = [], key
+            if app >= 0:
+                counts[app] = len(window) - bisect.bisect_left(window, at_ts - ANTI_FARM_WINDOW)
+                bisect.insort(window, stamp)
+            else:
+                at = bisect.bisect_left(window, stamp)
+                if at < len(window) and window[at] == stamp:
+                    window.pop(at)
+    return counts
+
+
+def _schedule(first: list, second: list, clans: int) -> Any:
+    """Wavefront level of every operation: one past the last level that touched either clan."""
+    last = [0] * clans
+    levels = []
+    append = levels.append
+    for a, b in zip(first, second):
+        level_a, level_b = last[a], last[b]
+        level = (level_a if level_a > level_b else level_b) + 1
+        last[a] = level
+        last[b] = level
+        append(level)
+    return np.array(levels, dtype=np.int64)
+
+
+def replay_ladder(
+    data: LadderData,
+    cfg: Optional[elo.EloConfig] = None,
+    features: FrozenSet[str] = frozenset(elo.BALANCE_FEATURES),
+    initial_elo: int = elo.ELO_INITIAL,
+    decay: Optional[DecayConfig] = None,
+) -> Dict[str, Any]:
+    """
+    Replay the ladder. Pure: no I/O.
+    elo_decay rows replay their recorded change; with `decay` they are decay ticks instead
+    (applied only above decay.threshold, floored at decay.floor), see balance_sim.
+    Returns {"elo": {clan_id: elo}, "matches_played": {...}, "deltas": {match_id: (delta_a, delta_b)},
+    "levels": wavefront depth}.
+    """
+    _require_numpy()
+    if cfg is None:
+        cfg = elo.EloConfig.from_config()
+
+    # --- Events -> operations ---------------------------------------------------
+    kind, event_match, event_clan = data.event_kind, data.event_match, data.event_clan
+    events = len(kind)
+    by_id = np.argsort(data.match_id, kind="stable")
+    ids = data.match_id[by_id]
+    row = np.full(events, -1, dtype=np.int64)  # index into the match columns, -1 if not decided
+    if len(ids):
+        at = np.minimum(np.searchsorted(ids, event_match), len(ids) - 1)
+        row = np.where(ids[at] == event_match, by_id[at], -1)
+
+    # The rows of one application / rollback are written together: the first of a run replays it
+    position = np.arange(events)
+    run_start = np.ones(events, dtype=bool)
+    run_start[1:] = (kind[1:] != kind[:-1]) | (event_match[1:] != event_match[:-1])
+    first_of_run = (position - np.maximum.accumulate(np.where(run_start, position, 0))) % 2 == 0
+
+    app_event = np.flatnonzero((kind == KIND_MATCH) & first_of_run & (row >= 0))
+    app_row = row[app_event]
+    apps = len(app_event)
+
+    # Rollback rows revert the latest earlier application of their match
+    rollback_event = np.flatnonzero((kind == KIND_ROLLBACK) & (row >= 0))
+    by_match = np.lexsort((app_event, event_match[app_event]))
+    stride = events + 1
+    app_keys = event_match[app_event][by_match] * stride + app_event[by_match]
+    found = np.searchsorted(app_keys, event_match[rollback_event] * stride + rollback_event) - 1
+    valid = found >= 0
+    found = np.where(valid, found, 0)
+    if apps:
+        valid &= event_match[app_event][by_match][found] == event_match[rollback_event]
+    else:
+        valid[:] = False
+    rollback_event, rollback_app = rollback_event[valid], by_match[found[valid]]
+
+    manual_event = np.flatnonzero((kind == KIND_DELTA) | (kind == KIND_SET) | (kind == KIND_DECAY))
+
+    # --- Dense clan indexes and levels ------------------------------------------
+    present = np.zeros(int(max(event_clan.max(initial=0), data.clan_a.max(initial=0), data.clan_b.max(initial=0))) + 1, dtype=bool)
+    present[event_clan] = True
+    present[data.clan_a[app_row]] = True
+    present[data.clan_b[app_row]] = True
+    universe = np.flatnonzero(present)
+    dense = np.cumsum(present) - 1  # clan_id -> index into `universe`
+    clans = len(universe)
+    ia, ib = dense[data.clan_a[app_row]], dense[data.clan_b[app_row]]
+
+    op_event = np.concatenate([app_event, rollback_event, manual_event])
+    op_first = np.concatenate([ia, dense[event_clan[rollback_event]], dense[event_clan[manual_event]]])
+    # A revert also waits for the application it undoes (its clan_a: a level at or after it)
+    op_second = np.concatenate([ib, ia[rollback_app], dense[event_clan[manual_event]]])
+    in_order = np.argsort(op_event, kind="stable")
+    op_level = np.empty(len(op_event), dtype=np.int64)
+    op_level[in_order] = _schedule(op_first[in_order].tolist(), op_second[in_order].tolist(), clans)
+    app_level = op_level[:apps]
+
+    # --- Per-application inputs that do not depend on ratings ----------------------
+    a_won = np.where(event_clan[app_event] == data.clan_a[app_row], data.event_won[app_event], 1 - data.event_won[app_event])
+    played_a, played_b = _played_before(ia, ib)
+    k_a = np.where(played_a < cfg.placement_matches, cfg.k_placement, cfg.k_stable)
+    k_b = np.where(played_b < cfg.placement_matches, cfg.k_placement, cfg.k_stable)
+
+    first_rollback = rollback_event[first_of_run[rollback_event]]
+    first_rollback_app = rollback_app[first_of_run[rollback_event]]
+    pair = np.minimum(ia, ib) * max(clans, 1) + np.maximum(ia, ib)
+    recent = _pair_window_counts(
+        pair, data.created_ts[app_row], data.event_ts[app_event], app_event,
+        pair[first_rollback_app], data.created_ts[app_row[first_rollback_app]], first_rollback,
+    )
+    multipliers = np.array(list(cfg.anti_farm_multipliers) + [cfg.default_multiplier])
+    multiplier = multipliers[np.minimum(recent, len(cfg.anti_farm_multipliers))]
+
+    ones = np.ones(apps)
+    if "win_rate_mod" in features:
+        (total_a, wins_a), (total_b, wins_b) = _win_rate_windows(data, elo.WIN_RATE_WINDOW)
+        wr_a = _win_rate_modifiers(total_a, wins_a, cfg)[app_row]
+        wr_b = _win_rate_modifiers(total_b, wins_b, cfg)[app_row]
+    else:
+        wr_a = wr_b = ones
+    if "rank_elo_mod" in features:
+        rank_a, rank_b = (m[app_row] for m in _rank_modifiers(data.avg_rank_a, data.avg_rank_b))
+    else:
+        rank_a = rank_b = ones
+    rank_applies = (rank_a != 1.0) | (rank_b != 1.0)
+
+    # Both sides of every application as one column, grouped by level
+    side_level = np.concatenate([app_level, app_level])
+    sort = _stable_order(side_level)
+    me = np.concatenate([ia, ib])[sort]
+    them = np.concatenate([ib, ia])[sort]
+    k = np.concatenate([k_a, k_b]).astype(np.float64)[sort]
+    score = np.concatenate([a_won, 1 - a_won]).astype(np.float64)[sort]
+    scale = np.concatenate([multiplier, multiplier])[sort]
+    # compute_elo(): the rank step (clamped, times win rate) replaces the win-rate step when it applies
+    modifier = np.where(
+        np.concatenate([rank_applies, rank_applies]),
+        np.maximum(0.3, np.concatenate([wr_a * rank_a, wr_b * rank_b])),
+        np.concatenate([wr_a, wr_b]),
+    )[sort]
+    max_level = int(op_level.max()) if len(op_level) else 0
+    bounds = np.searchsorted(side_level[sort], np.arange(1, max_level + 2)).tolist()
+    side_of = np.empty(2 * apps, dtype=np.int64)
+    side_of[sort] = np.arange(2 * apps)
+
+    table, span = _expected_table(cfg.rating_scale)
+    gap_edges, bonuses = np.array([100, 150, 201]), np.array([0, 5, 8, 10])
+    use_underdog = "underdog_bonus" in features
+    use_cap = "elo_gain_cap" in features
+
+    # Rollbacks, bonuses, decay and sets are rare: applied one by one at their level
+    others: Dict[int, list] = {}
+    for level, event, clan, app in zip(
+        op_level[apps:].tolist(), op_event[apps:].tolist(), op_first[apps:].tolist(),
+        np.concatenate([rollback_app, np.full(len(manual_event), -1)]).tolist(),
+    ):
+        others.setdefault(level, []).append((event, clan, app))
+    ia_list = ia.tolist()
+
+    # --- Wavefront: every level touches each clan at most once ---------------------
+    rating = np.full(clans, initial_elo, dtype=np.int64)
+    delta = np.zeros(2 * apps, dtype=np.int64)
+    for level in range(1, max_level + 1):
+        lo, hi = bounds[level - 1], bounds[level]
+        if hi > lo:
+            players = me[lo:hi]
+            mine = rating[players]
+            gap = rating[them[lo:hi]] - mine
+            expected = np.take(table, gap + span, mode="clip")
+            final = np.rint(np.rint(np.rint(k[lo:hi] * (score[lo:hi] - expected)) * scale[lo:hi]) * modifier[lo:hi])
+            if use_underdog:
+                final += score[lo:hi] * bonuses[np.searchsorted(gap_edges, gap, side="right")]
+            if use_cap:
+                np.minimum(final, cfg.max_gain_per_match, out=final)
+            final = final.astype(np.int64)
+            rating[players] = np.maximum(cfg.floor, mine + final)
+            delta[lo:hi] = final
+        for event, clan, app in others.get(level, ()):
+            if app >= 0:
+                rating[clan] -= delta[side_of[app] if clan == ia_list[app] else side_of[apps + app]]
+            elif kind[event] == KIND_SET:
+                rating[clan] = data.event_new[event]
+            elif kind[event] == KIND_DECAY and decay is not None:
+                if rating[clan] > decay.threshold:
+                    rating[clan] = max(decay.floor, rating[clan] + data.event_change[event])
+            else:
+                rating[clan] += data.event_change[event]
+
+    delta_a, delta_b = delta[side_of[:apps]], delta[side_of[apps:]]
+    return {
+        "elo": dict(zip(universe.tolist(), rating.tolist())),
+        "matches_played": dict(zip(universe.tolist(), np.bincount(np.concatenate([ia, ib]), minlength=clans).tolist())),
+        "deltas": dict(zip(data.match_id[app_row].tolist(), zip(delta_a.tolist(), delta_b.tolist()))),
+        "levels": max_level,
+    }
+
+
+async def _current_features() -> FrozenSet[str]:
+    return frozenset([f for f in elo.BALANCE_FEATURES if await db.is_balance_feature_enabled(f)])
+
+
+async def audit_ladder(features: Optional[FrozenSet[str]] = None, limit: int = 50) -> Dict[str, Any]:
+    """
+    Replay the whole ladder and compare it with the database.
+    Returns counts, timings, every clan whose stored Elo differs
+    ({clan_id, name, stored, replayed, diff}) and up to `limit` matches whose
+    stored final deltas differ from the replayed ones.
+    """
+    _require_numpy()
+    started = time.perf_counter()
+    data = await load_ladder()
+    loaded = time.perf_counter()
+    if features is None:
+        features = await _current_features()
+    result = await asyncio.to_thread(replay_ladder, data, None, features)
+    replayed = time.perf_counter()
+
+    clans = []
+    for clan_id, stored, name in zip(data.clan_ids.tolist(), data.clan_elo.tolist(), data.clan_names):
+        value = result["elo"].get(clan_id, elo.ELO_INITIAL)
+        if value != stored:
+            clans.append({"clan_id": clan_id, "name": name, "stored": stored, "replayed": value, "diff": stored - value})
+
+    matches = []
+    for match_id, stored_a, stored_b in zip(data.match_id.tolist(), data.final_delta_a.tolist(), data.final_delta_b.tolist()):
+        replayed_deltas = result["deltas"].get(match_id)
+        if replayed_deltas is not None and replayed_deltas != (stored_a, stored_b):
+            matches.append({"match_id": match_id, "stored": (stored_a, stored_b), "replayed": replayed_deltas})
+            if len(matches) >= limit:
+                break
+
+    return {
+        "matches": data.matches,
+        "events": data.events,
+        "clans": len(data.clan_ids),
+        "clan_mismatches": clans,
+        "match_mismatches": matches,
+        "load_seconds": round(loaded - started, 3),
+        "replay_seconds": round(replayed - loaded, 3),
+    }
+
+
+# =============================================================================
+# VOID + REPLAY ROLLBACK
+# =============================================================================
+
+def plan_void(data: LadderData, match_ids: List[int], features: FrozenSet[str] = frozenset(elo.BALANCE_FEATURES),
+              cfg: Optional[elo.EloConfig] = None) -> Dict[str, Any]:
+    """
+    What voiding `match_ids` does to the ladder. Pure: no I/O.
+    The ladder is replayed as it is and without those matches (their Elo, their
+    anti-farm and win-rate weight, their matches_played); the difference is applied
+    on top of the stored values, so drift elsewhere is neither fixed nor spread.
+    Returns {"match_ids", "first_match_id", "clans": [{clan_id, name, old_elo, new_elo,
+    change, played_change, voided: [(match_id, stored net change)]}], "matches":
+    [{match_id, old: (a, b), new: (a, b)}]} for the later matches whose deltas move.
+    """
+    _require_numpy()
+    void = np.isin(data.match_id, np.array(match_ids, dtype=np.int64))
+    voided = data.match_id[void].tolist()  # creation order
+    before = replay_ladder(data, cfg, features)
+    after = replay_ladder(replace(data, **{name: getattr(data, name)[~void] for name in MATCH_COLUMNS}), cfg, features)
+
+    # Net stored change of every voided match per clan (application minus earlier rollbacks)
+    rows = np.isin(data.event_match, np.array(voided, dtype=np.int64)) & np.isin(data.event_kind, [KIND_MATCH, KIND_ROLLBACK])
+    net: Dict[int, Dict[int, int]] = {}
+    for clan_id, match_id, change in zip(data.event_clan[rows].tolist(), data.event_match[rows].tolist(),
+                                         data.event_change[rows].tolist()):
+        per_match = net.setdefault(clan_id, {})
+        per_match[match_id] = per_match.get(match_id, 0) + change
+
+    clans = []
+    for clan_id, stored, name in zip(data.clan_ids.tolist(), data.clan_elo.tolist(), data.clan_names):
+        change = after["elo"].get(clan_id, elo.ELO_INITIAL) - before["elo"].get(clan_id, elo.ELO_INITIAL)
+        played_change = after["matches_played"].get(clan_id, 0) - before["matches_played"].get(clan_id, 0)
+        stored_voided = [(m, c) for m in voided if (c := net.get(clan_id, {}).get(m, 0))]
+        if change or played_change or stored_voided:
+            clans.append({
+                "clan_id": clan_id, "name": name, "old_elo": stored, "new_elo": stored + change,
+                "change": change, "played_change": played_change, "voided": stored_voided,
+            })
+    clans.sort(key=lambda c: (-abs(c["change"]), c["clan_id"]))
+
+    matches = []
+    for match_id, stored_a, stored_b in zip(data.match_id[~void].tolist(), data.final_delta_a[~void].tolist(),
+                                            data.final_delta_b[~void].tolist()):
+        old, new = before["deltas"].get(match_id), after["deltas"].get(match_id)
+        if old is not None and new is not None and old != new:
+            matches.append({
+                "match_id": match_id, "old": (stored_a, stored_b),
+                "new": (stored_a + new[0] - old[0], stored_b + new[1] - old[1]),
+            })
+
+    return {
+        "match_ids": voided,
+        "first_match_id": voided[0] if voided else None,
+        "clans": clans,
+        "matches": matches,
+    }
+
+
+async def _ladder_stamp() -> tuple:
+    """
+    Changes since a plan was built: last elo_history row, decided-match count and the
+    committed clan / match data versions. Inside transaction() it reads the writer's view.
+    """
+    async with db.get_read_connection() as conn:
+        cursor = await conn.execute(
+            "SELECT (SELECT MAX(id) FROM elo_history), "
+            "(SELECT COUNT(*) FROM matches WHERE status IN ('confirmed', 'resolved'))"
+        )
+        row = await cursor.fetchone()
+    return (*row, *db.get_data_version("clans", "matches"))
+
+
+async def plan_void_rollback(match_ids: List[int], features: Optional[FrozenSet[str]] = None) -> Dict[str, Any]:
+    """
+    Diff preview of apply_void_rollback(): loads the ladder and runs plan_void() in a
+    worker thread, so the bot keeps serving while the ladder is replayed.
+    Returns {"success": False, "reason"} if a match is unknown or not decided (confirmed / resolved).
+    """
+    _require_numpy()
+    started = time.perf_counter()
+    data = await load_ladder()
+    unknown = sorted(set(match_ids) - set(data.match_id.tolist()))
+    if not match_ids or unknown:
+        return {"success": False, "reason": f"Match không hợp lệ hoặc chưa có kết quả: {unknown or match_ids}"}
+    if features is None:
+        features = await _current_features()
+    plan = await asyncio.to_thread(plan_void, data, match_ids, features)
+    plan["success"] = True
+    plan["replay_seconds"] = round(time.perf_counter() - started, 3)
+    return plan
+
+
+async def _write_void_rollback(conn: Any, plan: Dict[str, Any], changed_by: Optional[int]) -> int:
+    """The writes of apply_void_rollback(); returns the number of elo_history rows."""
+    first = plan["first_match_id"]
+    await conn.executemany(
+        "UPDATE matches SET status = 'voided', elo_applied = 0 WHERE id = ? AND status IN ('confirmed', 'resolved')",
+        [(m,) for m in plan["match_ids"]]
+    )
+    await conn.executemany(
+        "UPDATE matches SET final_delta_a = ?, final_delta_b = ? WHERE id = ?",
+        [(*m["new"], m["match_id"]) for m in plan["matches"]]
+    )
+    await conn.executemany(
+        "UPDATE clans SET elo = ?, matches_played = MAX(0, matches_played + ?), updated_at = datetime('now') WHERE id = ?",
+        [(c["new_elo"], c["played_change"], c["clan_id"]) for c in plan["clans"]]
+    )
+
+    history = []
+    for clan in plan["clans"]:
+        current = clan["old_elo"]
+        for match_id, change in clan["voided"]:
+            history.append((clan["clan_id"], match_id, current, current - change, -change,
+                            f"rollback_match_{match_id}", changed_by))
+            current -= change
+        if current != clan["new_elo"]:
+            history.append((clan["clan_id"], first, current, clan["new_elo"], clan["new_elo"] - current,
+                            f"replay_correction_{first}", changed_by))
+    await conn.executemany(
+        """INSERT INTO elo_history (clan_id, match_id, old_elo, new_elo, change_amount, reason, changed_by)
+           VALUES (?, ?, ?, ?, ?, ?, ?)""",
+        history
+    )
+
+    for clan in plan["clans"]:
+        db.invalidate_clan(clan["clan_id"])
+    for match_id in plan["match_ids"] + [m["match_id"] for m in plan["matches"]]:
+        db.invalidate_matches(match_id)
+    return len(history)
+
+
+async def apply_void_rollback(match_ids: List[int], changed_by: Optional[int] = None,
+                              features: Optional[FrozenSet[str]] = None) -> Dict[str, Any]:
+    """
+    Void `match_ids` and write the replayed ladder in ONE writer transaction:
+    - matches: status 'voided', elo_applied 0; later matches get their recomputed final deltas
+    - clans: corrected elo and matches_played
+    - elo_history, per clan: a `rollback_match_<id>` row undoing each voided match's stored
+      change, then one `replay_correction_<first id>` row for the knock-on effect
+    The plan is built before the transaction (the writer is not held while the ladder is
+    read and replayed); inside it only _ladder_stamp() is compared. If another write landed
+    in between, the plan is rebuilt and retried, and on the last attempt rebuilt under the
+    lock. The applied plan can therefore differ from an earlier preview. Returns it.
+    """
+    _require_numpy()
+    if features is None:
+        features = await _current_features()
+    for attempt in range(1, PLAN_ATTEMPTS + 1):
+        stamp = await _ladder_stamp()
+        plan = await plan_void_rollback(match_ids, features)
+        if not plan["success"]:
+            return plan
+        async with db.transaction() as conn:
+            if await _ladder_stamp() != stamp:
+                if attempt < PLAN_ATTEMPTS:
+                    continue
+                plan = await plan_void_rollback(match_ids, features)
+                if not plan["success"]:
+                    return plan
+            history_rows = await _write_void_rollback(conn, plan, changed_by)
+        plan["history_rows"] = history_rows
+        plan["attempts"] = attempt
+        return plan
@@ -3,6 +3,7 @@ Loan Service
 Handles the logic for activating and ending loans, including member movement and Discord role updates.
 """
 
+import asyncio
 import discord
 from datetime import datetime, timezone
 from services import db, cooldowns
@@ -41,8 +42,9 @@ async def activate_loan(loan_id: int, guild: discord.Guild) -> bool:
         if member_user:
             discord_member = guild.get_member(int(member_user["discord_id"]))
             if discord_member:
-                lending_clan = await db.get_clan_by_id(lending_clan_id)
-                borrowing_clan = await db.get_clan_by_id(borrowing_clan_id)
+                lending_clan, borrowing_clan = await asyncio.gather(
+                    db.get_clan_by_id(lending_clan_id), db.get_clan_by_id(borrowing_clan_id)
+                )
                 
                 # Remove lending clan role
                 if lending_clan and lending_clan.get("discord_role_id"):
@@ -62,9 +64,11 @@ async def activate_loan(loan_id: int, guild: discord.Guild) -> bool:
     chat_channel = bot_utils.get_chat_channel()
     if chat_channel:
         try:
-            lending_clan = await db.get_clan_by_id(lending_clan_id)
-            borrowing_clan = await db.get_clan_by_id(borrowing_clan_id)
-            member_user = await db.get_user_by_id(member_id)
+            lending_clan, borrowing_clan, member_user = await asyncio.gather(
+                db.get_clan_by_id(lending_clan_id),
+                db.get_clan_by_id(borrowing_clan_id),
+                db.get_user_by_id(member_id),
+            )
             
             embed = discord.Embed(
                 title="🤝 Thông Báo Loan Thành Viên",
@@ -126,8 +130,9 @@ async def _update_roles_for_end(guild: discord.Guild, member_id: int, lending_id
         discord_member = guild.get_member(int(member_user["discord_id"]))
         if not discord_member: return
         
-        lending_clan = await db.get_clan_by_id(lending_id)
-        borrowing_clan = await db.get_clan_by_id(borrowing_id)
+        lending_clan, borrowing_clan = await asyncio.gather(
+            db.get_clan_by_id(lending_id), db.get_clan_by_id(borrowing_id)
+        )
         
         if borrowing_clan and borrowing_clan.get("discord_role_id"):
             role = guild.get_role(int(borrowing_clan["discord_role_id"]))
@@ -184,8 +189,9 @@ async def end_loan(loan_id: int, guild: discord.Guild):
         if member_user:
             discord_member = guild.get_member(int(member_user["discord_id"]))
             if discord_member:
-                lending_clan = await db.get_clan_by_id(lending_clan_id)
-                borrowing_clan = await db.get_clan_by_id(borrowing_clan_id)
+                lending_clan, borrowing_clan = await asyncio.gather(
+                    db.get_clan_by_id(lending_clan_id), db.get_clan_by_id(borrowing_clan_id)
+                )
                 
                 # Remove borrowing clan role
                 if borrowing_clan and borrowing_clan.get("discord_role_id"):
@@ -4,9 +4,9 @@ Centralized helpers for system bans, clan freeze, and Elo rollback operations.
 """
 
 import json
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 import discord
-from services import db
+from services import db, elo_replay
 
 
 # =============================================================================
@@ -27,10 +27,9 @@ async def check_clan_banned(clan_id: int) -> Tuple[bool, Optional[Dict[str, Any]
 
 async def check_clan_frozen(clan_id: int) -> Tuple[bool, Optional[Dict[str, Any]]]:
     """Check if clan is frozen. Returns (is_frozen, flags)."""
-    flags = await db.get_clan_flags(clan_id)
-    if flags and flags.get("is_frozen") == 1:
-        return (True, flags)
-    return (False, None)
+    if not await db.is_clan_frozen(clan_id):
+        return (False, None)
+    return (True, await db.get_clan_flags(clan_id))
 
 
 async def check_elo_eligible(clan_id: int) -> Tuple[bool, str]:
@@ -105,57 +104,46 @@ async def rollback_match_elo(match_id: int, mod_id: int) -> Dict[str, Any]:
     """
     Rollback Elo changes from a match.
     Returns dict with success status and details.
+    Runs as one db.transaction(): each clan is moved back relative to its current Elo,
+    so Elo gained or lost since the match is kept and a double rollback is impossible.
     """
-    # Get match
-    match = await db.get_match(match_id)
-    if not match:
-        return {"success": False, "reason": "Match không tồn tại"}
-    
-    # Check if Elo was applied
-    if not match.get("elo_applied"):
-        return {"success": False, "reason": "Match này chưa được áp dụng Elo"}
-    
-    # Get Elo history for this match
-    history = await db.get_elo_history_for_match(match_id)
-    if not history:
-        return {"success": False, "reason": "Không tìm thấy lịch sử Elo cho match này"}
-    
-    rollback_details = []
-    
-    for entry in history:
-        clan_id = entry["clan_id"]
-        old_elo = entry["old_elo"]
-        change = entry["change_amount"]
+    async with db.transaction():
+        # Get match
+        match = await db.get_match(match_id)
+        if not match:
+            return {"success": False, "reason": "Match không tồn tại"}
         
-        # Get current clan elo
-        clan = await db.get_clan_by_id(clan_id)
-        if not clan:
-            continue
+        # Check if Elo was applied
+        if not match.get("elo_applied"):
+            return {"success": False, "reason": "Match này chưa được áp dụng Elo"}
         
-        current_elo = clan["elo"]
-        # Revert by subtracting the change
-        new_elo = current_elo - change
+        # Get Elo history for this match
+        history = await db.get_elo_history_for_match(match_id)
+        if not history:
+            return {"success": False, "reason": "Không tìm thấy lịch sử Elo cho match này"}
         
-        # Update clan elo
-        await db.set_clan_elo_directly(clan_id, new_elo)
+        rollback_details = []
         
-        # Record rollback in elo_history
-        await db.update_clan_elo(
-            clan_id, new_elo, match_id, 
-            f"rollback_match_{match_id}", 
-            mod_id
-        )
+        for entry in history:
+            clan_id = entry["clan_id"]
+            change = entry["change_amount"]
+            
+            clan = await db.get_clan_by_id(clan_id)
+            # Revert by subtracting the change (recorded in elo_history)
+            adjusted = await db.adjust_clan_elo(clan_id, -change, f"rollback_match_{match_id}", match_id, mod_id)
+            if clan is None or adjusted is None:
+                continue
+            
+            rollback_details.append({
+                "clan_id": clan_id,
+                "clan_name": clan["name"],
+                "before": adjusted["old_elo"],
+                "after": adjusted["new_elo"],
+                "reverted_change": -change
+            })
         
-        rollback_details.append({
-            "clan_id": clan_id,
-            "clan_name": clan["name"],
-            "before": current_elo,
-            "after": new_elo,
-            "reverted_change": -change
-        })
-    
-    # Mark match as elo rolled back
-    await db.mark_match_elo_rolled_back(match_id)
+        # Mark match as elo rolled back
+        await db.mark_match_elo_rolled_back(match_id)
     
     return {
         "success": True,
@@ -164,6 +152,27 @@ async def rollback_match_elo(match_id: int, mod_id: int) -> Dict[str, Any]:
     }
 
 
+async def preview_replay_rollback(match_ids: List[int]) -> Dict[str, Any]:
+    """
+    Diff of a replay rollback before it is applied: which clans change and by how much,
+    and which later matches get new deltas (see elo_replay.plan_void_rollback). Read-only.
+    """
+    if elo_replay.np is None:
+        return {"success": False, "reason": "Replay rollback cần NumPy (pip install numpy)"}
+    return await elo_replay.plan_void_rollback(match_ids)
+
+
+async def replay_rollback_matches(match_ids: List[int], mod_id: int) -> Dict[str, Any]:
+    """
+    Void matches and recompute every affected clan from the first voided match onward,
+    all in one db.transaction() (see elo_replay.apply_void_rollback).
+    Unlike rollback_match_elo(), later matches are re-scored as if the voided ones never happened.
+    """
+    if elo_replay.np is None:
+        return {"success": False, "reason": "Replay rollback cần NumPy (pip install numpy)"}
+    return await elo_replay.apply_void_rollback(match_ids, mod_id)
+
+
 async def reset_clan_elo(clan_id: int, mod_id: int, new_elo: int = 1000) -> Dict[str, Any]:
     """
     Reset clan Elo to a specific value (default 1000).
@@ -0,0 +1,139 @@
+"""
+Row Records
+Compact __slots__ records returned by services/db.py helpers instead of dict(row).
+"""
+
+import keyword
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple, Type
+
+
+class Record(Mapping):
+    """
+    Base class for row records.
+
+    Fields come straight from `cursor.description`, so one record type covers both
+    `SELECT *` and joined selects (extra columns such as `clan_a_name` become fields).
+    A record behaves like the dict it replaces: `rec["name"]`, `rec.get()`, `in`,
+    `keys()` / `items()`, `dict(rec)` and `**rec` all work, and fields are also
+    plain attributes (`rec.name`). Assigning a key that is not a column still works;
+    it goes to a small overflow dict that is only allocated when used.
+    """
+
+    __slots__ = ("_extra",)
+    _fields: Tuple[str, ...] = ()
+    _field_set: frozenset = frozenset()
+
+    def __init__(self, values: Iterable[Any]):
+        setter = object.__setattr__
+        for name, value in zip(self._fields, values):
+            setter(self, name, value)
+        setter(self, "_extra", None)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._field_set:
+            return getattr(self, key)
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in self._field_set:
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._fields
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return len(self._fields) + (len(self._extra) if self._extra else 0)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._field_set or (self._extra is not None and key in self._extra)
+
+    def __repr__(self) -> str:
+        body = ", ".join(f"{key}={self[key]!r}" for key in self)
+        return f"{type(self).__name__}({body})"
+
+    def copy(self) -> "Record":
+        """Shallow copy of the same record type (like dict.copy())."""
+        clone = type(self)(getattr(self, name) for name in self._fields)
+        if self._extra:
+            clone._extra = dict(self._extra)
+        return clone
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.items())
+
+
+class User(Record):
+    __slots__ = ()
+
+
+class Clan(Record):
+    __slots__ = ()
+
+
+class ClanMember(Record):
+    __slots__ = ()
+
+
+class Match(Record):
+    __slots__ = ()
+
+
+class Loan(Record):
+    __slots__ = ()
+
+
+class Transfer(Record):
+    __slots__ = ()
+
+
+class Cooldown(Record):
+    __slots__ = ()
+
+
+class Case(Record):
+    __slots__ = ()
+
+
+_RESERVED = frozenset(dir(Record))
+_classes: Dict[Tuple[Type[Record], Tuple[str, ...]], Optional[Type[Record]]] = {}
+
+
+def record_class(base: Type[Record], columns: Tuple[str, ...]) -> Optional[Type[Record]]:
+    """
+    Concrete subclass of `base` with one slot per column (cached per column layout).
+    Returns None if the columns cannot be slots (duplicates, keywords, clashes with
+    Mapping methods) — callers then fall back to a plain dict.
+    """
+    key = (base, columns)
+    if key not in _classes:
+        usable = (
+            len(set(columns)) == len(columns)
+            and all(c.isidentifier() and not keyword.iskeyword(c) and c not in _RESERVED for c in columns)
+        )
+        _classes[key] = _build_class(base, columns) if usable else None
+    return _classes[key]
+
+
+def _build_class(base: Type[Record], columns: Tuple[str, ...]) -> Type[Record]:
+    # Generated __init__ unpacks the row in one statement (same trick as namedtuple);
+    # column names were validated as plain identifiers above.
+    targets = "".join(f"self.{c}, " for c in columns)
+    source = f"def __init__(self, values):\n    {targets}= values\n    self._extra = None\n"
+    namespace: Dict[str, Any] = {}
+    exec(source, namespace)
+    return type(base.__name__, (base,), {
+        "__slots__": columns,
+        "__init__": namespace["__init__"],
+        "_fields": columns,
+        "_field_set": frozenset(columns),
+        "__module__": __name__,
+    })
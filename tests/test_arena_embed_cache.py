@@ -0,0 +1,148 @@
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import db, elo
+from cogs import arena
+
+
+async def setup_test_db():
+    """Point the db module at a throwaway database file."""
+    db.DB_PATH = Path(tempfile.mkdtemp()) / "arena_embed_cache_test.db"
+    await db.init_db()
+    arena._rendered.clear()
+
+
+def pool_uses() -> int:
+    stats = db.get_read_pool_stats()
+    return stats["reused"] + stats["opened"]
+
+
+async def make_active_clan(name: str, members: int) -> tuple:
+    captain = await db.create_user(f"{name}_cap", f"{name}#CAP")
+    clan_id = await db.create_clan(name, captain)
+    for i in range(members):
+        await db.add_member(await db.create_user(f"{name}_{i}", f"{name}#{i}"), clan_id)
+    await db.update_clan_status(clan_id, "active")
+    return clan_id, captain
+
+
+async def leaderboard():
+    return await arena._render_cached("leaderboard", ("clans", "members"), arena._render_leaderboard)
+
+
+async def clan_list():
+    return await arena._render_cached(("clan_list", None), ("clans", "members"), lambda: arena._render_clan_list(None))
+
+
+async def match_history():
+    return await arena._render_cached("match_history", ("clans", "matches"), arena._render_match_history)
+
+
+async def test_repeat_clicks_skip_the_database():
+    print("\n--- Test: Unchanged data is served from the rendered cache ---")
+    await make_active_clan("AeAlpha", 3)
+    await make_active_clan("AeBeta", 2)
+    first = (await leaderboard(), await clan_list())
+    renders = arena._render_stats["renders"]
+    pool_before = pool_uses()
+    for _ in range(10):
+        assert (await leaderboard(), await clan_list()) == first
+    assert pool_uses() == pool_before
+    assert arena._render_stats["renders"] == renders
+    payload, select_clans = first[1]
+    assert "AeAlpha" in payload["fields"][0]["name"] and len(select_clans) == 2
+    assert "AeBeta" in first[0]["description"]
+    print(f"Stats: {arena._render_stats}")
+    print("✅ Cached clicks: Passed")
+
+
+async def test_writes_bump_the_version():
+    print("\n--- Test: Elo, member and match writes re-render ---")
+    clan_a = (await db.get_clan("AeAlpha"))["id"]
+    clan_b = (await db.get_clan("AeBeta"))["id"]
+    captain_a = (await db.get_user("AeAlpha_cap"))["id"]
+    captain_b = (await db.get_user("AeBeta_cap"))["id"]
+    assert await match_history() is None
+
+    # Match writes
+    match_id = await db.create_match_v2(clan_a, clan_b, captain_a)
+    assert "đang chờ kết quả" in (await match_history())["description"]
+    await db.report_match_v3(match_id, 13, 5)
+    await db.confirm_match_v2(match_id, captain_b)
+    assert "AeAlpha** thắng **AeBeta" in (await match_history())["description"]
+
+    # Elo write (one transaction touching clans and matches)
+    board = await leaderboard()
+    result = await elo.apply_match_result(match_id, clan_a)
+    assert result["success"], result
+    assert (await leaderboard()) != board
+    assert f"+{abs(result['final_delta_a'])}" in (await match_history())["description"]
+
+    # Member writes: roster change and rank declaration
+    listing = await clan_list()
+    await db.add_member(await db.create_user("AeBeta_new", "New#1"), clan_b)
+    assert (await clan_list()) != listing
+    board = await leaderboard()
+    await db.update_member_rank(captain_a, clan_a, "Diamond 1", 19)
+    assert (await leaderboard()) != board
+    print("✅ Version bumps: Passed")
+
+
+async def test_rollback_and_mid_render_writes():
+    print("\n--- Test: Rolled-back writes keep the cache, racing writes skip it ---")
+    clan_a = (await db.get_clan("AeAlpha"))["id"]
+    board = await leaderboard()
+    version = db.get_data_version("clans", "members")
+    try:
+        async with db.transaction():
+            await db.update_clan_elo(clan_a, 5000, None, "rolled back")
+            raise RuntimeError("abort")
+    except RuntimeError:
+        pass
+    assert db.get_data_version("clans", "members") == version
+    assert (await leaderboard()) == board
+
+    async def render_with_write():
+        payload = await arena._render_leaderboard()
+        await db.update_clan_elo(clan_a, 1500, None, "mid-render")
+        return payload
+
+    stale = await arena._render_cached("leaderboard_race", ("clans", "members"), render_with_write)
+    assert "leaderboard_race" not in arena._rendered  # rendered before the write: not kept
+    fresh = await leaderboard()
+    assert "`1500`" in fresh["description"] and "`1500`" not in stale["description"]
+    print("✅ Rollback + race: Passed")
+
+
+async def test_database_switch():
+    print("\n--- Test: A new database never reuses old renders ---")
+    assert (await leaderboard()) is not None
+    await setup_test_db()
+    assert (await leaderboard()) is None
+    print("✅ Database switch: Passed")
+
+
+async def main():
+    try:
+        await setup_test_db()
+        await test_repeat_clicks_skip_the_database()
+        await test_writes_bump_the_version()
+        await test_rollback_and_mid_render_writes()
+        await test_database_switch()
+        await db.close_pool()
+        print("\n🎉 ALL ARENA EMBED CACHE TESTS PASSED!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,159 @@
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import balance_sim, db, elo, elo_replay
+
+DECAY = elo_replay.DecayConfig(threshold=1050, amount=15, floor=100, inactivity_days=7)
+
+
+async def setup_test_db() -> dict:
+    """
+    Six weeks of history: clans 0-5 play every few hours throughout, clans 6-7 only
+    farm the others in week one and then go quiet (decay candidates). Match and
+    elo_history timestamps follow the simulated clock.
+    """
+    db.DB_PATH = Path(tempfile.mkdtemp()) / "balance_sim_test.db"
+    await db.init_db()
+    await db.load_system_settings()
+    rnd = random.Random(24)
+    captains = {}
+    for i in range(8):
+        captain = await db.create_user(f"bs_cap_{i}", f"Cap{i}#BS")
+        clan_id = await db.create_clan(f"BsClan{i}", captain)
+        await db.update_clan_status(clan_id, "active")
+        captains[clan_id] = captain
+    clan_ids = list(captains)
+    regulars, farmers = clan_ids[:6], clan_ids[6:]
+
+    clock = db.epoch_now(days=-42)
+    real_epoch_now = db.epoch_now
+    db.epoch_now = lambda **offset: clock + 300 + int(timedelta(**offset).total_seconds())  # Elo sees the simulated clock
+    schedule = [(farmer, rnd.choice(regulars), True) for farmer in farmers for _ in range(8)]
+    rnd.shuffle(schedule)
+    schedule += [(*rnd.sample(regulars, 2), None) for _ in range(110)]
+    for clan_a, clan_b, a_wins in schedule:
+        clock += 8 * 3600 if a_wins is None else 3600
+        match_id = await db.create_match_v2(clan_a, clan_b, captains[clan_a])
+        score = (13, 6) if a_wins or (a_wins is None and rnd.random() < 0.5) else (6, 13)
+        await db.report_match_v3(match_id, *score)
+        async with db.get_connection() as conn:
+            await conn.execute(
+                "UPDATE matches SET created_at = datetime(?, 'unixepoch'), created_ts = ? WHERE id = ?",
+                (clock, clock, match_id)
+            )
+            await conn.commit()
+        db.invalidate_matches(match_id)
+        async with db.transaction():
+            await db.confirm_match_v2(match_id, captains[clan_b])
+            result = await elo.apply_match_result(match_id, None)
+        assert result["success"], result
+        async with db.get_connection() as conn:
+            await conn.execute(
+                "UPDATE elo_history SET created_at = datetime(?, 'unixepoch') WHERE match_id = ?",
+                (clock + 300, match_id)
+            )
+            await conn.commit()
+    db.epoch_now = real_epoch_now
+    return {"regulars": regulars, "farmers": farmers}
+
+
+def baseline() -> balance_sim.Scenario:
+    return balance_sim.Scenario("current", elo.EloConfig.from_config(), frozenset(elo.BALANCE_FEATURES), DECAY)
+
+
+async def test_grid():
+    print("\n--- Test: scenario_grid() builds the cartesian product ---")
+    grid = balance_sim.scenario_grid(baseline(), {
+        "k_stable": [16, 64], "decay_amount": [0, 30], "underdog_bonus": [False],
+    })
+    assert len(grid) == 4
+    assert [s.name for s in grid][0] == "k_stable=16 decay_amount=0 underdog_bonus=False"
+    assert {(s.elo.k_stable, s.decay.amount) for s in grid} == {(16, 0), (16, 30), (64, 0), (64, 30)}
+    assert all("underdog_bonus" not in s.features and "elo_gain_cap" in s.features for s in grid)
+    assert balance_sim.scenario_grid(baseline(), {"elo_decay": [False]})[0].decay is None
+    assert balance_sim.scenario_grid(baseline(), {})[0].name == "current"
+    try:
+        balance_sim.scenario_grid(baseline(), {"k_stabel": [1]})
+        assert False, "typo accepted"
+    except ValueError:
+        pass
+    print("✅ Grid: Passed")
+
+
+async def test_decay_ticks(clans: dict):
+    print("\n--- Test: Simulated weekly decay only hits inactive clans ---")
+    data = await elo_replay.load_ladder()
+    ticked = balance_sim.with_decay_ticks(data, DECAY)
+    rows = ticked.event_kind == elo_replay.KIND_DECAY
+    decayed = set(ticked.event_clan[rows].tolist())
+    assert decayed == set(clans["farmers"]), decayed
+    assert ticked.events == data.events + int(rows.sum())
+    assert (ticked.event_ts[1:] >= ticked.event_ts[:-1]).all()  # ticks land at their time
+
+    plain = elo_replay.replay_ladder(data)
+    with_decay = elo_replay.replay_ladder(ticked, decay=DECAY)
+    for farmer in clans["farmers"]:
+        before, after = plain["elo"][farmer], with_decay["elo"][farmer]
+        print(f"Clan {farmer}: {before} -> {after}")
+        assert before > DECAY.threshold and DECAY.threshold - DECAY.amount < after <= DECAY.threshold + DECAY.amount
+    for regular in clans["regulars"]:
+        assert plain["elo"][regular] == with_decay["elo"][regular]
+    assert balance_sim.with_decay_ticks(data, None).events == data.events
+    print("✅ Decay ticks: Passed")
+
+
+async def test_simulate(clans: dict):
+    print("\n--- Test: Process pool what-if replay ---")
+    data = await elo_replay.load_ladder()
+    scenarios = balance_sim.scenario_grid(baseline(), {"k_stable": [16, 64], "elo_decay": [True, False]})
+    started = time.perf_counter()
+    reports = balance_sim.simulate(data, baseline(), scenarios, workers=2)
+    print(f"{len(reports)} configurations in {time.perf_counter() - started:.2f}s")
+    by_name = {r["name"]: r for r in reports}
+    for report in reports:
+        print(f"  {report['name']}: mean {report['mean']} std {report['std']} spearman {report['spearman']}")
+
+    base = by_name["current"]
+    assert base["clans"] == 8 and base["spearman"] == 1.0 and base["mean_rank_shift"] == 0 and base["top10_kept"] == 8
+    assert by_name["k_stable=64 elo_decay=True"]["std"] > by_name["k_stable=16 elo_decay=True"]["std"]
+    assert by_name["k_stable=16 elo_decay=False"]["mean"] > by_name["k_stable=16 elo_decay=True"]["mean"]
+
+    # Same numbers as an in-process replay; and current settings without decay == the stored ladder
+    balance_sim._init_worker(data)
+    inline = balance_sim._run_scenario(scenarios[0])
+    assert balance_sim.ladder_metrics(inline["ratings"])["mean"] == by_name[scenarios[0].name]["mean"]
+    stored = await db.get_clans_by_ids(clans["regulars"] + clans["farmers"])
+    no_decay = balance_sim._run_scenario(balance_sim.scenario_grid(baseline(), {"elo_decay": [False]})[0])
+    assert dict(zip(no_decay["clan_ids"].tolist(), no_decay["ratings"].tolist())) == {c: s["elo"] for c, s in stored.items()}
+    print("✅ Simulate: Passed")
+
+
+async def main():
+    if elo_replay.np is None:
+        print("⚠️ NumPy not installed: balance simulator tests skipped")
+        return
+    try:
+        clans = await setup_test_db()
+        await test_grid()
+        await test_decay_ticks(clans)
+        await test_simulate(clans)
+        await db.close_pool()
+        print("\n🎉 ALL BALANCE SIMULATOR TESTS PASSED!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
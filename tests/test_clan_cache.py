@@ -0,0 +1,162 @@
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import db, elo
+
+
+async def setup_test_db():
+    """Point the db module at a throwaway database file."""
+    db.DB_PATH = Path(tempfile.mkdtemp()) / "clan_cache_test.db"
+    await db.init_db()
+    db.set_cache_self_check(True)  # every hit below is compared against the database
+
+
+async def make_active_clan(name: str, captain_discord_id: str) -> int:
+    captain = await db.create_user(captain_discord_id, f"{name}#CAP")
+    clan_id = await db.create_clan(name, captain)
+    await db.update_clan_status(clan_id, "active")
+    return clan_id
+
+
+async def test_hits_skip_the_database():
+    print("\n--- Test: Repeated lookups are cache hits ---")
+    clan_id = await make_active_clan("CacheAlpha", "cc_cap_a")
+    await db.get_clan_by_id(clan_id)
+    db.set_cache_self_check(False)
+    before = db.get_clan_cache_stats()
+    pool_before = db.get_read_pool_stats()["reused"] + db.get_read_pool_stats()["opened"]
+    for _ in range(10):
+        assert (await db.get_clan_by_id(clan_id))["name"] == "CacheAlpha"
+        assert (await db.get_clan("CacheAlpha"))["id"] == clan_id
+    pool_after = db.get_read_pool_stats()["reused"] + db.get_read_pool_stats()["opened"]
+    after = db.get_clan_cache_stats()
+    db.set_cache_self_check(True)
+
+    print(f"Stats: {after}")
+    assert after["hits"] - before["hits"] == 20
+    assert pool_after == pool_before
+    print("✅ Cache hits: Passed")
+
+
+async def test_name_lookup_is_exact():
+    print("\n--- Test: Case-folded index keeps case-sensitive semantics ---")
+    clan_id = (await db.get_clan("CacheAlpha"))["id"]
+    assert await db.get_clan("cachealpha") is None  # SQLite `name = ?` is case-sensitive
+    assert (await db.get_clan_any_status("CacheAlpha"))["id"] == clan_id
+    # Callers get copies: mutating one must not leak into the cache
+    clan = await db.get_clan_by_id(clan_id)
+    clan["elo"] = -1
+    assert (await db.get_clan_by_id(clan_id))["elo"] != -1
+    print("✅ Exact names: Passed")
+
+
+async def test_mutators_invalidate():
+    print("\n--- Test: Every clan mutator invalidates ---")
+    clan_a = (await db.get_clan("CacheAlpha"))["id"]
+    clan_b = await make_active_clan("CacheBeta", "cc_cap_b")
+
+    steps = [
+        ("update_clan_elo", lambda: db.update_clan_elo(clan_a, 1111, None, "test")),
+        ("set_clan_elo_directly", lambda: db.set_clan_elo_directly(clan_a, 1200)),
+        ("increment_clan_matches", lambda: db.increment_clan_matches(clan_a)),
+        ("set_clan_discord_ids", lambda: db.set_clan_discord_ids(clan_a, "r1", "c1")),
+        ("apply_elo_decay", lambda: db.apply_elo_decay(clan_a, 15)),
+        ("update_clan_name", lambda: db.update_clan_name(clan_a, "CacheGamma")),
+        ("update_clan_status", lambda: db.update_clan_status(clan_a, "inactive")),
+        ("update_clan_status", lambda: db.update_clan_status(clan_a, "active")),
+    ]
+    for name, step in steps:
+        await db.get_clan_by_id(clan_a)  # make sure it is cached
+        await step()
+        await db.get_clan_by_id(clan_a)  # self-check raises if stale
+        print(f"  {name}: ok")
+
+    assert await db.get_clan("CacheAlpha") is None
+    assert (await db.get_clan("CacheGamma"))["id"] == clan_a
+
+    # Elo pipeline (raw UPDATE clans inside elo.apply_match_result)
+    creator = (await db.get_user("cc_cap_a"))["id"]
+    confirmer = (await db.get_user("cc_cap_b"))["id"]
+    await db.get_clans_by_ids([clan_a, clan_b])
+    match_id = await db.create_match_v2(clan_a, clan_b, creator)
+    await db.report_match_v3(match_id, 13, 5)
+    await db.confirm_match_v2(match_id, confirmer)
+    result = await elo.apply_match_result(match_id, clan_a)
+    assert (await db.get_clan_by_id(clan_a))["elo"] == result["elo_a_new"]
+    assert (await db.get_clan_by_id(clan_b))["elo"] == result["elo_b_new"]
+
+    await db.hard_delete_clan(clan_b)
+    assert await db.get_clan_by_id(clan_b) is None
+    assert await db.get_clan("CacheBeta") is None
+    assert await db.verify_clan_cache() == []
+    print("✅ Invalidation: Passed")
+
+
+async def test_raw_sql_and_transactions():
+    print("\n--- Test: Raw SQL hook and transaction outcome ---")
+    clan_id = (await db.get_clan("CacheGamma"))["id"]
+    async with db.get_connection() as conn:
+        await conn.execute("UPDATE clans SET elo = 900 WHERE id = ?", (clan_id,))
+        await conn.commit()
+    db.invalidate_clan(clan_id)
+    assert (await db.get_clan_by_id(clan_id))["elo"] == 900
+
+    try:
+        async with db.transaction():
+            await db.update_clan_elo(clan_id, 100, None, "rolled back")
+            assert (await db.get_clan_by_id(clan_id))["elo"] == 100  # scope sees its own write
+            raise RuntimeError("abort")
+    except RuntimeError:
+        pass
+    assert (await db.get_clan_by_id(clan_id))["elo"] == 900
+
+    async with db.transaction():
+        await db.update_clan_elo(clan_id, 950, None, "committed")
+    assert (await db.get_clan_by_id(clan_id))["elo"] == 950
+    print("✅ Raw SQL + transactions: Passed")
+
+
+async def test_bounded_lru():
+    print("\n--- Test: Cache stays bounded ---")
+    size = db.get_clan_cache_stats()["max_size"]
+    captain = await db.create_user("cc_bulk", "Bulk#1")
+    async with db.get_connection() as conn:
+        await conn.executemany(
+            "INSERT INTO clans (name, captain_id, status) VALUES (?, ?, 'active')",
+            [(f"Bulk{i}", captain) for i in range(size + 20)]
+        )
+        await conn.commit()
+        cursor = await conn.execute("SELECT id FROM clans WHERE name LIKE 'Bulk%' ORDER BY id")
+        ids = [row[0] for row in await cursor.fetchall()]
+    await db.get_clans_by_ids(ids)
+    stats = db.get_clan_cache_stats()
+    assert stats["size"] == size and stats["evictions"] >= 20
+    assert (await db.get_clan(f"Bulk{size + 19}"))["id"] == ids[-1]
+    print("✅ LRU bound: Passed")
+
+
+async def main():
+    try:
+        await setup_test_db()
+        await test_hits_skip_the_database()
+        await test_name_lookup_is_exact()
+        await test_mutators_invalidate()
+        await test_raw_sql_and_transactions()
+        await test_bounded_lru()
+        await db.close_pool()
+        print("\n🎉 ALL CLAN CACHE TESTS PASSED!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,133 @@
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import db, cooldowns
+
+
+async def setup_test_db():
+    """Point the db module at a throwaway database file."""
+    db.DB_PATH = Path(tempfile.mkdtemp()) / "cooldown_index_test.db"
+    await db.init_db()
+    await db.load_cooldowns()
+    db.set_cache_self_check(True)  # every lookup below is compared against the database
+
+
+def pool_uses() -> int:
+    stats = db.get_read_pool_stats()
+    return stats["reused"] + stats["opened"]
+
+
+async def test_checks_cost_no_queries():
+    print("\n--- Test: Guarded-action checks are served from memory ---")
+    user_id = await db.create_user("cd_user", "Cd#1")
+    await cooldowns.apply_member_join_cooldown(user_id, "Left clan", source_clan_id=7)
+    await cooldowns.apply_transfer_sickness(user_id)
+    await db.get_user_by_id(user_id)  # warm the identity cache (legacy column check)
+
+    db.set_cache_self_check(False)
+    pool_before = pool_uses()
+    for _ in range(10):
+        assert (await cooldowns.check_cooldown("user", user_id, cooldowns.KIND_JOIN_LEAVE))[0]
+        assert (await cooldowns.check_member_join_cooldown(user_id, target_clan_id=7))[0]
+        assert not (await cooldowns.check_member_join_cooldown(user_id, target_clan_id=8))[0]
+        assert (await db.get_active_cooldown(user_id, "user", "transfer_sickness"))["reason"] == "Transfer completed"
+        assert [c["kind"] for c in await db.get_all_user_cooldowns(user_id)] == ["join_leave", "transfer_sickness"]
+        assert not (await cooldowns.check_loan_cooldown("clan", 1))[0]
+    db.set_cache_self_check(True)
+    assert pool_uses() == pool_before
+    print(f"Stats: {db.get_cooldown_index_stats()}")
+    print("✅ O(1) checks: Passed")
+
+
+async def test_writes_are_published():
+    print("\n--- Test: set / set_minutes / clear keep the index current ---")
+    user_id = (await db.get_user("cd_user"))["id"]
+    first = await db.get_cooldown("user", user_id, "join_leave")
+    await db.set_cooldown_minutes("user", user_id, "join_leave", 5, "shorter")
+    second = await db.get_cooldown("user", user_id, "join_leave")
+    assert second["until_ts"] < first["until_ts"] and second["reason"] == "shorter"
+
+    await cooldowns.clear_cooldown("user", user_id, "transfer_sickness")
+    assert await db.get_cooldown("user", user_id, "transfer_sickness") is None
+    await cooldowns.clear_cooldown("user", user_id)
+    assert await db.get_all_user_cooldowns(user_id) == []
+
+    # Raw SQL has to tell the index
+    async with db.get_connection() as conn:
+        await conn.execute(
+            "INSERT INTO cooldowns (target_type, target_id, kind, until) VALUES ('clan', 5, 'loan', datetime('now', '+1 day'))"
+        )
+        await conn.commit()
+    db.invalidate_cooldowns()
+    assert (await cooldowns.check_loan_cooldown("clan", 5))[0]
+    print("✅ Write-through: Passed")
+
+
+async def test_expiry_touches_only_due_entries():
+    print("\n--- Test: Expiry sweep pops due entries off the heap ---")
+    writer_before = db.get_writer_stats()["jobs"]
+    assert await db.pop_expired_cooldowns() == []
+    assert db.get_writer_stats()["jobs"] == writer_before  # nothing due: no query, no write
+
+    user_id = (await db.get_user("cd_user"))["id"]
+    await db.set_cooldown_minutes("user", user_id, "match_create", -1, "already over")
+    await db.set_cooldown_minutes("clan", 9, "match_create", -1, "extended below")
+    await db.set_cooldown_minutes("clan", 9, "match_create", 30, "extended")  # old heap entry is stale
+    for i in range(100):
+        await db.set_cooldown("clan", 100 + i, "loan", 1, "not due")
+
+    expired = await db.pop_expired_cooldowns()
+    assert [(c["target_type"], c["kind"]) for c in expired] == [("user", "match_create")]
+    assert (await db.get_cooldown("clan", 9, "match_create"))["reason"] == "extended"
+    assert await db.pop_expired_cooldowns() == []
+
+    # Superseded heap entries do not pile up
+    for i in range(200):
+        await db.set_cooldown_minutes("clan", 9, "match_create", 30 + i, "bump")
+    stats = db.get_cooldown_index_stats()
+    print(f"Stats: {stats}")
+    assert stats["heap"] <= 2 * stats["rows"] + 64
+    print("✅ Heap expiry: Passed")
+
+
+async def test_transactions():
+    print("\n--- Test: Index follows transaction outcome ---")
+    try:
+        async with db.transaction():
+            await db.set_cooldown("clan", 42, "loan", 3, "rolled back")
+            assert await db.get_cooldown("clan", 42, "loan") is not None  # scope sees its own write
+            raise RuntimeError("abort")
+    except RuntimeError:
+        pass
+    assert await db.get_cooldown("clan", 42, "loan") is None
+
+    async with db.transaction():
+        await db.set_cooldown("clan", 42, "loan", 3, "committed")
+    assert (await db.get_cooldown("clan", 42, "loan"))["reason"] == "committed"
+    print("✅ Transactions: Passed")
+
+
+async def main():
+    try:
+        await setup_test_db()
+        await test_checks_cost_no_queries()
+        await test_writes_are_published()
+        await test_expiry_touches_only_due_entries()
+        await test_transactions()
+        await db.close_pool()
+        print("\n🎉 ALL COOLDOWN INDEX TESTS PASSED!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,79 @@
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import db
+
+
+async def setup_test_db():
+    """Point the db module at a throwaway database file."""
+    db.DB_PATH = Path(tempfile.mkdtemp()) / "batch_lookup_test.db"
+    await db.init_db()
+
+
+async def test_bulk_helpers():
+    print("\n--- Test: get_users_by_ids / get_clans_by_ids ---")
+    user_ids = [await db.create_user(f"bulk_{i}", f"Bulk#{i}") for i in range(5)]
+    clan_id = await db.create_clan("BulkClan", user_ids[0])
+
+    users = await db.get_users_by_ids(user_ids + [user_ids[0], 999999])
+    assert set(users) == set(user_ids)
+    assert users[user_ids[2]]["discord_id"] == "bulk_2"
+
+    clans = await db.get_clans_by_ids([clan_id, None])
+    assert clans[clan_id]["name"] == "BulkClan"
+    assert await db.get_clans_by_ids([]) == {}
+    print("✅ Bulk helpers: Passed")
+
+
+async def test_same_tick_lookups_are_coalesced():
+    print("\n--- Test: Concurrent get_user_by_id calls share one query ---")
+    ids = [u["id"] for u in (await db.get_users_by_ids(range(1, 6))).values()]
+    db._user_cache.clear()  # cold identity cache: measure the loader itself
+    before = db.get_lookup_stats()["users"]
+
+    results = await asyncio.gather(*(db.get_user_by_id(i) for i in ids + ids + [424242]))
+    after = db.get_lookup_stats()["users"]
+    print(f"Stats: {after}")
+
+    assert after["loads"] - before["loads"] == len(ids) * 2 + 1
+    assert after["batches"] - before["batches"] == 1
+    assert [r["id"] for r in results[:len(ids)]] == ids
+    assert results[-1] is None
+    # Same id, separate dicts: callers may mutate their copy
+    assert results[0] is not results[len(ids)]
+    print("✅ Coalescing: Passed")
+
+
+async def test_lookup_inside_transaction_sees_own_writes():
+    print("\n--- Test: Lookups inside transaction() bypass the loader ---")
+    async with db.transaction():
+        user_id = await db.create_user("bulk_tx", "Bulk#TX")
+        user = await db.get_user_by_id(user_id)
+        assert user is not None and user["discord_id"] == "bulk_tx"
+    assert await db.get_user_by_id(None) is None
+    print("✅ Scope lookups: Passed")
+
+
+async def main():
+    try:
+        await setup_test_db()
+        await test_bulk_helpers()
+        await test_same_tick_lookups_are_coalesced()
+        await test_lookup_inside_transaction_sees_own_writes()
+        await db.close_pool()
+        print("\n🎉 ALL BATCH LOOKUP TESTS PASSED!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
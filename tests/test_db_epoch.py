@@ -0,0 +1,139 @@
+import asyncio
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import db
+
+
+async def setup_test_db():
+    """Point the db module at a throwaway database file."""
+    db.DB_PATH = Path(tempfile.mkdtemp()) / "epoch_test.db"
+    await db.init_db()
+
+
+async def plan(sql: str, params: tuple) -> str:
+    async with db.get_connection() as conn:
+        cursor = await conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        return " | ".join(row[3] for row in await cursor.fetchall())
+
+
+async def test_mixed_formats_compare_correctly():
+    print("\n--- Test: isoformat() and datetime('now') strings compare as instants ---")
+    user_id = await db.create_user("epoch_user", "Epoch#1")
+    soon = datetime.now(timezone.utc) + timedelta(minutes=30)
+    past = datetime.now(timezone.utc) - timedelta(minutes=30)
+
+    # Same instant written three ways; text comparison got the offset/'T' forms wrong
+    async with db.get_connection() as conn:
+        await conn.execute(
+            "INSERT INTO cooldowns (target_type, target_id, kind, until) VALUES ('user', ?, 'iso', ?)",
+            (user_id, soon.isoformat())
+        )
+        await conn.execute(
+            "INSERT INTO cooldowns (target_type, target_id, kind, until) VALUES ('user', ?, 'sqlite', ?)",
+            (user_id, soon.strftime("%Y-%m-%d %H:%M:%S"))
+        )
+        await conn.execute(
+            "INSERT INTO cooldowns (target_type, target_id, kind, until) VALUES ('user', ?, 'offset', ?)",
+            (user_id, soon.astimezone(timezone(timedelta(hours=7))).isoformat())
+        )
+        await conn.execute(
+            "INSERT INTO cooldowns (target_type, target_id, kind, until) VALUES ('user', ?, 'expired', ?)",
+            (user_id, past.astimezone(timezone(timedelta(hours=7))).isoformat())
+        )
+        await conn.commit()
+    db.invalidate_cooldowns()
+
+    for kind in ("iso", "sqlite", "offset"):
+        cooldown = await db.get_cooldown("user", user_id, kind)
+        assert cooldown is not None, kind
+        assert cooldown["until_ts"] == int(soon.timestamp()), kind
+    assert await db.get_cooldown("user", user_id, "expired") is None
+    assert len(await db.get_all_user_cooldowns(user_id)) == 3
+
+    expired = await db.pop_expired_cooldowns()
+    assert [c["kind"] for c in expired] == ["expired"]
+    print("✅ Mixed formats: Passed")
+
+
+async def test_triggers_follow_updates():
+    print("\n--- Test: Epoch twin follows INSERT / UPSERT / UPDATE ---")
+    user_id = (await db.get_user("epoch_user"))["id"]
+    await db.set_cooldown("user", user_id, "join_leave", 2, "test")
+    first = await db.get_cooldown("user", user_id, "join_leave")
+    await db.set_cooldown_minutes("user", user_id, "join_leave", 5, "shorter")
+    second = await db.get_cooldown("user", user_id, "join_leave")
+    assert second["until_ts"] < first["until_ts"]
+    assert abs(second["until_ts"] - db.epoch_now(minutes=5)) <= 2
+
+    async with db.get_connection() as conn:
+        await conn.execute("UPDATE cooldowns SET until = datetime('now', '-1 minute') WHERE id = ?", (second["id"],))
+        await conn.commit()
+    db.invalidate_cooldowns()  # raw SQL bypasses the cooldown index
+    assert await db.get_cooldown("user", user_id, "join_leave") is None
+    print("✅ Triggers: Passed")
+
+
+async def test_backfill_on_upgrade():
+    print("\n--- Test: Migration backfills epoch columns of existing rows ---")
+    db.DB_PATH = Path(tempfile.mkdtemp()) / "epoch_upgrade.db"
+    await db.init_db()
+    async with db.get_connection() as conn:
+        # Simulate a version-9 database: rows written before the twins/triggers existed
+        await conn.execute("INSERT INTO users (discord_id, riot_id) VALUES ('old', 'Old#1')")
+        await conn.execute(
+            "INSERT INTO cooldowns (target_type, target_id, kind, until) VALUES ('user', 1, 'loan', '2099-01-01T00:00:00+00:00')"
+        )
+        await conn.execute("UPDATE cooldowns SET until_ts = NULL")
+        await conn.execute("PRAGMA user_version = 9")
+        await conn.commit()
+
+    report = await db.init_db()
+    assert [m["version"] for m in report["applied"]][0] == 10
+    cooldown = await db.get_cooldown("user", 1, "loan")
+    assert cooldown["until_ts"] == int(datetime(2099, 1, 1, tzinfo=timezone.utc).timestamp())
+    print("✅ Backfill: Passed")
+
+
+async def test_filters_are_index_range_scans():
+    print("\n--- Test: Expiry / window filters use indexes ---")
+    now = db.epoch_now()
+    checks = [
+        ("SELECT * FROM cooldowns WHERE until_ts <= ?", (now,), "idx_cooldowns_until_ts"),
+        ("SELECT id FROM loans WHERE status = 'active' AND end_ts < ?", (now,), "idx_loans_status_end_ts"),
+        ("SELECT id FROM loans WHERE status = 'requested' AND created_ts < ?", (now,), "idx_loans_status_created_ts"),
+        ("SELECT id FROM transfers WHERE status = 'requested' AND created_ts < ?", (now,), "idx_transfers_status_created_ts"),
+        ("SELECT clan_id FROM create_requests WHERE status = 'pending' AND expires_ts < ?", (now,), "idx_create_requests_expiry_ts"),
+        ("SELECT id FROM matches WHERE status = 'confirmed' AND created_ts >= ?", (now,), "idx_matches_status_created_ts"),
+    ]
+    for sql, params, index in checks:
+        query_plan = await plan(sql, params)
+        print(f"  {index}: {query_plan}")
+        assert index in query_plan, query_plan
+    print("✅ Index range scans: Passed")
+
+
+async def main():
+    try:
+        await setup_test_db()
+        await test_mixed_formats_compare_correctly()
+        await test_triggers_follow_updates()
+        await test_backfill_on_upgrade()
+        await test_filters_are_index_range_scans()
+        await db.close_pool()
+        print("\n🎉 ALL EPOCH TESTS PASSED!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,114 @@
+import asyncio
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import db
+
+
+def use_fresh_db(name: str) -> None:
+    """Point the db module at a throwaway database file."""
+    db.DB_PATH = Path(tempfile.mkdtemp()) / name
+
+
+async def test_fresh_database_reaches_latest_version():
+    print("\n--- Test: Fresh database runs every migration once ---")
+    use_fresh_db("fresh.db")
+    report = await db.init_db()
+    assert report["from_version"] == 0
+    assert report["to_version"] == db.SCHEMA_VERSION
+    assert len(report["applied"]) == db.SCHEMA_VERSION
+    assert all("ms" in m for m in report["applied"])
+    assert await db.get_schema_version() == db.SCHEMA_VERSION
+
+    # Second start: fast path, nothing applied
+    report = await db.init_db()
+    assert report["applied"] == [] and report["pending"] == []
+    print("✅ Fresh + fast path: Passed")
+
+
+async def test_dry_run_changes_nothing():
+    print("\n--- Test: Dry run only reports pending migrations ---")
+    use_fresh_db("dry_run.db")
+    report = await db.init_db(dry_run=True)
+    assert len(report["pending"]) == db.SCHEMA_VERSION
+    assert report["applied"] == []
+    assert await db.get_schema_version() == 0
+    print("✅ Dry run: Passed")
+
+
+async def test_legacy_cooldowns_are_folded_in():
+    print("\n--- Test: Legacy cooldown_until moves to cooldowns table ---")
+    use_fresh_db("legacy.db")
+    await db.init_db()
+
+    future = (datetime.now(timezone.utc) + timedelta(days=2)).isoformat()
+    past = (datetime.now(timezone.utc) - timedelta(days=2)).isoformat()
+    async with db.get_connection() as conn:
+        await conn.execute(
+            "INSERT INTO users (discord_id, riot_id, cooldown_until) VALUES ('legacy_a', 'A#1', ?)", (future,)
+        )
+        await conn.execute(
+            "INSERT INTO users (discord_id, riot_id, cooldown_until) VALUES ('legacy_b', 'B#1', ?)", (past,)
+        )
+        # Pretend this database predates the cooldown migration
+        await conn.execute("PRAGMA user_version = 7")
+        await conn.commit()
+
+    report = await db.init_db()
+    assert [m["version"] for m in report["applied"]] == list(range(8, db.SCHEMA_VERSION + 1))
+
+    user_a = await db.get_user("legacy_a")
+    user_b = await db.get_user("legacy_b")
+    assert user_a["cooldown_until"] is None and user_b["cooldown_until"] is None
+    assert await db.get_cooldown("user", user_a["id"], "join_leave") is not None
+    assert await db.get_cooldown("user", user_b["id"], "join_leave") is None
+    print("✅ Legacy cooldowns: Passed")
+
+
+async def test_advised_indexes_are_used():
+    print("\n--- Test: Workload indexes exist and are picked by the planner ---")
+    use_fresh_db("indexes.db")
+    await db.init_db()
+
+    async with db.get_connection() as conn:
+        cursor = await conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        existing = {row[0] for row in await cursor.fetchall()}
+        cursor = await conn.execute(
+            """EXPLAIN QUERY PLAN SELECT * FROM matches
+               WHERE COALESCE(winner_clan_id, resolved_winner_clan_id, reported_winner_clan_id) = ?
+               ORDER BY created_at DESC LIMIT 5""",
+            (1,)
+        )
+        plan = " ".join(row[3] for row in await cursor.fetchall())
+
+    retired = {name for names in db.RETIRED_INDEXES.values() for name in names}
+    for version, indexes in db.ADVISED_INDEXES.items():
+        for name, _ in indexes:
+            assert (name in existing) != (name in retired), name
+    assert "idx_matches_winner_created" in plan and "TEMP B-TREE" not in plan
+    print("✅ Advised indexes: Passed")
+
+
+async def main():
+    try:
+        await test_fresh_database_reaches_latest_version()
+        await test_dry_run_changes_nothing()
+        await test_legacy_cooldowns_are_folded_in()
+        await test_advised_indexes_are_used()
+        await db.close_pool()
+        print("\n🎉 ALL MIGRATION TESTS PASSED!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
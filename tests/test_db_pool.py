@@ -0,0 +1,98 @@
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import db
+
+
+async def setup_test_db():
+    """Point the db module at a throwaway database file."""
+    db.DB_PATH = Path(tempfile.mkdtemp()) / "pool_test.db"
+    await db.init_db()
+
+
+async def test_connections_are_reused():
+    print("\n--- Test: Pooled connections are reused ---")
+    before = db.get_pool_stats()
+    for _ in range(20):
+        async with db.get_connection() as conn:
+            await conn.execute("SELECT 1")
+    after = db.get_pool_stats()
+    print(f"Stats: {after}")
+
+    assert after["opened"] - before["opened"] <= 1
+    assert after["reused"] - before["reused"] >= 19
+    assert after["in_use"] == 0
+
+    async with db.get_connection() as conn:
+        cursor = await conn.execute("PRAGMA journal_mode")
+        assert (await cursor.fetchone())[0] == "wal"
+        cursor = await conn.execute("PRAGMA foreign_keys")
+        assert (await cursor.fetchone())[0] == 1
+    print("✅ Connections reused: Passed")
+
+
+async def test_nested_connections_overflow():
+    print("\n--- Test: Nested connections do not deadlock ---")
+    size = db.get_pool_stats()["size"]
+    held = []
+    for _ in range(size + 2):
+        cm = db.get_connection()
+        held.append((cm, await cm.__aenter__()))
+    assert db.get_pool_stats()["in_use"] == size + 2
+    for cm, _ in reversed(held):
+        await cm.__aexit__(None, None, None)
+
+    stats = db.get_pool_stats()
+    assert stats["in_use"] == 0
+    assert stats["idle"] == size
+    assert stats["overflow"] >= 2
+    print("✅ Overflow connections: Passed")
+
+
+async def test_uncommitted_work_is_rolled_back():
+    print("\n--- Test: Uncommitted writes are discarded on release ---")
+    try:
+        async with db.get_connection() as conn:
+            await conn.execute("INSERT INTO users (discord_id, riot_id) VALUES ('ghost', 'Ghost#1')")
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+
+    assert await db.get_user("ghost") is None
+    assert db.get_pool_stats()["rollbacks_on_release"] >= 1
+    print("✅ Rollback on release: Passed")
+
+
+async def test_health_check():
+    print("\n--- Test: Health check ---")
+    result = await db.check_pool_health()
+    print(f"Result: {result}")
+    assert result["replaced"] == 0
+    assert result["checked"] == db.get_pool_stats()["idle"] + db.get_read_pool_stats()["idle"]
+    print("✅ Health check: Passed")
+
+
+async def main():
+    try:
+        await setup_test_db()
+        await test_connections_are_reused()
+        await test_nested_connections_overflow()
+        await test_uncommitted_work_is_rolled_back()
+        await test_health_check()
+        await db.close_pool()
+        print("\n🎉 ALL POOL TESTS PASSED!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,95 @@
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import db
+
+
+async def setup_test_db():
+    """Point the db module at a throwaway database file."""
+    db.DB_PATH = Path(tempfile.mkdtemp()) / "read_lane_test.db"
+    await db.init_db()
+
+
+async def test_read_helpers_use_read_pool():
+    print("\n--- Test: Read helpers use the read-only pool ---")
+    await db.create_user("reader", "Reader#1")
+    before = db.get_read_pool_stats()
+    general_before = db.get_pool_stats()
+    for _ in range(10):
+        db._user_cache.clear()  # measure the query path, not the identity cache
+        assert await db.get_user("reader") is not None
+    after = db.get_read_pool_stats()
+
+    assert (after["opened"] + after["reused"]) - (before["opened"] + before["reused"]) == 10
+    assert db.get_pool_stats()["reused"] == general_before["reused"]
+    print("✅ Read lane: Passed")
+
+
+async def test_read_connection_rejects_writes():
+    print("\n--- Test: Read connections are query_only ---")
+    try:
+        async with db.get_read_connection() as conn:
+            await conn.execute("INSERT INTO users (discord_id, riot_id) VALUES ('nope', 'Nope#1')")
+        raise AssertionError("write on read connection succeeded")
+    except sqlite3.OperationalError as e:
+        print(f"Rejected: {e}")
+    assert await db.get_user("nope") is None
+    print("✅ query_only: Passed")
+
+
+async def test_reads_do_not_wait_for_writer():
+    print("\n--- Test: Reads run while the writer is busy ---")
+    release = asyncio.Event()
+
+    async def slow_job(conn):
+        await db.set_system_setting("slow", "1")  # joins this job's scope
+        await release.wait()
+
+    writer = asyncio.create_task(db.run_write(slow_job))
+    await asyncio.sleep(0.05)
+    assert db.get_writer_stats()["queue_depth"] == 0  # slow job holds the writer
+
+    # Committed data is readable, uncommitted write is not visible yet
+    user = await asyncio.wait_for(db.get_user("reader"), timeout=1)
+    assert user is not None
+    assert await asyncio.wait_for(db.get_system_setting("slow"), timeout=1) is None
+
+    release.set()
+    await writer
+    assert await db.get_system_setting("slow") == "1"
+    print("✅ Non-blocking reads: Passed")
+
+
+async def test_scope_reads_own_writes():
+    print("\n--- Test: Reads inside transaction() see the scope's writes ---")
+    async with db.transaction():
+        await db.set_system_setting("scoped", "yes")
+        assert await db.get_system_setting("scoped") == "yes"
+    print("✅ Read-your-writes: Passed")
+
+
+async def main():
+    try:
+        await setup_test_db()
+        await test_read_helpers_use_read_pool()
+        await test_read_connection_rejects_writes()
+        await test_reads_do_not_wait_for_writer()
+        await test_scope_reads_own_writes()
+        await db.close_pool()
+        print("\n🎉 ALL READ LANE TESTS PASSED!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,129 @@
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import db, elo
+
+
+async def setup_test_db():
+    """Point the db module at a throwaway database file."""
+    db.DB_PATH = Path(tempfile.mkdtemp()) / "transaction_test.db"
+    await db.init_db()
+
+
+async def make_active_clan(name: str, captain_discord_id: str) -> int:
+    captain = await db.create_user(captain_discord_id, f"{name}#CAP")
+    clan_id = await db.create_clan(name, captain)
+    await db.update_clan_status(clan_id, "active")
+    return clan_id
+
+
+async def test_helpers_join_one_connection():
+    print("\n--- Test: Helpers join the transaction connection ---")
+    before = db.get_writer_stats()
+    async with db.transaction():
+        assert db.in_transaction()
+        user_id = await db.create_user("tx_user", "Tx#1")
+        # Read-your-own-writes inside the scope
+        user = await db.get_user("tx_user")
+        assert user["id"] == user_id
+        assert db.get_pool_stats()["in_use"] == 0
+    after = db.get_writer_stats()
+
+    assert not db.in_transaction()
+    assert after["jobs"] == before["jobs"] + 1
+    assert await db.get_user("tx_user") is not None
+    print("✅ Single connection + commit: Passed")
+
+
+async def test_exception_rolls_back_everything():
+    print("\n--- Test: Exception rolls back all helper writes ---")
+    try:
+        async with db.transaction():
+            await db.create_user("tx_rollback", "Tx#2")  # helper calls commit() internally
+            await db.set_system_setting("tx_flag", "1")
+            raise RuntimeError("abort")
+    except RuntimeError:
+        pass
+
+    assert await db.get_user("tx_rollback") is None
+    assert await db.get_system_setting("tx_flag") is None
+    print("✅ Rollback: Passed")
+
+
+async def test_helper_rollback_is_local():
+    print("\n--- Test: Helper rollback only undoes its own savepoint ---")
+    clan_a = await make_active_clan("TxAlpha", "tx_cap_a")
+    await make_active_clan("TxBeta", "tx_cap_b")
+
+    async with db.transaction():
+        await db.set_system_setting("tx_kept", "yes")
+        # Duplicate name -> helper swallows IntegrityError and returns False
+        renamed = await db.update_clan_name(clan_a, "TxBeta")
+        assert renamed is False
+        # Helper with explicit BEGIN/rollback path
+        assert await db.accept_invite(999999) is False
+
+    assert await db.get_system_setting("tx_kept") == "yes"
+    print("✅ Local rollback: Passed")
+
+
+async def test_spawned_task_does_not_share_connection():
+    print("\n--- Test: Spawned tasks get their own connection ---")
+
+    async def child():
+        return db.in_transaction()
+
+    async with db.transaction():
+        joined = await asyncio.create_task(child())
+    assert joined is False
+    print("✅ Task isolation: Passed")
+
+
+async def test_apply_match_result_in_scope():
+    print("\n--- Test: Confirm + Elo pipeline in one transaction ---")
+    clan_a = await make_active_clan("TxGamma", "tx_cap_c")
+    clan_b = await make_active_clan("TxDelta", "tx_cap_d")
+    creator = (await db.get_user("tx_cap_c"))["id"]
+    confirmer = (await db.get_user("tx_cap_d"))["id"]
+
+    match_id = await db.create_match_v2(clan_a, clan_b, creator)
+    assert await db.report_match_v3(match_id, 13, 7)
+
+    async with db.transaction():
+        assert await db.confirm_match_v2(match_id, confirmer)
+        result = await elo.apply_match_result(match_id, clan_a)
+        match = await db.get_match_with_clans(match_id)
+
+    print(f"Result: {result['elo_a_old']} -> {result['elo_a_new']}")
+    assert result["success"]
+    assert match["elo_applied"] == 1
+    assert (await db.get_clan_by_id(clan_a))["elo"] == result["elo_a_new"]
+    assert len(await db.get_elo_history_for_match(match_id)) == 2
+    print("✅ Elo pipeline: Passed")
+
+
+async def main():
+    try:
+        await setup_test_db()
+        await test_helpers_join_one_connection()
+        await test_exception_rolls_back_everything()
+        await test_helper_rollback_is_local()
+        await test_spawned_task_does_not_share_connection()
+        await test_apply_match_result_in_scope()
+        await db.close_pool()
+        print("\n🎉 ALL TRANSACTION TESTS PASSED!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,116 @@
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import db
+
+
+async def setup_test_db():
+    """Point the db module at a throwaway database file."""
+    db.DB_PATH = Path(tempfile.mkdtemp()) / "writer_test.db"
+    await db.init_db()
+
+
+async def test_concurrent_writes_share_commits():
+    print("\n--- Test: Concurrent writes are group-committed ---")
+    before = db.get_writer_stats()
+    await asyncio.gather(*(db.set_system_setting(f"gc_{i}", str(i)) for i in range(50)))
+    after = db.get_writer_stats()
+    print(f"Stats: {after}")
+
+    jobs = after["jobs"] - before["jobs"]
+    batches = after["batches"] - before["batches"]
+    assert jobs == 50
+    assert batches < jobs
+    assert after["queue_depth"] == 0
+    assert after["max_batch_size"] > 1
+    for i in range(50):
+        assert await db.get_system_setting(f"gc_{i}") == str(i)
+    print(f"✅ {jobs} jobs in {batches} commits: Passed")
+
+
+async def test_failed_job_does_not_poison_batch():
+    print("\n--- Test: A failing job only rolls back itself ---")
+
+    async def bad_job(conn):
+        await conn.execute("INSERT INTO system_settings (key, value) VALUES ('bad', '1')")
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(
+        db.set_system_setting("good_1", "1"),
+        db.run_write(bad_job),
+        db.set_system_setting("good_2", "2"),
+        return_exceptions=True,
+    )
+    assert isinstance(results[1], RuntimeError)
+    assert await db.get_system_setting("good_1") == "1"
+    assert await db.get_system_setting("good_2") == "2"
+    assert await db.get_system_setting("bad") is None
+    print("✅ Failure isolation: Passed")
+
+
+async def test_run_write_returns_result():
+    print("\n--- Test: run_write returns the job result ---")
+
+    async def job(conn):
+        cursor = await conn.execute(
+            "INSERT INTO users (discord_id, riot_id) VALUES ('writer_user', 'Writer#1')"
+        )
+        return cursor.lastrowid
+
+    user_id = await db.run_write(job)
+    user = await db.get_user("writer_user")
+    assert user is not None and user["id"] == user_id
+    print("✅ Awaitable result: Passed")
+
+
+async def test_cancelled_caller_releases_writer():
+    print("\n--- Test: Cancelled callers do not stall the writer ---")
+    tasks = [asyncio.create_task(db.set_system_setting(f"cancel_{i}", "x")) for i in range(5)]
+    tasks[2].cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    # Writer must still accept work
+    await asyncio.wait_for(db.set_system_setting("after_cancel", "ok"), timeout=5)
+    assert await db.get_system_setting("after_cancel") == "ok"
+    print("✅ Cancellation: Passed")
+
+
+async def test_bot_code_has_no_raw_write_connections():
+    print("\n--- Test: Cogs and tasks never write outside the single writer ---")
+    root = Path(__file__).resolve().parent.parent
+    offenders = []
+    for path in [root / "main.py", *sorted((root / "cogs").glob("*.py")), *sorted((root / "services").glob("*.py"))]:
+        if path.name == "db.py":
+            continue
+        for number, line in enumerate(path.read_text(encoding="utf-8").splitlines(), 1):
+            if "db.get_connection(" in line:
+                offenders.append(f"{path.relative_to(root)}:{number}")
+    # Writes go through db.transaction() / db.run_write() / helpers, reads through get_read_connection()
+    assert offenders == [], offenders
+    print("✅ No bypass: Passed")
+
+
+async def main():
+    try:
+        await setup_test_db()
+        await test_concurrent_writes_share_commits()
+        await test_failed_job_does_not_poison_batch()
+        await test_run_write_returns_result()
+        await test_cancelled_caller_releases_writer()
+        await test_bot_code_has_no_raw_write_connections()
+        await db.close_pool()
+        print("\n🎉 ALL WRITER TESTS PASSED!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,164 @@
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import db, elo, moderation
+
+CLANS = 6
+MATCHES = 300
+
+
+async def setup_test_db(name: str) -> dict:
+    """
+    Fresh database with CLANS active clans and MATCHES reported matches between them.
+    Built from a fixed seed, so two calls produce the same ids, scores and timestamps.
+    """
+    db.DB_PATH = Path(tempfile.mkdtemp()) / f"{name}.db"
+    await db.init_db()
+    await db.load_system_settings()
+    rnd = random.Random(22)
+
+    captains = {}
+    for i in range(CLANS):
+        captain = await db.create_user(f"ec_cap_{i}", f"Cap{i}#EC")
+        clan_id = await db.create_clan(f"EcClan{i}", captain)
+        await db.update_clan_status(clan_id, "active")
+        captains[clan_id] = captain
+
+    clan_ids = list(captains)
+    matches = {}
+    for _ in range(MATCHES):
+        clan_a, clan_b = rnd.sample(clan_ids, 2)
+        match_id = await db.create_match_v2(clan_a, clan_b, captains[clan_a])
+        await db.report_match_v3(match_id, *rnd.choice([(13, 5), (7, 13), (13, 11), (9, 13)]))
+        matches[match_id] = captains[clan_b]  # the opponent captain confirms
+
+    # Distinct created_at values so the win-rate window never depends on ties
+    base = db.epoch_now(hours=-2)
+    async with db.get_connection() as conn:
+        await conn.executemany(
+            "UPDATE matches SET created_at = datetime(?, 'unixepoch'), created_ts = ? WHERE id = ?",
+            [(base + match_id, base + match_id, match_id) for match_id in matches]
+        )
+        await conn.commit()
+    db.invalidate_matches()
+    return matches
+
+
+async def confirm(match_id: int, user_id: int) -> dict:
+    """What ConfirmButton does: confirm + apply Elo as one unit of work."""
+    async with db.transaction():
+        if not await db.confirm_match_v2(match_id, user_id):
+            return {"success": False, "reason": "NOT_REPORTED"}
+        return await elo.apply_match_result(match_id, None)
+
+
+async def snapshot() -> tuple:
+    async with db.get_read_connection() as conn:
+        cursor = await conn.execute("SELECT id, elo, matches_played FROM clans ORDER BY id")
+        clans = [tuple(row) for row in await cursor.fetchall()]
+        cursor = await conn.execute(
+            "SELECT clan_id, match_id, old_elo, new_elo, change_amount, reason FROM elo_history ORDER BY id"
+        )
+        history = [tuple(row) for row in await cursor.fetchall()]
+    return clans, history
+
+
+def assert_history_chains(clans: list, history: list) -> None:
+    """Every elo_history row starts where the previous one for that clan ended."""
+    current = {}
+    for clan_id, _, old_elo, new_elo, change, _ in history:
+        assert current.get(clan_id, old_elo) == old_elo, f"clan {clan_id}: {current.get(clan_id)} != {old_elo}"
+        assert new_elo - old_elo == change
+        current[clan_id] = new_elo
+    for clan_id, elo_value, _ in clans:
+        assert current.get(clan_id, elo_value) == elo_value, f"clan {clan_id} ends at {elo_value}, history {current.get(clan_id)}"
+
+
+async def test_concurrent_confirms_match_serial_replay():
+    print(f"\n--- Test: {MATCHES} concurrent confirms == one-at-a-time replay ---")
+    matches = await setup_test_db("elo_concurrent")
+    order = list(matches)
+    random.Random(5).shuffle(order)
+    order += order[:40]  # double clicks: the second confirm of a match must be a no-op
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(confirm(match_id, matches[match_id]) for match_id in order))
+    elapsed = time.perf_counter() - started
+    applied = [r for r in results if r["success"]]
+    print(f"Concurrent: {len(applied)} applied in {elapsed:.2f}s, writer {db.get_writer_stats()['max_batch_size']} jobs/commit max")
+    assert len(applied) == MATCHES
+    concurrent_clans, concurrent_history = await snapshot()
+    assert_history_chains(concurrent_clans, concurrent_history)
+
+    # The order the writer actually applied them in
+    applied_order = list(dict.fromkeys(row[1] for row in concurrent_history))
+    assert sorted(applied_order) == sorted(matches)
+    await db.close_pool()
+
+    matches = await setup_test_db("elo_serial")
+    for match_id in applied_order:
+        assert (await confirm(match_id, matches[match_id]))["success"]
+    serial_clans, serial_history = await snapshot()
+    assert concurrent_clans == serial_clans
+    assert concurrent_history == serial_history
+    assert sum(row[2] for row in serial_clans) == 2 * MATCHES
+    print(f"Final Elo: {[row[1] for row in serial_clans]}")
+    print("✅ Concurrent == serial: Passed")
+
+
+async def test_mixed_elo_writers():
+    print("\n--- Test: Bonus / decay / admin adjust / rollback racing match results ---")
+    matches = await setup_test_db("elo_mixed")
+    clan_ids = [row[0] for row in (await snapshot())[0]]
+    rnd = random.Random(9)
+    order = list(matches)
+    rnd.shuffle(order)
+    jobs = []
+    for i, match_id in enumerate(order):
+        jobs.append(confirm(match_id, matches[match_id]))
+        if i % 5 == 0:
+            jobs.append(db.add_bonus_elo(rnd.choice(clan_ids), 7, "highlight"))
+        if i % 7 == 0:
+            jobs.append(db.apply_elo_decay(rnd.choice(clan_ids), 15))
+        if i % 11 == 0:
+            jobs.append(db.adjust_clan_elo(rnd.choice(clan_ids), rnd.randint(-30, 30), "admin_adjust: test", floor=0))
+    await asyncio.gather(*jobs)
+
+    # Roll back a few matches while new Elo keeps landing on the same clans
+    rollbacks = [moderation.rollback_match_elo(match_id, 1) for match_id in order[:20]]
+    rollbacks += [moderation.rollback_match_elo(match_id, 1) for match_id in order[:5]]  # double clicks
+    bonuses = [db.add_bonus_elo(clan_id, 3, "bonus") for clan_id in clan_ids]
+    results = await asyncio.gather(*rollbacks, *bonuses)
+    assert sum(1 for r in results[:len(rollbacks)] if r["success"]) == 20
+
+    clans, history = await snapshot()
+    assert_history_chains(clans, history)
+    for match_id in order[:20]:
+        rows = [row for row in history if row[1] == match_id]
+        assert sum(row[4] for row in rows) == 0, rows  # applied change fully reverted
+    print("✅ Mixed writers: Passed")
+
+
+async def main():
+    try:
+        await test_concurrent_confirms_match_serial_replay()
+        await test_mixed_elo_writers()
+        await db.close_pool()
+        print("\n🎉 ALL ELO CONCURRENCY TESTS PASSED!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,210 @@
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from services import db, elo
+
+
+async def setup_test_db():
+    """Point the db module at a throwaway database file."""
+    db.DB_PATH = Path(tempfile.mkdtemp()) / "elo_engine_test.db"
+    await db.init_db()
+    await db.load_system_settings()
+
+
+def make_context(**overrides) -> elo.MatchContext:
+    base = dict(
+        match_id=1, status="confirmed", elo_applied=False, winner_clan_id=10, score_a=13, score_b=7,
+        clan_a_id=10, clan_b_id=20, clan_a_name="A", clan_b_name="B",
+        clan_a_status="active", clan_b_status="active",
+        elo_a=1000, elo_b=1000, matches_played_a=20, matches_played_b=20,
+    )
+    base.update(overrides)
+    return elo.MatchContext(**base)
+
+
+def reference(ctx: elo.MatchContext) -> tuple:
+    """The Elo math spelled out with the public helpers, as apply_match_result used to do it."""
+    a_won = ctx.winner_clan_id == ctx.clan_a_id
+    k_a, k_b = elo.get_k_factor(ctx.matches_played_a), elo.get_k_factor(ctx.matches_played_b)
+    base_a = elo.compute_base_delta(ctx.elo_a, ctx.elo_b, 1.0 if a_won else 0.0, k=k_a)
+    base_b = elo.compute_base_delta(ctx.elo_b, ctx.elo_a, 0.0 if a_won else 1.0, k=k_b)
+    mult = elo.get_pair_multiplier(ctx.pair_matches_24h)
+    fa, fb = round(base_a * mult), round(base_b * mult)
+    wr_a = wr_b = 1.0
+    if "win_rate_mod" in ctx.features:
+        rate = lambda wins, total: wins / total if total else 0.0
+        wr_a = elo.get_win_rate_modifier(rate(ctx.win_rate_wins_a, ctx.win_rate_total_a), ctx.win_rate_total_a)
+        wr_b = elo.get_win_rate_modifier(rate(ctx.win_rate_wins_b, ctx.win_rate_total_b), ctx.win_rate_total_b)
+        fa, fb = round(fa * wr_a), round(fb * wr_b)
+    if "rank_elo_mod" in ctx.features and ctx.avg_rank_a is not None and ctx.avg_rank_b is not None:
+        rm_a, rm_b = elo.get_rank_modifier(ctx.avg_rank_a, ctx.avg_rank_b)
+        if rm_a != 1.0 or rm_b != 1.0:
+            fa = round(round(base_a * mult) * max(0.3, wr_a * rm_a))
+            fb = round(round(base_b * mult) * max(0.3, wr_b * rm_b))
+    if "underdog_bonus" in ctx.features:
+        bonus = elo.get_underdog_bonus(ctx.elo_a if a_won else ctx.elo_b, ctx.elo_b if a_won else ctx.elo_a)
+        if a_won:
+            fa += bonus
+        else:
+            fb += bonus
+    if "elo_gain_cap" in ctx.features:
+        fa, fb = min(fa, config.ELO_MAX_GAIN_PER_MATCH), min(fb, config.ELO_MAX_GAIN_PER_MATCH)
+    return fa, fb, max(elo.ELO_FLOOR, ctx.elo_a + fa), max(elo.ELO_FLOOR, ctx.elo_b + fb)
+
+
+async def test_pure_core():
+    print("\n--- Test: compute_elo() is pure and matches the helper formulas ---")
+    ctx = make_context()
+    result = elo.compute_elo(ctx)
+    assert result == elo.compute_elo(ctx)  # deterministic, context untouched
+    assert result["success"] and result["final_delta_a"] == 16 and result["final_delta_b"] == -16
+
+    assert elo.compute_elo(make_context(status="pending"))["reason"] == "INVALID_STATUS"
+    assert elo.compute_elo(make_context(elo_applied=True))["reason"] == "ALREADY_APPLIED"
+    assert elo.compute_elo(make_context(winner_clan_id=None, score_b=13))["reason"] == "DRAW_NOT_SUPPORTED"
+    assert elo.compute_elo(make_context(winner_clan_id=None, score_a=None))["reason"] == "WINNER_REQUIRED"
+    assert elo.compute_elo(make_context(winner_clan_id=None, score_a=5))["winner_clan_id"] == 20
+    assert elo.compute_elo(make_context(clan_b_status="inactive"))["inactive_clans"] == ["B"]
+    assert elo.compute_elo(make_context(frozen_clan_ids=frozenset({10})))["frozen_clans"] == ["A"]
+    assert elo.compute_elo(make_context(banned_clan_ids=frozenset({20})))["banned_clans"] == ["B"]
+    assert elo.compute_elo(make_context(pair_matches_24h=5))["multiplier"] == elo.DEFAULT_MULTIPLIER
+
+    # Custom config, no feature flags
+    cfg = replace(elo.EloConfig.from_config(), k_stable=10, floor=995)
+    custom = elo.compute_elo(make_context(winner_clan_id=20, features=frozenset()), cfg)
+    assert (custom["final_delta_a"], custom["elo_a_new"]) == (-5, 995)
+
+    rnd = random.Random(3)
+    for _ in range(2000):
+        ctx = make_context(
+            winner_clan_id=rnd.choice([10, 20]),
+            elo_a=rnd.randint(100, 2000), elo_b=rnd.randint(100, 2000),
+            matches_played_a=rnd.randint(0, 30), matches_played_b=rnd.randint(0, 30),
+            pair_matches_24h=rnd.randint(0, 5),
+            win_rate_total_a=rnd.randint(0, 10), win_rate_total_b=rnd.randint(0, 10),
+            avg_rank_a=rnd.choice([None, rnd.uniform(1, 25)]), avg_rank_b=rnd.uniform(1, 25),
+            features=frozenset(f for f in elo.BALANCE_FEATURES if rnd.random() < 0.7),
+        )
+        ctx = replace(ctx, win_rate_wins_a=rnd.randint(0, ctx.win_rate_total_a),
+                      win_rate_wins_b=rnd.randint(0, ctx.win_rate_total_b))
+        result = elo.compute_elo(ctx)
+        assert (result["final_delta_a"], result["final_delta_b"], result["elo_a_new"], result["elo_b_new"]) == reference(ctx), ctx
+
+    started = time.perf_counter()
+    for _ in range(10000):
+        elo.compute_elo(ctx)
+    print(f"compute_elo: {(time.perf_counter() - started) * 100:.2f} µs/call")
+    print("✅ Pure core: Passed")
+
+
+async def make_active_clan(name: str) -> tuple:
+    captain = await db.create_user(f"{name}_cap", f"{name}#CAP")
+    clan_id = await db.create_clan(name, captain)
+    await db.update_clan_status(clan_id, "active")
+    return clan_id, captain
+
+
+async def play(clan_a: int, clan_b: int, creator: int, confirmer: int, score: tuple) -> int:
+    match_id = await db.create_match_v2(clan_a, clan_b, creator)
+    await db.report_match_v3(match_id, *score)
+    await db.confirm_match_v2(match_id, confirmer)
+    return match_id
+
+
+async def test_context_matches_helpers():
+    print("\n--- Test: fetch_match_context() agrees with the per-value helpers ---")
+    clan_a, cap_a = await make_active_clan("EeAlpha")
+    clan_b, cap_b = await make_active_clan("EeBeta")
+    for i in range(4):
+        match_id = await play(clan_a, clan_b, cap_a, cap_b, (13, 5) if i % 3 else (4, 13))
+        await elo.apply_match_result(match_id, None)
+    match_id = await play(clan_b, clan_a, cap_b, cap_a, (13, 11))
+    await db.save_match_roster(match_id, "a", "[]", 12.5)
+
+    ctx = await elo.fetch_match_context(match_id, None)
+    wr_a = await db.get_clan_win_rate(clan_b)
+    wr_b = await db.get_clan_win_rate(clan_a)
+    assert (ctx.clan_a_id, ctx.clan_b_id, ctx.avg_rank_a, ctx.avg_rank_b) == (clan_b, clan_a, 12.5, None)
+    assert ctx.pair_matches_24h == await elo.count_elo_matches_between_clans(clan_a, clan_b) == 4
+    assert (ctx.win_rate_total_a, ctx.win_rate_wins_a) == (wr_a["total"], wr_a["wins"])
+    assert (ctx.win_rate_total_b, ctx.win_rate_wins_b) == (wr_b["total"], wr_b["wins"])
+    assert ctx.features == frozenset(elo.BALANCE_FEATURES)
+    assert await elo.fetch_match_context(999999) is None
+    print("✅ Context fetch: Passed")
+    return match_id
+
+
+async def test_two_round_trips(match_id: int):
+    print("\n--- Test: One SELECT, one write transaction per confirmation ---")
+    match = await db.get_match_with_clans(match_id)
+    before = await db.get_clans_by_ids([match["clan_a_id"], match["clan_b_id"]])
+    writer_jobs = db.get_writer_stats()["jobs"]
+    db.set_cache_self_check(False)  # self-check would add its own verification queries
+    db.reset_query_stats()
+    result = await elo.apply_match_result(match_id, None)
+    db.set_cache_self_check(db.config.DB_CACHE_SELF_CHECK)
+    assert result["success"], result
+
+    statements = db.get_query_stats(limit=100)
+    selects = [s for s in statements if s["sql"].startswith("SELECT")]
+    print(f"Statements: {[(s['sql'][:40], s['count']) for s in statements]}")
+    assert len(selects) == 1 and selects[0]["count"] == 1
+    assert db.get_writer_stats()["jobs"] == writer_jobs + 1
+
+    clans = await db.get_clans_by_ids(list(before))
+    for clan_id, clan in before.items():
+        expected = result["elo_a_new"] if clan["name"] == result["clan_a_name"] else result["elo_b_new"]
+        assert clans[clan_id]["elo"] == expected
+        assert clans[clan_id]["matches_played"] == clan["matches_played"] + 1
+    history = await db.get_clan_elo_history(list(before)[0])
+    assert history[0]["match_id"] == match_id
+    assert (await elo.apply_match_result(match_id, None))["reason"] == "ALREADY_APPLIED"
+    print("✅ Round trips: Passed")
+
+
+async def test_no_elo_paths_write_once():
+    print("\n--- Test: Frozen clan still marks the match processed ---")
+    clan_a = (await db.get_clan("EeAlpha"))["id"]
+    clan_b = (await db.get_clan("EeBeta"))["id"]
+    cap_a = (await db.get_user("EeAlpha_cap"))["id"]
+    cap_b = (await db.get_user("EeBeta_cap"))["id"]
+    match_id = await play(clan_a, clan_b, cap_a, cap_b, (13, 2))
+    await db.set_clan_frozen(clan_b, "test", cap_a)
+    elo_before = (await db.get_clan_by_id(clan_a))["elo"]
+    result = await elo.apply_match_result(match_id, None)
+    assert result["reason"] == "CLANS_FROZEN" and result["frozen_clans"] == ["EeBeta"]
+    match = await db.get_match_with_clans(match_id)
+    assert match["elo_applied"] == 0 and match["multiplier"] == 0
+    assert (await db.get_clan_by_id(clan_a))["elo"] == elo_before
+    await db.unset_clan_frozen(clan_b)
+    print("✅ No-Elo paths: Passed")
+
+
+async def main():
+    try:
+        await setup_test_db()
+        await test_pure_core()
+        match_id = await test_context_matches_helpers()
+        await test_two_round_trips(match_id)
+        await test_no_elo_paths_write_once()
+        await db.close_pool()
+        print("\n🎉 ALL ELO ENGINE TESTS PASSED!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,158 @@
+import asyncio
+import os
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import db, elo, elo_replay, moderation
+
+CLANS = 5
+MATCHES = 150
+
+
+async def setup_test_db():
+    """Point the db module at a throwaway database file."""
+    db.DB_PATH = Path(tempfile.mkdtemp()) / "elo_replay_test.db"
+    await db.init_db()
+    await db.load_system_settings()
+
+
+async def play_ladder() -> dict:
+    """
+    Play MATCHES matches through the real confirm path, spread over three days,
+    with rosters, a frozen stretch, bonuses, decay, an admin set and rollbacks.
+    """
+    rnd = random.Random(23)
+    captains = {}
+    for i in range(CLANS):
+        captain = await db.create_user(f"rp_cap_{i}", f"Cap{i}#RP")
+        clan_id = await db.create_clan(f"RpClan{i}", captain)
+        await db.update_clan_status(clan_id, "active")
+        captains[clan_id] = captain
+    clan_ids = list(captains)
+    base = db.epoch_now(days=-3)
+    played = []
+
+    for i in range(MATCHES):
+        clan_a, clan_b = rnd.sample(clan_ids[:3] if i % 4 else clan_ids, 2)  # favour a few pairs: anti-farm
+        match_id = await db.create_match_v2(clan_a, clan_b, captains[clan_a])
+        async with db.get_connection() as conn:
+            created = base + i * 1700  # ~3 days, one match every ~28 minutes
+            await conn.execute(
+                "UPDATE matches SET created_at = datetime(?, 'unixepoch'), created_ts = ? WHERE id = ?",
+                (created, created, match_id)
+            )
+            await conn.commit()
+        db.invalidate_matches(match_id)
+        if i % 3 == 0:
+            await db.save_match_roster(match_id, "a", "[]", rnd.uniform(1, 25))
+            await db.save_match_roster(match_id, "b", "[]", rnd.uniform(1, 25))
+        await db.report_match_v3(match_id, *rnd.choice([(13, 5), (7, 13), (13, 11), (9, 13)]))
+        async with db.transaction():
+            await db.confirm_match_v2(match_id, captains[clan_b])
+            result = await elo.apply_match_result(match_id, None)
+        played.append((match_id, result))
+
+        if i == 40:
+            await db.set_clan_frozen(clan_ids[0], "audit test", captains[clan_ids[1]])
+        if i == 55:
+            await db.unset_clan_frozen(clan_ids[0])
+        if i % 17 == 0:
+            await db.add_bonus_elo(rnd.choice(clan_ids), 7, "highlight")
+        if i % 29 == 0:
+            await db.apply_elo_decay(rnd.choice(clan_ids), 15)
+        if i == 90:
+            await db.update_clan_elo(clan_ids[2], 1234, None, "Admin Adjustment: audit test", None)
+        if i in (60, 100):
+            applied = [m for m, r in played if r["success"]]
+            await moderation.rollback_match_elo(applied[-3], 1)
+
+    assert any(r["reason"] == "CLANS_FROZEN" for _, r in played)
+    assert any(r["success"] and r["multiplier"] < 1.0 for _, r in played)
+    assert any(r["success"] and r["rank_mod_a"] != 1.0 for _, r in played)
+    return captains
+
+
+async def test_replay_matches_the_ladder():
+    print("\n--- Test: Replay reproduces every stored rating and delta ---")
+    await play_ladder()
+    report = await elo_replay.audit_ladder()
+    print(f"Report: {report['matches']} matches, {report['events']} events, "
+          f"load {report['load_seconds']}s, replay {report['replay_seconds']}s")
+    assert report["clans"] == CLANS and report["matches"] == MATCHES
+    assert report["clan_mismatches"] == [], report["clan_mismatches"]
+    assert report["match_mismatches"] == [], report["match_mismatches"]
+
+    data = await elo_replay.load_ladder()
+    result = elo_replay.replay_ladder(data)
+    clans = await db.get_clans_by_ids(data.clan_ids.tolist())
+    for clan_id, clan in clans.items():
+        assert result["matches_played"].get(clan_id, 0) == clan["matches_played"]
+    print("✅ Exact replay: Passed")
+
+
+async def test_win_rate_windows():
+    print("\n--- Test: Vectorized win-rate windows equal get_clan_win_rate() ---")
+    data = await elo_replay.load_ladder()
+    (total_a, wins_a), _ = elo_replay._win_rate_windows(data, elo.WIN_RATE_WINDOW)
+    last = {}
+    for i, clan_id in enumerate(data.clan_a.tolist()):
+        last[clan_id] = i
+    for clan_id, i in last.items():
+        if i == data.matches - 1 or all(data.clan_b[j] != clan_id for j in range(i + 1, data.matches)):
+            expected = await db.get_clan_win_rate(clan_id)
+            assert (int(total_a[i]), int(wins_a[i])) == (expected["total"], expected["wins"]), clan_id
+    print("✅ Win-rate windows: Passed")
+
+
+async def test_tampering_is_reported():
+    print("\n--- Test: Audit reports clans that drifted ---")
+    clan = await db.get_clan("RpClan1")
+    await db.set_clan_elo_directly(clan["id"], clan["elo"] + 50)  # no history row
+    async with db.get_connection() as conn:
+        await conn.execute(
+            "UPDATE matches SET final_delta_a = final_delta_a + 1 WHERE id = (SELECT MAX(match_id) FROM elo_history WHERE reason = 'match_win')"
+        )
+        await conn.commit()
+    db.invalidate_matches()
+
+    report = await elo_replay.audit_ladder()
+    assert [(c["name"], c["diff"]) for c in report["clan_mismatches"]] == [("RpClan1", 50)]
+    assert len(report["match_mismatches"]) == 1
+    print(f"Mismatches: {report['clan_mismatches']} {report['match_mismatches']}")
+    print("✅ Tampering: Passed")
+
+
+async def test_empty_ladder():
+    print("\n--- Test: Empty database ---")
+    await setup_test_db()
+    report = await elo_replay.audit_ladder()
+    assert (report["matches"], report["clan_mismatches"]) == (0, [])
+    print("✅ Empty ladder: Passed")
+
+
+async def main():
+    if elo_replay.np is None:
+        print("⚠️ NumPy not installed: ladder replay tests skipped")
+        return
+    try:
+        await setup_test_db()
+        await test_replay_matches_the_ladder()
+        await test_win_rate_windows()
+        await test_tampering_is_reported()
+        await test_empty_ladder()
+        await db.close_pool()
+        print("\n🎉 ALL ELO REPLAY TESTS PASSED!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
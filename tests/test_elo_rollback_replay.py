@@ -0,0 +1,227 @@
+import asyncio
+import os
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import db, elo, elo_replay, moderation
+
+CLANS = 5
+MATCHES = 90
+VOID = (30, 47, 57)   # schedule indexes voided by the test; 57 was already rolled back per match
+
+
+async def setup_test_db():
+    """Point the db module at a throwaway database file."""
+    db.DB_PATH = Path(tempfile.mkdtemp()) / "elo_rollback_replay_test.db"
+    await db.init_db()
+    await db.load_system_settings()
+
+
+async def play(rnd: random.Random, captains: dict, count: int, start: int, base: int) -> list:
+    """Play `count` matches through the real confirm path, one every ~28 minutes of created_ts."""
+    clan_ids = list(captains)
+    played = []
+    for i in range(start, start + count):
+        clan_a, clan_b = rnd.sample(clan_ids[:3] if i % 4 else clan_ids, 2)  # favour a few pairs: anti-farm
+        match_id = await db.create_match_v2(clan_a, clan_b, captains[clan_a])
+        async with db.get_connection() as conn:
+            created = base + i * 1700
+            await conn.execute(
+                "UPDATE matches SET created_at = datetime(?, 'unixepoch'), created_ts = ? WHERE id = ?",
+                (created, created, match_id)
+            )
+            await conn.commit()
+        db.invalidate_matches(match_id)
+        if i % 3 == 0:
+            await db.save_match_roster(match_id, "a", "[]", rnd.uniform(1, 25))
+            await db.save_match_roster(match_id, "b", "[]", rnd.uniform(1, 25))
+        await db.report_match_v3(match_id, *rnd.choice([(13, 5), (7, 13), (13, 11), (9, 13)]))
+        async with db.transaction():
+            await db.confirm_match_v2(match_id, captains[clan_b])
+            result = await elo.apply_match_result(match_id, None)
+        assert result["success"], result
+        played.append(match_id)
+
+        if i % 17 == 0:
+            await db.add_bonus_elo(rnd.choice(clan_ids), 7, "highlight")
+        if i % 29 == 0:
+            await db.apply_elo_decay(rnd.choice(clan_ids), 15)
+        if i == 60:
+            await moderation.rollback_match_elo(played[VOID[2] - start], 1)
+    return played
+
+
+async def setup_ladder() -> dict:
+    rnd = random.Random(25)
+    captains = {}
+    for i in range(CLANS):
+        captain = await db.create_user(f"rr_cap_{i}", f"Cap{i}#RR")
+        clan_id = await db.create_clan(f"RrClan{i}", captain)
+        await db.update_clan_status(clan_id, "active")
+        captains[clan_id] = captain
+    base = db.epoch_now(days=-3)
+    played = await play(rnd, captains, MATCHES, 0, base)
+    report = await elo_replay.audit_ladder()
+    assert report["clan_mismatches"] == [] and report["match_mismatches"] == []
+    return {"rnd": rnd, "captains": captains, "base": base, "played": played}
+
+
+async def history_rows() -> int:
+    async with db.get_read_connection() as conn:
+        cursor = await conn.execute("SELECT COUNT(*) FROM elo_history")
+        return (await cursor.fetchone())[0]
+
+
+async def test_preview(ladder: dict) -> dict:
+    print("\n--- Test: Diff preview is read-only ---")
+    voided = [ladder["played"][i] for i in VOID]
+    clans_before = await db.get_clans_by_ids(list(ladder["captains"]))
+    rows_before = await history_rows()
+
+    preview = await moderation.preview_replay_rollback(list(reversed(voided)))
+    assert preview["success"], preview
+    assert preview["match_ids"] == voided and preview["first_match_id"] == voided[0]
+    assert preview["matches"], "later matches should be re-scored"
+    assert all(m["match_id"] > voided[0] for m in preview["matches"])
+    # The legacy-rolled-back match has no stored change left to undo
+    assert all(m != voided[2] for c in preview["clans"] for m, _ in c["voided"])
+    assert sum(c["played_change"] for c in preview["clans"]) == -6
+    for clan in preview["clans"]:
+        print(f"  {clan['name']}: {clan['old_elo']} -> {clan['new_elo']} ({clan['change']:+d}), voided {clan['voided']}")
+
+    assert await db.get_clans_by_ids(list(ladder["captains"])) == clans_before
+    assert await history_rows() == rows_before
+    assert (await db.get_match(voided[0]))["status"] == "confirmed"
+
+    bad = await moderation.preview_replay_rollback([voided[0], 999999])
+    assert not bad["success"] and "999999" in bad["reason"]
+    print("✅ Preview: Passed")
+    return preview
+
+
+async def test_apply(ladder: dict, preview: dict):
+    print("\n--- Test: Apply writes the preview in one writer job ---")
+    voided = [ladder["played"][i] for i in VOID]
+    rows_before = await history_rows()
+    jobs_before = db.get_writer_stats()["jobs"]
+
+    result = await moderation.replay_rollback_matches(voided, 1)
+    assert result["success"], result
+    assert db.get_writer_stats()["jobs"] - jobs_before == 1
+    assert result["clans"] == preview["clans"] and result["matches"] == preview["matches"]
+    assert await history_rows() - rows_before == result["history_rows"]
+
+    for match_id in voided:
+        match = await db.get_match(match_id)
+        assert match["status"] == "voided" and not match["elo_applied"]
+    for changed in result["matches"]:
+        match = await db.get_match(changed["match_id"])
+        assert (match["final_delta_a"], match["final_delta_b"]) == changed["new"]
+    clans = await db.get_clans_by_ids([c["clan_id"] for c in result["clans"]])
+    for clan in result["clans"]:
+        assert clans[clan["clan_id"]]["elo"] == clan["new_elo"]
+        async with db.get_read_connection() as conn:
+            cursor = await conn.execute(
+                "SELECT old_elo, new_elo FROM elo_history WHERE clan_id = ? ORDER BY id DESC LIMIT ?",
+                (clan["clan_id"], len(clan["voided"]) + 1)
+            )
+            chain = [tuple(row) for row in await cursor.fetchall()][::-1]
+        # The new rows chain from the stored Elo to the corrected one
+        assert chain[-1][1] == clan["new_elo"]
+        assert all(chain[i][1] == chain[i + 1][0] for i in range(len(chain) - 1))
+
+    report = await elo_replay.audit_ladder()
+    assert report["matches"] == MATCHES - len(VOID)
+    assert report["clan_mismatches"] == [], report["clan_mismatches"]
+    assert report["match_mismatches"] == [], report["match_mismatches"]
+    print(f"{len(result['clans'])} clans, {len(result['matches'])} later matches, {result['history_rows']} history rows")
+    print("✅ Apply: Passed")
+
+
+async def test_second_apply_is_noop(ladder: dict):
+    print("\n--- Test: Voiding the same matches twice changes nothing ---")
+    voided = [ladder["played"][i] for i in VOID]
+    clans_before = await db.get_clans_by_ids(list(ladder["captains"]))
+    rows_before = await history_rows()
+    again = await moderation.replay_rollback_matches(voided, 1)
+    assert not again["success"]
+    assert await db.get_clans_by_ids(list(ladder["captains"])) == clans_before
+    assert await history_rows() == rows_before
+    print("✅ Second apply: Passed")
+
+
+async def test_write_between_plan_and_apply(ladder: dict):
+    print("\n--- Test: A write after the plan is built forces a re-plan ---")
+    match_id = ladder["played"][70]
+    clan_id = (await db.get_match(match_id))["clan_a_id"]
+    real_plan = elo_replay.plan_void_rollback
+    plans = []
+
+    async def racing_plan(match_ids, features=None):
+        plan = await real_plan(match_ids, features)
+        if not plans:
+            await db.add_bonus_elo(clan_id, 7, "highlight")  # lands before the writer job
+        plans.append(plan)
+        return plan
+
+    elo_replay.plan_void_rollback = racing_plan
+    try:
+        result = await elo_replay.apply_void_rollback([match_id], 1)
+    finally:
+        elo_replay.plan_void_rollback = real_plan
+    assert result["success"] and result["attempts"] == 2 and len(plans) == 2
+    stale = next(c for c in plans[0]["clans"] if c["clan_id"] == clan_id)
+    fresh = next(c for c in result["clans"] if c["clan_id"] == clan_id)
+    assert fresh["old_elo"] == stale["old_elo"] + 7
+    assert (await db.get_clan_by_id(clan_id))["elo"] == fresh["new_elo"]
+
+    report = await elo_replay.audit_ladder()
+    assert report["clan_mismatches"] == [], report["clan_mismatches"]
+    assert report["match_mismatches"] == [], report["match_mismatches"]
+    print("✅ Re-plan: Passed")
+
+
+async def test_ladder_continues(ladder: dict):
+    print("\n--- Test: Matches played afterwards still agree with the replay ---")
+    await play(ladder["rnd"], ladder["captains"], 20, MATCHES, ladder["base"])
+    report = await elo_replay.audit_ladder()
+    assert report["clan_mismatches"] == [], report["clan_mismatches"]
+    assert report["match_mismatches"] == [], report["match_mismatches"]
+    data = await elo_replay.load_ladder()
+    result = elo_replay.replay_ladder(data, features=frozenset(
+        [f for f in elo.BALANCE_FEATURES if await db.is_balance_feature_enabled(f)]
+    ))
+    clans = await db.get_clans_by_ids(list(ladder["captains"]))
+    for clan_id, clan in clans.items():
+        assert result["matches_played"].get(clan_id, 0) == clan["matches_played"]
+    print("✅ Continued ladder: Passed")
+
+
+async def main():
+    if elo_replay.np is None:
+        print("⚠️ NumPy not installed: replay rollback tests skipped")
+        return
+    try:
+        await setup_test_db()
+        ladder = await setup_ladder()
+        preview = await test_preview(ladder)
+        await test_apply(ladder, preview)
+        await test_second_apply_is_noop(ladder)
+        await test_write_between_plan_and_apply(ladder)
+        await test_ladder_continues(ladder)
+        await db.close_pool()
+        print("\n🎉 ALL REPLAY ROLLBACK TESTS PASSED!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
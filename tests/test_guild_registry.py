@@ -0,0 +1,147 @@
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from services import bot_utils
+
+
+class FakeGuild:
+    """Just enough of discord.Guild for the registry: named objects plus ID lookups that count scans."""
+
+    def __init__(self, guild_id: int):
+        self.id = guild_id
+        self._objects = {}
+        self.scans = 0
+
+    def add(self, kind: str, name: str, object_id: int):
+        obj = SimpleNamespace(id=object_id, name=name, kind=kind, guild=self)
+        self._objects[object_id] = obj
+        return obj
+
+    def _all(self, kind: str):
+        self.scans += 1
+        return [o for o in self._objects.values() if o.kind == kind]
+
+    @property
+    def roles(self):
+        return self._all("role")
+
+    @property
+    def text_channels(self):
+        return self._all("text_channel")
+
+    @property
+    def categories(self):
+        return self._all("category")
+
+    def get_role(self, object_id: int):
+        obj = self._objects.get(object_id)
+        return obj if obj is not None and obj.kind == "role" else None
+
+    def get_channel(self, object_id: int):
+        obj = self._objects.get(object_id)
+        return obj if obj is not None and obj.kind != "role" else None
+
+
+def make_guild() -> FakeGuild:
+    guild = FakeGuild(1)
+    guild.add("role", config.ROLE_VERIFIED, 10)
+    guild.add("role", config.ROLE_MOD, 11)
+    guild.add("role", config.ROLE_PLAYER, 12)
+    guild.add("text_channel", config.CHANNEL_MOD_LOG, 20)
+    guild.add("text_channel", config.CHANNEL_ARENA, 21)
+    guild.add("text_channel", config.CHANNEL_HIGHLIGHTS, 22)
+    guild.add("category", config.CATEGORY_CLANS, 30)
+    return guild
+
+
+async def test_lookups_skip_scans():
+    print("\n--- Test: Lookups after startup resolve by ID ---")
+    guild = make_guild()
+    found = bot_utils.resolve_guild_objects(guild)
+    assert found[config.ROLE_PLAYER].id == 12
+    assert found[config.CHANNEL_UPDATE_BOT] is None  # optional channel missing
+    assert found[config.ROLE_HIGHLIGHT_GOD] is None
+
+    scans = guild.scans
+    for _ in range(20):
+        assert bot_utils.get_role(config.ROLE_PLAYER, guild).id == 12
+        assert bot_utils.get_text_channel(config.CHANNEL_ARENA).id == 21  # registered guild by default
+        assert bot_utils.get_category(config.CATEGORY_CLANS, guild).id == 30
+        assert bot_utils.get_text_channel(config.CHANNEL_UPDATE_BOT, guild) is None  # cached miss
+    assert guild.scans == scans
+    print(f"Stats: {bot_utils.guild_registry_stats}")
+    print("✅ O(1) lookups: Passed")
+
+
+async def test_events_and_renames():
+    print("\n--- Test: Create / rename / delete keep the registry current ---")
+    guild = make_guild()
+    bot_utils.resolve_guild_objects(guild)
+
+    # Channel created after startup: the create event re-resolves
+    guild.add("text_channel", config.CHANNEL_UPDATE_BOT, 23)
+    bot_utils.refresh_guild_objects("text_channel", "category")
+    assert bot_utils.get_text_channel(config.CHANNEL_UPDATE_BOT, guild).id == 23
+
+    # Renamed without an event: the name check catches it
+    guild.get_channel(21).name = "arena-old"
+    assert bot_utils.get_text_channel(config.CHANNEL_ARENA, guild) is None
+    guild.add("text_channel", config.CHANNEL_ARENA, 24)
+    bot_utils.refresh_guild_objects("text_channel")
+    assert bot_utils.get_text_channel(config.CHANNEL_ARENA, guild).id == 24
+
+    # Role deleted and recreated with a new ID
+    del guild._objects[12]
+    bot_utils.refresh_guild_objects("role")
+    assert bot_utils.get_role(config.ROLE_PLAYER, guild) is None
+    guild.add("role", config.ROLE_PLAYER, 13)
+    bot_utils.refresh_guild_objects("role")
+    assert bot_utils.get_role(config.ROLE_PLAYER, guild).id == 13
+    print("✅ Events + renames: Passed")
+
+
+async def test_setters_and_other_guilds():
+    print("\n--- Test: Setters register IDs, unknown guilds fall back to a scan ---")
+    guild = make_guild()
+    bot_utils.resolve_guild_objects(guild)
+    created = guild.add("text_channel", config.CHANNEL_CHAT_ARENA, 25)
+    bot_utils.set_chat_channel(created)  # e.g. auto-created during on_ready
+    scans = guild.scans
+    assert bot_utils.get_text_channel(config.CHANNEL_CHAT_ARENA, guild) is created
+    assert guild.scans == scans
+
+    # Names that are not configured are resolved once, then served by ID
+    guild.add("role", "Custom", 40)
+    assert bot_utils.get_role("Custom", guild).id == 40
+    scans = guild.scans
+    assert bot_utils.get_role("Custom", guild).id == 40
+    assert guild.scans == scans
+
+    other = FakeGuild(2)
+    other.add("role", config.ROLE_PLAYER, 99)
+    assert bot_utils.get_role(config.ROLE_PLAYER, other).id == 99
+    assert bot_utils.get_role(config.ROLE_PLAYER, guild).id == 12  # registry untouched
+    print("✅ Setters + other guilds: Passed")
+
+
+async def main():
+    try:
+        await test_lookups_skip_scans()
+        await test_events_and_renames()
+        await test_setters_and_other_guilds()
+        print("\n🎉 ALL GUILD REGISTRY TESTS PASSED!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
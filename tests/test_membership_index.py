@@ -0,0 +1,172 @@
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import db, permissions
+
+
+async def setup_test_db():
+    """Point the db module at a throwaway database file."""
+    db.DB_PATH = Path(tempfile.mkdtemp()) / "membership_index_test.db"
+    await db.init_db()
+    db.set_cache_self_check(True)  # every lookup below is compared against the database
+
+
+def pool_uses() -> int:
+    stats = db.get_read_pool_stats()
+    return stats["reused"] + stats["opened"]
+
+
+async def make_active_clan(name: str, members: int) -> tuple:
+    captain = await db.create_user(f"{name}_cap", f"{name}#CAP")
+    clan_id = await db.create_clan(name, captain)
+    user_ids = [captain]
+    for i in range(members):
+        user_id = await db.create_user(f"{name}_{i}", f"{name}#{i}")
+        await db.add_member(user_id, clan_id)
+        user_ids.append(user_id)
+    await db.update_clan_status(clan_id, "active")
+    return clan_id, user_ids
+
+
+async def test_permission_checks_cost_no_queries():
+    print("\n--- Test: Warm permission checks do not touch the database ---")
+    clan_id, user_ids = await make_active_clan("MiAlpha", 4)
+    await permissions.is_user_in_clan("MiAlpha_0", clan_id)  # warm the caches
+    db.set_cache_self_check(False)
+    pool_before = pool_uses()
+    for _ in range(10):
+        assert await permissions.is_user_in_clan("MiAlpha_0", clan_id)
+        assert (await db.get_user_clan(user_ids[0]))["member_role"] == "captain"
+        assert await db.count_clan_members(clan_id) == 5
+        assert await db.get_user_clan(999999) is None
+    db.set_cache_self_check(True)
+    assert pool_uses() == pool_before
+    print(f"Stats: {db.get_membership_stats()}")
+    print("✅ Zero-query checks: Passed")
+
+
+async def test_helpers_write_through():
+    print("\n--- Test: Member helpers keep the index current ---")
+    clan_a = (await db.get_clan("MiAlpha"))["id"]
+    clan_b, _ = await make_active_clan("MiBeta", 4)
+    user_id = (await db.get_user("MiAlpha_1"))["id"]
+    refreshes = db.get_membership_stats()["refreshes"]
+
+    await db.update_member_role(user_id, clan_a, "vice")
+    assert (await db.get_user_clan(user_id))["member_role"] == "vice"
+    assert (await db.admin_set_member_role(clan_a, user_id, "member"))["changed"]
+    assert (await db.get_user_clan(user_id))["member_role"] == "member"
+
+    await db.move_member(user_id, clan_a, clan_b)
+    assert (await db.get_user_clan(user_id))["id"] == clan_b
+    assert await db.count_clan_members(clan_a) == 4
+    assert await db.count_clan_members(clan_b) == 6
+
+    await db.remove_member(user_id, clan_b)
+    assert await db.get_user_clan(user_id) is None
+    await db.add_member(user_id, clan_a, "recruit", "tryout", "2099-01-01T00:00:00+00:00")
+    await db.add_member(user_id, clan_a, "member")  # INSERT OR IGNORE: no change
+    joined = await db.get_user_clan(user_id)
+    assert (joined["member_role"], joined["join_type"]) == ("recruit", "tryout")
+    assert db.get_membership_stats()["refreshes"] == refreshes  # no reloads needed
+    print("✅ Write-through: Passed")
+
+
+async def test_multi_row_changes_reload():
+    print("\n--- Test: Captain hand-over, leave cleanup and raw SQL ---")
+    clan_a = (await db.get_clan("MiAlpha"))["id"]
+    old_captain = (await db.get_user("MiAlpha_cap"))["id"]
+    new_captain = (await db.get_user("MiAlpha_0"))["id"]
+    await db.admin_set_member_role(clan_a, new_captain, "captain")
+    assert (await db.get_user_clan(new_captain))["member_role"] == "captain"
+    assert (await db.get_user_clan(old_captain))["member_role"] == "member"
+
+    result = await db.cleanup_user_on_leave("MiAlpha_2")
+    assert result["success"], result
+    leaver = await db.get_user("LEAVER_MiAlpha_2")
+    assert leaver is None or await db.get_user_clan(leaver["id"]) is None
+
+    # Promote the recruit the way cogs/clan.py does it
+    recruit = (await db.get_user("MiAlpha_1"))["id"]
+    async with db.get_connection() as conn:
+        await conn.execute(
+            "UPDATE clan_members SET role='member', join_type='full', tryout_expires_at=NULL WHERE clan_id=? AND user_id=?",
+            (clan_a, recruit)
+        )
+        await conn.commit()
+    db.invalidate_members(user_id=recruit)
+    assert (await db.get_user_clan(recruit))["join_type"] == "full"
+    print("✅ Reloads: Passed")
+
+
+async def test_status_transitions_and_disband():
+    print("\n--- Test: Clan status filter and disband ---")
+    clan_b = (await db.get_clan("MiBeta"))["id"]
+    member = (await db.get_user("MiBeta_0"))["id"]
+    await db.update_clan_status(clan_b, "inactive")
+    assert (await db.get_user_clan(member))["status"] == "inactive"
+
+    async with db.get_connection() as conn:
+        await conn.execute("DELETE FROM clan_members WHERE clan_id = ?", (clan_b,))
+        await conn.execute("UPDATE clans SET status = 'disbanded' WHERE id = ?", (clan_b,))
+        await conn.commit()
+    db.invalidate_clan(clan_b)
+    db.invalidate_members(clan_id=clan_b)
+    assert await db.get_user_clan(member) is None
+    assert await db.count_clan_members(clan_b) == 0
+
+    clan_c, users_c = await make_active_clan("MiGamma", 1)
+    await db.hard_delete_clan(clan_c)
+    assert await db.get_user_clan(users_c[1]) is None
+    print("✅ Status + disband: Passed")
+
+
+async def test_transactions_and_reload():
+    print("\n--- Test: Transaction outcome and database switch ---")
+    clan_a = (await db.get_clan("MiAlpha"))["id"]
+    outsider = await db.create_user("mi_outsider", "Out#1")
+    try:
+        async with db.transaction():
+            await db.add_member(outsider, clan_a)
+            assert (await db.get_user_clan(outsider))["id"] == clan_a  # scope sees its own write
+            raise RuntimeError("abort")
+    except RuntimeError:
+        pass
+    assert await db.get_user_clan(outsider) is None
+
+    async with db.transaction():
+        await db.add_member(outsider, clan_a)
+    assert (await db.get_user_clan(outsider))["id"] == clan_a
+
+    loads = db.get_membership_stats()["loads"]
+    await setup_test_db()
+    assert await db.get_user_clan(outsider) is None
+    assert db.get_membership_stats()["loads"] == loads + 1
+    print("✅ Transactions + reload: Passed")
+
+
+async def main():
+    try:
+        await setup_test_db()
+        await test_permission_checks_cost_no_queries()
+        await test_helpers_write_through()
+        await test_multi_row_changes_reload()
+        await test_status_transitions_and_disband()
+        await test_transactions_and_reload()
+        await db.close_pool()
+        print("\n🎉 ALL MEMBERSHIP INDEX TESTS PASSED!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,173 @@
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import db, elo
+
+
+async def setup_test_db():
+    """Point the db module at a throwaway database file."""
+    db.DB_PATH = Path(tempfile.mkdtemp()) / "memo_cache_test.db"
+    await db.init_db()
+    db.set_cache_self_check(True)  # every hit below is compared against the database
+
+
+def pool_uses() -> int:
+    stats = db.get_read_pool_stats()
+    return stats["reused"] + stats["opened"]
+
+
+async def make_active_clan(name: str, members: int) -> tuple:
+    captain = await db.create_user(f"{name}_cap", f"{name}#CAP")
+    clan_id = await db.create_clan(name, captain)
+    for i in range(members):
+        await db.add_member(await db.create_user(f"{name}_{i}", f"{name}#{i}"), clan_id)
+    await db.update_clan_status(clan_id, "active")
+    return clan_id, captain
+
+
+async def test_hot_reads_are_memoized():
+    print("\n--- Test: Repeated reads are served from the memo ---")
+    clan_a, captain_a = await make_active_clan("MeAlpha", 3)
+    clan_b, _ = await make_active_clan("MeBeta", 2)
+    match_id = await db.create_match_v2(clan_a, clan_b, captain_a)
+    await db.update_clan_elo(clan_a, 1010, None, "seed")
+
+    first = (
+        await db.get_clan_members(clan_a), await db.get_match_with_clans(match_id),
+        await db.get_clan_elo_history(clan_a), await db.get_pending_matches(),
+    )
+    db.set_cache_self_check(False)
+    pool_before = pool_uses()
+    for _ in range(10):
+        assert (
+            await db.get_clan_members(clan_a), await db.get_match_with_clans(match_id),
+            await db.get_clan_elo_history(clan_a), await db.get_pending_matches(),
+        ) == first
+    db.set_cache_self_check(True)
+    assert pool_uses() == pool_before
+
+    stats = db.get_memo_stats()
+    print(f"Stats: {stats['get_clan_members']}")
+    for name in ("get_clan_members", "get_match_with_clans", "get_clan_elo_history", "get_pending_matches"):
+        assert stats[name]["hits"] >= 10, name
+
+    # Callers get their own copy
+    members = await db.get_clan_members(clan_a)
+    members[0]["role"] = "tampered"
+    members.pop()
+    assert len(await db.get_clan_members(clan_a)) == 4
+    assert "tampered" not in [m["role"] for m in await db.get_clan_members(clan_a)]
+    print("✅ Memoized reads: Passed")
+
+
+async def test_write_helpers_fire_tags():
+    print("\n--- Test: Write helpers invalidate by tag ---")
+    clan_a = (await db.get_clan("MeAlpha"))["id"]
+    clan_b = (await db.get_clan("MeBeta"))["id"]
+    captain_b = (await db.get_user("MeBeta_cap"))["id"]
+    match_id = (await db.get_pending_matches())[0]["id"]
+
+    # match:{id}
+    await db.report_match_v3(match_id, 13, 9)
+    assert (await db.get_match_with_clans(match_id))["status"] == "reported"
+    await db.confirm_match_v2(match_id, captain_b)
+    assert await db.get_pending_matches() == []
+
+    # clan:{id} (Elo history) through a match result
+    history_b = len(await db.get_clan_elo_history(clan_b))
+    result = await elo.apply_match_result(match_id, clan_a)
+    assert result["success"], result
+    assert len(await db.get_clan_elo_history(clan_b)) == history_b + 1
+    assert (await db.get_match_with_clans(match_id))["clan_a_elo"] == result["elo_a_new"]
+
+    # members:{id}, and only that clan's entry
+    before_b = db.get_memo_stats()["get_clan_members"]["invalidations"]
+    await db.get_clan_members(clan_b)
+    newcomer = await db.create_user("me_new", "New#1")
+    await db.add_member(newcomer, clan_a)
+    assert newcomer in [m["user_id"] for m in await db.get_clan_members(clan_a)]
+    await db.update_member_rank(newcomer, clan_a, "Gold 2", 13)
+    assert [m["valorant_rank"] for m in await db.get_clan_members(clan_a) if m["user_id"] == newcomer] == ["Gold 2"]
+    await db.move_member(newcomer, clan_a, clan_b)
+    assert newcomer in [m["user_id"] for m in await db.get_clan_members(clan_b)]
+    assert db.get_memo_stats()["get_clan_members"]["invalidations"] > before_b
+
+    # user:{id} / users (riot_id in member lists)
+    await db.ban_user(newcomer, "test")
+    await db.get_clan_members(clan_b)
+    async with db.get_connection() as conn:
+        await conn.execute("UPDATE users SET riot_id = 'Renamed#1' WHERE id = ?", (newcomer,))
+        await conn.commit()
+    db.invalidate_user(newcomer)
+    assert "Renamed#1" in [m["riot_id"] for m in await db.get_clan_members(clan_b)]
+    print("✅ Tag invalidation: Passed")
+
+
+async def test_transactions_and_lru():
+    print("\n--- Test: Transactions bypass, rollbacks keep, LRU bound ---")
+    clan_a = (await db.get_clan("MeAlpha"))["id"]
+    members = await db.get_clan_members(clan_a)
+    outsider = await db.create_user("me_out", "Out#1")
+    try:
+        async with db.transaction():
+            await db.add_member(outsider, clan_a)
+            assert len(await db.get_clan_members(clan_a)) == len(members) + 1  # scope sees its own write
+            raise RuntimeError("abort")
+    except RuntimeError:
+        pass
+    assert await db.get_clan_members(clan_a) == members
+
+    memo = db.get_clan_elo_history.memo
+    size, memo.size = memo.size, 3
+    try:
+        for limit in range(1, 8):
+            await db.get_clan_elo_history(clan_a, limit)
+        assert memo.get_stats()["size"] == 3 and memo.stats["evictions"] >= 4
+    finally:
+        memo.size = size
+
+    memo.ttl, ttl = 0.05, memo.ttl
+    try:
+        await db.get_clan_elo_history(clan_a, 99)
+        await asyncio.sleep(0.1)
+        expired = memo.stats["expired"]
+        await db.get_clan_elo_history(clan_a, 99)
+        assert memo.stats["expired"] == expired + 1
+    finally:
+        memo.ttl = ttl
+    print("✅ Transactions + LRU + TTL: Passed")
+
+
+async def test_database_switch():
+    print("\n--- Test: A new database never reuses old results ---")
+    clan_a = (await db.get_clan("MeAlpha"))["id"]
+    assert await db.get_clan_members(clan_a) != []
+    await setup_test_db()
+    assert await db.get_clan_members(clan_a) == []
+    print("✅ Database switch: Passed")
+
+
+async def main():
+    try:
+        await setup_test_db()
+        await test_hot_reads_are_memoized()
+        await test_write_helpers_fire_tags()
+        await test_transactions_and_lru()
+        await test_database_switch()
+        await db.close_pool()
+        print("\n🎉 ALL MEMO CACHE TESTS PASSED!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
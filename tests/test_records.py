@@ -0,0 +1,86 @@
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import db
+from services.records import Clan, Record, User, record_class
+
+
+async def setup_test_db():
+    """Point the db module at a throwaway database file."""
+    db.DB_PATH = Path(tempfile.mkdtemp()) / "records_test.db"
+    await db.init_db()
+
+
+async def test_helpers_return_records():
+    print("\n--- Test: Helpers return slotted records ---")
+    user_id = await db.create_user("rec_user", "Rec#1")
+    clan_id = await db.create_clan("RecClan", user_id)
+
+    user = await db.get_user("rec_user")
+    clan = await db.get_clan_by_id(clan_id)
+    assert isinstance(user, User) and isinstance(clan, Clan)
+    assert not hasattr(user, "__dict__")
+    assert user["id"] == user.id == user_id
+    members = await db.get_clan_members(clan_id)
+    assert members[0]["riot_id"] == "Rec#1"  # joined column is a field too
+    print(f"Record: {user!r}")
+    print("✅ Records: Passed")
+
+
+async def test_dict_compatibility():
+    print("\n--- Test: Records behave like the old dicts ---")
+    user = await db.get_user("rec_user")
+    plain = dict(user)
+
+    assert plain["discord_id"] == "rec_user"
+    assert user == plain and {**user} == plain
+    assert user.get("missing", "default") == "default"
+    assert "riot_id" in user and "missing" not in user
+    assert list(user.keys()) == list(plain.keys())
+    try:
+        user["missing"]
+        raise AssertionError("KeyError expected")
+    except KeyError:
+        pass
+
+    # Callers may still annotate results with extra keys
+    user["display"] = "shown"
+    assert user["display"] == "shown" and "display" in user
+    copy = user.copy()
+    copy["riot_id"] = "Changed#1"
+    assert user["riot_id"] == "Rec#1"
+    print("✅ Dict compatibility: Passed")
+
+
+async def test_unusable_columns_fall_back_to_dict():
+    print("\n--- Test: Odd column layouts fall back to dict ---")
+    assert record_class(User, ("id", "id")) is None
+    assert record_class(User, ("COUNT(*)",)) is None
+    assert record_class(User, ("items",)) is None
+    assert issubclass(record_class(User, ("id",)), Record)
+    print("✅ Fallback: Passed")
+
+
+async def main():
+    try:
+        await setup_test_db()
+        await test_helpers_return_records()
+        await test_dict_compatibility()
+        await test_unusable_columns_fall_back_to_dict()
+        await db.close_pool()
+        print("\n🎉 ALL RECORD TESTS PASSED!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,139 @@
+import asyncio
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import db, elo, moderation
+
+
+async def setup_test_db():
+    """Point the db module at a throwaway database file."""
+    db.DB_PATH = Path(tempfile.mkdtemp()) / "sanctions_test.db"
+    await db.init_db()
+    db.set_cache_self_check(True)  # every lookup below is compared against the database
+
+
+def pool_uses() -> int:
+    stats = db.get_read_pool_stats()
+    return stats["reused"] + stats["opened"]
+
+
+async def make_active_clan(name: str) -> tuple:
+    captain = await db.create_user(f"{name}_cap", f"{name}#CAP")
+    clan_id = await db.create_clan(name, captain)
+    await db.update_clan_status(clan_id, "active")
+    return clan_id, captain
+
+
+async def test_checks_are_served_from_memory():
+    print("\n--- Test: Sanction checks do not touch the database ---")
+    clan_a, mod = await make_active_clan("SnAlpha")
+    clan_b, player = await make_active_clan("SnBeta")
+    await db.add_system_ban("user", player, "cheating", mod)
+    await db.set_clan_frozen(clan_b, "investigation", mod)
+    await db.get_sanctions(user_ids=[player], clan_ids=[clan_a])  # load
+
+    db.set_cache_self_check(False)
+    pool_before = pool_uses()
+    for _ in range(10):
+        assert await db.is_user_system_banned(player)
+        assert not await db.is_user_system_banned(mod)
+        assert (await db.is_user_banned(player))["reason"] == "cheating"
+        assert await db.is_clan_frozen(clan_b)
+        assert not await db.is_clan_system_banned(clan_a)
+    sanctions = await db.get_sanctions(user_ids=[mod, player], clan_ids=[clan_a, clan_b, 424242])
+    db.set_cache_self_check(True)
+
+    assert pool_uses() == pool_before
+    assert sanctions == {"banned_users": {player}, "banned_clans": set(), "frozen_clans": {clan_b}}
+    print(f"Stats: {db.get_sanction_stats()}")
+    print("✅ In-memory checks: Passed")
+
+
+async def test_writes_and_expiry():
+    print("\n--- Test: Ban / unban / freeze / unfreeze and expires_at ---")
+    clan_a = (await db.get_clan("SnAlpha"))["id"]
+    clan_b = (await db.get_clan("SnBeta"))["id"]
+    mod = (await db.get_user("SnAlpha_cap"))["id"]
+    player = (await db.get_user("SnBeta_cap"))["id"]
+
+    assert await db.remove_system_ban("user", player)
+    assert not await db.is_user_system_banned(player)
+    assert await db.unset_clan_frozen(clan_b)
+    assert not await db.is_clan_frozen(clan_b)
+    assert (await moderation.check_clan_frozen(clan_b)) == (False, None)
+
+    soon = (datetime.now(timezone.utc) + timedelta(seconds=2)).isoformat()
+    await db.add_system_ban("clan", clan_a, "temporary", mod, expires_at=soon)
+    assert await db.is_clan_system_banned(clan_a)
+    assert (await moderation.check_elo_eligible(clan_a))[0] is False
+    await asyncio.sleep(2.1)
+    assert not await db.is_clan_system_banned(clan_a)  # lapses without a reload
+    assert (await moderation.check_elo_eligible(clan_a)) == (True, "")
+
+    await db.add_system_ban("clan", clan_a, "permanent now", mod)  # upsert clears expires_at
+    assert (await db.get_system_ban("clan", clan_a))["expires_at"] is None
+    await db.remove_system_ban("clan", clan_a)
+    print("✅ Writes + expiry: Passed")
+
+
+async def test_transactions():
+    print("\n--- Test: Snapshot follows transaction outcome ---")
+    clan_b = (await db.get_clan("SnBeta"))["id"]
+    mod = (await db.get_user("SnAlpha_cap"))["id"]
+    try:
+        async with db.transaction():
+            await db.set_clan_frozen(clan_b, "rolled back", mod)
+            assert await db.is_clan_frozen(clan_b)  # scope sees its own write
+            raise RuntimeError("abort")
+    except RuntimeError:
+        pass
+    assert not await db.is_clan_frozen(clan_b)
+
+    async with db.transaction():
+        assert not await db.is_clan_frozen(clan_b)  # snapshot is usable in a clean scope
+        await db.set_clan_frozen(clan_b, "committed", mod)
+    assert await db.is_clan_frozen(clan_b)
+    print("✅ Transactions: Passed")
+
+
+async def test_elo_uses_one_batched_check():
+    print("\n--- Test: apply_match_result skips Elo for a frozen clan ---")
+    clan_a = (await db.get_clan("SnAlpha"))["id"]
+    clan_b = (await db.get_clan("SnBeta"))["id"]
+    creator = (await db.get_user("SnAlpha_cap"))["id"]
+    confirmer = (await db.get_user("SnBeta_cap"))["id"]
+    match_id = await db.create_match_v2(clan_a, clan_b, creator)
+    await db.report_match_v3(match_id, 13, 7)
+    await db.confirm_match_v2(match_id, confirmer)
+    result = await elo.apply_match_result(match_id, clan_a)
+    assert result["reason"] == "CLANS_FROZEN" and result["frozen_clans"] == ["SnBeta"]
+
+    await db.hard_delete_clan(clan_b)  # drops its clan_flags row
+    assert not await db.is_clan_frozen(clan_b)
+    print("✅ Elo gate: Passed")
+
+
+async def main():
+    try:
+        await setup_test_db()
+        await test_checks_are_served_from_memory()
+        await test_writes_and_expiry()
+        await test_transactions()
+        await test_elo_uses_one_batched_check()
+        await db.close_pool()
+        print("\n🎉 ALL SANCTION TESTS PASSED!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
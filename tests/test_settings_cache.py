@@ -0,0 +1,92 @@
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import db
+
+
+async def setup_test_db():
+    """Point the db module at a throwaway database file."""
+    db.DB_PATH = Path(tempfile.mkdtemp()) / "settings_cache_test.db"
+    await db.init_db()
+
+
+async def test_reads_are_served_from_snapshot():
+    print("\n--- Test: Reads hit the snapshot, not the database ---")
+    await db.set_system_setting("matchmaking_locked", "1")
+    await db.set_system_setting("matchmaking_lock_reason", "Maintenance")
+    await db.load_system_settings()
+
+    queries_before = db.get_read_pool_stats()["reused"] + db.get_read_pool_stats()["opened"]
+    before = db.get_settings_cache_stats()
+    for _ in range(10):
+        assert await db.is_matchmaking_locked() == (True, "Maintenance")
+        assert await db.is_balance_feature_enabled("elo_gain_cap") is True  # unset -> default on
+    after = db.get_settings_cache_stats()
+    queries_after = db.get_read_pool_stats()["reused"] + db.get_read_pool_stats()["opened"]
+
+    print(f"Stats: {after}")
+    assert after["hits"] - before["hits"] == 30
+    assert after["misses"] == before["misses"]
+    assert queries_after == queries_before
+    print("✅ Snapshot reads: Passed")
+
+
+async def test_write_through():
+    print("\n--- Test: Writes update the snapshot ---")
+    await db.toggle_balance_feature("underdog_bonus", False)
+    assert await db.is_balance_feature_enabled("underdog_bonus") is False
+    await db.toggle_balance_feature("underdog_bonus", True)
+    assert await db.is_balance_feature_enabled("underdog_bonus") is True
+    await db.set_system_setting("matchmaking_locked", 0)
+    assert await db.is_matchmaking_locked() == (False, "")
+    print("✅ Write-through: Passed")
+
+
+async def test_transaction_rollback_and_commit():
+    print("\n--- Test: Cache follows transaction outcome ---")
+    try:
+        async with db.transaction():
+            await db.set_system_setting("season", "2")
+            assert await db.get_system_setting("season") == "2"  # read-your-own-writes
+            raise RuntimeError("abort")
+    except RuntimeError:
+        pass
+    assert await db.get_system_setting("season") is None
+
+    async with db.transaction():
+        await db.set_system_setting("season", "3")
+    assert await db.get_system_setting("season") == "3"
+    print("✅ Transactions: Passed")
+
+
+async def test_new_database_reloads():
+    print("\n--- Test: Switching database file reloads the snapshot ---")
+    await setup_test_db()
+    assert await db.get_system_setting("season") is None
+    print("✅ Reload: Passed")
+
+
+async def main():
+    try:
+        await setup_test_db()
+        await test_reads_are_served_from_snapshot()
+        await test_write_through()
+        await test_transaction_rollback_and_commit()
+        await test_new_database_reloads()
+        await db.close_pool()
+        print("\n🎉 ALL SETTINGS CACHE TESTS PASSED!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
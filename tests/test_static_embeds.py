@@ -0,0 +1,77 @@
+import os
+import sys
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from services import bot_utils
+from cogs import arena, clan
+
+
+def test_built_once_and_reused():
+    print("\n--- Test: Static screens are built once ---")
+    bot_utils.reset_static_embeds()
+    assert bot_utils.build_static_embeds("arena_dashboard", "arena_rules", "arena_donate") == 3
+    assert bot_utils.build_static_embeds("arena_dashboard", "arena_rules", "arena_donate") == 0
+    builds = bot_utils.static_embed_stats["builds"]
+    for _ in range(20):
+        rules = bot_utils.get_static_embed("arena_rules")
+        dashboard = arena.create_arena_embed()
+    assert bot_utils.static_embed_stats["builds"] == builds
+    assert rules.to_dict() == arena._build_rules_embed().to_dict()
+    assert len(rules.fields) == 13 and dashboard.title.startswith("🏟️ ARENA")
+    print("✅ Build once: Passed")
+
+
+def test_copies_are_independent():
+    print("\n--- Test: Callers can modify their copy ---")
+    embed = bot_utils.get_static_embed("arena_rules")
+    embed.add_field(name="extra", value="x")
+    embed.set_field_at(0, name="changed", value="y")
+    embed.set_footer(text="changed")
+    fresh = bot_utils.get_static_embed("arena_rules")
+    assert len(fresh.fields) == 13 and fresh.fields[0].name == "🏰 Tổng Quan"
+    assert fresh.footer.text.startswith("💡")
+    print("✅ Copies: Passed")
+
+
+def test_help_variants_and_reset():
+    print("\n--- Test: /clan help per role combination, reset on config change ---")
+    builds = bot_utils.static_embed_stats["builds"]
+    captain = bot_utils.get_static_embed("clan_help", False, True, "captain")
+    guest = bot_utils.get_static_embed("clan_help", False, False, None)
+    assert bot_utils.get_static_embed("clan_help", False, True, "captain").to_dict() == captain.to_dict()
+    assert bot_utils.static_embed_stats["builds"] == builds + 2
+    assert "👑 Lệnh Đội Trưởng" in [f.name for f in captain.fields]
+    assert "👑 Lệnh Đội Trưởng" not in [f.name for f in guest.fields]
+    assert captain.footer.text == "Your roles: Verified, Captain"
+    assert captain.to_dict() == clan._build_help_embed(False, True, "captain").to_dict()
+
+    original = config.DONATE_DESCRIPTION
+    config.DONATE_DESCRIPTION = "new text"
+    try:
+        assert bot_utils.get_static_embed("arena_donate").description == original
+        bot_utils.reset_static_embeds()
+        assert bot_utils.get_static_embed("arena_donate").description == "new text"
+    finally:
+        config.DONATE_DESCRIPTION = original
+        bot_utils.reset_static_embeds()
+    print("✅ Variants + reset: Passed")
+
+
+def main():
+    try:
+        test_built_once_and_reused()
+        test_copies_are_independent()
+        test_help_variants_and_reset()
+        print("\n🎉 ALL STATIC EMBED TESTS PASSED!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import db
+
+
+async def setup_test_db():
+    """Point the db module at a throwaway database file."""
+    db.DB_PATH = Path(tempfile.mkdtemp()) / "user_cache_test.db"
+    await db.init_db()
+    db.set_cache_self_check(True)  # every hit below is compared against the database
+
+
+def pool_uses() -> int:
+    stats = db.get_read_pool_stats()
+    return stats["reused"] + stats["opened"]
+
+
+async def test_hits_skip_the_database():
+    print("\n--- Test: Repeated identity lookups are cache hits ---")
+    user_id = await db.create_user("uc_alpha", "Alpha#1")
+    await db.get_user("uc_alpha")
+    db.set_cache_self_check(False)
+    before = db.get_user_cache_stats()
+    pool_before = pool_uses()
+    for _ in range(10):
+        assert (await db.get_user("uc_alpha"))["id"] == user_id
+        assert (await db.get_user_by_id(user_id))["discord_id"] == "uc_alpha"
+    after = db.get_user_cache_stats()
+    db.set_cache_self_check(True)
+
+    print(f"Stats: {after}")
+    assert after["hits"] - before["hits"] == 20
+    assert pool_uses() == pool_before
+    assert (await db.get_users_by_ids([user_id]))[user_id]["riot_id"] == "Alpha#1"
+    print("✅ Cache hits: Passed")
+
+
+async def test_unregistered_users_are_negative_cached():
+    print("\n--- Test: Unregistered Discord users cost one query per TTL ---")
+    assert await db.get_user("uc_stranger") is None
+    pool_before = pool_uses()
+    before = db.get_user_cache_stats()["negative_hits"]
+    for _ in range(10):
+        assert await db.get_user("uc_stranger") is None
+    assert db.get_user_cache_stats()["negative_hits"] - before == 10
+    assert pool_uses() == pool_before
+
+    # Registering clears the "not registered" entry right away
+    user_id = await db.create_user("uc_stranger", "Stranger#1")
+    assert (await db.get_user("uc_stranger"))["id"] == user_id
+
+    # Entries expire after the TTL
+    db._user_cache.negative_ttl = 0.05
+    assert await db.get_user("uc_ghost") is None
+    async with db.get_connection() as conn:  # registered behind the cache's back
+        await conn.execute("INSERT INTO users (discord_id, riot_id) VALUES ('uc_ghost', 'Ghost#1')")
+        await conn.commit()
+    assert await db.get_user("uc_ghost") is None
+    await asyncio.sleep(0.1)
+    assert (await db.get_user("uc_ghost"))["riot_id"] == "Ghost#1"
+    db._user_cache.negative_ttl = db.config.DB_USER_NEGATIVE_TTL_SECONDS
+    print("✅ Negative cache: Passed")
+
+
+async def test_mutators_invalidate():
+    print("\n--- Test: ban / unban / cooldown writes invalidate ---")
+    user_id = (await db.get_user("uc_alpha"))["id"]
+    await db.ban_user(user_id, "test")
+    assert (await db.get_user("uc_alpha"))["is_banned"] == 1
+    await db.unban_user(user_id)
+    assert (await db.get_user_by_id(user_id))["is_banned"] == 0
+    await db.update_user_cooldown(user_id, "2099-01-01 00:00:00")
+    await db.get_user("uc_alpha")
+    await db.update_user_cooldown(user_id, None)
+    assert (await db.get_user("uc_alpha"))["cooldown_until"] is None
+
+    try:
+        async with db.transaction():
+            await db.ban_user(user_id, "rolled back")
+            assert (await db.get_user("uc_alpha"))["is_banned"] == 1  # scope sees its own write
+            raise RuntimeError("abort")
+    except RuntimeError:
+        pass
+    assert (await db.get_user("uc_alpha"))["is_banned"] == 0
+    assert await db.verify_user_cache() == []
+    print("✅ Invalidation: Passed")
+
+
+async def test_leaving_the_server():
+    print("\n--- Test: cleanup_user_on_leave drops both keys ---")
+    # Plain member with no history: deleted
+    plain = await db.create_user("uc_plain", "Plain#1")
+    await db.get_user("uc_plain")
+    result = await db.cleanup_user_on_leave("uc_plain")
+    assert result["success"], result
+    assert await db.get_user("uc_plain") is None
+    assert await db.get_user_by_id(plain) is None
+
+    # Captain: anonymized, the old discord_id no longer resolves
+    captain = await db.create_user("uc_captain", "Captain#1")
+    clan_id = await db.create_clan("UserCacheClan", captain)
+    await db.update_clan_status(clan_id, "active")
+    await db.get_user("uc_captain")
+    result = await db.cleanup_user_on_leave("uc_captain")
+    assert result["success"], result
+    assert await db.get_user("uc_captain") is None
+    assert (await db.get_user("LEAVER_uc_captain"))["id"] == captain
+    assert (await db.get_user_by_id(captain))["is_banned"] == 1
+
+    # Rejoining creates a fresh row even though the old one was cached
+    rejoined = await db.create_user("uc_plain", "Plain#2")
+    assert (await db.get_user("uc_plain"))["id"] == rejoined
+    assert await db.verify_user_cache() == []
+    print("✅ Leave cleanup: Passed")
+
+
+async def main():
+    try:
+        await setup_test_db()
+        await test_hits_skip_the_database()
+        await test_unregistered_users_are_negative_cached()
+        await test_mutators_invalidate()
+        await test_leaving_the_server()
+        await db.close_pool()
+        print("\n🎉 ALL USER CACHE TESTS PASSED!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())